@@ -14,33 +14,87 @@ from __future__ import absolute_import
 __version__ = '1.0.2'
 
 
-import os
-if 'DISPLAY' not in os.environ:
+import importlib
+import sys
+
+
+# Names are only imported the first time they are asked for (PEP 562), so
+# that ``import landlab`` stays cheap and matplotlib is not loaded unless
+# something is plotted.
+_LAZY_IMPORTS = {
+    'ModelParameterDictionary': '.core.model_parameter_dictionary',
+    'MissingKeyError': '.core.model_parameter_dictionary',
+    'ParameterValueError': '.core.model_parameter_dictionary',
+    'load_params': '.core.model_parameter_loader',
+    'Component': '.core.model_component',
+    'Palette': '.framework.collections',
+    'Arena': '.framework.collections',
+    'NoProvidersError': '.framework.collections',
+    'Implements': '.framework.decorators',
+    'ImplementsOrRaise': '.framework.decorators',
+    'Framework': '.framework.framework',
+    'Scheduler': '.framework.scheduler',
+    'ParameterSweep': '.framework.sweep',
+    'FieldError': '.field.scalar_data_fields',
+    'LandlabTester': '.testing.nosetester',
+}
+for _name in ('ModelGrid', 'HexModelGrid', 'RadialModelGrid',
+              'RasterModelGrid', 'VoronoiDelaunayGrid', 'BAD_INDEX_VALUE',
+              'CORE_NODE', 'FIXED_VALUE_BOUNDARY', 'FIXED_GRADIENT_BOUNDARY',
+              'LOOPED_BOUNDARY', 'CLOSED_BOUNDARY', 'ACTIVE_LINK',
+              'FIXED_LINK', 'INACTIVE_LINK', 'create_and_initialize_grid'):
+    _LAZY_IMPORTS[_name] = '.grid'
+for _name in ('imshow_grid', 'imshow_node_grid', 'imshow_cell_grid',
+              'imshow_grid_at_node'):
+    _LAZY_IMPORTS[_name] = '.plot'
+del _name
+
+
+def __getattr__(name):
+    """Import a name, or a subpackage, the first time it is used."""
     try:
-        import matplotlib
-    except ImportError:
-        import warnings
-        warnings.warn('matplotlib not found', ImportWarning)
-    else:
-        matplotlib.use('Agg')
-
-from .core.model_parameter_dictionary import ModelParameterDictionary
-from .core.model_parameter_dictionary import (MissingKeyError,
-                                              ParameterValueError)
-from .core.model_parameter_loader import load_params
-from .core.model_component import Component
-from .framework.collections import Palette, Arena, NoProvidersError
-from .framework.decorators import Implements, ImplementsOrRaise
-from .framework.framework import Framework
-from .field.scalar_data_fields import FieldError
-from .grid import *
-from .plot import *
-
-from .testing.nosetester import LandlabTester
-test = LandlabTester().test
-bench = LandlabTester().bench
+        module = _LAZY_IMPORTS[name]
+    except KeyError:
+        if name.startswith('_'):
+            raise AttributeError(
+                'module {0!r} has no attribute {1!r}'.format(__name__, name))
+        try:
+            return importlib.import_module('.' + name, __name__)
+        except ImportError as error:
+            if getattr(error, 'name', None) != __name__ + '.' + name:
+                raise
+            raise AttributeError(
+                'module {0!r} has no attribute {1!r}'.format(__name__, name))
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+def test(**kwds):
+    """Run the landlab test suite (see :class:`LandlabTester`)."""
+    from .testing.nosetester import LandlabTester
+    return LandlabTester(sys.modules[__name__]).test(**kwds)
+
+
+def bench(**kwds):
+    """Run the landlab benchmarks (see :class:`LandlabTester`)."""
+    from .testing.nosetester import LandlabTester
+    return LandlabTester(sys.modules[__name__]).bench(**kwds)
+
+
+test.__test__ = bench.__test__ = False  # not themselves tests
+
+
+if sys.version_info < (3, 7):  # no module __getattr__, so import up front
+    for _name in list(_LAZY_IMPORTS):
+        __getattr__(_name)
 
 __all__ = ['ModelParameterDictionary', 'MissingKeyError',
            'ParameterValueError', 'Component', 'Palette', 'Arena',
            'NoProvidersError', 'Implements', 'ImplementsOrRaise',
-           'Framework', 'FieldError', 'LandlabTester', 'load_params']
+           'Framework', 'Scheduler', 'ParameterSweep', 'FieldError',
+           'LandlabTester', 'load_params']
@@ -0,0 +1,6 @@
+"""Benchmarks of landlab grids, fields, mappers, and components.
+
+The benchmarks are written for airspeed velocity (asv); see asv.conf.json
+at the top of the repository. Functions named ``bench_*`` run each of them
+once, as a smoke test, through ``landlab.bench()``.
+"""
@@ -0,0 +1,68 @@
+"""Grids of each type, with about a given number of nodes, to benchmark."""
+import numpy as np
+
+from landlab import (RasterModelGrid, HexModelGrid, RadialModelGrid,
+                     VoronoiDelaunayGrid)
+
+
+GRID_TYPES = ['raster', 'hex', 'radial', 'voronoi']
+
+# Approximate number of nodes of each grid
+SIZES = [1000, 10000, 100000]
+
+
+def _raster(n_nodes):
+    side = int(round(n_nodes ** .5))
+    return RasterModelGrid((side, side))
+
+
+def _hex(n_nodes):
+    side = int(round(n_nodes ** .5))
+    return HexModelGrid(side, side)
+
+
+def _radial(n_nodes):
+    # a radial grid with n shells has about 3 n ** 2 nodes
+    return RadialModelGrid(int(round((n_nodes / 3.) ** .5)))
+
+
+def _voronoi(n_nodes):
+    np.random.seed(1945)
+    side = n_nodes ** .5
+    return VoronoiDelaunayGrid(np.random.rand(n_nodes) * side,
+                               np.random.rand(n_nodes) * side)
+
+
+_GRID_MAKERS = {
+    'raster': _raster,
+    'hex': _hex,
+    'radial': _radial,
+    'voronoi': _voronoi,
+}
+
+
+def make_grid(grid_type, n_nodes):
+    """New grid of a type, with about *n_nodes* nodes."""
+    return _GRID_MAKERS[grid_type](n_nodes)
+
+
+def make_landscape(grid_type, n_nodes):
+    """New grid with random values at its nodes and links."""
+    grid = make_grid(grid_type, n_nodes)
+    np.random.seed(1945)
+    grid.add_field('node', 'topographic__elevation',
+                   np.random.rand(grid.number_of_nodes) + 0.01 * grid.x_of_node)
+    grid.add_field('node', 'soil__depth',
+                   np.random.rand(grid.number_of_nodes))
+    grid.add_field('link', 'surface_water__discharge',
+                   np.random.randn(grid.number_of_links))
+    grid.add_field('link', 'surface_water__depth',
+                   np.random.rand(grid.number_of_links))
+    return grid
+
+
+def make_landscapes(sizes=None):
+    """Landscapes of every type and size, keyed by (type, size)."""
+    sizes = SIZES if sizes is None else sizes
+    return dict(((grid_type, size), make_landscape(grid_type, size))
+                for grid_type in GRID_TYPES for size in sizes)
@@ -0,0 +1,24 @@
+"""Run asv benchmark classes once, as smoke tests."""
+
+
+def run_once(cls, *params):
+    """Run every benchmark of a class once, for one set of parameters.
+
+    Parameters
+    ----------
+    cls : class
+        An asv benchmark class, with *time_* and *peakmem_* methods and,
+        optionally, *setup* and *teardown* methods.
+    params : tuple
+        Parameters passed to every method.
+    """
+    bench = cls()
+    if hasattr(bench, 'setup'):
+        bench.setup(*params)
+    try:
+        for name in sorted(dir(bench)):
+            if name.startswith(('time_', 'peakmem_')):
+                getattr(bench, name)(*params)
+    finally:
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*params)
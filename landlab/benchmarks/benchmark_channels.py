@@ -0,0 +1,91 @@
+"""Benchmark finding chi and steepness indices on an eroded landscape.
+
+Chi is summed down the channel network in compiled code. Scanning a range
+of reference concavities with one call should cost little more than
+finding chi for a single concavity, as the channel network is built once
+and reused for every concavity.
+
+For steepness indices, the channel network is split into reaches in a
+single compiled pass. When every node gets its own index, all reaches are
+then done at once.
+"""
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import (FlowRouter, FastscapeEroder, ChiFinder,
+                                SteepnessFinder)
+from ._smoke import run_once
+
+
+SHAPES = [(50, 50), (200, 200)]
+
+CONCAVITIES = np.linspace(0.2, 0.8, 25)
+
+
+def _eroded_grid(shape):
+    np.random.seed(1945)
+    grid = RasterModelGrid(shape, 100.)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z += np.random.rand(z.size)
+
+    fr = FlowRouter(grid)
+    sp = FastscapeEroder(grid, K_sp=1.e-4)
+    for _ in range(10):
+        z[grid.core_nodes] += 1.
+        fr.run_one_step()
+        sp.run_one_step(1000.)
+    fr.run_one_step()
+    return grid
+
+
+class TimeChiFinder(object):
+
+    params = [[False, True], SHAPES]
+    param_names = ['use_true_dx', 'shape']
+    timeout = 300.
+    # the channel network is cached, so time a new finder each run
+    number = 1
+
+    def setup(self, use_true_dx, shape):
+        self.cf = ChiFinder(_eroded_grid(shape), min_drainage_area=1.e5,
+                            use_true_dx=use_true_dx)
+
+    def time_calculate_chi(self, use_true_dx, shape):
+        self.cf.calculate_chi()
+
+    def time_concavity_scan_one_at_a_time(self, use_true_dx, shape):
+        for concavity in CONCAVITIES:
+            self.cf.calculate_chi(reference_concavity=concavity)
+
+    def time_concavity_scan(self, use_true_dx, shape):
+        self.cf.calculate_chi_for_concavities(CONCAVITIES)
+
+    def time_best_fit_concavity(self, use_true_dx, shape):
+        self.cf.best_fit_concavity(np.linspace(0.1, 0.9, 50))
+
+
+class TimeSteepnessFinder(object):
+
+    params = [[0., 1000.], SHAPES]
+    param_names = ['discretization_length', 'shape']
+    timeout = 300.
+
+    def setup(self, discretization_length, shape):
+        self.sf = SteepnessFinder(_eroded_grid(shape), min_drainage_area=1.e5,
+                                  discretization_length=discretization_length)
+
+    def time_calculate_steepnesses(self, discretization_length, shape):
+        self.sf.calculate_steepnesses()
+
+    def time_concavity_scan(self, discretization_length, shape):
+        self.sf.calculate_steepnesses_for_concavities(CONCAVITIES)
+
+
+def bench_chi_finder():
+    for use_true_dx in (False, True):
+        run_once(TimeChiFinder, use_true_dx, SHAPES[0])
+
+
+def bench_steepness_finder():
+    for discretization_length in (0., 1000.):
+        run_once(TimeSteepnessFinder, discretization_length, SHAPES[0])
@@ -0,0 +1,278 @@
+"""Benchmark one time step of every component in landlab.components.
+
+Each component is set up on a raster of random topography, with flow
+already routed over it and whatever input fields it needs, and then timed
+while advancing one step. Components without a *run_one_step* method are
+timed with the method that does the same job (*update*, *erode*, and so on).
+"""
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import COMPONENTS, FlowRouter
+
+
+SHAPES = [(50, 50), (200, 200)]
+
+
+def _landscape(shape):
+    """Random topography, draining to one edge, with flow routed over it."""
+    np.random.seed(1945)
+    grid = RasterModelGrid(shape, 100.)
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z[:] = 0.1 * np.random.rand(grid.number_of_nodes) + 0.01 * grid.node_y
+    FlowRouter(grid).run_one_step()
+    return grid
+
+
+def _add_at_cell(grid, names, low=0., high=1.):
+    for name in names:
+        grid.add_field('cell', name, np.random.uniform(
+            low, high, grid.number_of_cells), noclobber=False)
+
+
+def _chi_finder(grid, cls):
+    chi = cls(grid, min_drainage_area=1e5)
+    return chi.calculate_chi
+
+
+def _linear_diffuser(grid, cls):
+    ld = cls(grid, linear_diffusivity=0.01)
+    return lambda: ld.run_one_step(1000.)
+
+
+def _flexure(grid, cls):
+    grid.add_field('node', 'lithosphere__overlying_pressure_increment',
+                   1e6 * np.random.rand(grid.number_of_nodes))
+    flex = cls(grid, method='flexure')
+    return flex.update
+
+
+def _flow_router(grid, cls):
+    return cls(grid).run_one_step
+
+
+def _depression_finder(grid, cls):
+    df = cls(grid)
+    return df.map_depressions
+
+
+def _perron(grid, cls):
+    nl = cls(grid, nonlinear_diffusivity=0.01)
+    return lambda: nl.run_one_step(100.)
+
+
+def _overland_flow_bates(grid, cls):
+    grid.add_zeros('node', 'surface_water__depth')
+    of = cls(grid, rainfall_intensity=1e-5)
+    return of.overland_flow
+
+
+def _overland_flow(grid, cls):
+    grid.add_zeros('node', 'surface_water__depth')
+    of = cls(grid, rainfall_intensity=1e-5, steep_slopes=True)
+    return lambda: of.run_one_step(dt=10.)
+
+
+def _pet(grid, cls):
+    _add_at_cell(grid, ['radiation__ratio_to_flat_surface'], 0.5, 1.5)
+    pet = cls(grid)
+    return lambda: pet.update(current_time=0.5)
+
+
+def _potentiality_flow_router(grid, cls):
+    return cls(grid).run_one_step
+
+
+def _radiation(grid, cls):
+    rad = cls(grid)
+    return lambda: rad.update(current_time=0.5)
+
+
+def _sink_filler(grid, cls):
+    return cls(grid).run_one_step
+
+
+def _stream_power(grid, cls):
+    sp = cls(grid, K_sp=1e-5)
+    return lambda: sp.run_one_step(100.)
+
+
+def _sed_dep(grid, cls):
+    sde = cls(grid, K_sp=1e-5)
+    return lambda: sde.run_one_step(100.)
+
+
+def _kinematic_wave(grid, cls):
+    grid.add_zeros('node', 'surface_water__depth')
+    grid.delete_field('node', 'surface_water__discharge')
+    kw = cls(grid)
+    return lambda: kw.run_one_step(10., rainfall_intensity=1e-4)
+
+
+def _steepness_finder(grid, cls):
+    sf = cls(grid, min_drainage_area=1e5)
+    return sf.calculate_steepnesses
+
+
+def _detachment_ltd(grid, cls):
+    grid.at_node['topographic__slope'] = grid.at_node[
+        'topographic__steepest_slope']
+    grid.at_node['surface_water__discharge'] = grid.at_node['drainage_area']
+    dle = cls(grid)
+    return lambda: dle.erode(100.)
+
+
+def _gflex(grid, cls):
+    grid.add_field('node', 'surface_load__stress',
+                   1e6 * np.random.rand(grid.number_of_nodes))
+    return cls(grid).run_one_step
+
+
+def _green_ampt(grid, cls):
+    # shallow enough that the water infiltrates everywhere
+    grid.add_field('node', 'surface_water__depth',
+                   np.full(grid.number_of_nodes, 1e-3))
+    grid.add_field('node', 'soil_water_infiltration__depth',
+                   np.full(grid.number_of_nodes, 0.2))
+    ga = cls(grid)
+    return lambda: ga.run_one_step(1.)
+
+
+def _fire_generator(grid, cls):
+    fg = cls(mean_fire_recurrence=10., shape_parameter=3.5)
+    return fg.generate_fire_recurrence
+
+
+def _soil_moisture(grid, cls):
+    _add_at_cell(grid, ['vegetation__cover_fraction',
+                        'vegetation__live_leaf_area_index',
+                        'surface__potential_evapotranspiration_rate',
+                        'soil_moisture__initial_saturation_fraction'])
+    grid.add_field('cell', 'rainfall__daily_depth',
+                   np.full(grid.number_of_cells, 20.))
+    grid.add_field('cell', 'vegetation__plant_functional_type',
+                   np.random.randint(0, 6, grid.number_of_cells))
+    sm = cls(grid)
+    return lambda: sm.update(0.5)
+
+
+def _vegetation(grid, cls):
+    _add_at_cell(grid, ['surface__evapotranspiration',
+                        'vegetation__water_stress',
+                        'surface__potential_evapotranspiration_rate',
+                        'surface__potential_evapotranspiration_30day_mean'])
+    grid.add_field('cell', 'vegetation__plant_functional_type',
+                   np.random.randint(0, 6, grid.number_of_cells))
+    veg = cls(grid)
+    return veg.update
+
+
+def _veg_ca(grid, cls):
+    _add_at_cell(grid, ['vegetation__cumulative_water_stress'])
+    grid.add_field('cell', 'vegetation__plant_functional_type',
+                   np.random.randint(0, 6, grid.number_of_cells))
+    ca = cls(grid)
+    return ca.update
+
+
+def _drainage_density(grid, cls):
+    mask = (grid.at_node['drainage_area'] > 1e5).astype(np.uint8)
+    dd = cls(grid, channel__mask=mask)
+    return dd.calc_drainage_density
+
+
+def _exponential_weatherer(grid, cls):
+    grid.add_ones('node', 'soil__depth')
+    ew = cls(grid)
+    return lambda: ew.run_one_step(10.)
+
+
+def _depth_dependent_diffuser(grid, cls):
+    grid.add_ones('node', 'soil__depth')
+    grid.add_zeros('node', 'soil_production__rate')
+    grid.add_zeros('node', 'bedrock__elevation')
+    dd = cls(grid, linear_diffusivity=0.01)
+    return lambda: dd.run_one_step(100.)
+
+
+def _cubic_diffuser(grid, cls):
+    cd = cls(grid, linear_diffusivity=0.01)
+    return lambda: cd.run_one_step(100.)
+
+
+def _depth_slope_product(grid, cls):
+    grid.at_node['topographic__slope'] = grid.at_node[
+        'topographic__steepest_slope']
+    grid.add_field('node', 'surface_water__depth',
+                   np.full(grid.number_of_nodes, 0.1))
+    dsp = cls(grid, k_e=1e-6)
+    return lambda: dsp.run_one_step(100.)
+
+
+# For each component, a function that sets it up on a grid and returns a
+# function that advances it one step
+STEPPERS = {
+    'ChiFinder': _chi_finder,
+    'LinearDiffuser': _linear_diffuser,
+    'Flexure': _flexure,
+    'FlowRouter': _flow_router,
+    'DepressionFinderAndRouter': _depression_finder,
+    'PerronNLDiffuse': _perron,
+    'OverlandFlowBates': _overland_flow_bates,
+    'OverlandFlow': _overland_flow,
+    'PotentialEvapotranspiration': _pet,
+    'PotentialityFlowRouter': _potentiality_flow_router,
+    'Radiation': _radiation,
+    'SinkFiller': _sink_filler,
+    'StreamPowerEroder': _stream_power,
+    'FastscapeEroder': _stream_power,
+    'SedDepEroder': _sed_dep,
+    'KinematicWaveRengers': _kinematic_wave,
+    'SteepnessFinder': _steepness_finder,
+    'DetachmentLtdErosion': _detachment_ltd,
+    'gFlex': _gflex,
+    'SoilInfiltrationGreenAmpt': _green_ampt,
+    'FireGenerator': _fire_generator,
+    'SoilMoisture': _soil_moisture,
+    'Vegetation': _vegetation,
+    'VegCA': _veg_ca,
+    'DrainageDensity': _drainage_density,
+    'ExponentialWeatherer': _exponential_weatherer,
+    'DepthDependentDiffuser': _depth_dependent_diffuser,
+    'CubicNonLinearDiffuser': _cubic_diffuser,
+    'DepthSlopeProductErosion': _depth_slope_product,
+}
+
+
+def _stepper(name, shape):
+    cls = dict((cls.__name__, cls) for cls in COMPONENTS)[name]
+    return STEPPERS[name](_landscape(shape), cls)
+
+
+class TimeComponentStep(object):
+
+    params = [sorted(STEPPERS), SHAPES]
+    param_names = ['component', 'shape']
+
+    def setup(self, name, shape):
+        try:
+            self.step = _stepper(name, shape)
+        except ImportError:  # an optional dependency is missing
+            raise NotImplementedError(name)
+
+    def time_run_one_step(self, name, shape):
+        self.step()
+
+
+def bench_every_component_covered():
+    assert set(STEPPERS) == set(cls.__name__ for cls in COMPONENTS)
+
+
+def bench_every_component_step():
+    for name in sorted(STEPPERS):
+        try:
+            step = _stepper(name, SHAPES[0])
+        except ImportError:
+            continue
+        step()
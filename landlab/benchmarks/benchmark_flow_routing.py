@@ -0,0 +1,101 @@
+"""Benchmark routing flow over a random landscape.
+
+An ensemble of runoff fields over unchanged topography can either be
+routed one member at a time, finding flow directions every time, or
+accumulated together over a single routing. The link geometry used to find
+flow directions is only rebuilt when the boundary conditions change.
+
+On a low-relief grid, the Jacobi sweeps of the PotentialityFlowRouter need
+about as many passes as there are nodes along the longest flow path,
+whereas the sparse solvers assemble and solve the equations once. Repeated
+solves with a new water input reuse the matrix.
+"""
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowRouter, PotentialityFlowRouter
+from ._smoke import run_once
+
+
+SHAPES = [(100, 100), (300, 300)]
+
+N_MEMBERS = 20
+
+
+def _routed_grid(shape):
+    np.random.seed(1945)
+    grid = RasterModelGrid(shape, 10.)
+    grid.add_field('node', 'topographic__elevation',
+                   np.random.rand(grid.number_of_nodes) + 0.01 * grid.node_x)
+    fr = FlowRouter(grid)
+    fr.run_one_step()
+    return fr
+
+
+class TimeFlowRouter(object):
+
+    params = [SHAPES]
+    param_names = ['shape']
+    timeout = 300.
+
+    def setup(self, shape):
+        self.fr = _routed_grid(shape)
+        self.runoff = np.random.rand(self.fr.grid.number_of_nodes, N_MEMBERS)
+
+    def time_route_flow(self, shape):
+        self.fr.run_one_step()
+
+    def time_route_flow_changed_topography(self, shape):
+        core = self.fr.grid.core_nodes
+        z = self.fr.grid.at_node['topographic__elevation']
+        z[core] += 0.01 * np.random.rand(len(core))
+        self.fr.run_one_step()
+
+    def time_runoff_ensemble_rerouting(self, shape):
+        runoff_in = self.fr.grid.at_node['water__unit_flux_in']
+        for member in range(N_MEMBERS):
+            runoff_in[:] = self.runoff[:, member]
+            self.fr.run_one_step()
+
+    def time_runoff_ensemble(self, shape):
+        self.fr.route_runoff_ensemble(self.runoff)
+
+
+def _low_relief_router(solver, shape):
+    np.random.seed(1945)
+    grid = RasterModelGrid(shape, 10.)
+    grid.add_field('node', 'topographic__elevation',
+                   1.e-4 * grid.node_x + 1.e-3 * np.sin(grid.node_y / 50.) +
+                   1.e-4 * np.random.rand(grid.number_of_nodes))
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    grid.add_ones('node', 'water__unit_flux_in')
+    return PotentialityFlowRouter(grid, solver=solver)
+
+
+class TimePotentialityFlowRouter(object):
+
+    params = [['jacobi', 'direct', 'krylov'], SHAPES]
+    param_names = ['solver', 'shape']
+    timeout = 600.
+    # the sparse solvers reuse their matrix, so time a new router each run
+    number = 1
+
+    def setup(self, solver, shape):
+        self.router = _low_relief_router(solver, shape)
+
+    def time_route_flow(self, solver, shape):
+        self.router.route_flow()
+
+    def time_route_flow_new_water_input(self, solver, shape):
+        for rate in (1., 2., 3.):
+            self.router.grid.at_node['water__unit_flux_in'].fill(rate)
+            self.router.route_flow()
+
+
+def bench_flow_router():
+    run_once(TimeFlowRouter, (20, 30))
+
+
+def bench_potentiality_flow_router():
+    for solver in TimePotentialityFlowRouter.params[0]:
+        run_once(TimePotentialityFlowRouter, solver, (20, 30))
@@ -0,0 +1,59 @@
+"""Benchmark gradients and divergence on each type of grid."""
+from ._grids import GRID_TYPES, SIZES, make_landscapes
+
+
+class TimeGradients(object):
+
+    params = [GRID_TYPES, SIZES]
+    param_names = ['grid_type', 'size']
+    timeout = 600.
+
+    def setup_cache(self):
+        return make_landscapes()
+
+    def setup(self, grids, grid_type, size):
+        self.grid = grids[(grid_type, size)]
+        self.z = self.grid.at_node['topographic__elevation']
+        self.grad = self.grid.empty(at='link')
+
+    def time_calc_grad_at_link(self, grids, grid_type, size):
+        self.grid.calc_grad_at_link(self.z, out=self.grad)
+
+    def time_calc_diff_at_link(self, grids, grid_type, size):
+        self.grid.calc_diff_at_link(self.z, out=self.grad)
+
+    def time_calc_grad_at_patch(self, grids, grid_type, size):
+        self.grid.calc_grad_at_patch()
+
+    def time_calc_slope_at_node(self, grids, grid_type, size):
+        self.grid.calc_slope_at_node()
+
+
+class TimeDivergence(object):
+
+    params = [GRID_TYPES, SIZES]
+    param_names = ['grid_type', 'size']
+    timeout = 600.
+
+    def setup_cache(self):
+        return make_landscapes()
+
+    def setup(self, grids, grid_type, size):
+        self.grid = grids[(grid_type, size)]
+        self.q = self.grid.at_link['surface_water__discharge']
+
+    def time_calc_flux_div_at_node(self, grids, grid_type, size):
+        self.grid.calc_flux_div_at_node(self.q)
+
+    def time_calc_flux_div_at_cell(self, grids, grid_type, size):
+        self.grid.calc_flux_div_at_cell(self.q)
+
+    def time_calc_net_flux_at_node(self, grids, grid_type, size):
+        self.grid.calc_net_flux_at_node(self.q)
+
+
+def bench_gradients_and_divergence():
+    for grid in make_landscapes(sizes=SIZES[:1]).values():
+        grid.calc_grad_at_link(grid.at_node['topographic__elevation'])
+        grid.calc_grad_at_patch()
+        grid.calc_flux_div_at_node(grid.at_link['surface_water__discharge'])
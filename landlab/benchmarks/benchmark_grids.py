@@ -0,0 +1,123 @@
+"""Benchmark building grids of each type, and adding fields to them.
+
+Hex grids are also built in each shape and orientation. The peak memory
+used while building a VoronoiDelaunayGrid is tracked as well as the time,
+and bench_voronoi_peak_memory checks it against a bound on the number of
+bytes per node.
+"""
+from __future__ import print_function
+
+import numpy as np
+
+from landlab import HexModelGrid, VoronoiDelaunayGrid
+from ._grids import GRID_TYPES, SIZES, make_grid
+from ._smoke import run_once
+
+
+MAX_PEAK_BYTES_PER_NODE = 3000
+
+
+class TimeGridConstruction(object):
+
+    params = [GRID_TYPES, SIZES]
+    param_names = ['grid_type', 'size']
+    timeout = 300.
+
+    def time_construct(self, grid_type, size):
+        make_grid(grid_type, size)
+
+
+class TimeFieldCreation(object):
+
+    params = [GRID_TYPES, SIZES, ['node', 'link']]
+    param_names = ['grid_type', 'size', 'group']
+    timeout = 300.
+
+    def setup(self, grid_type, size, group):
+        self.grid = make_grid(grid_type, size)
+        self.values = np.random.rand(self.grid.number_of_elements(group))
+
+    def time_add_empty(self, grid_type, size, group):
+        self.grid.add_empty(group, 'topographic__elevation', noclobber=False)
+
+    def time_add_zeros(self, grid_type, size, group):
+        self.grid.add_zeros(group, 'topographic__elevation', noclobber=False)
+
+    def time_add_field_copy(self, grid_type, size, group):
+        self.grid.add_field(group, 'topographic__elevation', self.values,
+                            copy=True, noclobber=False)
+
+
+class TimeHexGrid(object):
+
+    params = [['hex', 'rect'], ['horizontal', 'vertical'], SIZES]
+    param_names = ['shape', 'orientation', 'size']
+    timeout = 300.
+    # patches are found once and then cached, so time a new grid each run
+    number = 1
+
+    def setup(self, shape, orientation, size):
+        side = int(round(size ** .5))
+        self.args = (side, side)
+        self.kwds = dict(shape=shape, orientation=orientation)
+        self.grid = HexModelGrid(*self.args, **self.kwds)
+
+    def time_construct(self, shape, orientation, size):
+        HexModelGrid(*self.args, **self.kwds)
+
+    def time_patches(self, shape, orientation, size):
+        self.grid.patches_at_node
+        self.grid.links_at_patch
+
+
+def _random_points(n_points):
+    np.random.seed(1945)
+    return np.random.rand(n_points), np.random.rand(n_points)
+
+
+class TimeVoronoiGrid(object):
+
+    params = [SIZES]
+    param_names = ['size']
+    timeout = 300.
+
+    def setup(self, size):
+        self.points = _random_points(size)
+
+    def time_construct(self, size):
+        VoronoiDelaunayGrid(*self.points)
+
+    def peakmem_construct(self, size):
+        VoronoiDelaunayGrid(*self.points)
+
+
+def bench_construct_every_grid():
+    for grid_type in GRID_TYPES:
+        grid = make_grid(grid_type, SIZES[0])
+        for group in ('node', 'link'):
+            grid.add_zeros(group, 'topographic__elevation')
+
+
+def bench_hex_grid_shapes():
+    for shape in ('hex', 'rect'):
+        for orientation in ('horizontal', 'vertical'):
+            run_once(TimeHexGrid, shape, orientation, SIZES[0])
+
+
+def bench_voronoi_peak_memory():
+    try:
+        import tracemalloc
+    except ImportError:
+        return
+
+    (x, y) = _random_points(SIZES[1])
+    tracemalloc.start()
+    try:
+        VoronoiDelaunayGrid(x, y)
+        (_, peak) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    print('peak memory: {mb:.1f} MB ({per_node:.0f} bytes per node)'.format(
+        mb=peak / 1e6, per_node=peak / len(x)))
+    assert peak < MAX_PEAK_BYTES_PER_NODE * len(x)
@@ -0,0 +1,37 @@
+"""Benchmark the time taken to import landlab in a fresh interpreter.
+
+Names in landlab, landlab.components and landlab.plot are only imported
+when they are first used, so ``import landlab`` itself should be almost
+free. Each benchmark fails if the import takes longer than its budget
+(in seconds), which includes starting the interpreter and importing
+numpy.
+"""
+import subprocess
+import sys
+import time
+
+
+IMPORT_BUDGET = 1.
+GRID_IMPORT_BUDGET = 2.
+
+
+def _time_import(statement, budget):
+    start = time.time()
+    subprocess.check_call([sys.executable, '-c', statement])
+    elapsed = time.time() - start
+    assert elapsed < budget, (
+        '{0!r} took {1:.2f} s (budget is {2:.2f} s)'.format(statement,
+                                                           elapsed, budget))
+
+
+def bench_import_landlab():
+    _time_import('import numpy, landlab', IMPORT_BUDGET)
+
+
+def bench_import_raster_model_grid():
+    _time_import('from landlab import RasterModelGrid', GRID_IMPORT_BUDGET)
+
+
+def bench_import_component():
+    _time_import('from landlab.components import FlowRouter',
+                 GRID_IMPORT_BUDGET)
@@ -0,0 +1,64 @@
+"""Benchmark every mapper in landlab.grid.mappers on each type of grid."""
+from landlab.grid import mappers
+
+from ._grids import GRID_TYPES, SIZES, make_landscapes
+
+
+# Fields that each mapper is passed
+_AT_NODE = ('topographic__elevation', )
+_AT_LINK = ('surface_water__discharge', )
+_CONTROL_AT_NODE = ('topographic__elevation', 'soil__depth')
+_CONTROL_AT_LINK = ('surface_water__discharge', 'surface_water__depth')
+
+MAPPERS = {
+    'map_link_head_node_to_link': _AT_NODE,
+    'map_link_tail_node_to_link': _AT_NODE,
+    'map_min_of_link_nodes_to_link': _AT_NODE,
+    'map_max_of_link_nodes_to_link': _AT_NODE,
+    'map_mean_of_link_nodes_to_link': _AT_NODE,
+    'map_value_at_min_node_to_link': _CONTROL_AT_NODE,
+    'map_value_at_max_node_to_link': _CONTROL_AT_NODE,
+    'map_node_to_cell': _AT_NODE,
+    'map_min_of_node_links_to_node': _AT_LINK,
+    'map_max_of_node_links_to_node': _AT_LINK,
+    'map_upwind_node_link_max_to_node': _AT_LINK,
+    'map_downwind_node_link_max_to_node': _AT_LINK,
+    'map_upwind_node_link_mean_to_node': _AT_LINK,
+    'map_downwind_node_link_mean_to_node': _AT_LINK,
+    'map_value_at_upwind_node_link_max_to_node': _CONTROL_AT_LINK,
+    'map_value_at_downwind_node_link_max_to_node': _CONTROL_AT_LINK,
+    'map_mean_of_patch_nodes_to_patch': _AT_NODE,
+    'map_max_of_patch_nodes_to_patch': _AT_NODE,
+    'map_min_of_patch_nodes_to_patch': _AT_NODE,
+    'map_link_vector_sum_to_patch': _AT_LINK,
+}
+
+
+class TimeMappers(object):
+
+    params = [sorted(MAPPERS), GRID_TYPES, SIZES]
+    param_names = ['mapper', 'grid_type', 'size']
+    timeout = 600.
+
+    def setup_cache(self):
+        return make_landscapes()
+
+    def setup(self, grids, name, grid_type, size):
+        self.grid = grids[(grid_type, size)]
+        self.mapper = getattr(mappers, name)
+
+    def time_mapper(self, grids, name, grid_type, size):
+        self.mapper(self.grid, *MAPPERS[name])
+
+
+def bench_every_mapper_covered():
+    assert set(MAPPERS) == set(name for name in dir(mappers)
+                               if name.startswith('map_'))
+
+
+def bench_every_mapper():
+    grids = make_landscapes(sizes=SIZES[:1])
+    for name in sorted(MAPPERS):
+        for grid_type in GRID_TYPES:
+            getattr(mappers, name)(grids[(grid_type, SIZES[0])],
+                                   *MAPPERS[name])
@@ -0,0 +1,62 @@
+"""Benchmark grid operations on memory-mapped fields.
+
+Elevation is either held in memory or in a file mapped by a
+:class:`~landlab.field.memmap.MemmapFieldStore`, so the cost of paging can
+be compared with the in-memory baseline for gradients and flow routing.
+Set the LANDLAB_SCRATCH environment variable to put the files on a
+particular disk (the default is the system temporary directory).
+"""
+import os
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowRouter
+from landlab.field.memmap import MemmapFieldStore
+from ._smoke import run_once
+
+
+SHAPES = [(300, 300), (1000, 1000)]
+
+
+def _grid(shape, store=None):
+    np.random.seed(1945)
+    grid = RasterModelGrid(shape, 10.)
+    if store is not None:
+        store.attach(grid)
+    z = grid.add_empty('node', 'topographic__elevation')
+    z[:] = np.random.rand(grid.number_of_nodes) + 0.01 * grid.node_x
+    if store is not None:
+        store.flush()
+    return grid
+
+
+def _store():
+    return MemmapFieldStore(directory=os.environ.get('LANDLAB_SCRATCH'),
+                            policy=['topographic__elevation'])
+
+
+class TimeMemmapFields(object):
+
+    params = [['memory', 'memmap'], SHAPES]
+    param_names = ['storage', 'shape']
+    timeout = 300.
+
+    def setup(self, storage, shape):
+        self.store = _store() if storage == 'memmap' else None
+        self.grid = _grid(shape, self.store)
+
+    def teardown(self, storage, shape):
+        if self.store is not None:
+            self.store.remove()
+
+    def time_calc_grad_at_link(self, storage, shape):
+        self.grid.calc_grad_at_link(self.grid.at_node['topographic__elevation'])
+
+    def time_route_flow(self, storage, shape):
+        FlowRouter(self.grid).run_one_step()
+
+
+def bench_gradient_and_route_flow():
+    for storage in ('memory', 'memmap'):
+        run_once(TimeMemmapFields, storage, (20, 30))
@@ -0,0 +1,111 @@
+"""Benchmark overland flow with a wetting front, and over a deep channel.
+
+Only the first columns of the grid are flooded by the wetting front, so
+OverlandFlow updating just the links at wet nodes (with *wet_depth*) does
+far less work than updating every link.
+
+A deep channel through shallow water limits the global time step, which
+local time steps (with *time_step_levels*) avoid away from the channel.
+This is timed for both OverlandFlow and KinematicWaveRengers.
+"""
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components.overland_flow import (OverlandFlow,
+                                              KinematicWaveRengers)
+from landlab.grid.structured_quad.links import left_edge_horizontal_ids
+from ._smoke import run_once
+
+
+WETTING_FRONT_OPTIONS = {
+    'all_links': {},
+    'wet_links': dict(wet_depth=0.002),
+    'wet_links_steep_slopes': dict(wet_depth=0.002, steep_slopes=True),
+}
+
+
+class TimeWettingFront(object):
+
+    params = [sorted(WETTING_FRONT_OPTIONS), [(200, 1000)]]
+    param_names = ['options', 'shape']
+    timeout = 600.
+    duration = 500.
+
+    def setup(self, options, shape):
+        grid = RasterModelGrid(shape, spacing=25)
+        grid.add_zeros('node', 'surface_water__depth')
+        grid.add_zeros('node', 'topographic__elevation')
+        grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+        self.grid = grid
+        self.of = OverlandFlow(grid, mannings_n=0.01, h_init=0.001,
+                               **WETTING_FRONT_OPTIONS[options])
+
+    def time_flood(self, options, shape):
+        grid = self.grid
+        left_inactive_ids = left_edge_horizontal_ids(grid.shape)
+        q = grid.at_link['surface_water__discharge']
+        h = grid.at_node['surface_water__depth']
+        time = 0.
+        while time < self.duration:
+            q[left_inactive_ids] = q[left_inactive_ids + 1]
+            dt = self.of.calc_time_step()
+            self.of.overland_flow(dt)
+            h[grid.nodes[1: -1, 1]] = (
+                (7. / 3.) * (0.01 ** 2) * (0.4 ** 3) * time) ** (3. / 7.)
+            time += dt
+
+
+def _channel(shape):
+    grid = RasterModelGrid(shape, spacing=10.)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    h = grid.add_zeros('node', 'surface_water__depth')
+    is_channel = np.abs(grid.node_x - grid.node_x.mean()) < 15.
+    h[is_channel] = 5.
+    z[~is_channel] = 4.98
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    return grid
+
+
+class TimeChannel(object):
+
+    params = [[None, 5], [(200, 1000)]]
+    param_names = ['time_step_levels', 'shape']
+    timeout = 600.
+    # water drains from the channel, so time a new one each run
+    number = 1
+    duration = 120.
+
+    def setup(self, time_step_levels, shape):
+        self.of = OverlandFlow(_channel(shape), mannings_n=0.03,
+                               h_init=0.001,
+                               time_step_levels=time_step_levels)
+
+    def time_overland_flow(self, time_step_levels, shape):
+        self.of.overland_flow(self.duration)
+
+
+class TimeChannelKinematicWave(object):
+
+    params = [[None, 5], [(50, 200)]]
+    param_names = ['time_step_levels', 'shape']
+    timeout = 600.
+    number = 1
+    duration = 10.
+
+    def setup(self, time_step_levels, shape):
+        self.kw = KinematicWaveRengers(_channel(shape), dt_max=60.,
+                                       time_step_levels=time_step_levels)
+
+    def time_kinematic_wave_rengers(self, time_step_levels, shape):
+        self.kw.run_one_step(self.duration, rainfall_intensity=0.)
+
+
+def bench_wetting_front():
+    for options in sorted(WETTING_FRONT_OPTIONS):
+        run_once(TimeWettingFront, options, (20, 40))
+
+
+def bench_channel():
+    for time_step_levels in (None, 5):
+        run_once(TimeChannel, time_step_levels, (20, 40))
+        run_once(TimeChannelKinematicWave, time_step_levels, (20, 40))
@@ -0,0 +1,107 @@
+"""Benchmark stream power erosion on a random landscape.
+
+Drainage basins are independent of one another, so groups of basins are
+accumulated and eroded at the same time in compiled kernels that release
+the GIL. Compare with the serial runs on a machine with several cores.
+
+The smooth-threshold eroder finds elevations node by node with Newton's
+method in a compiled kernel, so an erosion step should take about as long
+as one of the FastscapeEroder. The SedDepEroder routes sediment down the
+network in a compiled kernel, with the sediment flux function looked up in
+a table built when the component is created.
+"""
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import (FlowRouter, FastscapeEroder,
+                                StreamPowerSmoothThresholdEroder,
+                                SedDepEroder)
+from ._smoke import run_once
+
+
+SHAPES = [(100, 100), (300, 300)]
+
+SED_DEP_OPTIONS = {
+    'power_law_humped': dict(Qc='power_law',
+                             sed_dependency_type='generalized_humped'),
+    'power_law_almost_parabolic': dict(
+        Qc='power_law', sed_dependency_type='almost_parabolic'),
+    'mpm_linear_decline': dict(Qc='MPM',
+                               sed_dependency_type='linear_decline'),
+}
+
+
+def _landscape(shape, spacing=10., slope=0.01):
+    np.random.seed(1945)
+    grid = RasterModelGrid(shape, spacing)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z += np.random.rand(z.size) + slope * grid.node_y
+    return grid
+
+
+class _TimeErosionStep(object):
+
+    timeout = 300.
+
+    def _set_up(self, grid, eroder, dt, n_threads=1, **kwds):
+        self.grid = grid
+        self.fr = FlowRouter(grid, n_threads=n_threads)
+        self.eroder = eroder(grid, **kwds)
+        self.dt = dt
+
+    def time_erosion_step(self, *args):
+        self.fr.run_one_step()
+        self.eroder.run_one_step(self.dt)
+        self.grid.at_node['topographic__elevation'][
+            self.grid.core_nodes] += 0.01
+
+
+class TimeFastscapeThreads(_TimeErosionStep):
+
+    params = [[1, 2, 4], SHAPES]
+    param_names = ['n_threads', 'shape']
+
+    def setup(self, n_threads, shape):
+        self._set_up(_landscape(shape), FastscapeEroder, 10.,
+                     n_threads=n_threads, K_sp=0.001, n_sp=1.5,
+                     threshold_sp=0.1)
+
+
+class TimeSmoothThreshold(_TimeErosionStep):
+
+    params = [['FastscapeEroder', 'StreamPowerSmoothThresholdEroder'],
+              SHAPES]
+    param_names = ['eroder', 'shape']
+
+    def setup(self, eroder, shape):
+        cls = {'FastscapeEroder': FastscapeEroder,
+               'StreamPowerSmoothThresholdEroder':
+               StreamPowerSmoothThresholdEroder}[eroder]
+        self._set_up(_landscape(shape), cls, 10., K_sp=0.001,
+                     threshold_sp=0.1)
+
+
+class TimeSedDepEroder(_TimeErosionStep):
+
+    params = [sorted(SED_DEP_OPTIONS), SHAPES[:1]]
+    param_names = ['options', 'shape']
+
+    def setup(self, options, shape):
+        self._set_up(_landscape(shape, spacing=100., slope=0.001),
+                     SedDepEroder, 100., K_sp=1.e-5,
+                     **SED_DEP_OPTIONS[options])
+
+
+def bench_fastscape_threads():
+    for n_threads in (1, 2):
+        run_once(TimeFastscapeThreads, n_threads, (20, 30))
+
+
+def bench_smooth_threshold():
+    for eroder in TimeSmoothThreshold.params[0]:
+        run_once(TimeSmoothThreshold, eroder, (20, 30))
+
+
+def bench_sed_dep_eroder():
+    for options in sorted(SED_DEP_OPTIONS):
+        run_once(TimeSedDepEroder, options, (20, 30))
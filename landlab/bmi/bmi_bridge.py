@@ -18,6 +18,7 @@ import numpy as np
 import yaml
 
 from ..core.model_component import Component
+from ..core.utils import takes_time_step
 from ..grid import RasterModelGrid
 
 __all__ = ['TimeStepper', 'wrap_as_bmi']
@@ -99,9 +100,15 @@ class TimeStepper(object):
         """Change the time step."""
         self._step = new_val
 
-    def advance(self):
-        """Advance the time stepper by one time step."""
-        self._time += self.step
+    def advance(self, step=None):
+        """Advance the time stepper by one time step.
+
+        Parameters
+        ----------
+        step : float, optional
+            Advance by this much rather than by the time step.
+        """
+        self._time += self.step if step is None else step
         if self._stop is not None and self._time > self._stop:
             raise StopIteration()
 
@@ -166,6 +173,22 @@ def wrap_as_bmi(cls):
     >>> dz = flexure.get_value('lithosphere_surface__elevation_increment')
     >>> np.all(dz == 0.)
     False
+
+    Values can be read without copying them, and written in place.
+
+    >>> ptr = flexure.get_value_ptr('lithosphere_surface__elevation_increment')
+    >>> np.all(ptr == dz)
+    True
+    >>> ptr is flexure.get_value_ptr('lithosphere_surface__elevation_increment')
+    True
+    >>> np.all(flexure.get_value_at_indices(
+    ...     'lithosphere_surface__elevation_increment', [0, 1]) == ptr[:2])
+    True
+    >>> flexure.set_value_at_indices(
+    ...     'lithosphere__overlying_pressure_increment', [0], [0.])
+    >>> flexure.update_until(10.)
+    >>> flexure.get_current_time()
+    10.0
     """
     if not issubclass(cls, Component):
         raise TypeError('class must inherit from Component')
@@ -263,9 +286,18 @@ def wrap_as_bmi(cls):
             self._base = self._cls(grid, **params)
 
         def update(self):
-            """Update the component one time step."""
+            """Update the component one time step.
+
+            Components without an *update* method are advanced with
+            *run_one_step*, which is given the time step if it takes one.
+            """
             if hasattr(self._base, 'update'):
                 self._base.update()
+            elif hasattr(self._base, 'run_one_step'):
+                if takes_time_step(self._base.run_one_step):
+                    self._base.run_one_step(self.get_time_step())
+                else:
+                    self._base.run_one_step()
             self._clock.advance()
 
         def update_frac(self, frac):
@@ -276,11 +308,28 @@ def wrap_as_bmi(cls):
             self._clock.step = time_step
 
         def update_until(self, then):
-            """Update the component until a given time."""
+            """Update the component until a given time.
+
+            Components that can be given a time step of any length (those
+            that divide it internally, such as the `LinearDiffuser`) are
+            run once, over the whole interval. Others are updated one time
+            step at a time, with a fraction of a step at the end.
+            """
+            if (self._cls._unconstrained_time_step and
+                    not hasattr(self._base, 'update') and
+                    hasattr(self._base, 'run_one_step') and
+                    takes_time_step(self._base.run_one_step)):
+                dt = then - self.get_current_time()
+                if dt > 0.:
+                    self._base.run_one_step(dt)
+                    self._clock.advance(dt)
+                return
+
             n_steps = (then - self.get_current_time()) / self.get_time_step()
             for _ in range(int(n_steps)):
                 self.update()
-            self.update_frac(n_steps - int(n_steps))
+            if n_steps > int(n_steps):
+                self.update_frac(n_steps - int(n_steps))
 
         def finalize(self):
             """Clean-up the component."""
@@ -292,36 +341,80 @@ def wrap_as_bmi(cls):
 
         def get_var_itemsize(self, name):
             """Get the size of elements of a variable."""
-            return np.dtype('float').itemsize
+            return np.dtype(self.get_var_type(name)).itemsize
 
         def get_var_nbytes(self, name):
             """Get the total number of bytes used by a variable."""
-            return self.get_itemsize(name) * self._base.grid.number_of_nodes
+            return (self.get_var_itemsize(name) *
+                    self._base.grid.number_of_nodes)
 
         def get_var_type(self, name):
             """Get the data type for a variable."""
-            return str(np.dtype('float'))
+            if name in self._base.grid.at_node:
+                return str(self._base.grid.at_node[name].dtype)
+            return str(np.dtype(self._cls.var_type(name)))
 
         def get_var_units(self, name):
             """Get the unit used by a variable."""
             return self._cls.var_units(name)
 
-        def get_value_ref(self, name):
-            """Get a reference to a variable's data."""
+        def get_value_ptr(self, name):
+            """Get a reference to a variable's data.
+
+            The returned array is the field itself, not a copy, so changes
+            made to it are seen by the component. Components that skip
+            work when their input fields have not changed will only notice
+            such changes after a call to `set_value` or
+            `set_value_at_indices`.
+            """
             return self._base.grid.at_node[name]
 
-        def get_value(self, name):
-            """Get a copy of a variable's data."""
-            return self._base.grid.at_node[name].copy()
+        def get_value_ref(self, name):
+            """Get a reference to a variable's data (see `get_value_ptr`)."""
+            return self.get_value_ptr(name)
+
+        def get_value(self, name, dest=None):
+            """Get a copy of a variable's data.
+
+            If *dest* is given, the values are copied into it, and it is
+            returned, rather than into a new array. It must be an array with
+            one element per node, of any shape.
+            """
+            values = self.get_value_ptr(name)
+            if dest is None:
+                return values.copy()
+            dest[...] = np.reshape(values, np.shape(dest))
+            return dest
+
+        def get_value_at_indices(self, name, inds, dest=None):
+            """Get a variable's values at some nodes.
+
+            If *dest* is given, the values are copied into it, and it is
+            returned, rather than into a new array.
+            """
+            return np.take(self.get_value_ptr(name), inds, out=dest)
 
         def set_value(self, name, vals):
             """Set the values of a variable."""
-            if name in self.get_input_var_names():
-                if name in self._base.grid.at_node:
-                    self._base.grid.at_node[name][:] = vals.flat
-                else:
-                    self._base.grid.at_node[name] = vals
+            self._check_input_var(name)
+            grid = self._base.grid
+            if name in grid.at_node:
+                field = grid.at_node[name]
+                if vals is not field:
+                    field[:] = np.reshape(vals, -1)
+                grid.mark_modified('node', name)
             else:
+                grid.at_node[name] = vals
+
+        def set_value_at_indices(self, name, inds, src):
+            """Set a variable's values at some nodes."""
+            self._check_input_var(name)
+            self._base.grid.at_node[name][inds] = src
+            self._base.grid.mark_modified('node', name)
+
+        def _check_input_var(self, name):
+            """Raise KeyError unless *name* is an input exchange item."""
+            if name not in self.get_input_var_names():
                 raise KeyError('{name} is not an input item'.format(name=name))
 
         def get_grid_origin(self, gid):
@@ -0,0 +1,125 @@
+#! /usr/bin/env python
+from nose.tools import (assert_equal, assert_true, assert_is, assert_raises,
+                        assert_not_equal)
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid, Component
+from landlab.bmi import TimeStepper, wrap_as_bmi
+from landlab.components import FlowRouter, LinearDiffuser
+
+
+class _StepRecorder(Component):
+
+    """Component that records the time steps it is run with."""
+
+    _name = 'StepRecorder'
+
+    _input_var_names = ('topographic__elevation', )
+
+    _output_var_names = ('topographic__elevation', )
+
+    _var_units = {'topographic__elevation': 'm'}
+
+    _var_mapping = {'topographic__elevation': 'node'}
+
+    _var_doc = {'topographic__elevation': 'land surface topography'}
+
+    def __init__(self, grid, **kwds):
+        super(_StepRecorder, self).__init__(grid, **kwds)
+        self.dts = []
+
+    def run_one_step(self, dt):
+        self.dts.append(dt)
+
+
+def _bmi(cls, step=1., **kwds):
+    """BMI-wrapped component on a small raster with a sloping surface."""
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('node', 'topographic__elevation', grid.node_x.copy())
+    bmi = wrap_as_bmi(cls)()
+    bmi._base = cls(grid, **kwds)
+    bmi._clock = TimeStepper(step=step)
+    return bmi
+
+
+def test_get_value_ptr_is_field():
+    bmi = _bmi(_StepRecorder)
+    z = bmi._base.grid.at_node['topographic__elevation']
+    assert_is(bmi.get_value_ptr('topographic__elevation'), z)
+
+    values = bmi.get_value('topographic__elevation')
+    assert_true(values is not z)
+    assert_array_equal(values, z)
+
+
+def test_get_value_into_dest():
+    bmi = _bmi(_StepRecorder)
+    z = bmi._base.grid.at_node['topographic__elevation']
+
+    dest = np.empty((4, 5))
+    assert_is(bmi.get_value('topographic__elevation', dest=dest), dest)
+    assert_array_equal(dest.flat, z)
+
+    dest = np.zeros((5, 4)).T  # not contiguous
+    bmi.get_value('topographic__elevation', dest=dest)
+    assert_array_equal(dest.reshape(-1), z)
+
+    dest = np.empty(2)
+    assert_is(bmi.get_value_at_indices('topographic__elevation', [1, 2],
+                                       dest=dest), dest)
+    assert_array_equal(dest, z[[1, 2]])
+
+
+def test_set_value_at_indices_marks_modified():
+    bmi = _bmi(_StepRecorder)
+    grid = bmi._base.grid
+    version = grid.field_version('node', 'topographic__elevation')
+
+    bmi.set_value_at_indices('topographic__elevation', [0, 3], [10., 20.])
+    assert_equal(grid.at_node['topographic__elevation'][3], 20.)
+    assert_not_equal(grid.field_version('node', 'topographic__elevation'),
+                     version)
+
+    assert_raises(KeyError, bmi.set_value_at_indices, 'drainage_area', [0],
+                  [1.])
+
+
+def test_update_passes_time_step():
+    bmi = _bmi(_StepRecorder, step=2.)
+    bmi.update()
+    bmi.update_frac(.5)
+    assert_equal(bmi._base.dts, [2., 1.])
+    assert_equal(bmi.get_current_time(), 3.)
+
+
+def test_update_component_without_time_step():
+    bmi = _bmi(FlowRouter)
+    bmi.update()
+    assert_equal(bmi.get_current_time(), 1.)
+    assert_true(np.any(bmi._base.grid.at_node['drainage_area'] > 0.))
+
+
+def test_update_until_without_trailing_zero_step():
+    bmi = _bmi(_StepRecorder, step=2.)
+    bmi.update_until(4.)
+    assert_equal(bmi._base.dts, [2., 2.])
+
+    bmi.update_until(7.)
+    assert_equal(bmi._base.dts, [2., 2., 2., 1.])
+    assert_equal(bmi.get_current_time(), 7.)
+
+
+def test_update_until_unconstrained_time_step():
+    bmi = _bmi(LinearDiffuser, linear_diffusivity=0.01)
+    dts = []
+    run_one_step = bmi._base.run_one_step
+
+    def recording_run_one_step(dt):
+        dts.append(dt)
+        run_one_step(dt)
+
+    bmi._base.run_one_step = recording_run_one_step
+    bmi.update_until(10.)
+    assert_equal(dts, [10.])
+    assert_equal(bmi.get_current_time(), 10.)
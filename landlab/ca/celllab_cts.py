@@ -128,7 +128,6 @@ from _heapq import heappop
 from _heapq import heapify
 import landlab
 import numpy as np
-import pylab as plt
 
 _USE_CYTHON = False
 
@@ -322,6 +321,7 @@ class CAPlotter(object):
             Colormap to be used in plotting
         """
         import matplotlib
+        import matplotlib.pyplot as plt
 
         # Set the colormap; default to matplotlib's "jet" colormap
         if cmap is None:
@@ -342,6 +342,8 @@ class CAPlotter(object):
 
     def update_plot(self):
         """Plot the current node state grid."""
+        import matplotlib.pyplot as plt
+
         plt.clf()
         if self.gridtype == 'rast':
             nsr = self.ca.grid.node_vector_to_raster(self.ca.node_state)
@@ -359,6 +361,8 @@ class CAPlotter(object):
         Wrap up plotting by switching off interactive model and showing the
         plot.
         """
+        import matplotlib.pyplot as plt
+
         plt.ioff()
         plt.show()
 
@@ -1,43 +1,90 @@
-from .chi_index import ChiFinder
-from .diffusion import LinearDiffuser
-from .fire_generator import FireGenerator
-from .detachment_ltd_erosion import DetachmentLtdErosion, DepthSlopeProductErosion
-from .flexure import Flexure
-from .flow_routing import FlowRouter, DepressionFinderAndRouter
-from .nonlinear_diffusion import PerronNLDiffuse
-from .overland_flow import OverlandFlowBates, OverlandFlow
-from .overland_flow import KinematicWaveRengers
-from .potentiality_flowrouting import PotentialityFlowRouter
-from .pet import PotentialEvapotranspiration
-from .radiation import Radiation
-from .soil_moisture import SoilMoisture
-from .vegetation_dynamics import Vegetation
-from .sink_fill import SinkFiller
-from .steepness_index import SteepnessFinder
-from .stream_power import StreamPowerEroder, FastscapeEroder, StreamPowerSmoothThresholdEroder, SedDepEroder
-from .uniform_precip import PrecipitationDistribution
-from .soil_moisture import SoilInfiltrationGreenAmpt
-from .plant_competition_ca import VegCA
-from .gflex import gFlex
-from .drainage_density import DrainageDensity
-from .fire_generator import FireGenerator
-from .weathering import ExponentialWeatherer
-from .depth_dependent_diffusion import DepthDependentDiffuser
-from .cubic_nonlinear_hillslope_flux import CubicNonLinearDiffuser
-from .depth_dependent_cubic_soil_creep import DepthDependentCubicDiffuser
-
-
-COMPONENTS = [ChiFinder, LinearDiffuser,
-              Flexure, FlowRouter, DepressionFinderAndRouter,
-              PerronNLDiffuse, OverlandFlowBates, OverlandFlow,
-              PotentialEvapotranspiration, PotentialityFlowRouter,
-              Radiation, SinkFiller, StreamPowerEroder,
-              FastscapeEroder, SedDepEroder, KinematicWaveRengers,
-              SteepnessFinder, DetachmentLtdErosion, gFlex,
-              SoilInfiltrationGreenAmpt, FireGenerator,
-              SoilMoisture, Vegetation, VegCA, DrainageDensity,
-	      ExponentialWeatherer, DepthDependentDiffuser,
-	      CubicNonLinearDiffuser, DepthSlopeProductErosion ]
-
-
-__all__ = [cls.__name__ for cls in COMPONENTS]
+import importlib
+import sys
+
+
+# Components are only imported the first time they are asked for (see
+# landlab/__init__.py), so importing one component does not import them all.
+_LAZY_IMPORTS = {
+    'ChiFinder': '.chi_index',
+    'LinearDiffuser': '.diffusion',
+    'FireGenerator': '.fire_generator',
+    'DetachmentLtdErosion': '.detachment_ltd_erosion',
+    'DepthSlopeProductErosion': '.detachment_ltd_erosion',
+    'Flexure': '.flexure',
+    'FlowRouter': '.flow_routing',
+    'DepressionFinderAndRouter': '.flow_routing',
+    'PerronNLDiffuse': '.nonlinear_diffusion',
+    'OverlandFlowBates': '.overland_flow',
+    'OverlandFlow': '.overland_flow',
+    'KinematicWaveRengers': '.overland_flow',
+    'PotentialityFlowRouter': '.potentiality_flowrouting',
+    'PotentialEvapotranspiration': '.pet',
+    'Radiation': '.radiation',
+    'SoilMoisture': '.soil_moisture',
+    'Vegetation': '.vegetation_dynamics',
+    'SinkFiller': '.sink_fill',
+    'SteepnessFinder': '.steepness_index',
+    'StreamPowerEroder': '.stream_power',
+    'FastscapeEroder': '.stream_power',
+    'StreamPowerSmoothThresholdEroder': '.stream_power',
+    'SedDepEroder': '.stream_power',
+    'PrecipitationDistribution': '.uniform_precip',
+    'SoilInfiltrationGreenAmpt': '.soil_moisture',
+    'VegCA': '.plant_competition_ca',
+    'gFlex': '.gflex',
+    'DrainageDensity': '.drainage_density',
+    'ExponentialWeatherer': '.weathering',
+    'DepthDependentDiffuser': '.depth_dependent_diffusion',
+    'CubicNonLinearDiffuser': '.cubic_nonlinear_hillslope_flux',
+    'DepthDependentCubicDiffuser': '.depth_dependent_cubic_soil_creep',
+}
+
+__all__ = ['ChiFinder', 'LinearDiffuser',
+           'Flexure', 'FlowRouter', 'DepressionFinderAndRouter',
+           'PerronNLDiffuse', 'OverlandFlowBates', 'OverlandFlow',
+           'PotentialEvapotranspiration', 'PotentialityFlowRouter',
+           'Radiation', 'SinkFiller', 'StreamPowerEroder',
+           'FastscapeEroder', 'SedDepEroder', 'KinematicWaveRengers',
+           'SteepnessFinder', 'DetachmentLtdErosion', 'gFlex',
+           'SoilInfiltrationGreenAmpt', 'FireGenerator',
+           'SoilMoisture', 'Vegetation', 'VegCA', 'DrainageDensity',
+           'ExponentialWeatherer', 'DepthDependentDiffuser',
+           'CubicNonLinearDiffuser', 'DepthSlopeProductErosion']
+
+
+def __getattr__(name):
+    """Import a component, or a subpackage, the first time it is used.
+
+    Asking for ``COMPONENTS`` imports every component in ``__all__``.
+    """
+    if name == 'COMPONENTS':
+        value = [__getattr__(cls_name) for cls_name in __all__]
+    else:
+        try:
+            module = _LAZY_IMPORTS[name]
+        except KeyError:
+            if name.startswith('_'):
+                raise AttributeError(
+                    'module {0!r} has no attribute {1!r}'.format(__name__,
+                                                                 name))
+            try:
+                return importlib.import_module('.' + name, __name__)
+            except ImportError as error:
+                if getattr(error, 'name', None) != __name__ + '.' + name:
+                    raise
+                raise AttributeError(
+                    'module {0!r} has no attribute {1!r}'.format(__name__,
+                                                                 name))
+        value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS) | {'COMPONENTS'})
+
+
+if sys.version_info < (3, 7):  # no module __getattr__, so import up front
+    __getattr__('COMPONENTS')
+    for _name in list(_LAZY_IMPORTS):
+        __getattr__(_name)
@@ -0,0 +1,96 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+
+@cython.boundscheck(False)
+def integrate_chi_avg_dx(np.ndarray[DTYPE_INT_t, ndim=1] valid_upstr_order,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=2] chi_integrand,
+                         np.ndarray[DTYPE_INT_t, ndim=1] receivers,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=2] chi_array):
+    """Sum chi integrands down the channel network.
+
+    Each column of *chi_array* holds chi for a different reference
+    concavity. Because nodes are visited in upstream order, the chi of a
+    node's receiver is always known by the time the node is reached.
+
+    Parameters
+    ----------
+    valid_upstr_order : array of ints
+        Nodes in the channel network in upstream order.
+    chi_integrand : (n_channel_nodes, n_concavities) array of floats
+        The value (A0/A)**concavity, in upstream order.
+    receivers : array of ints
+        The receiver of each node.
+    chi_array : (n_nodes, n_concavities) array of floats
+        Array in which to store the (unscaled) chi.
+    """
+    cdef int n_nodes = valid_upstr_order.shape[0]
+    cdef int n_cols = chi_array.shape[1]
+    cdef int i
+    cdef int col
+    cdef int node
+    cdef int dstr_node
+
+    for i in range(n_nodes):
+        node = valid_upstr_order[i]
+        dstr_node = receivers[node]
+        for col in range(n_cols):
+            chi_array[node, col] = (chi_array[dstr_node, col] +
+                                    chi_integrand[i, col])
+
+
+@cython.boundscheck(False)
+def integrate_chi_each_dx(np.ndarray[DTYPE_INT_t, ndim=1] valid_upstr_order,
+                          np.ndarray[DTYPE_FLOAT_t, ndim=2] half_integrand,
+                          np.ndarray[DTYPE_INT_t, ndim=1] receivers,
+                          np.ndarray[DTYPE_INT_t, ndim=1] links,
+                          np.ndarray[DTYPE_FLOAT_t, ndim=1] link_lengths,
+                          np.ndarray[DTYPE_FLOAT_t, ndim=2] chi_array):
+    """Sum chi integrands times link lengths down the channel network.
+
+    Uses a trapezium integration method. Each column of *chi_array* holds
+    chi for a different reference concavity.
+
+    Parameters
+    ----------
+    valid_upstr_order : array of ints
+        Nodes in the channel network in upstream order.
+    half_integrand : (n_nodes, n_concavities) array of floats
+        Half the value (A0/A)**concavity, in *node* order.
+    receivers : array of ints
+        The receiver of each node.
+    links : array of ints
+        The link to the receiver of each node.
+    link_lengths : array of floats
+        Lengths of links, including diagonals.
+    chi_array : (n_nodes, n_concavities) array of floats
+        Array in which to store chi.
+    """
+    cdef int n_nodes = valid_upstr_order.shape[0]
+    cdef int n_cols = chi_array.shape[1]
+    cdef int i
+    cdef int col
+    cdef int node
+    cdef int dstr_node
+    cdef int dstr_link
+    cdef double dstr_length
+
+    for i in range(n_nodes):
+        node = valid_upstr_order[i]
+        dstr_link = links[node]
+        if dstr_link != -1:
+            dstr_node = receivers[node]
+            dstr_length = link_lengths[dstr_link]
+            for col in range(n_cols):
+                chi_array[node, col] = (
+                    chi_array[dstr_node, col] +
+                    (half_integrand[node, col] +
+                     half_integrand[dstr_node, col]) * dstr_length)
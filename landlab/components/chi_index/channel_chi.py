@@ -9,11 +9,15 @@ from six.moves import range  # this is Python 3's generator, not P2's list
 
 from landlab import ModelParameterDictionary, Component, FieldError, \
                     FIXED_VALUE_BOUNDARY, BAD_INDEX_VALUE, CLOSED_BOUNDARY
+from landlab.utils.decorators import skip_if_fields_unchanged
 import numpy as np
-try:
-    from itertools import izip
-except ImportError:
-    izip = zip
+
+from .cfuncs import integrate_chi_avg_dx as _integrate_chi_avg_dx
+from .cfuncs import integrate_chi_each_dx as _integrate_chi_each_dx
+
+
+_NETWORK_FIELDS = ('drainage_area', 'flow__upstream_node_order',
+                   'flow__receiver_node', 'flow__link_to_receiver_node')
 
 
 class ChiFinder(Component):
@@ -24,7 +28,7 @@ class ChiFinder(Component):
     Construction::
 
         ChiFinder(grid, reference_concavity=0.5, min_drainage_area=1.e6,
-                  reference_area=1., use_true_dx=False)
+                  reference_area=1., use_true_dx=False, skip_unchanged=False)
 
     Parameters
     ----------
@@ -43,6 +47,10 @@ class ChiFinder(Component):
         spacing along the channel (which can lead to a quantization effect,
         and is not preferred by Taylor & Royden). If False, the mean value of
         node spacing along the all channels is assumed everywhere.
+    skip_unchanged : bool (default False)
+        If True, only calculate chi if the topography, the flow routing, or
+        the boundary conditions have changed since it was last calculated,
+        and reuse the channel network while the flow routing is unchanged.
 
     Examples
     --------
@@ -153,11 +161,13 @@ class ChiFinder(Component):
                 }
 
     def __init__(self, grid, reference_concavity=0.5, min_drainage_area=1.e6,
-                 reference_area=1., use_true_dx=False, **kwds):
+                 reference_area=1., use_true_dx=False, skip_unchanged=False,
+                 **kwds):
         """
         Constructor for the component.
         """
         self._grid = grid
+        self.skip_unchanged = skip_unchanged
         self._reftheta = reference_concavity
         self.min_drainage = min_drainage_area
         if reference_area is None:
@@ -174,7 +184,10 @@ class ChiFinder(Component):
         self._mask = self.grid.ones('node', dtype=bool)
         # this one needs modifying if smooth_elev
         self._elev = self.grid.at_node['topographic__elevation']
+        self._network_key = None
+        self._network = None
 
+    @skip_if_fields_unchanged()
     def calculate_chi(self, **kwds):
         """
         This is the main method. Call it to calculate local chi indices
@@ -191,6 +204,203 @@ class ChiFinder(Component):
         self.chi.fill(0.)
         # test for new kwds:
         reftheta = kwds.get('reference_concavity', self._reftheta)
+        (ch_nodes, ch_chi) = self._integrate_chi(
+            reftheta, use_cache=self.skip_unchanged, **kwds)
+        self.chi[ch_nodes] = ch_chi[:, 0]
+        self._mask[ch_nodes] = False
+
+    def calculate_chi_for_concavities(self, concavities, **kwds):
+        """Calculate chi for several reference concavities in one sweep.
+
+        The channel network is only traversed once, with chi for every
+        concavity summed together. The 'channel__chi_index' field and the
+        hillslope mask are not updated.
+
+        The thresholded channel network is cached, and only rebuilt if
+        *min_drainage_area*, the boundary conditions, or the versions of the
+        flow routing fields change (as they do each time a flow router is
+        run), so repeated scans of the same network are cheap.
+
+        Parameters
+        ----------
+        concavities : array of floats
+            The reference concavities to use.
+
+        Other parameters are as for :func:`calculate_chi`.
+
+        Returns
+        -------
+        chi : (n_nodes, n_concavities) array of floats
+            Chi at each node (rows) for each concavity (columns). Nodes
+            not in the channel network receive zeros.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid, CLOSED_BOUNDARY
+        >>> from landlab.components import FlowRouter
+        >>> mg = RasterModelGrid((3, 4), 1.)
+        >>> for nodes in (mg.nodes_at_right_edge, mg.nodes_at_bottom_edge,
+        ...               mg.nodes_at_top_edge):
+        ...     mg.status_at_node[nodes] = CLOSED_BOUNDARY
+        >>> _ = mg.add_field('node', 'topographic__elevation', mg.node_x)
+        >>> fr = FlowRouter(mg)
+        >>> cf = ChiFinder(mg, min_drainage_area=1.)
+        >>> fr.run_one_step()
+        >>> chi = cf.calculate_chi_for_concavities([0., 0.5, 1.])
+        >>> chi.shape
+        (12, 3)
+        >>> chi[4:8]  # doctest: +NORMALIZE_WHITESPACE
+        array([[ 1.        ,  0.70710678,  0.5       ],
+               [ 2.        ,  1.41421356,  1.        ],
+               [ 3.        ,  2.41421356,  2.        ],
+               [ 0.        ,  0.        ,  0.        ]])
+        """
+        reftheta = np.asarray(concavities, dtype=float).reshape(-1)
+        chi = np.zeros((self.grid.number_of_nodes, reftheta.size))
+        (ch_nodes, ch_chi) = self._integrate_chi(reftheta, use_cache=True,
+                                                 **kwds)
+        chi[ch_nodes] = ch_chi
+        return chi
+
+    def chi_elevation_collinearity(self, concavities, **kwds):
+        """Measure how well chi and elevation fall on a line, by concavity.
+
+        For each reference concavity, the coefficient of determination,
+        R**2, of a straight line fit through chi and elevation at all
+        channel nodes is found. The best-fitting concavity for a landscape
+        at steady state gives the most nearly collinear chi plot. Chi for
+        every concavity is found in one sweep of the (cached) channel
+        network; see :func:`calculate_chi_for_concavities`.
+
+        Parameters
+        ----------
+        concavities : array of floats
+            The reference concavities to test.
+
+        Other parameters are as for :func:`calculate_chi`.
+
+        Returns
+        -------
+        r_squared : array of floats
+            R**2 of the chi-elevation fit for each concavity.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid, CLOSED_BOUNDARY
+        >>> from landlab.components import FlowRouter
+        >>> mg = RasterModelGrid((3, 5), 1.)
+        >>> for nodes in (mg.nodes_at_right_edge, mg.nodes_at_bottom_edge,
+        ...               mg.nodes_at_top_edge):
+        ...     mg.status_at_node[nodes] = CLOSED_BOUNDARY
+        >>> z = mg.add_zeros('node', 'topographic__elevation')
+        >>> z[6:9] = [1., 2., 3.]
+        >>> fr = FlowRouter(mg)
+        >>> cf = ChiFinder(mg, min_drainage_area=1.)
+        >>> fr.run_one_step()
+        >>> r_squared = cf.chi_elevation_collinearity([0., 0.5, 1.])
+        >>> np.round(r_squared, 4)
+        array([ 1.    ,  0.9842,  0.9391])
+        """
+        reftheta = np.asarray(concavities, dtype=float).reshape(-1)
+        (ch_nodes, ch_chi) = self._integrate_chi(reftheta, use_cache=True,
+                                                 **kwds)
+        ch_z = self.grid.at_node['topographic__elevation'][ch_nodes]
+
+        chi_anomaly = ch_chi - ch_chi.mean(axis=0)
+        z_anomaly = ch_z - ch_z.mean()
+        covariance = np.dot(z_anomaly, chi_anomaly)
+        return covariance ** 2 / (np.sum(chi_anomaly ** 2, axis=0) *
+                                  np.dot(z_anomaly, z_anomaly))
+
+    def best_fit_concavity(self, concavities, **kwds):
+        """Find the concavity that gives the most collinear chi plot.
+
+        Parameters
+        ----------
+        concavities : array of floats
+            The reference concavities to test.
+
+        Other parameters are as for :func:`calculate_chi`.
+
+        Returns
+        -------
+        float
+            The concavity with the largest chi-elevation R**2 (see
+            :func:`chi_elevation_collinearity`).
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid, CLOSED_BOUNDARY
+        >>> from landlab.components import FlowRouter
+        >>> mg = RasterModelGrid((3, 5), 1.)
+        >>> for nodes in (mg.nodes_at_right_edge, mg.nodes_at_bottom_edge,
+        ...               mg.nodes_at_top_edge):
+        ...     mg.status_at_node[nodes] = CLOSED_BOUNDARY
+        >>> z = mg.add_zeros('node', 'topographic__elevation')
+        >>> z[6:9] = [1., 2., 3.]
+        >>> fr = FlowRouter(mg)
+        >>> cf = ChiFinder(mg, min_drainage_area=1.)
+        >>> fr.run_one_step()
+        >>> cf.best_fit_concavity([0., 0.5, 1.])
+        0.0
+        """
+        concavities = np.asarray(concavities, dtype=float).reshape(-1)
+        r_squared = self.chi_elevation_collinearity(concavities, **kwds)
+        return concavities[np.nanargmax(r_squared)]
+
+    def _channel_network(self, min_drainage, use_cache=False):
+        """Get the channel network, in upstream order.
+
+        Returns a tuple of the channel nodes, their drainage areas, the
+        position in the network of each node's receiver, the length of the
+        link to each node's receiver (zero if there is none), and the mean
+        of these link lengths. If *use_cache* is True, the network is only
+        rebuilt if *min_drainage*, the boundary conditions, or the flow
+        routing fields have changed version since it was last built.
+        """
+        key = (min_drainage, self.grid.bc_set_code,
+               tuple(self.grid.field_version('node', name)
+                     for name in _NETWORK_FIELDS))
+        if use_cache and self._network_key == key:
+            return self._network
+
+        upstr_order = self.grid.at_node['flow__upstream_node_order']
+        # get an array of only nodes with A above threshold:
+        valid_upstr_order = upstr_order[self.grid.at_node['drainage_area'][
+            upstr_order] >= min_drainage]
+        valid_upstr_areas = self.grid.at_node['drainage_area'][
+            valid_upstr_order]
+
+        position_in_network = np.full(self.grid.number_of_nodes, -1,
+                                      dtype=int)
+        position_in_network[valid_upstr_order] = np.arange(
+            valid_upstr_order.size)
+        receiver_position = position_in_network[
+            self.grid.at_node['flow__receiver_node'][valid_upstr_order]]
+
+        links = self.grid.at_node['flow__link_to_receiver_node'][
+            valid_upstr_order]
+        has_link = links != BAD_INDEX_VALUE
+        dstr_lengths = np.zeros(valid_upstr_order.size)
+        dstr_lengths[has_link] = self.grid._length_of_link_with_diagonals[
+            links[has_link]]
+        mean_dx = dstr_lengths[has_link].mean()
+
+        self._network_key = key
+        self._network = (valid_upstr_order, valid_upstr_areas,
+                         receiver_position, dstr_lengths, mean_dx)
+        return self._network
+
+    def _integrate_chi(self, reftheta, use_cache=False, **kwds):
+        """Integrate chi along the channel network for each of *reftheta*.
+
+        Returns the channel nodes, in upstream order, and a 2-D array of chi
+        at each of these nodes (rows) for each concavity (columns).
+        """
+        reftheta = np.reshape(reftheta, -1)
         min_drainage = kwds.get('min_drainage_area', self.min_drainage)
         A0 = kwds.get('reference_area', self._A0)
         if A0 is None:
@@ -201,43 +411,46 @@ class ChiFinder(Component):
         assert A0 > 0.
         use_true_dx = kwds.get('use_true_dx', self.use_true_dx)
 
-        upstr_order = self.grid.at_node['flow__upstream_node_order']
-        # get an array of only nodes with A above threshold:
-        valid_upstr_order = upstr_order[self.grid.at_node['drainage_area'][
-            upstr_order] >= min_drainage]
-        valid_upstr_areas = self.grid.at_node['drainage_area'][
-            valid_upstr_order]
+        (ch_nodes, ch_areas, receiver_position, dstr_lengths,
+         mean_dx) = self._channel_network(min_drainage, use_cache=use_cache)
+        # the network's own ordering is upstream order:
+        network_order = np.arange(ch_nodes.size)
+        chi_integrand = np.power.outer(A0/ch_areas, reftheta)
+        ch_chi = np.zeros_like(chi_integrand)
         if not use_true_dx:
-            chi_integrand = (A0/valid_upstr_areas)**reftheta
-            mean_dx = self.mean_channel_node_spacing(valid_upstr_order)
-            self.integrate_chi_avg_dx(valid_upstr_order, chi_integrand,
-                                      self.chi, mean_dx)
+            _integrate_chi_avg_dx(network_order, chi_integrand,
+                                  receiver_position, ch_chi)
+            ch_chi *= mean_dx
         else:
-            chi_integrand = self.grid.zeros('node')
-            chi_integrand[valid_upstr_order] = (A0/valid_upstr_areas)**reftheta
-            self.integrate_chi_each_dx(valid_upstr_order, chi_integrand,
-                                       self.chi)
+            links = np.where(dstr_lengths > 0., network_order,
+                             BAD_INDEX_VALUE)
+            _integrate_chi_each_dx(network_order, 0.5 * chi_integrand,
+                                   receiver_position, links, dstr_lengths,
+                                   ch_chi)
         # stamp over the closed nodes, as it's possible they can receive infs
         # if min_drainage_area < grid.cell_area_at_node
-        self.chi[self.grid.status_at_node == CLOSED_BOUNDARY] = 0.
-        self._mask[valid_upstr_order] = False
+        ch_chi[self.grid.status_at_node[ch_nodes] == CLOSED_BOUNDARY] = 0.
+        return (ch_nodes, ch_chi)
 
     def integrate_chi_avg_dx(self, valid_upstr_order, chi_integrand,
                              chi_array, mean_dx):
         """
         Calculates chi at each channel node by summing chi_integrand.
 
-        This method assumes a uniform, mean spacing between nodes. Method is
-        deliberately split out for potential cythonization at a later stage.
+        This method assumes a uniform, mean spacing between nodes. The sum
+        is done in compiled code. To find chi for several concavities at
+        once, give *chi_integrand* and *chi_array* one column per concavity.
 
         Parameters
         ----------
         valid_upstr_order : array of ints
             nodes in the channel network in upstream order.
         chi_integrand : array of floats
-            The value (A0/A)**concavity, in upstream order.
+            The value (A0/A)**concavity, in upstream order. May be 2-D,
+            with one column for each concavity.
         chi_array : array of floats
-            Array in which to store chi.
+            Array in which to store chi. If 2-D, it must have the same
+            number of columns as *chi_integrand*.
         mean_dx : float
             The mean node spacing in the network.
 
@@ -268,11 +481,14 @@ class ChiFinder(Component):
                [ 0. ,  0. ,  0. ,  0. ]])
         """
         receivers = self.grid.at_node['flow__receiver_node']
+        valid_upstr_order = np.asarray(valid_upstr_order, dtype=int)
         # because chi_array is all zeros, BC cases where node is receiver
         # resolve themselves
-        for (node, integrand) in izip(valid_upstr_order, chi_integrand):
-            dstr_node = receivers[node]
-            chi_array[node] = chi_array[dstr_node] + integrand
+        _integrate_chi_avg_dx(
+            valid_upstr_order,
+            np.asarray(chi_integrand, dtype=float).reshape(
+                (valid_upstr_order.size, -1)),
+            receivers, chi_array.reshape((chi_array.shape[0], -1)))
         chi_array *= mean_dx
 
     def integrate_chi_each_dx(self, valid_upstr_order, chi_integrand_at_nodes,
@@ -280,18 +496,21 @@ class ChiFinder(Component):
         """
         Calculates chi at each channel node by summing chi_integrand*dx.
 
-        This method accounts explicitly for spacing between each node. Method
-        is deliberately split out for potential cythonization at a later
-        stage. Uses a trapezium integration method.
+        This method accounts explicitly for spacing between each node. Uses
+        a trapezium integration method. The sum is done in compiled code. To
+        find chi for several concavities at once, give
+        *chi_integrand_at_nodes* and *chi_array* one column per concavity.
 
         Parameters
         ----------
         valid_upstr_order : array of ints
             nodes in the channel network in upstream order.
         chi_integrand_at_nodes : array of floats
-            The value (A0/A)**concavity, in *node* order.
+            The value (A0/A)**concavity, in *node* order. May be 2-D, with
+            one column for each concavity.
         chi_array : array of floats
-            Array in which to store chi.
+            Array in which to store chi. If 2-D, it must have the same
+            number of columns as *chi_integrand_at_nodes*.
 
         Examples
         --------
@@ -357,17 +576,11 @@ class ChiFinder(Component):
         link_lengths = self.grid._length_of_link_with_diagonals
         # because chi_array is all zeros, BC cases where node is receiver
         # resolve themselves
-        half_integrand = 0.5 * chi_integrand_at_nodes
-        for node in valid_upstr_order:
-            dstr_node = receivers[node]
-            dstr_link = links[node]
-            if dstr_link != BAD_INDEX_VALUE:
-                dstr_length = link_lengths[dstr_link]
-                half_head_val = half_integrand[node]
-                half_tail_val = half_integrand[dstr_node]
-                mean_val = half_head_val + half_tail_val
-                chi_to_add = mean_val * dstr_length
-                chi_array[node] = chi_array[dstr_node] + chi_to_add
+        half_integrand = 0.5 * np.asarray(chi_integrand_at_nodes, dtype=float)
+        _integrate_chi_each_dx(
+            np.asarray(valid_upstr_order, dtype=int),
+            half_integrand.reshape((half_integrand.shape[0], -1)), receivers,
+            links, link_lengths, chi_array.reshape((chi_array.shape[0], -1)))
 
     def mean_channel_node_spacing(self, ch_nodes):
         """
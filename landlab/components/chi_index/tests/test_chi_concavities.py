@@ -0,0 +1,68 @@
+"""Test finding chi for several concavities at once."""
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_almost_equal
+
+from landlab import RasterModelGrid
+from landlab.components import FlowRouter, FastscapeEroder, ChiFinder
+
+
+def _eroded_grid():
+    np.random.seed(1945)
+    grid = RasterModelGrid((40, 40), 100.)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z += np.random.rand(z.size)
+
+    fr = FlowRouter(grid)
+    sp = FastscapeEroder(grid, K_sp=1.e-4)
+    for _ in range(10):
+        z[grid.core_nodes] += 1.
+        fr.run_one_step()
+        sp.run_one_step(1000.)
+    fr.run_one_step()
+    return grid
+
+
+def test_concavities_match_calculate_chi():
+    """Test each column matches chi for that concavity alone."""
+    grid = _eroded_grid()
+    cf = ChiFinder(grid, min_drainage_area=1.e5)
+    concavities = [0.2, 0.45, 0.7]
+    for use_true_dx in (False, True):
+        chi = cf.calculate_chi_for_concavities(concavities,
+                                               use_true_dx=use_true_dx)
+        for (col, concavity) in enumerate(concavities):
+            cf.calculate_chi(reference_concavity=concavity,
+                             use_true_dx=use_true_dx)
+            assert_array_equal(chi[:, col], cf.chi_indices)
+
+
+def test_network_rebuilt_after_routing():
+    """Test the cached network is rebuilt when the flow routing changes."""
+    grid = _eroded_grid()
+    fr = FlowRouter(grid)
+    cf = ChiFinder(grid, min_drainage_area=1.e5)
+    chi_before = cf.calculate_chi_for_concavities([0.5])
+
+    z = grid.at_node['topographic__elevation']
+    z[grid.core_nodes] += np.random.rand(grid.number_of_core_nodes)
+    fr.run_one_step()
+    chi_after = cf.calculate_chi_for_concavities([0.5])
+
+    cf.calculate_chi(reference_concavity=0.5)
+    assert_array_equal(chi_after[:, 0], cf.chi_indices)
+    assert not np.all(chi_before == chi_after)
+
+
+def test_best_fit_concavity():
+    """Test the best-fit concavity of a perfectly collinear chi plot."""
+    grid = _eroded_grid()
+    cf = ChiFinder(grid, min_drainage_area=1.e5)
+    cf.calculate_chi(reference_concavity=0.45)
+    grid.at_node['topographic__elevation'][:] = 0.01 * cf.chi_indices
+
+    concavities = np.linspace(0.2, 0.7, 11)
+    r_squared = cf.chi_elevation_collinearity(concavities)
+    assert_almost_equal(r_squared[5], 1.)
+    assert np.all(r_squared[[4, 6]] < r_squared[5])
+    assert_almost_equal(cf.best_fit_concavity(concavities), 0.45)
@@ -48,7 +48,8 @@ class LinearDiffuser(Component):
 
     Construction::
 
-        LinearDiffuser(grid, linear_diffusivity=None, method='simple')
+        LinearDiffuser(grid, linear_diffusivity=None, method='simple',
+                       skip_unchanged=False)
 
     Parameters
     ----------
@@ -74,6 +75,11 @@ class LinearDiffuser(Component):
         performed on a raster. 'on_diagonals' pretends that the "faces" of a
         cell with 8 links are represented by a stretched regular octagon set
         within the true cell.
+    skip_unchanged : bool
+        If True, diffusivities given as a field are only mapped onto the
+        links again if the field or the boundary conditions have changed.
+        Diffusivities changed in place must then be marked as modified with
+        the grid's *mark_modified* method.
 
     Examples
     --------
@@ -132,6 +138,9 @@ class LinearDiffuser(Component):
 
     _name = 'LinearDiffuser'
 
+    # run_one_step divides long time steps internally
+    _unconstrained_time_step = True
+
     _input_var_names = ('topographic__elevation',)
 
     _output_var_names = ('topographic__elevation',
@@ -158,8 +167,11 @@ class LinearDiffuser(Component):
 
     @use_file_name_or_kwds
     def __init__(self, grid, linear_diffusivity=None, method='simple',
-                 **kwds):
+                 skip_unchanged=False, **kwds):
         self._grid = grid
+        self.skip_unchanged = skip_unchanged
+        self._kd_field = None
+        self._kd_version = None
         self._bc_set_code = self.grid.bc_set_code
         assert method in ('simple', 'resolve_on_patches', 'on_diagonals')
         if method == 'resolve_on_patches':
@@ -189,8 +201,10 @@ class LinearDiffuser(Component):
                 try:
                     self._kd = self.grid.at_link[linear_diffusivity]
                     self._kd_on_links = True
+                    self._kd_field = ('link', linear_diffusivity)
                 except KeyError:
                     self._kd = self.grid.at_node[linear_diffusivity]
+                    self._kd_field = ('node', linear_diffusivity)
         else:
             raise KeyError("linear_diffusivity must be provided to the " +
                            "LinearDiffuser component")
@@ -407,148 +421,194 @@ class LinearDiffuser(Component):
         # do mapping of array kd here, in case it points at an updating
         # field:
         if type(self._kd) is np.ndarray:
-            if not self._kd_on_links:
-                kd_links = self.grid.map_max_of_link_nodes_to_link(self._kd)
-                kd_activelinks = kd_links[self.grid.active_links]
-                # re-derive CFL condition, as could change dynamically:
-                dt_links = self._CFL_actives_prefactor / kd_activelinks
-                self.dt = np.nanmin(dt_links)
-            else:
-                kd_links = self._kd
-                kd_activelinks = self._kd[self.grid.active_links]
-                dt_links = self._CFL_actives_prefactor / kd_activelinks
-                self.dt_links = dt_links
-                self.dt = np.nanmin(np.fabs(dt_links))
+            if not self._kd_is_unchanged():
+                if not self._kd_on_links:
+                    self._kd_links = self.grid.map_max_of_link_nodes_to_link(
+                        self._kd)
+                    self._kd_activelinks = self._kd_links[
+                        self.grid.active_links]
+                    # re-derive CFL condition, as could change dynamically:
+                    dt_links = (self._CFL_actives_prefactor /
+                                self._kd_activelinks)
+                    self.dt = np.nanmin(dt_links)
+                else:
+                    self._kd_links = self._kd
+                    self._kd_activelinks = self._kd[self.grid.active_links]
+                    dt_links = (self._CFL_actives_prefactor /
+                                self._kd_activelinks)
+                    self.dt_links = dt_links
+                    self.dt = np.nanmin(np.fabs(dt_links))
+            kd_links = self._kd_links
+            kd_activelinks = self._kd_activelinks
         else:
             kd_activelinks = self._kd
             # re-derive CFL condition, as could change dynamically:
             dt_links = self._CFL_actives_prefactor / kd_activelinks
             self.dt = np.nanmin(dt_links)
 
+        # scratch arrays, reused from one step to the next
+        buffers = mg.buffers
+        borrowed = [buffers.empty('link', purpose='gradient'),
+                    buffers.empty('node', purpose='dzdt')]
+        (grads, dzdt) = borrowed
+
         if self._use_patches:
             # need this else diffusivities on inactive links deform off-angle
             # calculations
-            kd_links = kd_links.copy()
+            kd_at_link = buffers.empty('link', purpose='diffusivity')
+            borrowed.append(kd_at_link)
+            kd_at_link[:] = kd_links
+            kd_links = kd_at_link
             kd_links[self.grid.status_at_link == INACTIVE_LINK] = 0.
-
-        # Take the smaller of delt or built-in time-step size self.dt
-        self.tstep_ratio = dt / self.dt
-        repeats = int(self.tstep_ratio // 1.)
-        extra_time = self.tstep_ratio - repeats
-
-        # Can really get into trouble if no diffusivity happens but we run...
-        if self.dt < np.inf:
-            loops = repeats+1
-        else:
-            loops = 0
-        for i in range(loops):
-            if not self._use_diags:
-                grads = mg.calc_grad_at_link(z)
-                self.g[mg.active_links] = grads[mg.active_links]
-                if not self._use_patches:  # currently forbidden
-                    # if diffusivity is an array, self._kd is already
-                    # active_links-long
-                    self.qs[mg.active_links] = (
-                        -kd_activelinks * self.g[mg.active_links])
-                    # Calculate the net deposition/erosion rate at each node
-                    mg.calc_flux_div_at_node(self.qs, out=self.dqsds)
-                else:  # project onto patches
-                    slx = mg.zeros('link')
-                    sly = mg.zeros('link')
-                    slx[self._hoz] = self.g[self._hoz]
-                    sly[self._vert] = self.g[self._vert]
-                    patch_dx, patch_dy = mg.calc_grad_at_patch(z)
-                    xvecs_vert = np.ma.array(patch_dx[self._y_link_patches],
-                                             mask=self._y_link_patch_mask)
-                    slx[self._vert] = xvecs_vert.mean()
-                    yvecs_hoz = np.ma.array(patch_dy[self._x_link_patches],
-                                            mask=self._x_link_patch_mask)
-                    sly[self._hoz] = yvecs_hoz.mean()
-                    # now map diffusivities (already on links, but we want
-                    # more spatial averaging)
-                    Kx = mg.zeros('link')
-                    Ky = mg.zeros('link')
-                    Kx[self._hoz] = kd_links[self._hoz]
-                    Ky[self._vert] = kd_links[self._vert]
-                    vert_link_crosslink_K = np.ma.array(
-                        kd_links[self._vert_link_neighbors],
-                        mask=self._vert_link_badlinks)
-                    hoz_link_crosslink_K = np.ma.array(
-                        kd_links[self._hoz_link_neighbors],
-                        mask=self._hoz_link_badlinks)
-                    Kx[self._vert] = vert_link_crosslink_K.mean(axis=1)
-                    Ky[self._hoz] = hoz_link_crosslink_K.mean(axis=1)
-                    Cslope = np.sqrt(slx ** 2 + sly ** 2)
-                    v = np.sqrt(Kx ** 2 + Ky ** 2)
-                    flux_links = v * Cslope
-                    # NEW, to resolve issue with K being off angle to S:
-                    # in fact, no. Doing this just makes this equivalent
-                    # to the basic diffuser, but with a bunch more crap
-                    # involved.
-                    # flux_x = slx * Kx
-                    # flux_y = sly * Ky
-                    # flux_links = np.sqrt(flux_x*flux_x + flux_y*flux_y)
-                    theta = np.arctan(np.fabs(sly) / (np.fabs(slx) + 1.e-10))
-                    flux_links[self._hoz] *= (
-                        np.sign(slx[self._hoz]) * np.cos(theta[self._hoz]))
-                    flux_links[self._vert] *= (
-                        np.sign(sly[self._vert]) * np.sin(theta[self._vert]))
-                    # zero out the inactive links
-                    self.qs[mg.active_links] = -flux_links[mg.active_links]
-
-                    self.grid.calc_flux_div_at_node(self.qs, out=self.dqsds)
-
-            else:  # ..._use_diags
-                # NB: this is dirty code. It uses the obsolete diagonal data
-                # structures, and necessarily has to do a bunch of mapping
-                # on the fly.
-                # remap the kds onto the links, as necessary
-                if type(self._kd) is np.ndarray:
-                    d8link_kd = np.empty(self.grid._number_of_d8_links,
-                                         dtype=float)
-                    d8link_kd[self.grid.active_links] = kd_activelinks
-                    d8link_kd[self.grid._diag_active_links] = np.amax(
-                        (self._kd[self.grid._diag_activelink_fromnode],
-                         self._kd[self.grid._diag_activelink_tonode]), axis=0)
-                else:
-                    d8link_kd = self._kd
-                self.g[self.grid.active_links] = self.grid.calc_grad_at_link(
-                    z)[self.grid.active_links]
-                self.g[self.grid._diag_active_links] = ((
-                    z[self.grid._diag_activelink_tonode] -
-                    z[self.grid._diag_activelink_fromnode]) /
-                        self.grid._length_of_link_with_diagonals[
-                            self.grid._diag_active_links])
-                self.qs[:] = -d8link_kd * self.g
-
-                total_flux = self.qs * self._d8width_face_at_link  # nlinks
-                totalflux_allnodes = (
-                    total_flux[self.grid.links_at_node] *
-                    self.grid.active_link_dirs_at_node).sum(axis=1)
-                totalflux_allnodes += (
-                    total_flux[self.grid._diag_links_at_node] *
-                    self.grid._diag_active_link_dirs_at_node).sum(axis=1)
-                self.dqsds[self.grid.node_at_cell] = -totalflux_allnodes[
-                    self.grid.node_at_cell] / self.grid.area_of_cell
-
-            # Calculate the total rate of elevation change
-            dzdt = - self.dqsds
-            # Update the elevations
-            timestep = self.dt
-            if i == (repeats):
-                timestep *= extra_time
+            (slx, sly, Kx, Ky) = (
+                buffers.empty('link', purpose=purpose) for purpose in
+                ('slope_x', 'slope_y', 'diffusivity_x', 'diffusivity_y'))
+            borrowed.extend((slx, sly, Kx, Ky))
+
+        try:
+            # Take the smaller of delt or built-in time-step size self.dt
+            self.tstep_ratio = dt / self.dt
+            repeats = int(self.tstep_ratio // 1.)
+            extra_time = self.tstep_ratio - repeats
+
+            # Can really get into trouble if no diffusivity happens but we
+            # run...
+            if self.dt < np.inf:
+                loops = repeats+1
             else:
-                pass
-            self.grid.at_node[self.values_to_diffuse][core_nodes] += dzdt[
-                core_nodes] * timestep
-
-            # check the BCs, update if fixed gradient
-            vals = self.grid.at_node[self.values_to_diffuse]
-            vals[self.fixed_grad_nodes] = (vals[self.fixed_grad_anchors] +
-                                           self.fixed_grad_offsets)
+                loops = 0
+            for i in range(loops):
+                if not self._use_diags:
+                    mg.calc_grad_at_link(z, out=grads)
+                    self.g[mg.active_links] = grads[mg.active_links]
+                    if not self._use_patches:  # currently forbidden
+                        # if diffusivity is an array, self._kd is already
+                        # active_links-long
+                        self.qs[mg.active_links] = (
+                            -kd_activelinks * self.g[mg.active_links])
+                        # Calculate the net deposition/erosion rate at each
+                        # node
+                        mg.calc_flux_div_at_node(self.qs, out=self.dqsds)
+                    else:  # project onto patches
+                        slx.fill(0.)
+                        sly.fill(0.)
+                        slx[self._hoz] = self.g[self._hoz]
+                        sly[self._vert] = self.g[self._vert]
+                        patch_dx, patch_dy = mg.calc_grad_at_patch(z)
+                        xvecs_vert = np.ma.array(
+                            patch_dx[self._y_link_patches],
+                            mask=self._y_link_patch_mask)
+                        slx[self._vert] = xvecs_vert.mean()
+                        yvecs_hoz = np.ma.array(patch_dy[self._x_link_patches],
+                                                mask=self._x_link_patch_mask)
+                        sly[self._hoz] = yvecs_hoz.mean()
+                        # now map diffusivities (already on links, but we want
+                        # more spatial averaging)
+                        Kx.fill(0.)
+                        Ky.fill(0.)
+                        Kx[self._hoz] = kd_links[self._hoz]
+                        Ky[self._vert] = kd_links[self._vert]
+                        vert_link_crosslink_K = np.ma.array(
+                            kd_links[self._vert_link_neighbors],
+                            mask=self._vert_link_badlinks)
+                        hoz_link_crosslink_K = np.ma.array(
+                            kd_links[self._hoz_link_neighbors],
+                            mask=self._hoz_link_badlinks)
+                        Kx[self._vert] = vert_link_crosslink_K.mean(axis=1)
+                        Ky[self._hoz] = hoz_link_crosslink_K.mean(axis=1)
+                        Cslope = np.sqrt(slx ** 2 + sly ** 2)
+                        v = np.sqrt(Kx ** 2 + Ky ** 2)
+                        flux_links = v * Cslope
+                        # NEW, to resolve issue with K being off angle to S:
+                        # in fact, no. Doing this just makes this equivalent
+                        # to the basic diffuser, but with a bunch more crap
+                        # involved.
+                        # flux_x = slx * Kx
+                        # flux_y = sly * Ky
+                        # flux_links = np.sqrt(flux_x*flux_x + flux_y*flux_y)
+                        theta = np.arctan(
+                            np.fabs(sly) / (np.fabs(slx) + 1.e-10))
+                        flux_links[self._hoz] *= (
+                            np.sign(slx[self._hoz]) * np.cos(theta[self._hoz]))
+                        flux_links[self._vert] *= (
+                            np.sign(sly[self._vert]) *
+                            np.sin(theta[self._vert]))
+                        # zero out the inactive links
+                        self.qs[mg.active_links] = -flux_links[mg.active_links]
+
+                        self.grid.calc_flux_div_at_node(self.qs,
+                                                        out=self.dqsds)
+
+                else:  # ..._use_diags
+                    # NB: this is dirty code. It uses the obsolete diagonal
+                    # data structures, and necessarily has to do a bunch of
+                    # mapping on the fly.
+                    # remap the kds onto the links, as necessary
+                    if type(self._kd) is np.ndarray:
+                        d8link_kd = np.empty(self.grid._number_of_d8_links,
+                                             dtype=float)
+                        d8link_kd[self.grid.active_links] = kd_activelinks
+                        d8link_kd[self.grid._diag_active_links] = np.amax(
+                            (self._kd[self.grid._diag_activelink_fromnode],
+                             self._kd[self.grid._diag_activelink_tonode]),
+                            axis=0)
+                    else:
+                        d8link_kd = self._kd
+                    self.grid.calc_grad_at_link(z, out=grads)
+                    self.g[self.grid.active_links] = grads[
+                        self.grid.active_links]
+                    self.g[self.grid._diag_active_links] = ((
+                        z[self.grid._diag_activelink_tonode] -
+                        z[self.grid._diag_activelink_fromnode]) /
+                            self.grid._length_of_link_with_diagonals[
+                                self.grid._diag_active_links])
+                    self.qs[:] = -d8link_kd * self.g
+
+                    total_flux = self.qs * self._d8width_face_at_link  # nlinks
+                    totalflux_allnodes = (
+                        total_flux[self.grid.links_at_node] *
+                        self.grid.active_link_dirs_at_node).sum(axis=1)
+                    totalflux_allnodes += (
+                        total_flux[self.grid._diag_links_at_node] *
+                        self.grid._diag_active_link_dirs_at_node).sum(axis=1)
+                    self.dqsds[self.grid.node_at_cell] = -totalflux_allnodes[
+                        self.grid.node_at_cell] / self.grid.area_of_cell
+
+                # Calculate the total rate of elevation change
+                np.negative(self.dqsds, out=dzdt)
+                # Update the elevations
+                timestep = self.dt
+                if i == (repeats):
+                    timestep *= extra_time
+                else:
+                    pass
+                self.grid.at_node[self.values_to_diffuse][core_nodes] += dzdt[
+                    core_nodes] * timestep
+
+                # check the BCs, update if fixed gradient
+                vals = self.grid.at_node[self.values_to_diffuse]
+                vals[self.fixed_grad_nodes] = (vals[self.fixed_grad_anchors] +
+                                               self.fixed_grad_offsets)
+        finally:
+            buffers.release(*borrowed)
+        self.grid.mark_modified('node', self.values_to_diffuse)
 
         return self.grid
 
+    def _kd_is_unchanged(self):
+        """Check if the diffusivity field is unchanged since last mapped.
+
+        Diffusivities are only treated as unchanged if *skip_unchanged* is
+        set and they come from a field whose version has not changed.
+        """
+        if self._kd_field is None:
+            return False
+        version = (self.grid.bc_set_code,
+                   self.grid.field_version(*self._kd_field))
+        unchanged = self.skip_unchanged and version == self._kd_version
+        self._kd_version = version
+        return unchanged
+
     def run_one_step(self, dt, **kwds):
         """Run the diffuser for one timestep, dt.
 
@@ -7,6 +7,7 @@ import os
 
 import numpy as np
 from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_equal
 try:
     from nose.tools import assert_is
 except ImportError:
@@ -121,3 +122,20 @@ def test_diffusion():
                             5.80291603e-05,   4.34416626e-04])
 
     assert_array_almost_equal(mg.at_node['topographic__elevation'], z_target)
+
+
+def test_diffusion_reuses_scratch_arrays():
+    for (method, at) in [('simple', 'node'), ('on_diagonals', 'node'),
+                         ('resolve_on_patches', 'link')]:
+        mg = RasterModelGrid((10, 10))
+        z = mg.add_zeros('node', 'topographic__elevation')
+        z[mg.core_nodes] = np.random.rand(mg.number_of_core_nodes)
+        kd = mg.ones(at=at)
+        dfn = LinearDiffuser(mg, linear_diffusivity=kd, method=method)
+
+        dfn.run_one_step(1.)
+        n_allocations = mg.buffers.number_of_allocations
+        for _ in range(3):
+            dfn.run_one_step(1.)
+        assert_equal(mg.buffers.number_of_allocations, n_allocations)
+        assert_equal(mg.buffers.number_in_use, 0)
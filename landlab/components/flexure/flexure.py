@@ -185,6 +185,11 @@ class Flexure(Component):
         if method not in ('airy', 'flexure'):
             raise ValueError(
                 '{method}: method not understood'.format(method=method))
+        if grid.dtype != np.float64:
+            # the compiled flexure solver is double precision only
+            raise ValueError(
+                'Flexure needs a double-precision grid, not '
+                '{dtype}'.format(dtype=grid.dtype))
 
         self._grid = grid
 
@@ -87,3 +87,8 @@ def test_field_initialized_to_zero():
     for name in flex.grid['node']:
         field = flex.grid['node'][name]
         assert_true(np.all(field == 0.))
+
+
+def test_single_precision_grid():
+    grid = RasterModelGrid((20, 20), spacing=10e3, dtype=np.float32)
+    assert_raises(ValueError, Flexure, grid)
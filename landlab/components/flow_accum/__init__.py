@@ -1,7 +1,11 @@
 from .flow_accum_bw import (make_ordered_node_array,
                             find_drainage_area_and_discharge,
-                            flow_accumulation)
+                            find_discharge_ensemble,
+                            flow_accumulation,
+                            partition_stack_by_basin,
+                            run_on_basins)
 
 
 __all__ = ['make_ordered_node_array', 'find_drainage_area_and_discharge',
-           'flow_accumulation', ]
+           'find_discharge_ensemble', 'flow_accumulation',
+           'partition_stack_by_basin', 'run_on_basins', ]
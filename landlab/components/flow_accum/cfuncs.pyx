@@ -5,6 +5,8 @@ cimport cython
 
 DTYPE = np.int
 ctypedef np.int_t DTYPE_INT_t
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
 
 
 @cython.boundscheck(False)
@@ -29,3 +31,54 @@ cpdef _add_to_stack(DTYPE_INT_t l, DTYPE_INT_t j,
             j = _add_to_stack(m, j, s, delta, donors)
     
     return j
+
+
+@cython.boundscheck(False)
+def _accumulate_bw(np.ndarray[DTYPE_INT_t, ndim=1] s,
+                   np.ndarray[DTYPE_INT_t, ndim=1] r,
+                   np.ndarray[DTYPE_FLOAT_t, ndim=2] values):
+    """
+    Accumulates each column of values downstream, in place.
+
+    The stack, s, is worked through from upstream to downstream, adding the
+    values at each node to those at its receiver. All columns are done in
+    the same pass over the stack.
+    """
+    cdef int n_nodes = s.shape[0]
+    cdef int n_cols = values.shape[1]
+    cdef int i, col, donor, recvr
+
+    for i in range(n_nodes - 1, -1, -1):
+        donor = s[i]
+        recvr = r[donor]
+        if donor != recvr:
+            for col in range(n_cols):
+                values[recvr, col] += values[donor, col]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _accumulate_bw_basins(np.ndarray[DTYPE_INT_t, ndim=1] s,
+                          np.ndarray[DTYPE_INT_t, ndim=1] r,
+                          np.ndarray[DTYPE_FLOAT_t, ndim=2] values,
+                          np.ndarray[DTYPE_INT_t, ndim=2] basin_ranges):
+    """
+    Accumulates each column of values downstream, basin by basin, in place.
+
+    Each row of basin_ranges gives the start and end (exclusive) of the
+    section of the stack, s, that holds one drainage basin. The GIL is
+    released, so other threads can work on other basins at the same time.
+    """
+    cdef int n_basins = basin_ranges.shape[0]
+    cdef int n_cols = values.shape[1]
+    cdef int basin, i, col, donor, recvr
+
+    with nogil:
+        for basin in range(n_basins):
+            for i in range(basin_ranges[basin, 1] - 1,
+                           basin_ranges[basin, 0] - 1, -1):
+                donor = s[i]
+                recvr = r[donor]
+                if donor != recvr:
+                    for col in range(n_cols):
+                        values[recvr, col] += values[donor, col]
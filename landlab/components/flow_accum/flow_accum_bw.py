@@ -22,14 +22,31 @@ If you simply want the ordered list by itself, use::
 
     s = make_ordered_node_array(r, b)
 
+To accumulate several runoff fields at once over an existing ordering, use::
+
+    q = find_discharge_ensemble(s, r, runoff)
+
+Each baselevel node heads an independent drainage basin, which occupies a
+contiguous section of s. Given *n_threads* > 1, accumulation is split into
+groups of basins of similar total size (see partition_stack_by_basin) that
+are worked on in parallel threads.
+
 Created: GT Nov 2013
 """
+import heapq
+import threading
+
 from six.moves import range
-from .cfuncs import _add_to_stack
+from .cfuncs import _add_to_stack, _accumulate_bw, _accumulate_bw_basins
 
 import numpy
 
 
+# basins holding more than 1 / (_LARGE_BASIN_FRACTION * n_partitions) of
+# the nodes are placed one at a time when partitioning the stack
+_LARGE_BASIN_FRACTION = 10
+
+
 class _DrainageStack():
     """
     The _DrainageStack() class implements Braun & Willett's add_to_stack
@@ -224,7 +241,7 @@ def make_ordered_node_array(receiver_nodes, baselevel_nodes):
 
 
 def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
-                                     boundary_nodes=None):
+                                     boundary_nodes=None, n_threads=1):
     """Calculate the drainage area and water discharge at each node.
 
     Parameters
@@ -239,6 +256,8 @@ def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
     runoff : float or ndarray
         Local runoff rate at each cell (in water depth per time). If it's an
         array, must have same length as s (that is, the number of nodes).
+    n_threads : int, optional
+        Number of threads over which to split the drainage basins.
 
     Returns
     -------
@@ -288,19 +307,192 @@ def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
         discharge[boundary_nodes] = 0
 
     # Iterate backward through the list, which means we work from upstream to
-    # downstream.
-    for i in range(np-1, -1, -1):
-        donor = s[i]
-        recvr = r[donor]
-        if donor != recvr:
-            drainage_area[recvr] += drainage_area[donor]
-            discharge[recvr] += discharge[donor]
+    # downstream. Both arrays are accumulated in the same pass.
+    accumulated = numpy.column_stack((drainage_area, discharge)).astype(float)
+    _accumulate(s, r, accumulated, n_threads=n_threads)
+    drainage_area[:] = accumulated[:, 0]
+    discharge[:] = accumulated[:, 1]
 
     return drainage_area, discharge
 
 
+def find_discharge_ensemble(s, r, runoff, node_cell_area=1.0,
+                            boundary_nodes=None, n_threads=1):
+    """Calculate discharge at each node for each of several runoff fields.
+
+    All ensemble members are accumulated in a single pass over the stack,
+    so a flow routing can be reused for many runoff fields without
+    finding flow directions or ordering the nodes again.
+
+    Parameters
+    ----------
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs
+    r : ndarray of int
+        Receiver IDs for each node
+    runoff : ndarray of float, shape (n_nodes, n_members)
+        Local runoff rate at each cell (in water depth per time), with one
+        column for each ensemble member.
+    node_cell_area : float or ndarray
+        Cell surface areas for each node. If it's an array, must have same
+        length as s (that is, the number of nodes).
+    boundary_nodes : ndarray of int, optional
+        Nodes at which to zero the discharge.
+    n_threads : int, optional
+        Number of threads over which to split the drainage basins.
+
+    Returns
+    -------
+    ndarray of float, shape (n_nodes, n_members)
+        Discharge at each node for each ensemble member.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum import find_discharge_ensemble
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8])-1
+    >>> s = np.array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+    >>> runoff = np.ones((10, 3))
+    >>> runoff[:, 1] = 2.
+    >>> runoff[0, 2] = 5.
+    >>> find_discharge_ensemble(s, r, runoff)
+    array([[  1.,   2.,   5.],
+           [  3.,   6.,   7.],
+           [  1.,   2.,   1.],
+           [  1.,   2.,   1.],
+           [ 10.,  20.,  14.],
+           [  4.,   8.,   4.],
+           [  3.,   6.,   3.],
+           [  2.,   4.,   2.],
+           [  1.,   2.,   1.],
+           [  1.,   2.,   1.]])
+    """
+    runoff = numpy.asarray(runoff, dtype=float)
+    runoff = runoff.reshape((len(s), -1))
+    node_cell_area = numpy.broadcast_to(node_cell_area, (len(s), ))
+
+    discharge = runoff * node_cell_area.reshape((-1, 1))
+    if boundary_nodes is not None:
+        discharge[boundary_nodes] = 0.
+
+    _accumulate(s, r, discharge, n_threads=n_threads)
+
+    return discharge
+
+
+def partition_stack_by_basin(s, r, n_partitions):
+    """Split a stack into groups of whole drainage basins of similar size.
+
+    Every node that is its own receiver starts a new drainage basin, which
+    runs up to the start of the next one. The largest basins are handed out
+    first, each to whichever group holds the fewest nodes so far. The
+    (usually many) small basins that are left then fill each group up to an
+    equal share of the nodes.
+
+    Parameters
+    ----------
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs
+    r : ndarray of int
+        Receiver IDs for each node
+    n_partitions : int
+        Number of groups to make.
+
+    Returns
+    -------
+    list of ndarray of int, shape (n_basins, 2)
+        For each group, the start and end (exclusive) of each of its basins
+        in the stack, in stack order. Groups may be empty.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum import partition_stack_by_basin
+    >>> r = np.array([0, 0, 1, 3, 3, 5])
+    >>> s = np.array([0, 1, 2, 3, 4, 5])
+    >>> partition_stack_by_basin(s, r, 2)
+    [array([[0, 3]]), array([[3, 5],
+           [5, 6]])]
+    """
+    s = numpy.asarray(s, dtype=int)
+    starts = numpy.flatnonzero(numpy.asarray(r)[s] == s)
+    ends = numpy.append(starts[1:], len(s))
+    sizes = ends - starts
+
+    by_size = numpy.argsort(- sizes, kind='mergesort')
+    n_large = numpy.count_nonzero(
+        sizes > len(s) // (_LARGE_BASIN_FRACTION * n_partitions))
+
+    group_of_basin = numpy.empty(len(starts), dtype=int)
+    groups = [(0, group) for group in range(n_partitions)]
+    for basin in by_size[:n_large]:
+        (size, group) = heapq.heappop(groups)
+        group_of_basin[basin] = group
+        heapq.heappush(groups, (size + sizes[basin], group))
+
+    loads = numpy.zeros(n_partitions, dtype=int)
+    for (size, group) in groups:
+        loads[group] = size
+    shortfall = (len(s) / float(n_partitions) - loads).clip(0.)
+    small_basins = by_size[n_large:]
+    filled_before = numpy.cumsum(sizes[small_basins]) - sizes[small_basins]
+    group_of_basin[small_basins] = numpy.searchsorted(
+        numpy.cumsum(shortfall)[:-1], filled_before, side='right')
+
+    return [numpy.column_stack((starts[in_group], ends[in_group]))
+            for in_group in (group_of_basin == group
+                             for group in range(n_partitions))]
+
+
+def _accumulate(s, r, values, n_threads=1):
+    """Accumulate the columns of values downstream, in place."""
+    s = numpy.asarray(s, dtype=int)
+    r = numpy.asarray(r, dtype=int)
+    if n_threads > 1:
+        run_on_basins(_accumulate_bw_basins,
+                      partition_stack_by_basin(s, r, n_threads), s, r, values)
+    else:
+        _accumulate_bw(s, r, values)
+
+
+def run_on_basins(func, partitions, *args):
+    """Run a function on groups of drainage basins in parallel threads.
+
+    The function is called once for each (non-empty) group, as
+    ``func(*(args + (basin_ranges, )))``. It should release the GIL while
+    it works. Any error raised in a thread is raised again here once all
+    threads have finished.
+
+    Parameters
+    ----------
+    func : function
+        The function to run.
+    partitions : list of ndarray of int, shape (n_basins, 2)
+        Groups of basins, as from partition_stack_by_basin.
+    args : tuple
+        Arguments that come before the basin ranges in calls to func.
+    """
+    errors = []
+
+    def _run(basin_ranges):
+        try:
+            func(*(args + (basin_ranges, )))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=_run, args=(basin_ranges, ))
+               for basin_ranges in partitions if len(basin_ranges) > 0]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
 def flow_accumulation(receiver_nodes, baselevel_nodes, node_cell_area=1.0,
-                      runoff_rate=1.0, boundary_nodes=None):
+                      runoff_rate=1.0, boundary_nodes=None, n_threads=1):
     """Calculate drainage area and (steady) discharge.
 
     Calculates and returns the drainage area and (steady) discharge at each
@@ -327,7 +519,8 @@ def flow_accumulation(receiver_nodes, baselevel_nodes, node_cell_area=1.0,
     #problem as part of route_flow_dn.
 
     a, q = find_drainage_area_and_discharge(s, receiver_nodes, node_cell_area,
-                                            runoff_rate, boundary_nodes)
+                                            runoff_rate, boundary_nodes,
+                                            n_threads=n_threads)
 
     return a, q, s
 
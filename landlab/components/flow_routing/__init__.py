@@ -1,6 +1,9 @@
 from .route_flow_dn import FlowRouter
 from .lake_mapper import DepressionFinderAndRouter
-from .flow_direction_DN import grid_flow_directions, flow_directions
+from .flow_direction_DN import (grid_flow_directions, flow_directions,
+                                active_link_stencil,
+                                flow_directions_on_stencil)
 
 __all__ = ['FlowRouter', 'DepressionFinderAndRouter', 'grid_flow_directions',
-           'flow_directions']
+           'flow_directions', 'active_link_stencil',
+           'flow_directions_on_stencil']
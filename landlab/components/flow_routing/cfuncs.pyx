@@ -6,6 +6,10 @@ cimport cython
 DTYPE_FLOAT = np.double
 ctypedef np.double_t DTYPE_FLOAT_t
 
+ctypedef fused DTYPE_REAL_t:
+    np.float32_t
+    np.float64_t
+
 DTYPE_INT = np.int
 #ctypedef np.longlong_t DTYPE_INT_t
 ctypedef np.int_t DTYPE_INT_t
@@ -14,14 +18,17 @@ ctypedef np.int_t DTYPE_INT_t
 @cython.boundscheck(False)
 def adjust_flow_receivers(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                           np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
-                          np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
-                          np.ndarray[DTYPE_FLOAT_t, ndim=1] link_slope,
+                          np.ndarray[DTYPE_REAL_t, ndim=1] z,
+                          np.ndarray[DTYPE_REAL_t, ndim=1] link_slope,
                           np.ndarray[DTYPE_INT_t, ndim=1] active_links,
                           np.ndarray[DTYPE_INT_t, ndim=1] receiver,
                           np.ndarray[DTYPE_INT_t, ndim=1] receiver_link,
-                          np.ndarray[DTYPE_FLOAT_t, ndim=1] steepest_slope):
+                          np.ndarray[DTYPE_REAL_t, ndim=1] steepest_slope):
     """Adjust flow receivers based on link slopes and steepest gradients.
 
+    Elevations, link slopes and steepest slopes must all be of the same
+    floating point type, either single or double precision.
+
     Parameters
     ----------
     src_nodes : array_like
@@ -55,3 +62,56 @@ def adjust_flow_receivers(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
             receiver[dst_id] = src_id
             steepest_slope[dst_id] = - link_slope[i]
             receiver_link[dst_id] = active_links[i]
+
+
+@cython.boundscheck(False)
+def find_steepest_receivers(np.ndarray[DTYPE_REAL_t, ndim=1] z,
+                            np.ndarray[DTYPE_INT_t, ndim=2] neighbors,
+                            np.ndarray[DTYPE_INT_t, ndim=2] links,
+                            np.ndarray[DTYPE_FLOAT_t, ndim=2] lengths,
+                            np.ndarray[DTYPE_INT_t, ndim=1] receiver,
+                            np.ndarray[DTYPE_INT_t, ndim=1] receiver_link,
+                            np.ndarray[DTYPE_REAL_t, ndim=1] steepest_slope):
+    """Find the steepest downhill neighbor of every node.
+
+    Each row of the stencil holds the neighbors of a node that are joined
+    to it by an active link, padded with -1. Neighbors are tried in the
+    order given, and a later neighbor only replaces an earlier one if it is
+    strictly steeper.
+
+    Parameters
+    ----------
+    z : array_like
+        Node elevations.
+    neighbors : array_like of int, shape (n_nodes, n_neighbors)
+        Neighbors of each node, or -1.
+    links : array_like of int, shape (n_nodes, n_neighbors)
+        Link to each neighbor.
+    lengths : array_like of float, shape (n_nodes, n_neighbors)
+        Length of the link to each neighbor.
+    receiver : array_like
+        Flow-receiver node IDs, initially the nodes themselves.
+    receiver_link : array_like
+        Flow-receiver link IDs, initially -1.
+    steepest_slope : array_like
+        Gradient of steepest descent from nodes, initially zero.
+    """
+    cdef int n_nodes = neighbors.shape[0]
+    cdef int n_neighbors = neighbors.shape[1]
+    cdef int node
+    cdef int i
+    cdef int neighbor
+    cdef DTYPE_REAL_t slope
+
+    for node in range(n_nodes):
+        for i in range(n_neighbors):
+            neighbor = neighbors[node, i]
+            if neighbor == -1:
+                break
+            if z[node] > z[neighbor]:
+                slope = ((z[node] - z[neighbor]) /
+                         <DTYPE_REAL_t>lengths[node, i])
+                if slope > steepest_slope[node]:
+                    receiver[node] = neighbor
+                    steepest_slope[node] = slope
+                    receiver_link[node] = links[node, i]
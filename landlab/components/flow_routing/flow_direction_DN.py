@@ -178,7 +178,8 @@ def flow_directions(elev, active_links, tail_node, head_node, link_slope,
     """
     # Setup
     num_nodes = len(elev)
-    steepest_slope = np.zeros(num_nodes)
+    dtype = np.result_type(np.asarray(elev).dtype, np.float32)
+    steepest_slope = np.zeros(num_nodes, dtype=dtype)
     receiver = np.arange(num_nodes)
     receiver_link = UNDEFINED_INDEX + np.zeros(num_nodes, dtype=np.int)
 
@@ -201,6 +202,7 @@ def flow_directions(elev, active_links, tail_node, head_node, link_slope,
     if method == 'cython':
         from .cfuncs import adjust_flow_receivers
 
+        link_slope = np.asarray(link_slope, dtype=dtype)
         adjust_flow_receivers(tail_node, head_node, elev, link_slope,
                               active_links, receiver, receiver_link,
                               steepest_slope)
@@ -260,6 +262,155 @@ def flow_directions(elev, active_links, tail_node, head_node, link_slope,
     return receiver, steepest_slope, sink, receiver_link
 
 
+def active_link_stencil(num_nodes, active_links, tail_node, head_node,
+                        link_lengths):
+    """Neighbors of each node across active links.
+
+    The stencil lists, for each node, every node joined to it by one of the
+    given links along with the link and its length. Neighbors are listed in
+    the order of the links, so that :func:`flow_directions_on_stencil`
+    breaks ties between equally steep neighbors in the same way as
+    :func:`flow_directions`. The stencil only depends on the grid and its
+    boundary conditions, so it can be kept between calls.
+
+    Parameters
+    ----------
+    num_nodes : int
+        Number of nodes.
+    active_links : array_like
+        IDs of active links.
+    tail_node : array_like
+        IDs of the tail node for each link.
+    head_node : array_like
+        IDs of the head node for each link.
+    link_lengths : array_like
+        Length of each link.
+
+    Returns
+    -------
+    tuple of ndarray, each of shape (num_nodes, max_neighbors)
+        Neighbor node IDs, link IDs and link lengths. Rows are padded with
+        -1 (node and link IDs) and 0 (lengths).
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_routing import active_link_stencil
+    >>> (neighbors, links, lengths) = active_link_stencil(
+    ...     4, np.array([3, 5, 6]), np.array([0, 1, 1]), np.array([1, 2, 3]),
+    ...     np.array([1., 2., 3.]))
+    >>> neighbors
+    array([[ 1, -1, -1],
+           [ 0,  2,  3],
+           [ 1, -1, -1],
+           [ 1, -1, -1]])
+    >>> links
+    array([[ 3, -1, -1],
+           [ 3,  5,  6],
+           [ 5, -1, -1],
+           [ 6, -1, -1]])
+    >>> lengths
+    array([[ 1.,  0.,  0.],
+           [ 1.,  2.,  3.],
+           [ 2.,  0.,  0.],
+           [ 3.,  0.,  0.]])
+    """
+    n_links = len(active_links)
+    nodes = np.concatenate((tail_node, head_node))
+    order = np.lexsort((np.tile(np.arange(n_links), 2), nodes))
+    nodes = nodes[order]
+
+    n_neighbors = np.bincount(nodes, minlength=num_nodes)
+    offset = np.cumsum(n_neighbors) - n_neighbors
+    column = np.arange(len(nodes)) - offset[nodes]
+    width = max(n_neighbors.max(), 1) if num_nodes > 0 else 1
+
+    neighbors = np.full((num_nodes, width), -1, dtype=int)
+    links = np.full((num_nodes, width), -1, dtype=int)
+    lengths = np.zeros((num_nodes, width), dtype=float)
+    neighbors[nodes, column] = np.concatenate((head_node, tail_node))[order]
+    links[nodes, column] = np.tile(active_links, 2)[order]
+    lengths[nodes, column] = np.tile(link_lengths, 2)[order]
+
+    return neighbors, links, lengths
+
+
+def flow_directions_on_stencil(elev, neighbors, links, lengths,
+                               baselevel_nodes=None):
+    """Find flow directions using a stencil of neighbors.
+
+    Gives the same result as :func:`flow_directions`, but visits each node
+    once in a compiled loop over the neighbors found by
+    :func:`active_link_stencil`, rather than finding link slopes first.
+
+    Parameters
+    ----------
+    elev : array_like
+        Elevations at nodes.
+    neighbors, links, lengths : ndarray
+        Stencil of neighbors from :func:`active_link_stencil`.
+    baselevel_nodes : array_like, optional
+        IDs of open boundary (baselevel) nodes.
+
+    Returns
+    -------
+    receiver : ndarray
+        For each node, the ID of the node that receives its flow. Defaults to
+        the node itself if no other receiver is assigned.
+    steepest_slope : ndarray
+        The slope value (positive downhill) in the direction of flow
+    sink : ndarray
+        IDs of nodes that are flow sinks (they are their own receivers)
+    receiver_link : ndarray
+        ID of link that leads from each node to its receiver, or
+        UNDEFINED_INDEX if none.
+
+    Examples
+    --------
+    The example below is the Braun and Willett (2012) network used by
+    :func:`flow_directions`.
+
+    >>> import numpy as np
+    >>> from landlab.components.flow_routing import (
+    ...     active_link_stencil, flow_directions_on_stencil)
+    >>> z = np.array([2.4, 1.0, 2.2, 3.0, 0.0, 1.1, 2.0, 2.3, 3.1, 3.2])
+    >>> fn = np.array([1,4,4,0,1,2,5,1,5,6,7,7,8,6,3,3,2,0])
+    >>> tn = np.array([4,5,7,1,2,5,6,5,7,7,8,9,9,8,8,6,3,3])
+    >>> stencil = active_link_stencil(10, np.arange(len(fn)), fn, tn,
+    ...                               np.ones(len(fn)))
+    >>> r, ss, snk, rl = flow_directions_on_stencil(z, *stencil)
+    >>> r
+    array([1, 4, 1, 6, 4, 4, 5, 4, 6, 7])
+    >>> ss
+    array([ 1.4,  1. ,  1.2,  1. ,  0. ,  1.1,  0.9,  2.3,  1.1,  0.9])
+    >>> snk
+    array([4])
+    >>> rl[3:8]
+    array([15, -1,  1,  6,  2])
+    """
+    from .cfuncs import find_steepest_receivers
+
+    num_nodes = len(elev)
+    dtype = np.result_type(np.asarray(elev).dtype, np.float32)
+    elev = np.asarray(elev, dtype=dtype)
+    steepest_slope = np.zeros(num_nodes, dtype=dtype)
+    receiver = np.arange(num_nodes)
+    receiver_link = UNDEFINED_INDEX + np.zeros(num_nodes, dtype=int)
+
+    find_steepest_receivers(elev, neighbors, links, lengths, receiver,
+                            receiver_link, steepest_slope)
+
+    if baselevel_nodes is not None:
+        receiver[baselevel_nodes] = baselevel_nodes
+        receiver_link[baselevel_nodes] = UNDEFINED_INDEX
+        steepest_slope[baselevel_nodes] = 0.
+
+    (sink, ) = np.where(receiver == np.arange(num_nodes))
+    sink = as_id_array(sink)
+
+    return receiver, steepest_slope, sink, receiver_link
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod()
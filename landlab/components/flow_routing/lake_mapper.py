@@ -10,6 +10,7 @@ import numpy as np
 from landlab import (ModelParameterDictionary, Component, FieldError,
                      FIXED_VALUE_BOUNDARY, CLOSED_BOUNDARY, CORE_NODE)
 from landlab.core.utils import as_id_array
+from landlab.utils.decorators import skip_if_fields_unchanged
 from landlab.core.model_parameter_dictionary import MissingKeyError
 from landlab.components.flow_accum import flow_accum_bw
 from landlab.grid.base import BAD_INDEX_VALUE as LOCAL_BAD_INDEX_VALUE
@@ -22,6 +23,12 @@ _PIT = 1
 _CURRENT_LAKE = 2
 _FLOODED = 3
 
+# Flow-routing fields that are changed when flow is routed across lakes
+_REROUTED_FIELDS = ('flow__receiver_node', 'flow__sink_flag',
+                    'topographic__steepest_slope', 'drainage_area',
+                    'surface_water__discharge', 'flow__upstream_node_order',
+                    'flow__link_to_receiver_node')
+
 use_cfuncs = True
 
 
@@ -167,7 +174,7 @@ class DepressionFinderAndRouter(Component):
             'otherwise BAD_INDEX_VALUE'
     }
 
-    def __init__(self, grid, routing='D8', **kwds):
+    def __init__(self, grid, routing='D8', skip_unchanged=False, **kwds):
         """Create a DepressionFinderAndRouter.
 
         Constructor assigns a copy of the grid, sets the current time, and
@@ -181,8 +188,13 @@ class DepressionFinderAndRouter(Component):
             If grid is a raster type, controls whether lake connectivity can
             occur on diagonals ('D8', default), or only orthogonally ('D4').
             Has no effect if grid is not a raster.
+        skip_unchanged : bool, optional
+            If True, only map depressions if the elevations, the flow
+            routing, or the boundary conditions have changed since they
+            were last mapped.
         """
         self._grid = grid
+        self.skip_unchanged = skip_unchanged
         self._bc_set_code = self.grid.bc_set_code
         if routing is not 'D8':
             assert routing is 'D4'
@@ -852,6 +864,8 @@ class DepressionFinderAndRouter(Component):
                                             )[self._unique_pits]
 
 
+    @skip_if_fields_unchanged('topographic__elevation', 'flow__sink_flag',
+                              'flow__receiver_node')
     def map_depressions(self, pits='flow__sink_flag', reroute_flow=True):
         """Map depressions/lakes in a topographic surface.
 
@@ -943,6 +957,9 @@ class DepressionFinderAndRouter(Component):
             self.grads = self._grid.at_node['topographic__steepest_slope']
             self._route_flow()
             self._reaccumulate_flow()
+            for name in _REROUTED_FIELDS:
+                if name in self._grid.at_node:
+                    self._grid.mark_modified('node', name)
 
 
     def _find_unresolved_neighbors(self, nbrs, receivers):
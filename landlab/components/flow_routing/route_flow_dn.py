@@ -21,7 +21,9 @@ from landlab import FieldError, Component
 from landlab import FIXED_VALUE_BOUNDARY, FIXED_GRADIENT_BOUNDARY
 from landlab import ModelParameterDictionary
 from landlab import RasterModelGrid, VoronoiDelaunayGrid  # for type tests
-from landlab.utils.decorators import use_file_name_or_kwds
+from landlab.grid.structured_quad import links as squad_links
+from landlab.utils.decorators import (use_file_name_or_kwds,
+                                      skip_if_fields_unchanged)
 import numpy
 
 
@@ -42,7 +44,8 @@ class FlowRouter(Component):
 
     Construction::
 
-        FlowRouter(grid, method='D8', runoff_rate=None)
+        FlowRouter(grid, method='D8', runoff_rate=None, skip_unchanged=False,
+                   n_threads=1)
 
     Parameters
     ----------
@@ -57,6 +60,14 @@ class FlowRouter(Component):
         'water__unit_flux_in'. If both the field and argument are present at
         the time of initialization, runoff_rate will *overwrite* the field.
         If neither are set, defaults to spatially constant unit input.
+    skip_unchanged : bool, optional
+        If True, only route flow if the input fields or boundary conditions
+        have changed since flow was last routed. Elevations changed in place
+        must then be marked as modified with the grid's *mark_modified*
+        method.
+    n_threads : int, optional
+        If greater than 1, accumulate drainage area and discharge over this
+        many threads, each working on a group of whole drainage basins.
     """
 
     _name = 'DNFlowRouter'
@@ -119,9 +130,12 @@ class FlowRouter(Component):
     }
 
     @use_file_name_or_kwds
-    def __init__(self, grid, method='D8', runoff_rate=None, **kwds):
+    def __init__(self, grid, method='D8', runoff_rate=None,
+                 skip_unchanged=False, n_threads=1, **kwds):
         # We keep a local reference to the grid
         self._grid = grid
+        self.skip_unchanged = skip_unchanged
+        self._n_threads = n_threads
         self._bc_set_code = self.grid.bc_set_code
         if method in ('D8', 'D4', None):
             self.method = method
@@ -148,10 +162,10 @@ class FlowRouter(Component):
             grid.at_node['water__unit_flux_in']
         except FieldError:
             if runoff_rate is None:
-                grid.add_ones('node', 'water__unit_flux_in', dtype=float)
+                grid.add_ones('node', 'water__unit_flux_in')
             else:
                 if type(runoff_rate) in (float, int):
-                    grid.add_empty('node', 'water__unit_flux_in', dtype=float)
+                    grid.add_empty('node', 'water__unit_flux_in')
                     grid.at_node['water__unit_flux_in'].fill(runoff_rate)
                 else:
                     grid.at_node['water__unit_flux_in'] = runoff_rate
@@ -184,8 +198,7 @@ class FlowRouter(Component):
         #   - drainage area at each node
         #   - receiver of each node
         try:
-            self.drainage_area = grid.add_zeros('drainage_area', at='node',
-                                                dtype=float)
+            self.drainage_area = grid.add_zeros('drainage_area', at='node')
         except FieldError:
             self.drainage_area = grid.at_node['drainage_area']
         try:
@@ -195,12 +208,12 @@ class FlowRouter(Component):
             self.receiver = grid.at_node['flow__receiver_node']
         try:
             self.steepest_slope = grid.add_zeros(
-                'topographic__steepest_slope', at='node', dtype=float)
+                'topographic__steepest_slope', at='node')
         except FieldError:
             self.steepest_slope = grid.at_node['topographic__steepest_slope']
         try:
-            self.discharges = grid.add_zeros('surface_water__discharge', at='node',
-                                             dtype=float)
+            self.discharges = grid.add_zeros('surface_water__discharge',
+                                             at='node')
         except FieldError:
             self.discharges = grid.at_node['surface_water__discharge']
         try:
@@ -236,6 +249,39 @@ class FlowRouter(Component):
             self._activelink_tail = self.grid.node_at_link_tail[self.grid.active_links]
             self._activelink_head = self.grid.node_at_link_head[self.grid.active_links]
 
+        # None of the following change unless the boundary conditions do, so
+        # find them once here rather than on every call to route_flow
+        self._stencil_method = self.method
+        if self.method == 'D8':
+            num_d4_active = self._grid.number_of_active_links
+            link_lengths = numpy.empty(len(self._active_links), dtype=float)
+            d4_lengths = link_lengths[:num_d4_active]
+            d4_lengths.fill(self._grid.dx)
+            d4_lengths[squad_links.is_vertical_link(
+                self._grid.shape,
+                self._active_links[:num_d4_active])] = self._grid.dy
+            link_lengths[num_d4_active:] = numpy.sqrt(
+                self._grid.dy ** 2. + self._grid.dx ** 2.)
+            self._stencil = flow_direction_DN.active_link_stencil(
+                self._grid.number_of_nodes, self._active_links,
+                self._activelink_tail, self._activelink_head, link_lengths)
+        else:
+            active_links = self._grid.active_links
+            self._stencil = flow_direction_DN.active_link_stencil(
+                self._grid.number_of_nodes, active_links,
+                self._grid.node_at_link_tail[active_links],
+                self._grid.node_at_link_head[active_links],
+                self._grid.length_of_link[active_links])
+
+        (self._baselevel_nodes, ) = numpy.where(
+            numpy.logical_or(self._grid.status_at_node == FIXED_VALUE_BOUNDARY,
+                             self._grid.status_at_node == FIXED_GRADIENT_BOUNDARY))
+
+        # closed cells can't contribute
+        self._node_cell_area = self._grid.cell_area_at_node.copy()
+        self._node_cell_area[self._grid.closed_boundary_nodes] = 0.
+
+    @skip_if_fields_unchanged()
     def route_flow(self, **kwds):
         """Route surface-water flow over a landscape.
 
@@ -325,7 +371,8 @@ class FlowRouter(Component):
             if not self._is_raster:
                 self.method = None
 
-        if self._bc_set_code != self.grid.bc_set_code:
+        if (self._bc_set_code != self.grid.bc_set_code or
+                self._stencil_method != self.method):
             self.updated_boundary_conditions()
             self._bc_set_code = self.grid.bc_set_code
 
@@ -333,40 +380,13 @@ class FlowRouter(Component):
         # 'topographic__elevation'
         elevs = self._grid['node']['topographic__elevation']
 
-        node_cell_area = self._grid.cell_area_at_node.copy()
-        node_cell_area[self._grid.closed_boundary_nodes] = 0.
-        # closed cells can't contribute
+        node_cell_area = self._node_cell_area
 
-        # Calculate the downhill-positive slopes at the d8 active links
-        if self.method == 'D8':
-            link_slope = - self._grid._calculate_gradients_at_d8_active_links(
-                elevs)
-        else:
-            link_slope = - self._grid.calc_grad_of_active_link(
-                elevs)
-
-        # Find the baselevel nodes
-        (baselevel_nodes, ) = numpy.where(
-            numpy.logical_or(self._grid.status_at_node == FIXED_VALUE_BOUNDARY,
-                             self._grid.status_at_node == FIXED_GRADIENT_BOUNDARY))
-
-        # Calculate flow directions
-        if self.method == 'D4':
-            num_d4_active = self._grid.number_of_active_links  # only d4
-            receiver, steepest_slope, sink, recvr_link = \
-                flow_direction_DN.flow_directions(elevs, self._active_links,
-                                         self._activelink_tail[:num_d4_active],
-                                         self._activelink_head[:num_d4_active],
-                                         link_slope,
-                                         grid=self._grid,
-                                         baselevel_nodes=baselevel_nodes)
-        else:  # Voronoi or D8
-            receiver, steepest_slope, sink, recvr_link = \
-                flow_direction_DN.flow_directions(elevs, self._active_links,
-                                     self._activelink_tail,
-                                     self._activelink_head, link_slope,
-                                     grid=self._grid,
-                                     baselevel_nodes=baselevel_nodes)
+        # Calculate flow directions, looking at the neighbors of every node
+        # across its active (D8 or D4) links
+        receiver, steepest_slope, sink, recvr_link = \
+            flow_direction_DN.flow_directions_on_stencil(
+                elevs, *self._stencil, baselevel_nodes=self._baselevel_nodes)
 
         # TODO: either need a way to calculate and return the *length* of the
         # flow links, OR the caller has to handle the raster / non-raster case.
@@ -374,7 +394,8 @@ class FlowRouter(Component):
         # Calculate drainage area, discharge, and ...
         a, q, s = flow_accum_bw.flow_accumulation(
             receiver, sink, node_cell_area=node_cell_area,
-            runoff_rate=self._grid.at_node['water__unit_flux_in'])
+            runoff_rate=self._grid.at_node['water__unit_flux_in'],
+            n_threads=self._n_threads)
 
         # added DEJH March 2014:
         # store the generated data in the grid
@@ -384,12 +405,69 @@ class FlowRouter(Component):
         self._grid['node']['surface_water__discharge'][:] = q
         self._grid['node']['flow__upstream_node_order'][:] = s
         self._grid['node']['flow__link_to_receiver_node'][:] = recvr_link
-        self._grid['node']['flow__sink_flag'][:] = numpy.zeros_like(receiver,
-                                                                    dtype=bool)
+        self._grid['node']['flow__sink_flag'].fill(False)
         self._grid['node']['flow__sink_flag'][sink] = True
 
         return self._grid
 
+    def route_runoff_ensemble(self, runoff):
+        """Accumulate discharge for several runoff fields at once.
+
+        Reuses the receivers and node ordering found by the last call to
+        :func:`route_flow` (or :func:`run_one_step`), so flow directions are
+        not found again. Every ensemble member is accumulated in a single
+        pass over the node ordering. No fields are changed.
+
+        Parameters
+        ----------
+        runoff : ndarray of float, shape (n_nodes, n_members)
+            Local runoff rate at each node, with one column for each
+            ensemble member.
+
+        Returns
+        -------
+        ndarray of float, shape (n_nodes, n_members)
+            Discharge at each node for each ensemble member.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components.flow_routing import FlowRouter
+        >>> mg = RasterModelGrid((5, 4), spacing=(10., 10))
+        >>> elev = np.array([0.,  0.,  0., 0.,
+        ...                  0., 21., 10., 0.,
+        ...                  0., 31., 20., 0.,
+        ...                  0., 32., 30., 0.,
+        ...                  0.,  0.,  0., 0.])
+        >>> _ = mg.add_field('node','topographic__elevation', elev)
+        >>> mg.set_closed_boundaries_at_grid_edges(True, True, True, False)
+        >>> fr = FlowRouter(mg)
+        >>> fr.run_one_step()
+        >>> runoff = np.column_stack((np.ones(mg.number_of_nodes),
+        ...                          np.arange(mg.number_of_nodes)))
+        >>> q = fr.route_runoff_ensemble(runoff)
+        >>> q[:, 0].reshape(mg.shape) # doctest: +NORMALIZE_WHITESPACE
+        array([[   0.,  100.,  500.,    0.],
+               [   0.,  100.,  500.,    0.],
+               [   0.,  100.,  300.,    0.],
+               [   0.,  100.,  100.,    0.],
+               [   0.,    0.,    0.,    0.]])
+        >>> q[:, 1].reshape(mg.shape) # doctest: +NORMALIZE_WHITESPACE
+        array([[    0.,   500.,  5200.,     0.],
+               [    0.,   500.,  5200.,     0.],
+               [    0.,   900.,  3700.,     0.],
+               [    0.,  1300.,  1400.,     0.],
+               [    0.,     0.,     0.,     0.]])
+        """
+        if self._bc_set_code != self.grid.bc_set_code:
+            self.updated_boundary_conditions()
+            self._bc_set_code = self.grid.bc_set_code
+        return flow_accum_bw.find_discharge_ensemble(
+            self._grid.at_node['flow__upstream_node_order'],
+            self._grid.at_node['flow__receiver_node'], runoff,
+            node_cell_area=self._node_cell_area, n_threads=self._n_threads)
+
     def run_one_step(self, **kwds):
         """Route surface-water flow over a landscape.
 
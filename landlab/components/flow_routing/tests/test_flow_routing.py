@@ -405,6 +405,98 @@ def test_internal_closed():
                               mg.at_node['topographic__steepest_slope'])
 
 
+def test_single_precision():
+    """Test routing on a single-precision grid matches double precision."""
+    fields = []
+    for dtype in (np.float32, np.float64):
+        mg = RasterModelGrid((5, 7), dtype=dtype)
+        z = mg.add_zeros('node', 'topographic__elevation')
+        z += mg.x_of_node + 0.5 * mg.y_of_node
+        z[mg.x_of_node == 0.] = -1.
+        fr = FlowRouter(mg)
+        fr.run_one_step()
+        assert_equal(mg.at_node['drainage_area'].dtype, dtype)
+        assert_equal(mg.at_node['topographic__steepest_slope'].dtype, dtype)
+        fields.append(mg.at_node)
+
+    assert_array_equal(fields[0]['flow__receiver_node'],
+                       fields[1]['flow__receiver_node'])
+    assert_array_almost_equal(fields[0]['drainage_area'],
+                              fields[1]['drainage_area'])
+    assert_array_almost_equal(fields[0]['topographic__steepest_slope'],
+                              fields[1]['topographic__steepest_slope'])
+
+
+def test_skip_unchanged():
+    """Test that routing is skipped if elevations are unchanged."""
+    mg = RasterModelGrid((5, 7))
+    z = mg.add_zeros('node', 'topographic__elevation')
+    z += mg.x_of_node + 0.5 * mg.y_of_node
+    fr = FlowRouter(mg, skip_unchanged=True)
+
+    fr.run_one_step()
+    version = mg.field_version('node', 'drainage_area')
+    fr.run_one_step()
+    assert_equal(mg.field_version('node', 'drainage_area'), version)
+
+    z[mg.core_nodes] = 10. - z[mg.core_nodes]
+    mg.mark_modified('node', 'topographic__elevation')
+    fr.run_one_step()
+    assert_true(mg.field_version('node', 'drainage_area') != version)
+
+    mg_all = RasterModelGrid((5, 7))
+    mg_all.add_field('node', 'topographic__elevation', z.copy())
+    FlowRouter(mg_all).run_one_step()
+    assert_array_equal(mg.at_node['flow__receiver_node'],
+                       mg_all.at_node['flow__receiver_node'])
+    assert_array_almost_equal(mg.at_node['drainage_area'],
+                              mg_all.at_node['drainage_area'])
+
+
+def test_skip_unchanged_boundary_conditions():
+    """Test that routing is redone if the boundary conditions change."""
+    mg = RasterModelGrid((5, 7))
+    z = mg.add_zeros('node', 'topographic__elevation')
+    z += mg.x_of_node
+    fr = FlowRouter(mg, skip_unchanged=True)
+    fr.run_one_step()
+    assert_almost_equal(mg.at_node['drainage_area'][7], 5.)
+
+    mg.set_closed_boundaries_at_grid_edges(False, False, True, False)
+    fr.run_one_step()
+    assert_almost_equal(mg.at_node['drainage_area'][7], 0.)
+
+
+def test_stencil_matches_link_slopes():
+    """Test flow directions on the cached stencil match those from links."""
+    from landlab.components.flow_routing import flow_directions
+
+    np.random.seed(1945)
+    mg = RasterModelGrid((12, 15), spacing=(2., 3.))
+    z = mg.add_field('node', 'topographic__elevation',
+                     np.random.randint(0, 4, mg.number_of_nodes) * 1.)
+    mg.status_at_node[np.random.randint(0, mg.number_of_nodes, 10)] = (
+        CLOSED_BOUNDARY)
+
+    for method in ('D8', 'D4'):
+        fr = FlowRouter(mg, method=method)
+        fr.run_one_step()
+        if method == 'D8':
+            (links, tails, heads) = mg._d8_active_links()
+            link_slope = - mg._calculate_gradients_at_d8_active_links(z)
+        else:
+            links = mg.active_links
+            (tails, heads) = (mg._activelink_fromnode, mg._activelink_tonode)
+            link_slope = - mg.calc_grad_at_link(z)[links]
+        (receiver, slope, _, link) = flow_directions(
+            z, links, tails, heads, link_slope,
+            baselevel_nodes=np.where(mg.status_at_node == 1)[0])
+
+        assert_array_equal(mg.at_node['flow__receiver_node'], receiver)
+        assert_array_equal(mg.at_node['topographic__steepest_slope'], slope)
+        assert_array_equal(mg.at_node['flow__link_to_receiver_node'], link)
+
+
 @with_setup(setup_voronoi)
 def test_voronoi():
     """Test routing on a (radial) voronoi."""
@@ -426,3 +518,24 @@ def test_voronoi_closedinternal():
     assert_array_almost_equal(vmg.at_node['drainage_area'][vmg.core_nodes],
                               A_target_internal)
     assert_almost_equal(vmg.at_node['drainage_area'][12], A_target_outlet)
+
+
+def test_runoff_ensemble():
+    """Test an ensemble of runoff fields matches routing each in turn."""
+    np.random.seed(1945)
+    mg = RasterModelGrid((20, 30), 10.)
+    mg.add_field('node', 'topographic__elevation',
+                 np.random.rand(mg.number_of_nodes) + 0.01 * mg.node_x)
+    mg.status_at_node[mg.nodes_at_top_edge] = CLOSED_BOUNDARY
+    runoff = np.random.rand(mg.number_of_nodes, 4)
+
+    fr = FlowRouter(mg)
+    fr.run_one_step()
+    discharge = fr.route_runoff_ensemble(runoff)
+    assert_equal(discharge.shape, (mg.number_of_nodes, 4))
+
+    for member in range(4):
+        mg.at_node['water__unit_flux_in'][:] = runoff[:, member]
+        fr.run_one_step()
+        assert_array_almost_equal(discharge[:, member],
+                                  mg.at_node['surface_water__discharge'])
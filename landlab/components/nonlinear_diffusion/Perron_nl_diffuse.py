@@ -358,7 +358,10 @@ class PerronNLDiffuse(Component):
                 self.right_interior_IDs, :][:, self.right_mask])
 
     def _initialize(self, grid, input_stream):
-        inputs = ModelParameterDictionary(input_stream)
+        if isinstance(input_stream, ModelParameterDictionary):
+            inputs = input_stream
+        else:
+            inputs = ModelParameterDictionary(input_stream)
         self.inputs = inputs
         self.grid = grid
 
@@ -0,0 +1,481 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from libc.math cimport sqrt, fabs, pow
+
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_UINT8 = np.uint8
+ctypedef np.uint8_t DTYPE_UINT8_t
+
+cdef double _SEVEN_OVER_THREE = 7.0 / 3.0
+
+
+@cython.cdivision(True)
+cdef inline double _calc_discharge(double q, double q_nbrs, double h_link,
+                                   double slope, double mannings_n,
+                                   double theta, double g, double dt):
+    """Discharge from the de Almeida momentum equation."""
+    return (
+        (theta * q + (1. - theta) / 2. * q_nbrs - g * h_link * dt * slope) /
+        (1. + g * dt * mannings_n * mannings_n * fabs(q) /
+         pow(h_link, _SEVEN_OVER_THREE)))
+
+
+@cython.cdivision(True)
+cdef inline double _limit_discharge(double q, double h_link, double g,
+                                    double dt, double dx):
+    """Limit discharge by the Froude and Courant numbers."""
+    cdef double speed = sqrt(g * h_link)
+    cdef double froude = q / h_link / speed
+    cdef int is_courant = fabs(q * dt / dx) > h_link / 4.
+
+    if q > 0.:
+        if is_courant:
+            return h_link * dx / 5. / dt
+        elif froude > 1.:
+            return h_link * speed
+    elif q < 0.:
+        if is_courant:
+            return - h_link * dx / 5. / dt
+        elif froude < -1.:
+            return - h_link * speed
+    return q
+
+
+@cython.cdivision(True)
+cdef inline double _limit_discharge_by_depth(double q, double h_tail,
+                                             double h_head, double length,
+                                             double dt):
+    """Limit discharge so a link drains at most a quarter of its source.
+
+    A node has at most four links, so however they are stepped the water
+    they take out of it in one step cannot exceed the water it holds.
+    """
+    cdef double q_max
+
+    if q > 0.:
+        q_max = max(h_tail, 0.) * length / (4. * dt)
+        if q > q_max:
+            return q_max
+    elif q < 0.:
+        q_max = max(h_head, 0.) * length / (4. * dt)
+        if q < - q_max:
+            return - q_max
+    return q
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def find_wet_links(np.ndarray[DTYPE_INT_t, ndim=1] wet_nodes,
+                   np.ndarray[DTYPE_INT_t, ndim=2] links_at_node,
+                   np.ndarray[DTYPE_INT_t, ndim=1] prev_wet_links,
+                   DTYPE_INT_t n_prev,
+                   np.ndarray[DTYPE_UINT8_t, ndim=1] is_marked,
+                   np.ndarray[DTYPE_INT_t, ndim=1] wet_links,
+                   np.ndarray[DTYPE_FLOAT_t, ndim=1] q):
+    """Find the links that touch wet nodes.
+
+    Links that were wet but are no longer are given zero discharge.
+
+    Parameters
+    ----------
+    wet_nodes : ndarray of int
+        Nodes that are wet.
+    links_at_node : ndarray of int, shape (n_nodes, 4)
+        Links at each node, with -1 for missing links.
+    prev_wet_links : ndarray of int
+        Links that were wet on the previous step.
+    n_prev : int
+        Number of links in *prev_wet_links*.
+    is_marked : ndarray of uint8
+        Work buffer of zeros, one per link. It is returned filled with zeros.
+    wet_links : ndarray of int
+        Buffer to hold the wet links.
+    q : ndarray of float
+        Discharge at links.
+
+    Returns
+    -------
+    int
+        The number of wet links.
+    """
+    cdef int n_wet_nodes = wet_nodes.shape[0]
+    cdef int n_links_per_node = links_at_node.shape[1]
+    cdef int n_wet = 0
+    cdef int i
+    cdef int j
+    cdef int link
+
+    for i in range(n_wet_nodes):
+        for j in range(n_links_per_node):
+            link = links_at_node[wet_nodes[i], j]
+            if link >= 0 and not is_marked[link]:
+                is_marked[link] = 1
+                wet_links[n_wet] = link
+                n_wet += 1
+
+    for i in range(n_prev):
+        link = prev_wet_links[i]
+        if not is_marked[link]:
+            q[link] = 0.
+
+    for i in range(n_wet):
+        is_marked[wet_links[i]] = 0
+
+    return n_wet
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def update_wet_links(np.ndarray[DTYPE_INT_t, ndim=1] wet_links,
+                     DTYPE_INT_t n_wet,
+                     np.ndarray[DTYPE_UINT8_t, ndim=1] is_active_link,
+                     np.ndarray[DTYPE_INT_t, ndim=1] node_at_link_tail,
+                     np.ndarray[DTYPE_INT_t, ndim=1] node_at_link_head,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] length_of_link,
+                     np.ndarray[DTYPE_INT_t, ndim=2] neighbors_at_link,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] mannings_n,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] h,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] h_links,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] slope,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] q,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] q_new,
+                     DTYPE_FLOAT_t theta,
+                     DTYPE_FLOAT_t g,
+                     DTYPE_FLOAT_t dt,
+                     DTYPE_FLOAT_t dx,
+                     int steep_slopes):
+    """Update flow depth, water-surface slope, and discharge at wet links.
+
+    This is the de Almeida momentum update of *OverlandFlow*, done only
+    for the wet links.
+
+    Parameters
+    ----------
+    wet_links : ndarray of int
+        Links to update.
+    n_wet : int
+        Number of links in *wet_links*.
+    is_active_link : ndarray of uint8
+        Flags that indicate if a link is active.
+    node_at_link_tail, node_at_link_head : ndarray of int
+        Nodes at link tails and heads.
+    length_of_link : ndarray of float
+        Length of each link.
+    neighbors_at_link : ndarray of int, shape (n_links, 2)
+        Parallel neighbors of each link, with -1 for no neighbor.
+    mannings_n : ndarray of float
+        Manning's roughness at each link.
+    z : ndarray of float
+        Elevation at nodes.
+    h : ndarray of float
+        Water depth at nodes.
+    h_links : ndarray of float
+        Water depth at links.
+    slope : ndarray of float
+        Water-surface gradient at links.
+    q : ndarray of float
+        Discharge at links.
+    q_new : ndarray of float
+        Work buffer, with one element per link.
+    theta : float
+        Weighting factor.
+    g : float
+        Acceleration due to gravity.
+    dt : float
+        Time step.
+    dx : float
+        Node spacing used in the Courant limit.
+    steep_slopes : int
+        If nonzero, limit discharge by the Froude and Courant numbers.
+    """
+    cdef int i
+    cdef int link
+    cdef int tail
+    cdef int head
+    cdef int nbr
+    cdef double w_tail
+    cdef double w_head
+    cdef double q_nbrs
+
+    for i in range(n_wet):
+        link = wet_links[i]
+        if is_active_link[link]:
+            tail = node_at_link_tail[link]
+            head = node_at_link_head[link]
+            w_tail = h[tail] + z[tail]
+            w_head = h[head] + z[head]
+            h_links[link] = max(w_tail, w_head) - max(z[tail], z[head])
+            slope[link] = (w_head - w_tail) / length_of_link[link]
+
+    for i in range(n_wet):
+        link = wet_links[i]
+
+        q_nbrs = 0.
+        nbr = neighbors_at_link[link, 0]
+        if nbr >= 0:
+            q_nbrs += q[nbr]
+        nbr = neighbors_at_link[link, 1]
+        if nbr >= 0:
+            q_nbrs += q[nbr]
+
+        q_new[i] = _calc_discharge(q[link], q_nbrs, h_links[link],
+                                   slope[link], mannings_n[link], theta, g,
+                                   dt)
+
+    for i in range(n_wet):
+        link = wet_links[i]
+        if steep_slopes:
+            q[link] = _limit_discharge(q_new[i], h_links[link], g, dt, dx)
+        else:
+            q[link] = q_new[i]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def update_depth_at_wet_nodes(np.ndarray[DTYPE_INT_t, ndim=1] wet_links,
+                              DTYPE_INT_t n_wet,
+                              np.ndarray[DTYPE_INT_t, ndim=1] node_at_link_tail,
+                              np.ndarray[DTYPE_INT_t, ndim=1] node_at_link_head,
+                              np.ndarray[DTYPE_FLOAT_t, ndim=1] length_of_link,
+                              np.ndarray[DTYPE_UINT8_t, ndim=1] is_core_node,
+                              np.ndarray[DTYPE_FLOAT_t, ndim=1] q,
+                              np.ndarray[DTYPE_FLOAT_t, ndim=1] h,
+                              DTYPE_FLOAT_t dt,
+                              DTYPE_FLOAT_t h_min,
+                              DTYPE_FLOAT_t h_reset):
+    """Update water depths at core nodes from discharge at wet links.
+
+    Parameters
+    ----------
+    wet_links : ndarray of int
+        Links with discharge.
+    n_wet : int
+        Number of links in *wet_links*.
+    node_at_link_tail, node_at_link_head : ndarray of int
+        Nodes at link tails and heads.
+    length_of_link : ndarray of float
+        Length of each link.
+    is_core_node : ndarray of uint8
+        Flags that indicate if a node is a core node.
+    q : ndarray of float
+        Discharge at links.
+    h : ndarray of float
+        Water depth at nodes.
+    dt : float
+        Time step.
+    h_min : float
+        Depths at nodes of wet links that fall below this value are
+        reset to *h_reset*.
+    h_reset : float
+        Depth to reset shallow nodes to.
+    """
+    cdef int i
+    cdef int link
+    cdef int node
+    cdef double dh
+
+    for i in range(n_wet):
+        link = wet_links[i]
+        dh = q[link] / length_of_link[link] * dt
+        node = node_at_link_tail[link]
+        if is_core_node[node]:
+            h[node] -= dh
+        node = node_at_link_head[link]
+        if is_core_node[node]:
+            h[node] += dh
+
+    for i in range(n_wet):
+        link = wet_links[i]
+        node = node_at_link_tail[link]
+        if h[node] < h_min:
+            h[node] = h_reset
+        node = node_at_link_head[link]
+        if h[node] < h_min:
+            h[node] = h_reset
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def run_local_time_steps(np.ndarray[DTYPE_INT_t, ndim=1] links,
+                         np.ndarray[DTYPE_INT_t, ndim=1] offset_at_level,
+                         DTYPE_INT_t n_levels,
+                         np.ndarray[DTYPE_UINT8_t, ndim=1] is_active_link,
+                         np.ndarray[DTYPE_INT_t, ndim=1] node_at_link_tail,
+                         np.ndarray[DTYPE_INT_t, ndim=1] node_at_link_head,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] length_of_link,
+                         np.ndarray[DTYPE_INT_t, ndim=2] neighbors_at_link,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] mannings_n,
+                         np.ndarray[DTYPE_UINT8_t, ndim=1] is_core_node,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] h,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] h_links,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] slope,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] q,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] q_new,
+                         np.ndarray[DTYPE_INT_t, ndim=1] steps_at_level,
+                         DTYPE_FLOAT_t theta,
+                         DTYPE_FLOAT_t g,
+                         DTYPE_FLOAT_t dt_min,
+                         DTYPE_FLOAT_t dx,
+                         int steep_slopes,
+                         DTYPE_FLOAT_t h_min,
+                         DTYPE_FLOAT_t h_reset):
+    """Advance links at their own power-of-two time steps.
+
+    Links are grouped into levels, with the links of level *k* stepping
+    forward by ``dt_min * 2 ** k``. Links of level *k* are updated every
+    ``2 ** k`` steps of the finest level so that, after
+    ``2 ** (n_levels - 1)`` fine steps, every level has reached the same
+    time. The volume of water carried by a link over its step is moved
+    from one end of the link to the other, so water is conserved whatever
+    the levels of the nodes at either end.
+
+    Parameters
+    ----------
+    links : ndarray of int
+        Links to update, sorted by level.
+    offset_at_level : ndarray of int
+        Offset into *links* of the first link of each level, with an
+        extra element for the end of the last level.
+    n_levels : int
+        Number of levels.
+    is_active_link : ndarray of uint8
+        Flags that indicate if a link is active.
+    node_at_link_tail, node_at_link_head : ndarray of int
+        Nodes at link tails and heads.
+    length_of_link : ndarray of float
+        Length of each link.
+    neighbors_at_link : ndarray of int, shape (n_links, 2)
+        Parallel neighbors of each link, with -1 for no neighbor.
+    mannings_n : ndarray of float
+        Manning's roughness at each link.
+    is_core_node : ndarray of uint8
+        Flags that indicate if a node is a core node.
+    z : ndarray of float
+        Elevation at nodes.
+    h : ndarray of float
+        Water depth at nodes.
+    h_links : ndarray of float
+        Water depth at links.
+    slope : ndarray of float
+        Water-surface gradient at links.
+    q : ndarray of float
+        Discharge at links.
+    q_new : ndarray of float
+        Work buffer, with one element per link.
+    steps_at_level : ndarray of int
+        Number of steps taken by each level. Incremented in place.
+    theta : float
+        Weighting factor.
+    g : float
+        Acceleration due to gravity.
+    dt_min : float
+        Time step of the finest level.
+    dx : float
+        Node spacing used in the Courant limit.
+    steep_slopes : int
+        If nonzero, limit discharge by the Froude and Courant numbers.
+    h_min : float
+        Depths at nodes of updated links that fall below this value are
+        reset to *h_reset*.
+    h_reset : float
+        Depth to reset shallow nodes to.
+    """
+    cdef int n_steps = 1 << (n_levels - 1)
+    cdef int step
+    cdef int top
+    cdef int level
+    cdef int n_update
+    cdef int i
+    cdef int link
+    cdef int tail
+    cdef int head
+    cdef int nbr
+    cdef double dt
+    cdef double w_tail
+    cdef double w_head
+    cdef double q_nbrs
+    cdef double dh
+
+    for step in range(n_steps):
+        top = 0
+        while top < n_levels - 1 and ((step >> top) & 1) == 0:
+            top += 1
+        if step == 0:
+            top = n_levels - 1
+        n_update = offset_at_level[top + 1]
+
+        for level in range(top + 1):
+            steps_at_level[level] += 1
+
+        for i in range(n_update):
+            link = links[i]
+            if is_active_link[link]:
+                tail = node_at_link_tail[link]
+                head = node_at_link_head[link]
+                w_tail = h[tail] + z[tail]
+                w_head = h[head] + z[head]
+                h_links[link] = max(w_tail, w_head) - max(z[tail], z[head])
+                slope[link] = (w_head - w_tail) / length_of_link[link]
+
+        for level in range(top + 1):
+            dt = dt_min * (1 << level)
+            for i in range(offset_at_level[level], offset_at_level[level + 1]):
+                link = links[i]
+
+                q_nbrs = 0.
+                nbr = neighbors_at_link[link, 0]
+                if nbr >= 0:
+                    q_nbrs += q[nbr]
+                nbr = neighbors_at_link[link, 1]
+                if nbr >= 0:
+                    q_nbrs += q[nbr]
+
+                q_new[i] = _calc_discharge(q[link], q_nbrs, h_links[link],
+                                           slope[link], mannings_n[link],
+                                           theta, g, dt)
+                if steep_slopes:
+                    q_new[i] = _limit_discharge(q_new[i], h_links[link], g,
+                                                dt, dx)
+                if not is_active_link[link]:
+                    q_new[i] = 0.
+                elif level > 0:
+                    q_new[i] = _limit_discharge_by_depth(
+                        q_new[i], h[node_at_link_tail[link]],
+                        h[node_at_link_head[link]], length_of_link[link], dt)
+
+        for level in range(top + 1):
+            dt = dt_min * (1 << level)
+            for i in range(offset_at_level[level], offset_at_level[level + 1]):
+                link = links[i]
+                q[link] = q_new[i]
+
+                dh = q_new[i] / length_of_link[link] * dt
+                tail = node_at_link_tail[link]
+                if is_core_node[tail]:
+                    h[tail] -= dh
+                head = node_at_link_head[link]
+                if is_core_node[head]:
+                    h[head] += dh
+
+        for i in range(n_update):
+            link = links[i]
+            tail = node_at_link_tail[link]
+            if h[tail] < h_min:
+                h[tail] = h_reset
+            head = node_at_link_head[link]
+            if h[head] < h_min:
+                h[head] = h_reset
@@ -91,6 +91,9 @@ import numpy as np
 from landlab.grid.structured_quad import links
 from landlab.utils.decorators import use_file_name_or_kwds
 
+from .cfuncs import (find_wet_links, update_wet_links,
+                     update_depth_at_wet_nodes, run_local_time_steps)
+
 
 _SEVEN_OVER_THREE = 7.0 / 3.0
 
@@ -126,6 +129,19 @@ class OverlandFlow(Component):
         Weighting factor from de Almeida et al., 2012.
     rainfall_intensity : float, optional
         Rainfall intensity.
+    wet_depth : float, optional
+        If given, only update discharge at links that touch a node whose
+        water depth is greater than *wet_depth* (m). Links away from the
+        wetting front carry no discharge. Because the update is restricted
+        to the wet part of the grid, this is much faster when only a small
+        part of the grid is flooded.
+    time_step_levels : int, optional
+        If given, use local time stepping with this many levels. Links are
+        binned by the stable time step of the deeper of their end nodes and
+        links of level *k* step forward by 2 ** *k* times the global stable
+        time step, so that links in shallow water are updated less often than
+        links in deep water. The volume moved by each link update is subtracted
+        from one node and added to the other, so water is conserved exactly.
 
 
 
@@ -136,7 +152,8 @@ class OverlandFlow(Component):
 
         OverlandFlow(grid, default_fixed_links=False, h_init=0.00001,
                  alpha=0.7, mannings_n=0.03, g=9.81, theta=0.8,
-                 rainfall_intensity=0.0, steep_slopes=False, **kwds)
+                 rainfall_intensity=0.0, steep_slopes=False, wet_depth=None,
+                 time_step_levels=None, **kwds)
 
 """
     _name = 'OverlandFlow'
@@ -176,7 +193,8 @@ class OverlandFlow(Component):
     @use_file_name_or_kwds
     def __init__(self, grid, default_fixed_links=False, h_init=0.00001,
                  alpha=0.7, mannings_n=0.03, g=9.81, theta=0.8,
-                 rainfall_intensity=0.0, steep_slopes=False, **kwds):
+                 rainfall_intensity=0.0, steep_slopes=False, wet_depth=None,
+                 time_step_levels=None, **kwds):
         """Create a overland flow component.
 
         Parameters
@@ -197,6 +215,20 @@ class OverlandFlow(Component):
             Weighting factor from de Almeida et al., 2012.
         rainfall_intensity : float, optional
             Rainfall intensity.
+        wet_depth : float, optional
+            If given, only update discharge at links that touch a node whose
+            water depth is greater than *wet_depth* (m). Links away from the
+            wetting front carry no discharge. Because the update is restricted
+            to the wet part of the grid, this is much faster when only a small
+            part of the grid is flooded.
+        time_step_levels : int, optional
+            If given, use local time stepping with this many levels. Links are
+            binned by the stable time step of the deeper of their end nodes and
+            links of level *k* step forward by 2 ** *k* times the global stable
+            time step, so that links in shallow water are updated less often
+            than links in deep water. The volume moved by each link update is
+            subtracted from one node and added to the other, so water is
+            conserved exactly.
         """
         super(OverlandFlow, self).__init__(grid, **kwds)
 
@@ -215,6 +247,14 @@ class OverlandFlow(Component):
         self.theta = theta
         self.rainfall_intensity = rainfall_intensity
         self.steep_slopes = steep_slopes
+        self.wet_depth = wet_depth
+        self.time_step_levels = time_step_levels
+        if time_step_levels is not None:
+            if time_step_levels < 1:
+                raise ValueError('time_step_levels must be at least 1')
+            self._steps_at_level = np.zeros(time_step_levels, dtype=np.int)
+            self._updates_at_level = np.zeros(time_step_levels, dtype=np.int)
+            self._all_links = np.arange(grid.number_of_links, dtype=np.int)
 
 
         # Now setting up fields at the links...
@@ -390,9 +430,215 @@ class OverlandFlow(Component):
         self.q_vertical = np.zeros(links.number_of_vertical_links(
             self.grid.shape))
 
+        if self.wet_depth is not None or self.time_step_levels is not None:
+            self._set_up_link_buffers()
+
         # Once the neighbor arrays are set up, we change the flag to True!
         self.neighbor_flag = True
 
+    def _set_up_link_buffers(self):
+        """Create the link arrays and work buffers used by the compiled
+        link updates."""
+        grid = self.grid
+        n_links = grid.number_of_links
+
+        self._neighbors_at_link = np.empty((n_links, 2), dtype=np.int)
+        self._neighbors_at_link[self.horizontal_ids, 0] = self.west_neighbors
+        self._neighbors_at_link[self.horizontal_ids, 1] = self.east_neighbors
+        self._neighbors_at_link[self.vertical_ids, 0] = self.north_neighbors
+        self._neighbors_at_link[self.vertical_ids, 1] = self.south_neighbors
+
+        self._is_active_link = np.zeros(n_links, dtype=np.uint8)
+        self._is_active_link[self.grid.active_links] = 1
+
+        self._is_core_node = np.zeros(grid.number_of_nodes, dtype=np.uint8)
+        self._is_core_node[grid.core_nodes] = 1
+
+        self._links_at_node = grid.links_at_node.astype(np.int, copy=False)
+        self._node_at_link_tail = grid.node_at_link_tail.astype(np.int,
+                                                                copy=False)
+        self._node_at_link_head = grid.node_at_link_head.astype(np.int,
+                                                                copy=False)
+        self._length_of_link = grid.length_of_link.astype(float, copy=False)
+        self._mannings_at_link = np.empty(n_links, dtype=float)
+
+        # Links are found by marking them in _is_marked_link, and the wet
+        # links of this and the previous time step swap between two buffers.
+        self._is_marked_link = np.zeros(n_links, dtype=np.uint8)
+        self._q_new = np.empty(n_links, dtype=float)
+        self._wet_link_buffers = (np.empty(n_links, dtype=np.int),
+                                  np.empty(n_links, dtype=np.int))
+        (wet_links, ) = np.where(
+            self.grid.at_link['surface_water__discharge'] != 0.)
+        self._wet_link_buffers[1][:len(wet_links)] = wet_links
+        self._number_of_wet_links = len(wet_links)
+
+    def _find_wet_links(self):
+        """Find the links that touch nodes deeper than *wet_depth*.
+
+        Returns
+        -------
+        ndarray of int
+            The wet links.
+        """
+        q = self.grid.at_link['surface_water__discharge']
+
+        (wet_links, prev_wet_links) = self._wet_link_buffers
+        (wet_nodes, ) = np.where(
+            self.grid.at_node['surface_water__depth'] > self.wet_depth)
+        n_wet = find_wet_links(wet_nodes, self._links_at_node,
+                               prev_wet_links, self._number_of_wet_links,
+                               self._is_marked_link, wet_links, q)
+        self._wet_link_buffers = (prev_wet_links, wet_links)
+        self._number_of_wet_links = n_wet
+
+        return wet_links[:n_wet]
+
+    def _depth_reset(self):
+        """Depth below which water depths are reset, and the reset value."""
+        if self.steep_slopes is True:
+            return (self.h_init, self.h_init * 10.0 ** -3)
+        else:
+            return (- np.inf, 0.)
+
+    def _update_wet_links(self):
+        """Update depth and discharge for one time step at wet links only.
+
+        Nodes with water deeper than *wet_depth* are wet, and the links
+        that touch them are the wet links. The momentum equation is solved
+        only at the wet links, and only nodes at the ends of wet links
+        change depth, other than through rainfall.
+        """
+        self.h = h = self.grid.at_node['surface_water__depth']
+        self.q = q = self.grid.at_link['surface_water__discharge']
+
+        if self.default_fixed_links is True:
+            q[self.grid.fixed_links] = q[self.active_neighbors]
+
+        wet_links = self._find_wet_links()
+        n_wet = len(wet_links)
+
+        update_wet_links(wet_links, n_wet, self._is_active_link,
+                         self._node_at_link_tail, self._node_at_link_head,
+                         self._length_of_link, self._neighbors_at_link,
+                         self._mannings_at_link,
+                         self.grid.at_node['topographic__elevation'], h,
+                         self.grid.at_link['surface_water__depth'],
+                         self.water_surface_slope, q, self._q_new,
+                         self.theta, self.g, self.dt, self.grid.dx,
+                         int(self.steep_slopes is True))
+
+        if self.default_fixed_links is True:
+            q[self.grid.fixed_links] = q[self.active_neighbors]
+
+        if self.rainfall_intensity != 0.:
+            h[self.grid.core_nodes] += self.rainfall_intensity * self.dt
+
+        (h_min, h_reset) = self._depth_reset()
+        update_depth_at_wet_nodes(wet_links, n_wet, self._node_at_link_tail,
+                                  self._node_at_link_head,
+                                  self._length_of_link, self._is_core_node,
+                                  q, h, self.dt, h_min, h_reset)
+
+    def _run_local_time_steps(self, dt_min, max_dt):
+        """Update depth and discharge with local time steps.
+
+        Each link is given a level, *k*, from the stable time step at its
+        deeper end node (the one with the shorter time step), and is stepped
+        forward by ``dt_min * 2 ** k``. Levels are capped at
+        *time_step_levels* - 1 and so that the coarsest level does not step
+        past *max_dt*. On levels above the finest, discharge is limited so
+        that a link takes at most a quarter of the water at its upstream
+        node, so that depths do not go negative. Inactive links carry no
+        discharge.
+
+        Parameters
+        ----------
+        dt_min : float
+            The global stable time step, which is the time step of the
+            finest level.
+        max_dt : float
+            The largest time to step forward, or infinity to take one step
+            of the coarsest level.
+
+        Returns
+        -------
+        float
+            The time stepped forward, which is the time step of the
+            coarsest level.
+        """
+        self.h = h = self.grid.at_node['surface_water__depth']
+        self.q = q = self.grid.at_link['surface_water__discharge']
+
+        if max_dt < dt_min:
+            (dt_min, max_level) = (max_dt, 0)
+        elif max_dt == np.inf:
+            max_level = self.time_step_levels - 1
+        else:
+            max_level = min(self.time_step_levels - 1,
+                            int(np.log2(max_dt / dt_min)))
+
+        if self.wet_depth is not None:
+            update_links = self._find_wet_links()
+        else:
+            update_links = self._all_links
+
+        with np.errstate(divide='ignore'):
+            dt_at_node = self.alpha * self.grid.dx / np.sqrt(
+                self.g * h.clip(0.))
+            level_at_node = np.log2(dt_at_node / dt_min)
+        level_at_node = np.clip(level_at_node, 0, max_level).astype(np.int8)
+        level_at_link = np.minimum(
+            level_at_node[self._node_at_link_tail[update_links]],
+            level_at_node[self._node_at_link_head[update_links]])
+
+        sorted_by_level = np.argsort(level_at_link, kind='mergesort')
+        update_links = update_links[sorted_by_level]
+        offset_at_level = np.searchsorted(level_at_link[sorted_by_level],
+                                          np.arange(max_level + 2))
+
+        if self.default_fixed_links is True:
+            q[self.grid.fixed_links] = q[self.active_neighbors]
+
+        (h_min, h_reset) = self._depth_reset()
+        run_local_time_steps(update_links, offset_at_level, max_level + 1,
+                             self._is_active_link, self._node_at_link_tail,
+                             self._node_at_link_head, self._length_of_link,
+                             self._neighbors_at_link, self._mannings_at_link,
+                             self._is_core_node,
+                             self.grid.at_node['topographic__elevation'], h,
+                             self.grid.at_link['surface_water__depth'],
+                             self.water_surface_slope, q, self._q_new,
+                             self._steps_at_level, self.theta, self.g, dt_min,
+                             self.grid.dx, int(self.steep_slopes is True),
+                             h_min, h_reset)
+        self._updates_at_level[:max_level + 1] += (
+            np.diff(offset_at_level) * 2 ** (max_level - np.arange(
+                max_level + 1)))
+
+        if self.default_fixed_links is True:
+            q[self.grid.fixed_links] = q[self.active_neighbors]
+
+        dt = dt_min * 2 ** max_level
+        if self.rainfall_intensity != 0.:
+            h[self.grid.core_nodes] += self.rainfall_intensity * dt
+
+        return dt
+
+    @property
+    def time_step_report(self):
+        """Time steps taken with local time stepping.
+
+        A dictionary with the number of steps taken by each level
+        (*steps*), and the number of link updates done at each level
+        (*link_updates*), during the last call to *overland_flow*. Level
+        *k* has a time step 2 ** *k* times that of the finest level.
+        """
+        return {
+            'steps': self._steps_at_level.copy(),
+            'link_updates': self._updates_at_level.copy(),
+        }
+
     def overland_flow(self, dt=None):
         """Generate overland flow across a grid.
 
@@ -409,11 +655,31 @@ class OverlandFlow(Component):
         local_elapsed_time = 0.
         if dt is None:
             dt = np.inf  # to allow the loop to begin
+
+        if self.time_step_levels is not None:
+            self._steps_at_level.fill(0)
+            self._updates_at_level.fill(0)
+
+        if self.wet_depth is not None or self.time_step_levels is not None:
+            if self.neighbor_flag is False:
+                self.set_up_neighbor_arrays()
+            self._mannings_at_link[:] = self.mannings_n
+            if self.steep_slopes is True:
+                h = self.grid.at_node['surface_water__depth']
+                h[h < self.h_init] = self.h_init * 10.0 ** -3
+
         while local_elapsed_time < dt:
             dt_local = self.calc_time_step()
             # Can really get into trouble if nothing happens but we still run:
             if not dt_local < np.inf:
                 break
+            if self.time_step_levels is not None:
+                self.dt = self._run_local_time_steps(
+                    dt_local, dt - local_elapsed_time)
+                if dt is np.inf:
+                    break
+                local_elapsed_time += self.dt
+                continue
             if local_elapsed_time + dt_local > dt:
                 dt_local = dt - local_elapsed_time
             self.dt = dt_local
@@ -423,6 +689,13 @@ class OverlandFlow(Component):
             if self.neighbor_flag is False:
                 self.set_up_neighbor_arrays()
 
+            if self.wet_depth is not None:
+                self._update_wet_links()
+                if dt is np.inf:
+                    break
+                local_elapsed_time += self.dt
+                continue
+
             # In case another component has added data to the fields, we just
             # reset our water depths, topographic elevations and water
             # discharge variables to the fields.
@@ -637,6 +910,13 @@ class OverlandFlow(Component):
                 break
             local_elapsed_time += self.dt
 
+        if self.wet_depth is not None or self.time_step_levels is not None:
+            for (group, name) in (('node', 'surface_water__depth'),
+                                  ('link', 'surface_water__depth'),
+                                  ('link', 'surface_water__discharge'),
+                                  ('link', 'water_surface__gradient')):
+                self.grid.mark_modified(group, name)
+
     def run_one_step(self, dt=None):
         """Generate overland flow across a grid.
 
@@ -163,34 +163,44 @@ class KinwaveOverlandFlowModel(Component):
     def run_one_step(self, dt, current_time=0.0, **kwds):
         """Calculate water flow for a time period `dt`.
         """
-        # Calculate water depth at links. This implements an "upwind" scheme
-        # in which water depth at the links is the depth at the higher of the
-        # two nodes.
-        H_link = self._grid.map_value_at_max_node_to_link(
-                'topographic__elevation', 'surface_water__depth')
-
-        # Calculate velocity using the Manning equation.
-        self.vel = (-self.sign_slope * self.vel_coef * H_link**0.66667 *
-                    self.sqrt_slope)
-
-        # Calculate discharge
-        self.disch = H_link * self.vel
-
-        # Flux divergence
-        dqda = self._grid.calc_flux_div_at_node(self.disch)
-
-        # Rate of change of water depth
-        if current_time < self.precip_duration:
-            ppt = self.precip
-        else:
-            ppt = 0.0
-        dHdt = ppt - self.infilt - dqda
-
-        # Update water depth: simple forward Euler scheme
-        self.depth[self._grid.core_nodes] += dHdt[self._grid.core_nodes] * dt
-
-        # Very crude numerical hack: prevent negative water depth
-        self.depth[np.where(self.depth < 0.0)[0]] = 0.0
+        buffers = self._grid.buffers
+        H_link = buffers.empty('link', purpose='water_depth')
+        dqda = buffers.empty('node', purpose='discharge_divergence')
+
+        try:
+            # Calculate water depth at links. This implements an "upwind"
+            # scheme in which water depth at the links is the depth at the
+            # higher of the two nodes.
+            self._grid.map_value_at_max_node_to_link(
+                'topographic__elevation', 'surface_water__depth', out=H_link)
+
+            # Calculate velocity using the Manning equation.
+            np.power(H_link, 0.66667, out=self.vel)
+            self.vel *= self.sqrt_slope
+            self.vel *= self.sign_slope
+            self.vel *= -self.vel_coef
+
+            # Calculate discharge
+            np.multiply(H_link, self.vel, out=self.disch)
+
+            # Flux divergence
+            self._grid.calc_flux_div_at_node(self.disch, out=dqda)
+
+            # Rate of change of water depth
+            if current_time < self.precip_duration:
+                ppt = self.precip
+            else:
+                ppt = 0.0
+            core_nodes = self._grid.core_nodes
+
+            # Update water depth: simple forward Euler scheme
+            self.depth[core_nodes] += (
+                ppt - self.infilt - dqda[core_nodes]) * dt
+
+            # Very crude numerical hack: prevent negative water depth
+            np.maximum(self.depth, 0.0, out=self.depth)
+        finally:
+            buffers.release(H_link, dqda)
 
 
 if __name__ == '__main__':
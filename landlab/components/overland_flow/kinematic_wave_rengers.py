@@ -42,7 +42,8 @@ class KinematicWaveRengers(Component):
 
         KinematicWaveRengers(grid, mannings_n=0.03, critical_flow_depth=0.003,
                              mannings_epsilon=0.33333333, dt_max=0.3,
-                             max_courant=0.2, min_surface_water_depth=1.e-8)
+                             max_courant=0.2, min_surface_water_depth=1.e-8,
+                             time_step_levels=None)
 
     Parameters
     ----------
@@ -67,6 +68,13 @@ class KinematicWaveRengers(Component):
     min_surface_water_depth : float (m)
         A water depth below which surface water thickness may never fall, to
         ensure model stabilty.
+    time_step_levels : int or None
+        If given, use local time stepping with this many levels. Cells are
+        binned by their own Courant-limited time step, and cells of level *k*
+        step forward by 2 ** *k* times the global stable time step, so that
+        cells of slow, shallow water are updated less often than cells of
+        fast, deep water. The water a cell gives up in a step is added to its
+        receivers in the same step, so water is conserved exactly.
 
     Examples
     --------
@@ -107,6 +115,9 @@ class KinematicWaveRengers(Component):
 
     _name = 'KinematicWaveRengers'
 
+    # run_one_step divides long time steps internally
+    _unconstrained_time_step = True
+
     _input_var_names = (
         'topographic__elevation',
         'surface_water__depth',
@@ -143,7 +154,8 @@ class KinematicWaveRengers(Component):
     @use_file_name_or_kwds
     def __init__(self, grid, mannings_n=0.03, critical_flow_depth=0.003,
                  mannings_epsilon=0.33333333, dt_max=0.3, max_courant=0.2,
-                 min_surface_water_depth=1.e-8, **kwds):
+                 min_surface_water_depth=1.e-8, time_step_levels=None,
+                 **kwds):
         """Initialize the kinematic wave approximation overland flow component.
         """
 
@@ -163,6 +175,13 @@ class KinematicWaveRengers(Component):
         assert not np.isclose(dt_max, 0.)
         self.dt_max = dt_max
         self.min_surface_water_depth = min_surface_water_depth
+        self.time_step_levels = time_step_levels
+        if time_step_levels is not None:
+            if time_step_levels < 1:
+                raise ValueError('time_step_levels must be at least 1')
+            self._steps_at_level = np.zeros(time_step_levels, dtype=int)
+            self._updates_at_level = np.zeros(time_step_levels, dtype=int)
+        self._max_courant = max_courant
         self._active_depths = self.grid.at_node[
             'surface_water__depth'][active]
         all_grads = self.grid.calc_grad_at_link('topographic__elevation')
@@ -225,17 +244,25 @@ class KinematicWaveRengers(Component):
         hnew = self.hnew
         if update_topography:
             self.update_topographic_params()
+        if self.time_step_levels is not None:
+            self._steps_at_level.fill(0)
+            self._updates_at_level.fill(0)
         while elapsed_time_in_dt < dt:
             internal_dt = self.calc_grads_and_timesteps(
                 update_topography, track_min_depth)
             remaining_dt = dt - elapsed_time_in_dt
+            if self.time_step_levels is not None:
+                elapsed_time_in_dt += self._run_local_time_steps(
+                    internal_dt, remaining_dt, rainfall_intensity,
+                    track_min_depth)
+                continue
             # now reduce timestep is needed if limited by total tstep length
             internal_dt = min(internal_dt, remaining_dt).clip(0.)
             # this section uses our final-array-val-is-zero trick
             qx_left = self.qx[self._neighbors[:, 2]].clip(min=0.)
             qx_right = self.qx[self._neighbors[:, 0]].clip(max=0.)
-            qy_top = self.qy[self._neighbors[:, 1]].clip(min=0.)
-            qy_bottom = self.qy[self._neighbors[:, 3]].clip(max=0.)
+            qy_top = self.qy[self._neighbors[:, 1]].clip(max=0.)
+            qy_bottom = self.qy[self._neighbors[:, 3]].clip(min=0.)
             # FR's rainfall handling was here. We're going to assume that the
             # component is being driven by a "LL style" rainfall record, where
             # the provided rainfall_intensity is constant across the provide
@@ -251,7 +278,7 @@ class KinematicWaveRengers(Component):
             # flux it round
             hnew -= internal_dt/self.grid.dx*np.fabs(self.qy[active])
             hnew -= internal_dt/self.grid.dy*np.fabs(self.qx[active])
-            hnew += internal_dt/self.grid.dx*(qy_top - qy_bottom)[active]
+            hnew += internal_dt/self.grid.dx*(qy_bottom - qy_top)[active]
             hnew += internal_dt/self.grid.dy*(qx_left - qx_right)[active]
             hnew[self.fixed_grad_nodes_active] = hnew[
                 self.fixed_grad_anchors_active]
@@ -295,14 +322,7 @@ class KinematicWaveRengers(Component):
         if track_min_depth:
             self._water_balance.append(
                 (hnew-self._h[active]).sum()/self._h[active].sum())
-        n = self._n * (hnew/self._hc)**self._negepsilon
-        twothirdshnewbyn = hnew**0.66666666 / n
-        self.vely[active] = twothirdshnewbyn * self.vertslopept5
-        self.velx[active] = twothirdshnewbyn * self.hozslopept5
-        self.vely[self.posvertgrads] *= -1.
-        self.velx[self.poshozgrads] *= -1.
-        self.qy[active] = self.vely[active] * hnew  # m**2/s
-        self.qx[active] = self.velx[active] * hnew  # m**2/s
+        self._update_discharges(slice(None))
         maxvely = np.fabs(self.vely).max()
         maxvelx = np.fabs(self.velx).max()
         if self.equaldims:
@@ -319,6 +339,154 @@ class KinematicWaveRengers(Component):
 
         return internal_dt
 
+    def _update_discharges(self, cells):
+        """Update velocities and discharges at some of the active nodes.
+
+        Parameters
+        ----------
+        cells : array of int or slice
+            Positions of the nodes to update in the array of active nodes.
+        """
+        nodes = self._active[cells]
+        hnew = self.hnew[cells]
+        n = self._n * (hnew/self._hc)**self._negepsilon
+        twothirdshnewbyn = hnew**0.66666666 / n
+        self.vely[nodes] = twothirdshnewbyn * self.vertslopept5[cells]
+        self.velx[nodes] = twothirdshnewbyn * self.hozslopept5[cells]
+        self.vely[nodes[self.posvertgrads[nodes]]] *= -1.
+        self.velx[nodes[self.poshozgrads[nodes]]] *= -1.
+        self.qy[nodes] = self.vely[nodes] * hnew  # m**2/s
+        self.qx[nodes] = self.velx[nodes] * hnew  # m**2/s
+
+    def _run_local_time_steps(self, dt_min, max_dt, rainfall_intensity,
+                              track_min_depth):
+        """Update water depths with local time steps.
+
+        Each active node is given a level, *k*, from its own Courant-limited
+        time step, and is stepped forward by ``dt_min * 2 ** k``. Levels are
+        capped at *time_step_levels* - 1 and so that the coarsest level does
+        not step past *max_dt*. Water flows from a node to its downhill
+        neighbors. It is taken from the node when the node steps and, so that
+        no water is lost or gained, added to the neighbors at the same time.
+        Because a node can deepen before its next step, a node gives up at
+        most *max_courant* of its water in one step.
+
+        Parameters
+        ----------
+        dt_min : float
+            The global stable time step, which is the time step of the
+            finest level.
+        max_dt : float
+            The largest time to step forward.
+        rainfall_intensity : float or array (m/s)
+            The rainfall intensity across the grid.
+        track_min_depth : bool
+            If True, track mass gained by enforcing the minimum water depth.
+
+        Returns
+        -------
+        float
+            The time stepped forward, which is the time step of the
+            coarsest level.
+        """
+        active = self._active
+        hnew = self.hnew
+
+        if max_dt < dt_min:
+            (dt_min, max_level) = (max_dt, 0)
+        else:
+            max_level = min(self.time_step_levels - 1,
+                            int(np.log2(max_dt / dt_min)))
+
+        velx = np.fabs(self.velx[active])
+        vely = np.fabs(self.vely[active])
+        with np.errstate(divide='ignore'):
+            if self.equaldims:
+                dt_at_cell = self.courant_prefactor/(velx + vely)
+            else:
+                dt_at_cell = self.courant_prefactor/(self.grid.dy*velx +
+                                                     self.grid.dx*vely)
+            if self.dt_max is not None:
+                np.minimum(dt_at_cell, self.dt_max, out=dt_at_cell)
+            level_at_cell = np.floor(np.log2(dt_at_cell / dt_min))
+        level_at_cell = np.clip(level_at_cell, 0, max_level).astype(int)
+        dt_at_cell = dt_min * 2. ** level_at_cell
+        cells_at_level = [np.where(level_at_cell == level)[0]
+                          for level in range(max_level + 1)]
+
+        # the receivers of each node, as positions in the array of active
+        # nodes; water sent to an inactive node (-1) leaves the grid
+        cell_at_node = np.full(self.grid.number_of_nodes + 1, -1, dtype=int)
+        cell_at_node[active] = np.arange(active.size)
+        neighbors = self._neighbors[active]
+        receiver_x = cell_at_node[np.where(self.poshozgrads[active],
+                                           neighbors[:, 2], neighbors[:, 0])]
+        receiver_y = cell_at_node[np.where(self.posvertgrads[active],
+                                           neighbors[:, 3], neighbors[:, 1])]
+        receiver_x[receiver_x == -1] = active.size
+        receiver_y[receiver_y == -1] = active.size
+
+        if type(rainfall_intensity) is np.ndarray:
+            rainfall_intensity = rainfall_intensity[active]
+
+        for step in range(2 ** max_level):
+            levels = [level for level in range(max_level + 1)
+                      if step % 2 ** level == 0]
+            cells = np.concatenate([cells_at_level[level]
+                                    for level in levels])
+            self._steps_at_level[levels] += 1
+            self._updates_at_level[levels] += [cells_at_level[level].size
+                                               for level in levels]
+            if step > 0:
+                hnew[cells] = hnew[cells].clip(self.min_surface_water_depth)
+                if track_min_depth:
+                    self._water_balance.append(
+                        (hnew-self._h[active]).sum()/self._h[active].sum())
+                self._update_discharges(cells)
+
+            dt = dt_at_cell[cells]
+            nodes = active[cells]
+            out_x = dt/self.grid.dy*np.fabs(self.qx[nodes])
+            out_y = dt/self.grid.dx*np.fabs(self.qy[nodes])
+            out = out_x + out_y
+            too_much = out > self._max_courant * hnew[cells]
+            if np.any(too_much):
+                scale = (self._max_courant * hnew[cells][too_much] /
+                         out[too_much])
+                out_x[too_much] *= scale
+                out_y[too_much] *= scale
+                out[too_much] *= scale
+
+            if type(rainfall_intensity) is np.ndarray:
+                hnew[cells] += dt * rainfall_intensity[cells]
+            else:
+                hnew[cells] += dt * rainfall_intensity
+            hnew[self.actives_BCs] = self.actives_BCs_water_depth
+            hnew[cells] -= out
+            hnew += np.bincount(
+                np.concatenate((receiver_x[cells], receiver_y[cells])),
+                weights=np.concatenate((out_x, out_y)),
+                minlength=active.size + 1)[:-1]
+            hnew[self.fixed_grad_nodes_active] = hnew[
+                self.fixed_grad_anchors_active]
+
+        self._internal_dt = dt_min
+        return dt_min * 2 ** max_level
+
+    @property
+    def time_step_report(self):
+        """Time steps taken with local time stepping.
+
+        A dictionary with the number of steps taken by each level
+        (*steps*), and the number of node updates done at each level
+        (*cell_updates*), during the last call to *run_one_step*. Level
+        *k* has a time step 2 ** *k* times that of the finest level.
+        """
+        return {
+            'steps': self._steps_at_level.copy(),
+            'cell_updates': self._updates_at_level.copy(),
+        }
+
     def update_topographic_params(self):
         """
         If the topo changes during the run, change the held params used by
@@ -374,6 +542,8 @@ class KinematicWaveRengers(Component):
     def internal_timestep(self):
         """
         Return the internal timestep last used by the kinematic wave component.
+
+        With local time stepping, this is the time step of the finest level.
         """
         try:
             return self._internal_dt
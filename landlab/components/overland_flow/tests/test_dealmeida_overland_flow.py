@@ -163,3 +163,129 @@ def test_deAlm_analytical_imposed_dt_long():
     hdeAlm = hdeAlm[1][1:]
     hdeAlm = np.append(hdeAlm, [0])
     np.testing.assert_almost_equal(h_analytical, hdeAlm, decimal=1)
+
+
+def _run_analytical(dt=None, **kwds):
+    grid = RasterModelGrid((32, 240), spacing=25)
+    grid.add_zeros('node', 'surface_water__depth')
+    grid.add_zeros('node', 'topographic__elevation')
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    left_inactive_ids = left_edge_horizontal_ids(grid.shape)
+    deAlm = OverlandFlow(grid, mannings_n=0.01, h_init=0.001, **kwds)
+    time = 0.0
+
+    while time < 500.:
+        grid.at_link['surface_water__discharge'][left_inactive_ids] = (
+            grid.at_link['surface_water__discharge'][left_inactive_ids + 1])
+        step = dt or deAlm.calc_time_step()
+        deAlm.overland_flow(step)
+        h_boundary = (((7./3.) * (0.01**2) * (0.4**3) *
+                      time) ** (3./7.))
+        grid.at_node['surface_water__depth'][grid.nodes[1: -1, 1]] = h_boundary
+        time += step
+
+    return grid
+
+
+def _assert_matches_analytical(grid):
+    x = np.arange(0, ((grid.shape[1]) * grid.dx), grid.dx)
+    h_analytical = (-(7./3.) * (0.01**2) * (0.4**2) * (x - (0.4 * 500)))
+    h_analytical[np.where(h_analytical > 0)] = (h_analytical[np.where(
+        h_analytical > 0)] ** (3./7.))
+    h_analytical[np.where(h_analytical < 0)] = 0.0
+
+    hdeAlm = grid.at_node['surface_water__depth'].reshape(grid.shape)
+    hdeAlm = hdeAlm[1][1:]
+    hdeAlm = np.append(hdeAlm, [0])
+    np.testing.assert_almost_equal(h_analytical, hdeAlm, decimal=1)
+
+
+def test_deAlm_wet_depth_analytical():
+    _assert_matches_analytical(_run_analytical(wet_depth=0.002))
+
+
+def test_deAlm_wet_depth_matches_all_links():
+    for steep_slopes in (False, True):
+        grid_all = _run_analytical(steep_slopes=steep_slopes)
+        grid_wet = _run_analytical(steep_slopes=steep_slopes, wet_depth=0.002)
+
+        np.testing.assert_array_almost_equal(
+            grid_wet.at_node['surface_water__depth'],
+            grid_all.at_node['surface_water__depth'], decimal=2)
+
+        wet_links = np.abs(grid_wet.at_link['surface_water__discharge']) > 0.
+        assert_true(np.any(wet_links))
+        assert_true(not np.all(wet_links))
+
+
+def test_deAlm_local_time_steps_analytical():
+    _assert_matches_analytical(_run_analytical(dt=10., time_step_levels=4))
+    _assert_matches_analytical(
+        _run_analytical(dt=10., time_step_levels=4, wet_depth=0.002))
+
+
+def test_deAlm_local_time_steps_conserve_water():
+    grid = RasterModelGrid((20, 40), spacing=10.)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    h = grid.add_zeros('node', 'surface_water__depth')
+    is_channel = np.abs(grid.node_x - 200.) < 15.
+    h[is_channel] = 5.
+    z[~is_channel] = 4.9
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+
+    deAlm = OverlandFlow(grid, mannings_n=0.03, h_init=0.01,
+                         time_step_levels=4)
+    volume = h.sum()
+    deAlm.overland_flow(30.)
+
+    assert_true(abs(h.sum() - volume) < 1e-10 * volume)
+
+    report = deAlm.time_step_report
+    assert_equal(report['steps'][0], 2 * report['steps'][1] + 1)
+    assert_true(np.all(np.diff(report['steps']) < 0))
+    assert_true(report['link_updates'].sum() <
+                report['steps'][0] * grid.number_of_links)
+
+
+def test_deAlm_one_time_step_level_is_global():
+    grid_global = _run_analytical(dt=10.)
+    grid_local = _run_analytical(dt=10., time_step_levels=1)
+
+    np.testing.assert_array_almost_equal(
+        grid_local.at_node['surface_water__depth'],
+        grid_global.at_node['surface_water__depth'])
+
+
+def test_deAlm_local_time_steps_mound_onto_dry_ground():
+    for time_step_levels in (2, 3, 4):
+        grid = RasterModelGrid((30, 30), spacing=10.)
+        grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+        r = np.hypot(grid.node_x, grid.node_y)
+        grid.add_field('node', 'topographic__elevation', 0.01 * r)
+        h = grid.add_field('node', 'surface_water__depth',
+                           0.2 * np.exp(- r ** 2 / 2000.))
+
+        deAlm = OverlandFlow(grid, mannings_n=0.05,
+                             time_step_levels=time_step_levels)
+        volume = h.sum()
+        for _ in range(10):
+            deAlm.overland_flow(dt=10.)
+
+        assert_true(np.all(np.isfinite(h)))
+        assert_true(np.all(h >= 0.))
+        assert_true(abs(h.sum() - volume) < 1e-10 * volume)
+        assert_true(deAlm.time_step_report['steps'][1] > 0)
+
+
+def test_deAlm_local_time_steps_run_one_step():
+    grid = RasterModelGrid((10, 10))
+    grid.add_zeros('node', 'topographic__elevation')
+    h = grid.add_ones('node', 'surface_water__depth')
+    h[44] = 2.
+
+    deAlm = OverlandFlow(grid, time_step_levels=3)
+    deAlm.run_one_step()
+
+    assert_true(np.all(np.isfinite(h)))
+    assert_true(deAlm.dt > 0.)
+    assert_true(np.any(grid.at_link['surface_water__discharge'] != 0.))
@@ -0,0 +1,75 @@
+"""Unit tests for landlab.components.overland_flow.KinematicWaveRengers.
+"""
+from nose.tools import assert_equal, assert_true, assert_raises
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+
+from landlab import RasterModelGrid
+from landlab.components.overland_flow import KinematicWaveRengers
+
+
+def _run_over_bowl(n_steps=5, rain=1.e-5, **kwds):
+    """Run over closed bowl topography, with deep water on one side."""
+    grid = RasterModelGrid((12, 12), spacing=10.)
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    grid.add_field('node', 'topographic__elevation',
+                   0.05 * (np.abs(grid.x_of_node - 55.) +
+                           np.abs(grid.y_of_node - 55.)))
+    h = grid.add_zeros('node', 'surface_water__depth')
+    h.fill(1.e-3)
+    h[grid.x_of_node < 30.] = 0.05
+    kw = KinematicWaveRengers(grid, min_surface_water_depth=1.e-12,
+                              dt_max=60., **kwds)
+    volume = h[grid.core_nodes].sum()
+    for _ in range(n_steps):
+        kw.run_one_step(60., rainfall_intensity=rain)
+    return (kw, volume)
+
+
+def test_conserve_water():
+    """Test flow in x and y conserves water over a closed bowl."""
+    (kw, volume) = _run_over_bowl()
+    h = kw.grid.at_node['surface_water__depth']
+    assert_array_almost_equal(h[kw.grid.core_nodes].sum(),
+                              volume + 1.e-5 * 300. * 100., decimal=12)
+
+
+def test_local_time_steps_conserve_water():
+    (kw, volume) = _run_over_bowl(time_step_levels=4)
+    h = kw.grid.at_node['surface_water__depth']
+    assert_true(np.all(h > 0.))
+    assert_array_almost_equal(h[kw.grid.core_nodes].sum(),
+                              volume + 1.e-5 * 300. * 100., decimal=12)
+
+    report = kw.time_step_report
+    assert_equal(len(report['steps']), 4)
+    assert_true(np.all(report['steps'][:-1] >= 2 * report['steps'][1:]))
+    assert_true(report['cell_updates'][3] > 0)
+    assert_true(report['cell_updates'].sum() <
+                report['steps'][0] * kw.grid.number_of_core_nodes)
+
+
+def test_local_time_steps_match_global():
+    (kw_global, _) = _run_over_bowl()
+    (kw_local, _) = _run_over_bowl(time_step_levels=4)
+    assert_array_almost_equal(
+        kw_local.grid.at_node['surface_water__depth'],
+        kw_global.grid.at_node['surface_water__depth'], decimal=3)
+
+
+def test_one_time_step_level_is_global():
+    (kw_global, _) = _run_over_bowl()
+    (kw_local, _) = _run_over_bowl(time_step_levels=1)
+    assert_array_almost_equal(
+        kw_local.grid.at_node['surface_water__depth'],
+        kw_global.grid.at_node['surface_water__depth'], decimal=12)
+    assert_array_equal(kw_local.time_step_report['cell_updates'],
+                       kw_local.time_step_report['steps'] *
+                       kw_local.grid.number_of_core_nodes)
+
+
+def test_bad_time_step_levels():
+    grid = RasterModelGrid((4, 5), spacing=10.)
+    grid.add_zeros('node', 'topographic__elevation')
+    grid.add_zeros('node', 'surface_water__depth')
+    assert_raises(ValueError, KinematicWaveRengers, grid, time_step_levels=0)
@@ -0,0 +1,50 @@
+"""Unit tests for landlab.components.overland_flow.KinwaveOverlandFlowModel.
+"""
+from nose.tools import assert_equal, assert_true, assert_is, assert_raises
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components.overland_flow.generate_overland_flow_kinwave import (
+    KinwaveOverlandFlowModel)
+
+
+def _sloping_grid():
+    grid = RasterModelGrid((5, 6), 10.)
+    grid.add_field('node', 'topographic__elevation', 0.01 * grid.node_x)
+    return grid
+
+
+def test_run_one_step_updates_fields():
+    grid = _sloping_grid()
+    kw = KinwaveOverlandFlowModel(grid, precip_rate=100.)
+    vel = grid.at_link['water__velocity']
+    for _ in range(10):
+        kw.run_one_step(10.)
+
+    assert_true(grid.at_node['surface_water__depth'].max() > 0.)
+    assert_is(kw.vel, vel)
+    assert_true(np.all(vel <= 0.))
+    assert_true(vel.min() < 0.)
+
+    disch = grid.at_link['water__specific_discharge']
+    assert_is(kw.disch, disch)
+    assert_true(disch.min() < 0.)
+
+
+def test_run_one_step_reuses_scratch_arrays():
+    grid = _sloping_grid()
+    kw = KinwaveOverlandFlowModel(grid, precip_rate=100.)
+    kw.run_one_step(10.)
+    n_allocations = grid.buffers.number_of_allocations
+    for _ in range(3):
+        kw.run_one_step(10.)
+    assert_equal(grid.buffers.number_of_allocations, n_allocations)
+    assert_equal(grid.buffers.number_in_use, 0)
+
+
+def test_run_one_step_releases_scratch_arrays_on_error():
+    grid = _sloping_grid()
+    kw = KinwaveOverlandFlowModel(grid, precip_rate=100.)
+    grid.at_node.pop('surface_water__depth')
+    assert_raises(KeyError, kw.run_one_step, 10.)
+    assert_equal(grid.buffers.number_in_use, 0)
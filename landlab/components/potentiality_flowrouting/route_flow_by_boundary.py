@@ -12,6 +12,8 @@ Created on Fri Feb 20 09:32:27 2015
 # Could suppress by mirroring the diagonals
 
 import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.linalg as linalg
 from landlab import RasterModelGrid, Component, FieldError, INACTIVE_LINK, \
     CLOSED_BOUNDARY, CORE_NODE
 import inspect
@@ -51,7 +53,7 @@ class PotentialityFlowRouter(Component):
     Construction::
 
         PotentialityFlowRouter(grid, method='D8', flow_equation='default',
-                     Chezys_C=30., Mannings_n=0.03)
+                     Chezys_C=30., Mannings_n=0.03, solver='jacobi')
 
     Notes
     -----
@@ -76,6 +78,14 @@ class PotentialityFlowRouter(Component):
         Required if flow_equation == 'Chezy'.
     Mannings_n : float (optional)
         Required if flow_equation == 'Manning'.
+    solver : {'jacobi', 'direct', 'krylov'}, optional
+        How to solve for the potential field. 'jacobi' (the default) sweeps
+        over the grid until the potentials stop changing. 'direct' and
+        'krylov' assemble the equations as a sparse matrix and solve them
+        with a sparse LU factorization or with ILU-preconditioned BiCGSTAB.
+        The matrix, and its factorization, is reused for as long as the
+        topography and boundary conditions do not change, so that only the
+        water input differs between calls.
 
     Examples
     --------
@@ -94,6 +104,16 @@ class PotentialityFlowRouter(Component):
     >>> np.allclose(mg.at_node['surface_water__discharge'][mg.core_nodes],
     ...             Q_at_core_nodes)
     True
+
+    The same potentials can be found with a sparse direct solver.
+
+    >>> potfr = PotentialityFlowRouter(mg, solver='direct')
+    >>> potfr.run_one_step()
+    >>> np.allclose(mg.at_node['surface_water__discharge'][mg.core_nodes],
+    ...             Q_at_core_nodes)
+    True
+    >>> potfr.solver_report['solver']
+    'direct'
     """
     _name = 'PotentialityFlowRouter'
 
@@ -138,9 +158,11 @@ class PotentialityFlowRouter(Component):
     _min_slope_thresh = 1.e-24
     # if your flow isn't connecting up, this probably needs to be reduced
 
+    _krylov_tolerance = 1.e-12
+
     @use_file_name_or_kwds
     def __init__(self, grid, method='D8', flow_equation='default',
-                 Chezys_C=30., Mannings_n=0.03, **kwds):
+                 Chezys_C=30., Mannings_n=0.03, solver='jacobi', **kwds):
         """Initialize flow router.
         """
         if RasterModelGrid in inspect.getmro(grid.__class__):
@@ -162,6 +184,12 @@ class PotentialityFlowRouter(Component):
             self.route_on_diagonals = True
         else:
             self.route_on_diagonals = False
+        assert solver in ('jacobi', 'direct', 'krylov')
+        self.solver = solver
+        self._solver_report = None
+        self._matrix_pattern = None
+        self._solve_matrix = None
+        self._solved_topography = None
 
         # hacky fix because water__discharge is defined on both links and nodes
         for out_field in self._output_var_names:
@@ -222,13 +250,19 @@ class PotentialityFlowRouter(Component):
         pos_incoming_link_grads = (-link_grad_at_node_w_dir).clip(0.)
 
         if not self.route_on_diagonals or not self._raster:
-            while mismatch > 1.e-6:
+            if self.solver != 'jacobi':
+                self._solve_for_potential(z, outgoing_sum,
+                                          pos_incoming_link_grads,
+                                          grid.neighbors_at_node, qwater_in)
+            sweeps = 0
+            while self.solver == 'jacobi' and mismatch > 1.e-6:
                 K_link_ends = self._K[grid.neighbors_at_node]
                 incoming_K_sum = (pos_incoming_link_grads*K_link_ends
                                   ).sum(axis=1) + self._min_slope_thresh
                 self._K[:] = (incoming_K_sum + qwater_in)/outgoing_sum
                 mismatch = np.sum(np.square(self._K-prev_K))
                 prev_K = self._K.copy()
+                sweeps += 1
 
             upwind_K = grid.map_value_at_max_node_to_link(z, self._K)
             self._discharges_at_link[:] = upwind_K * g
@@ -246,7 +280,16 @@ class PotentialityFlowRouter(Component):
 
             outgoing_sum += np.sum(diag_grad_at_node_w_dir.clip(0.), axis=1)
             pos_incoming_diag_grads = (-diag_grad_at_node_w_dir).clip(0.)
-            while mismatch > 1.e-6:
+            if self.solver != 'jacobi':
+                self._solve_for_potential(
+                    z, outgoing_sum,
+                    np.hstack((pos_incoming_link_grads,
+                               pos_incoming_diag_grads)),
+                    np.hstack((grid.neighbors_at_node,
+                               grid._diagonal_neighbors_at_node)),
+                    qwater_in)
+            sweeps = 0
+            while self.solver == 'jacobi' and mismatch > 1.e-6:
                 K_link_ends = self._K[grid.neighbors_at_node]
                 K_diag_ends = self._K[grid._diagonal_neighbors_at_node]
                 incoming_K_sum = ((pos_incoming_link_grads * K_link_ends
@@ -256,6 +299,7 @@ class PotentialityFlowRouter(Component):
                 self._K[:] = (incoming_K_sum + qwater_in) / outgoing_sum
                 mismatch = np.sum(np.square(self._K - prev_K))
                 prev_K = self._K.copy()
+                sweeps += 1
 
             # ^this is necessary to suppress stupid apparent link Qs at flow
             # edges, if present.
@@ -269,6 +313,10 @@ class PotentialityFlowRouter(Component):
                 upwind_diag_K * gd)
             self._discharges_at_link[grid._all_d8_inactive_links] = 0.
 
+        if self.solver == 'jacobi':
+            self._solver_report = {'solver': 'jacobi', 'iterations': sweeps,
+                                   'residual': mismatch}
+
         np.multiply(self._K, outgoing_sum, out=self._Qw)
         # there is no sensible way to save discharges at links, if we route
         # on diagonals.
@@ -288,6 +336,105 @@ class PotentialityFlowRouter(Component):
         else:
             pass
 
+    def _solve_for_potential(self, z, outgoing_sum, incoming_grads,
+                             neighbors, qwater_in):
+        """Solve for the potential field with a sparse solver.
+
+        The potential at a node, times the sum of its outgoing gradients, is
+        the discharge out of the node. Each node's discharge is its water
+        input plus the share of each upstream neighbor's discharge that
+        flows to it,
+
+            Q_i - sum_j (g_ij / s_j) Q_j = q_i
+
+        where g_ij is the gradient from neighbor j down to node i, and s_j
+        is the sum of the outgoing gradients of j. This system is solved
+        for discharge, which keeps it well-conditioned even where a node
+        has no outflow, and the potentials are then Q / s.
+
+        Parameters
+        ----------
+        z : ndarray
+            Elevations at nodes.
+        outgoing_sum : ndarray
+            Sum of outgoing gradients at each node.
+        incoming_grads : ndarray of shape (n_nodes, n_neighbors)
+            Gradients from each neighbor down to each node.
+        neighbors : ndarray of shape (n_nodes, n_neighbors)
+            Neighbors of each node, with -1 for missing neighbors.
+        qwater_in : ndarray
+            Water input at each node.
+        """
+        if (self._solved_topography is None or
+                self._solved_topography[0] != self.grid.bc_set_code or
+                not np.array_equal(self._solved_topography[1], z)):
+            self._assemble_matrix(outgoing_sum, incoming_grads, neighbors)
+            self._solved_topography = (self.grid.bc_set_code, z.copy())
+
+        rhs = qwater_in + self._min_slope_thresh
+        (discharge, iterations) = self._solve_matrix(rhs)
+
+        residual = (np.linalg.norm(self._matrix.dot(discharge) - rhs) /
+                    np.linalg.norm(rhs))
+        self._solver_report = {'solver': self.solver,
+                               'iterations': iterations,
+                               'residual': residual}
+        self._K[:] = discharge / outgoing_sum
+
+    def _assemble_matrix(self, outgoing_sum, incoming_grads, neighbors):
+        """Assemble (and factor) the matrix of the discharge equations.
+
+        The sparsity pattern of the matrix depends only on the connectivity
+        of the grid, and so is kept between calls.
+        """
+        n_nodes = self.grid.number_of_nodes
+
+        if (self._matrix_pattern is None or
+                self._matrix_pattern[0] != self.grid.bc_set_code):
+            (slots, ) = np.where(neighbors.flat >= 0)
+            rows = np.concatenate((np.arange(n_nodes),
+                                   slots // neighbors.shape[1]))
+            cols = np.concatenate((np.arange(n_nodes), neighbors.flat[slots]))
+            pattern = sparse.csc_matrix(
+                (np.arange(1, rows.size + 1), (rows, cols)),
+                shape=(n_nodes, n_nodes))
+            self._matrix_pattern = (self.grid.bc_set_code, slots,
+                                    cols[n_nodes:], pattern.data - 1,
+                                    pattern.indices, pattern.indptr)
+
+        (_, slots, upstream, order, indices, indptr) = self._matrix_pattern
+        values = np.concatenate((np.ones(n_nodes),
+                                 - incoming_grads.flat[slots] /
+                                 outgoing_sum[upstream]))
+        self._matrix = sparse.csc_matrix((values[order], indices, indptr),
+                                         shape=(n_nodes, n_nodes))
+
+        if self.solver == 'direct':
+            lu = linalg.splu(self._matrix)
+            self._solve_matrix = lambda rhs: (lu.solve(rhs), 1)
+        else:
+            ilu = linalg.spilu(self._matrix)
+            preconditioner = linalg.LinearOperator((n_nodes, n_nodes),
+                                                   ilu.solve)
+
+            def _solve_matrix(rhs):
+                iterations = [0]
+
+                def _count(_):
+                    iterations[0] += 1
+
+                (solution, info) = linalg.bicgstab(
+                    self._matrix, rhs, x0=self._Qw.copy(),
+                    tol=self._krylov_tolerance, M=preconditioner,
+                    callback=_count)
+                if info != 0:
+                    raise RuntimeError(
+                        'Krylov solver did not converge ({info})'.format(
+                            info=info))
+                return solution, iterations[0]
+
+            self._solve_matrix = _solve_matrix
+
     def run_one_step(self, **kwds):
         """Route surface-water flow over a landscape.
 
@@ -295,6 +442,19 @@ class PotentialityFlowRouter(Component):
         """
         self.route_flow(**kwds)
 
+    @property
+    def solver_report(self):
+        """Report of the last solve for the potential field.
+
+        A dict that gives the *solver* used, the number of *iterations*
+        (sweeps for 'jacobi', BiCGSTAB iterations for 'krylov', and 1 for
+        'direct'), and the final *residual*. For 'jacobi' the residual is
+        the sum of squared changes in potential over the last sweep;
+        otherwise it is the relative norm of the residual of the discharge
+        equations.
+        """
+        return self._solver_report
+
     @property
     def discharges_at_links(self):
         """Return the discharges at links.
@@ -59,17 +59,18 @@ def test_sheetflow():
          1.00000000e+00,   1.00000000e+00,   1.00000000e+00,
          1.00000000e+00])
 
-    mg = RasterModelGrid((NROWS, NCOLS), (DX, DX))
-    z = (3000. - mg.node_x) * 0.5
-    mg.at_node['topographic__elevation'] = z
+    for solver in ('jacobi', 'direct', 'krylov'):
+        mg = RasterModelGrid((NROWS, NCOLS), (DX, DX))
+        z = (3000. - mg.node_x) * 0.5
+        mg.at_node['topographic__elevation'] = z
 
-    mg.set_closed_boundaries_at_grid_edges(False, True, True, True)
-    mg.add_ones('node', 'water__unit_flux_in')
+        mg.set_closed_boundaries_at_grid_edges(False, True, True, True)
+        mg.add_ones('node', 'water__unit_flux_in')
 
-    pfr = PotentialityFlowRouter(mg)
-    pfr.route_flow()
+        pfr = PotentialityFlowRouter(mg, solver=solver)
+        pfr.route_flow()
 
-    assert_allclose(mg.at_node['surface_water__discharge'], flux)
+        assert_allclose(mg.at_node['surface_water__discharge'], flux)
 
 
 def test_in_network():
@@ -172,17 +173,46 @@ def test_in_network():
          6.04728603e+24,   2.94714791e+24,   2.00238741e+24,
          8.82968356e+23])
 
-    mg = RasterModelGrid((NROWS, NCOLS), (DX, DX))
-
-    mg.add_field('node', 'topographic__elevation', z)
-
-    Qin = np.ones_like(z) * 100. / (60. * 60. * 24. * 365.25)
-    # ^remember, flux is /s, so this is a small number!
-    mg.add_field('node', 'water__unit_flux_in', Qin)
-
-    pfr = PotentialityFlowRouter(mg, flow_equation='Manning')
-    pfr.route_flow()
-
-    assert_allclose(mg.at_node['surface_water__discharge'], flux)
-    assert_allclose(mg.at_node['flow__potential'][mg.core_nodes],
-                    potnt[mg.core_nodes])
+    for solver in ('jacobi', 'direct', 'krylov'):
+        mg = RasterModelGrid((NROWS, NCOLS), (DX, DX))
+
+        mg.add_field('node', 'topographic__elevation', z)
+
+        Qin = np.ones_like(z) * 100. / (60. * 60. * 24. * 365.25)
+        # ^remember, flux is /s, so this is a small number!
+        mg.add_field('node', 'water__unit_flux_in', Qin)
+
+        pfr = PotentialityFlowRouter(mg, flow_equation='Manning',
+                                     solver=solver)
+        pfr.route_flow()
+
+        assert_allclose(mg.at_node['surface_water__discharge'], flux)
+        assert_allclose(mg.at_node['flow__potential'][mg.core_nodes],
+                        potnt[mg.core_nodes])
+
+
+def test_sparse_solver_reuses_matrix():
+    """Test that only the water input can change between solves."""
+    for method in ('D8', 'D4'):
+        mg = RasterModelGrid((NROWS, NCOLS), (DX, DX))
+        z = mg.add_field('node', 'topographic__elevation',
+                         (3000. - mg.node_x) * 0.5 + mg.node_y * 0.1)
+        mg.set_closed_boundaries_at_grid_edges(False, True, True, True)
+        Qin = mg.add_ones('node', 'water__unit_flux_in')
+
+        pfr = PotentialityFlowRouter(mg, method=method, solver='direct')
+        pfr.route_flow()
+        matrix = pfr._matrix
+        flux = mg.at_node['surface_water__discharge'].copy()
+
+        Qin *= 2.
+        pfr.route_flow()
+        assert_is(pfr._matrix, matrix)
+        assert_allclose(mg.at_node['surface_water__discharge'], 2. * flux,
+                        rtol=1.e-10, atol=1.e-10)
+        assert_is(pfr.solver_report['iterations'], 1)
+        assert pfr.solver_report['residual'] < 1.e-10
+
+        z[mg.core_nodes] += 1.
+        pfr.route_flow()
+        assert pfr._matrix is not matrix
@@ -0,0 +1,77 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_UINT8 = np.uint8
+ctypedef np.uint8_t DTYPE_UINT8_t
+
+
+@cython.boundscheck(False)
+def find_channel_segments(np.ndarray[DTYPE_INT_t, ndim=1] valid_dstr_order,
+                          np.ndarray[DTYPE_INT_t, ndim=1] receivers,
+                          np.ndarray[DTYPE_UINT8_t, ndim=1] incorporated,
+                          np.ndarray[DTYPE_INT_t, ndim=1] seg_nodes,
+                          np.ndarray[DTYPE_INT_t, ndim=1] seg_offsets):
+    """Split the channel network into unique reaches.
+
+    Starting from each node not already in a reach, follow the receivers
+    downstream until reaching either the end of a flow path or a node that
+    is already in a reach. In the latter case, that node is repeated as the
+    final node of the new reach. Each node is visited at most twice, so the
+    whole network is split in a single pass.
+
+    Parameters
+    ----------
+    valid_dstr_order : array of ints
+        Nodes in the channel network, in the order in which to start reaches.
+    receivers : array of ints
+        The receiver of each node.
+    incorporated : array of uint8
+        Zeros on input, one for each node in a reach on output.
+    seg_nodes : array of ints
+        Output array for the nodes of each reach, top-to-bottom and one
+        reach after another. Must be at least as long as the number of
+        nodes plus *valid_dstr_order*.
+    seg_offsets : array of ints
+        Output array for the offset into *seg_nodes* of the start of each
+        reach. The final reach is followed by the number of nodes written.
+        Must be one longer than *valid_dstr_order*.
+
+    Returns
+    -------
+    int
+        The number of reaches.
+    """
+    cdef int n_nodes = valid_dstr_order.shape[0]
+    cdef int n_segs = 0
+    cdef int n_seg_nodes = 0
+    cdef int i
+    cdef int node
+    cdef int next_node
+
+    for i in range(n_nodes):
+        node = valid_dstr_order[i]
+        if incorporated[node]:
+            continue
+        incorporated[node] = 1
+        seg_offsets[n_segs] = n_seg_nodes
+        seg_nodes[n_seg_nodes] = node
+        n_seg_nodes += 1
+        while True:
+            next_node = receivers[node]
+            if next_node == node:  # end of flow path
+                break
+            seg_nodes[n_seg_nodes] = next_node
+            n_seg_nodes += 1
+            if incorporated[next_node]:
+                break
+            incorporated[next_node] = 1
+            node = next_node
+        n_segs += 1
+    seg_offsets[n_segs] = n_seg_nodes
+
+    return n_segs
@@ -18,6 +18,8 @@ from landlab.grid.base import BAD_INDEX_VALUE
 from landlab.utils.decorators import use_file_name_or_kwds
 import numpy as np
 
+from .cfuncs import find_channel_segments as _find_channel_segments
+
 
 class SteepnessFinder(Component):
     """
@@ -173,64 +175,117 @@ class SteepnessFinder(Component):
         self.ksn.fill(0.)
         # test for new kwds:
         reftheta = kwds.get('reference_concavity', self._reftheta)
+        self._calc_steepnesses(self.ksn, self._mask, reftheta, **kwds)
+
+    def calculate_steepnesses_for_concavities(self, concavities, **kwds):
+        """Calculate steepness indices for several reference concavities.
+
+        The channel network is only segmented once, and the indices for every
+        concavity are found from the same segments. The
+        'channel__steepness_index' field and the hillslope mask are not
+        updated.
+
+        Parameters
+        ----------
+        concavities : array of floats
+            The reference concavities to use.
+
+        Other parameters are as for :func:`calculate_steepnesses`.
+
+        Returns
+        -------
+        ksn : (n_nodes, n_concavities) array of floats
+            Steepness index at each node (rows) for each concavity (columns).
+            Nodes without a defined value receive zeros.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid, CLOSED_BOUNDARY
+        >>> from landlab.components import FlowRouter
+        >>> mg = RasterModelGrid((3, 6), 100.)
+        >>> for nodes in (mg.nodes_at_right_edge, mg.nodes_at_bottom_edge,
+        ...               mg.nodes_at_top_edge):
+        ...     mg.status_at_node[nodes] = CLOSED_BOUNDARY
+        >>> _ = mg.add_field('node', 'topographic__elevation', mg.node_x)
+        >>> fr = FlowRouter(mg)
+        >>> sf = SteepnessFinder(mg, min_drainage_area=10000.)
+        >>> _ = fr.route_flow()
+        >>> ksn = sf.calculate_steepnesses_for_concavities([0., 0.5])
+        >>> ksn[6:12]  # doctest: +NORMALIZE_WHITESPACE
+        array([[   0.        ,    0.        ],
+               [   1.        ,  200.        ],
+               [   1.        ,  173.20508076],
+               [   1.        ,  141.42135624],
+               [   1.        ,  100.        ],
+               [   0.        ,    0.        ]])
+        """
+        reftheta = np.asarray(concavities, dtype=float).reshape(-1)
+        ksn = np.zeros((self.grid.number_of_nodes, reftheta.size))
+        mask = self.grid.ones('node', dtype=bool)
+        self._calc_steepnesses(ksn, mask, reftheta, **kwds)
+        return ksn
+
+    def _calc_steepnesses(self, ksn, mask, reftheta, **kwds):
+        """Calculate steepness indices into *ksn* for each of *reftheta*.
+
+        *ksn* has one row for each node, and, if *reftheta* is an array, one
+        column for each concavity. Channel nodes are set False in *mask*.
+        """
         min_drainage = kwds.get('min_drainage_area', self.min_drainage)
         elev_step = kwds.get('elev_step', self._elev_step)
         discretization_length = kwds.get('discretization_length',
                                          self._discretization)
+        # one trailing axis for each concavity, if more than one:
+        theta_shape = (1, ) * np.ndim(reftheta)
 
         upstr_order = self.grid.at_node['flow__upstream_node_order']
         # get an array of only nodes with A above threshold:
         valid_dstr_order = (upstr_order[self.grid.at_node['drainage_area'][
             upstr_order] >= min_drainage])[::-1]
-        valid_dstr_elevs = self.grid.at_node['topographic__elevation'][
-            valid_dstr_order]
-        valid_dstr_areas = self.grid.at_node['drainage_area'][valid_dstr_order]
         # note elevs are guaranteed to be in order, UNLESS a fill
         # algorithm has been used.
-        nodes_incorporated = self.grid.zeros('node', dtype=bool)
-        # now do each poss channel in turn
-        # get the head of the first (longest!) channel:
-        for dstr_order_index in range(valid_dstr_order.size):
-            this_ch_top_node = valid_dstr_order[dstr_order_index]  # top node
-            if not nodes_incorporated[this_ch_top_node]:
-                nodes_incorporated[this_ch_top_node] = True
-                nodes_in_channel = [this_ch_top_node, ]
-                penultimate_node = this_ch_top_node
-                current_node_incorporated = False
-                while not current_node_incorporated:
-                    next_node = self.grid.at_node['flow__receiver_node'][
-                        penultimate_node]
-                    if next_node == penultimate_node:  # end of flow path
-                        break
-                    nodes_in_channel.append(next_node)
-                    current_node_incorporated = nodes_incorporated[next_node]
-                    # ^ this is a COPY op, so we're free to update the array
-                    nodes_incorporated[next_node] = True
-                    penultimate_node = next_node
-                # by here, we have a full, unique reach in nodes_in_channel
-                # it incorporates a single, duplicate node at the lower end
+        (seg_nodes, seg_offsets) = self.channel_segments(valid_dstr_order)
+
+        if not (elev_step or discretization_length):
+            # all the nodes; much easier as links work, and every segment can
+            # be done at once. Chop off the final node of each segment, as it
+            # either belongs to an existing flow path or has S = 0.
+            is_final = np.zeros(seg_nodes.size, dtype=bool)
+            is_final[seg_offsets[1:] - 1] = True
+            assert np.all(self.grid.at_node['topographic__steepest_slope'][
+                seg_nodes] >= 0.)
+            ch_nodes = seg_nodes[~is_final]
+            log_A = np.log10(self.grid.at_node['drainage_area'][ch_nodes])
+            log_S = np.log10(self.grid.at_node['topographic__steepest_slope'][
+                ch_nodes])
+            # we're potentially propagating nans here if S<=0
+            log_ksn = (log_S.reshape((-1, ) + theta_shape) +
+                       reftheta * log_A.reshape((-1, ) + theta_shape))
+            ksn[ch_nodes] = 10.**log_ksn
+            mask[seg_nodes] = False
+        else:
+            # now do each poss channel in turn
+            for seg in range(seg_offsets.size - 1):
+                # a full, unique reach; it incorporates a single, duplicate
+                # node at the lower end
+                ch_nodes = seg_nodes[seg_offsets[seg]:seg_offsets[seg + 1]]
                 # Now, if this segment long enough?
                 if elev_step:
-                    top_elev = self._elev[nodes_in_channel[0]]
-                    base_elev = self._elev[nodes_in_channel[-1]]
+                    top_elev = self._elev[ch_nodes[0]]
+                    base_elev = self._elev[ch_nodes[-1]]
                     # work up the channel from the base to make new interp pts
-                    interp_pt_elevs = np.arange(base_elev, top_elev,
-                                                elev_step)
+                    interp_pt_elevs = np.arange(base_elev, top_elev, elev_step)
                     if interp_pt_elevs.size <= 1:
                         # <1 step; bail on this whole segment
                         break
                     # now we can fairly closely follow the Geomorphtools
                     # algorithm:
-                    ch_nodes = np.array(nodes_in_channel)
-                    # ^ this is top-to-bottom
                     ch_A = self.grid.at_node['drainage_area'][ch_nodes]
                     ch_dists = self.channel_distances_downstream(ch_nodes)
-                    ch_S = self.interpolate_slopes_with_step(ch_nodes,
-                                                             ch_dists,
-                                                             interp_pt_elevs)
+                    ch_S = self.interpolate_slopes_with_step(
+                        ch_nodes, ch_dists, interp_pt_elevs)
                 else:
-                    # all the nodes; much easier as links work
-                    ch_nodes = np.array(nodes_in_channel)
                     ch_dists = self.channel_distances_downstream(ch_nodes)
                     ch_A = self.grid.at_node['drainage_area'][ch_nodes]
                     ch_S = self.grid.at_node['topographic__steepest_slope'][
@@ -243,19 +298,75 @@ class SteepnessFinder(Component):
                                                        discretization_length)
                 else:  # not discretized
                     # also chopping off the final node, as above
-                    log_A = np.log10(ch_A[:-1])
-                    log_S = np.log10(ch_S[:-1])
+                    log_A = np.log10(ch_A[:-1]).reshape((-1, ) + theta_shape)
+                    log_S = np.log10(ch_S[:-1]).reshape((-1, ) + theta_shape)
                     # we're potentially propagating nans here if S<=0
                     log_ksn = log_S + reftheta * log_A
                     ch_ksn = 10.**log_ksn
                 # save the answers into the main arrays:
-                assert np.all(self._mask[ch_nodes[:-1]])
+                assert np.all(mask[ch_nodes[:-1]])
                 # Final node gets trimmed off...
-                self.ksn[ch_nodes[:-1]] = ch_ksn
-                self._mask[ch_nodes] = False
+                ksn[ch_nodes[:-1]] = ch_ksn
+                mask[ch_nodes] = False
         # now a final sweep to remove any undefined ksn values:
-        self._mask[self.ksn == -1.] = True
-        self.ksn[self.ksn == -1.] = 0.
+        is_undefined = np.any((ksn == -1.).reshape((ksn.shape[0], -1)),
+                              axis=1)
+        mask[is_undefined] = True
+        ksn[is_undefined] = 0.
+
+    def channel_segments(self, valid_dstr_order):
+        """
+        Split the channel network into unique reaches, in a single pass.
+
+        Starting from each node in turn, flow is followed downstream until it
+        reaches either the end of a flow path or a node in an earlier reach.
+        In the latter case, that node is included again as the last node of
+        the new reach.
+
+        Parameters
+        ----------
+        valid_dstr_order : array of ints
+            The channel nodes, in the order in which to start new reaches.
+
+        Returns
+        -------
+        (seg_nodes, seg_offsets) : tuple of arrays of ints
+            The nodes of each reach, top-to-bottom, one reach after
+            another, and the offset into *seg_nodes* of the start of each
+            reach (followed by the length of *seg_nodes*).
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid, CLOSED_BOUNDARY
+        >>> from landlab.components import FlowRouter
+        >>> mg = RasterModelGrid((4, 5), 1.)
+        >>> for nodes in (mg.nodes_at_right_edge, mg.nodes_at_bottom_edge,
+        ...               mg.nodes_at_top_edge):
+        ...     mg.status_at_node[nodes] = CLOSED_BOUNDARY
+        >>> _ = mg.add_field('node', 'topographic__elevation',
+        ...                  mg.node_x + 10. * (mg.node_y > 1.))
+        >>> fr = FlowRouter(mg)
+        >>> sf = SteepnessFinder(mg)
+        >>> _ = fr.route_flow()
+        >>> mg.at_node['flow__receiver_node'][[5, 6, 7, 8, 11, 12, 13]]
+        array([5, 5, 6, 7, 6, 7, 8])
+        >>> (seg_nodes, seg_offsets) = sf.channel_segments(
+        ...     np.array([11, 12, 13, 8, 7, 6, 5]))
+        >>> seg_nodes
+        array([11,  6,  5, 12,  7,  6, 13,  8,  7])
+        >>> seg_offsets
+        array([0, 3, 6, 9])
+        """
+        valid_dstr_order = np.asarray(valid_dstr_order, dtype=int)
+        receivers = self.grid.at_node['flow__receiver_node']
+        incorporated = np.zeros(self.grid.number_of_nodes, dtype=np.uint8)
+        seg_nodes = np.empty(self.grid.number_of_nodes +
+                             valid_dstr_order.size, dtype=int)
+        seg_offsets = np.empty(valid_dstr_order.size + 1, dtype=int)
+        n_segs = _find_channel_segments(valid_dstr_order, receivers,
+                                        incorporated, seg_nodes, seg_offsets)
+        return (seg_nodes[:seg_offsets[n_segs]], seg_offsets[:n_segs + 1])
 
     def channel_distances_downstream(self, ch_nodes):
         """
@@ -387,8 +498,9 @@ class SteepnessFinder(Component):
             Drainage areas at each node in the flowpath.
         ch_S : array of floats
             Slope at each node in the flowpath (defined as positive).
-        ref_theta : float
-            The reference concavity; must be positive.
+        ref_theta : float or array of floats
+            The reference concavity; must be positive. If an array, indices
+            are found for each concavity.
         discretization_length : float (m)
             The streamwise length of each segment.
 
@@ -397,7 +509,8 @@ class SteepnessFinder(Component):
         ch_ksn : array of floats
             The normalized steepness index at each node in the flowpath,
             EXCEPT THE LAST. (i.e., length is (ch_dists.size - 1)). Values
-            will be the same within each defined segment.
+            will be the same within each defined segment. If *ref_theta* is
+            an array, there is one column for each concavity.
 
         Examples
         --------
@@ -434,7 +547,7 @@ class SteepnessFinder(Component):
         >>> np.allclose(ch_ksn_overdiscretized, ksn_10)
         True
         """
-        ch_ksn = np.empty_like(ch_A)
+        ch_ksn = np.empty(ch_A.shape + np.shape(ref_theta))
         # need to remove the influence of the final node in the seg,
         # as it reflects either the edge of the grid (S=0) or a point
         # after a confluence - hence the 0.000001
@@ -8,13 +8,21 @@ cimport cython
 DTYPE_FLOAT = np.double
 ctypedef np.double_t DTYPE_FLOAT_t
 
+ctypedef fused DTYPE_REAL_t:
+    np.float32_t
+    np.float64_t
+
 DTYPE_INT = np.int
 ctypedef np.int_t DTYPE_INT_t
 
+DTYPE_UINT8 = np.uint8
+ctypedef np.uint8_t DTYPE_UINT8_t
+
 
 cdef extern from "math.h":
     double fabs(double x) nogil
     double pow(double x, double y) nogil
+    double exp(double x) nogil
 
 
 @cython.boundscheck(False)
@@ -53,14 +61,59 @@ def erode_avoiding_pits(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
             node_dz[src_id] = (node_z[src_id] - z_dst_after) * 0.999999
 
 
+@cython.cdivision(True)
+cdef inline int _erode_with_link_alpha(double z_src, double z_dst,
+                                       double alpha, double n,
+                                       double threshxdt,
+                                       double * z_new) nogil:
+    """Find the eroded elevation of a node with Newton's method.
+
+    Returns 0 on success, and 1 if the solver failed to converge.
+    """
+    cdef int niter = 0
+    cdef double z_diff
+    cdef double prev_z = 0.
+    cdef double next_z = z_src
+    cdef double f
+    cdef double excess_thresh
+
+    while True:
+        niter += 1
+        if niter >= 50:
+            return 1
+        z_diff = next_z - z_dst
+        f = alpha * pow(z_diff, n - 1.)
+        excess_thresh = f * z_diff - threshxdt
+        if excess_thresh < 0.:
+            excess_thresh = 0.
+        next_z = next_z - ((next_z - z_src + excess_thresh) / (1. + n * f))
+        if next_z < z_dst:
+            next_z = z_dst + 1.e-15  # maintain connectivity
+        if next_z != 0.:
+            if fabs((next_z - prev_z)/next_z) < 1.48e-08 or n == 1.:
+                break
+        else:
+            break
+
+        prev_z = next_z
+
+    z_new[0] = next_z
+    return 0
+
+
+@cython.boundscheck(False)
 def erode_with_link_alpha_varthresh(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                                     np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
-                                    np.ndarray[DTYPE_FLOAT_t, ndim=1] threshsxdt,
-                                    np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
+                                    np.ndarray[DTYPE_REAL_t, ndim=1] threshsxdt,
+                                    np.ndarray[DTYPE_REAL_t, ndim=1] alpha,
                                     DTYPE_FLOAT_t n,
-                                    np.ndarray[DTYPE_FLOAT_t, ndim=1] z):
+                                    np.ndarray[DTYPE_REAL_t, ndim=1] z):
     """Erode node elevations using alpha scaled by link length.
 
+    Thresholds, alpha and elevations must all be of the same floating-point
+    type, either single or double precision. New elevations are found in
+    double precision.
+
     Parameters
     ----------
     src_nodes : array_like
@@ -80,63 +133,36 @@ def erode_with_link_alpha_varthresh(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
     cdef unsigned int src_id
     cdef unsigned int dst_id
     cdef unsigned int i
-    cdef double threshxdt
-    cdef double z_diff
-    cdef double prev_z
+    cdef int failed
     cdef double next_z
-    cdef double f
-    cdef double excess_thresh
 
     for i in range(n_nodes):
         src_id = src_nodes[i]
         dst_id = dst_nodes[src_id]
-        threshxdt = threshsxdt[i]
 
         if src_id != dst_id and z[src_id] > z[dst_id]:
-            next_z = z[src_id]
-            prev_z = 0.
-            niter = 0
-
-            while True:
-                niter += 1
-                if niter > 40:
-                    print('===============')
-                    print(z[src_id])
-                    print(z[dst_id])
-                    print(next_z)
-                    print(z_diff)
-                    print(f)
-                    print(alpha[src_id])
-                assert niter < 50, 'failure to converge in SP solver'
-                z_diff = next_z - z[dst_id]
-                f = alpha[src_id] * pow(z_diff, n - 1.)
-                excess_thresh = f * z_diff - threshxdt
-                if excess_thresh < 0.:
-                    excess_thresh = 0.
-                next_z = next_z - ((next_z - z[src_id] + excess_thresh) /
-                                   (1. + n * f))
-                if next_z < z[dst_id]:
-                    next_z = z[dst_id] + 1.e-15  # maintain connectivity
-                if next_z != 0.:
-                    if fabs((next_z - prev_z)/next_z) < 1.48e-08 or n == 1.:
-                        break
-                else:
-                    break
-
-                prev_z = next_z;
+            failed = _erode_with_link_alpha(z[src_id], z[dst_id],
+                                            alpha[src_id], n, threshsxdt[i],
+                                            &next_z)
+            assert not failed, 'failure to converge in SP solver'
 
             if next_z < z[src_id]:
                 z[src_id] = next_z
 
 
+@cython.boundscheck(False)
 def erode_with_link_alpha_fixthresh(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                                     np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
                                     DTYPE_FLOAT_t threshxdt,
-                                    np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
+                                    np.ndarray[DTYPE_REAL_t, ndim=1] alpha,
                                     DTYPE_FLOAT_t n,
-                                    np.ndarray[DTYPE_FLOAT_t, ndim=1] z):
+                                    np.ndarray[DTYPE_REAL_t, ndim=1] z):
     """Erode node elevations using alpha scaled by link length.
 
+    Alpha and elevations must be of the same floating-point type, either
+    single or double precision. New elevations are found in double
+    precision.
+
     Parameters
     ----------
     src_nodes : array_like
@@ -156,49 +182,334 @@ def erode_with_link_alpha_fixthresh(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
     cdef unsigned int src_id
     cdef unsigned int dst_id
     cdef unsigned int i
-    cdef unsigned int niter
-    cdef double z_diff
-    cdef double prev_z
+    cdef int failed
     cdef double next_z
-    cdef double f
-    cdef double excess_thresh
 
     for i in range(n_nodes):
         src_id = src_nodes[i]
         dst_id = dst_nodes[src_id]
 
         if src_id != dst_id and z[src_id] > z[dst_id]:
-            next_z = z[src_id]
-            prev_z = 0.
-            niter = 0
-
-            while True:
-                niter += 1
-                if niter > 40:
-                    print('===============')
-                    print(z[src_id])
-                    print(z[dst_id])
-                    print(next_z)
-                    print(z_diff)
-                    print(f)
-                    print(alpha[src_id])
-                assert niter < 50, 'failure to converge in SP solver'
-                z_diff = next_z - z[dst_id]
-                f = alpha[src_id] * pow(z_diff, n - 1.)
-                excess_thresh = f * z_diff - threshxdt
-                if excess_thresh < 0.:
-                    excess_thresh = 0.
-                next_z = next_z - ((next_z - z[src_id] + excess_thresh) /
-                                   (1. + n * f))
-                if next_z < z[dst_id]:
-                   next_z = z[dst_id] + 1.e-15  # maintain connectivity
-                if next_z != 0.:
-                    if fabs((next_z - prev_z)/next_z) < 1.48e-08 or n == 1.:
+            failed = _erode_with_link_alpha(z[src_id], z[dst_id],
+                                            alpha[src_id], n, threshxdt,
+                                            &next_z)
+            assert not failed, 'failure to converge in SP solver'
+
+            if next_z < z[src_id]:
+                z[src_id] = next_z
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def erode_with_link_alpha_basins(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
+                                 np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+                                 np.ndarray[DTYPE_REAL_t, ndim=1] threshsxdt,
+                                 np.ndarray[DTYPE_REAL_t, ndim=1] alpha,
+                                 DTYPE_FLOAT_t n,
+                                 np.ndarray[DTYPE_REAL_t, ndim=1] z,
+                                 np.ndarray[DTYPE_INT_t, ndim=2] basin_ranges):
+    """Erode node elevations using alpha scaled by link length, by basin.
+
+    As :func:`erode_with_link_alpha_varthresh`, but only for the sections
+    of *src_nodes* that hold the drainage basins given by *basin_ranges*.
+    The GIL is released, so other threads can erode other basins at the
+    same time.
+
+    Parameters
+    ----------
+    src_nodes : array_like
+        Ordered upstream node ids.
+    dst_nodes : array_like
+        Node ids of nodes receiving flow.
+    threshsxdt : array_like
+        Incision thresholds, in the order of *src_nodes*, multiplied by the
+        timestep.
+    alpha : array_like
+        Erosion factor scaled by link length to the *n - 1*.
+    n : float
+        Exponent.
+    z : array_like
+        Node elevations.
+    basin_ranges : array_like of int, shape (n_basins, 2)
+        Start and end (exclusive) of each basin in *src_nodes*.
+    """
+    cdef int n_basins = basin_ranges.shape[0]
+    cdef int basin
+    cdef int src_id
+    cdef int dst_id
+    cdef int i
+    cdef int failed = 0
+    cdef double next_z
+
+    with nogil:
+        for basin in range(n_basins):
+            for i in range(basin_ranges[basin, 0], basin_ranges[basin, 1]):
+                src_id = src_nodes[i]
+                dst_id = dst_nodes[src_id]
+
+                if src_id != dst_id and z[src_id] > z[dst_id]:
+                    failed = _erode_with_link_alpha(
+                        z[src_id], z[dst_id], alpha[src_id], n,
+                        threshsxdt[i], &next_z)
+                    if failed:
                         break
-                else:
-                    break
 
-                prev_z = next_z;
+                    if next_z < z[src_id]:
+                        z[src_id] = next_z
+            if failed:
+                break
 
-            if next_z < z[src_id]:
-                z[src_id] = next_z
\ No newline at end of file
+    assert not failed, 'failure to converge in SP solver'
+
+
+@cython.boundscheck(False)
+def smooth_stream_power_eroder_solver(
+        np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
+        np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+        np.ndarray[DTYPE_UINT8_t, ndim=1] has_receiver,
+        np.ndarray[DTYPE_REAL_t, ndim=1] alpha,
+        np.ndarray[DTYPE_REAL_t, ndim=1] gamma,
+        np.ndarray[DTYPE_REAL_t, ndim=1] delta,
+        np.ndarray[DTYPE_REAL_t, ndim=1] z):
+    """Erode node elevations with the smooth-threshold stream power law.
+
+    Solve, from downstream to upstream, for the new elevation, *x*, of
+    each node,
+
+    .. math::
+
+        x (1 + \\alpha) + \\gamma e^{-\\delta (x - z_r)} -
+        (z + \\alpha z_r + \\gamma) = 0
+
+    where :math:`z_r` is the new elevation of the node's receiver. Roots
+    are found with Newton's method using the same convergence criteria as
+    *scipy.optimize.newton*: iteration stops once successive estimates
+    differ by no more than 1.48e-8, and fails after 50 iterations.
+
+    Alpha, gamma, delta and elevations must all be of the same
+    floating-point type, either single or double precision. Roots are found
+    in double precision.
+
+    Parameters
+    ----------
+    src_nodes : array_like
+        Ordered upstream node ids.
+    dst_nodes : array_like
+        Node ids of nodes receiving flow.
+    has_receiver : array_like of uint8
+        Flags that indicate if a node drains to a receiver.
+    alpha : array_like
+        K A^m dt / L at each node.
+    gamma : array_like
+        Threshold multiplied by the time step at each node.
+    delta : array_like
+        K A^m / (L * threshold) at each node.
+    z : array_like
+        Node elevations.
+    """
+    cdef unsigned int n_nodes = src_nodes.size
+    cdef unsigned int src_id
+    cdef unsigned int dst_id
+    cdef unsigned int i
+    cdef unsigned int niter
+    cdef double a
+    cdef double b
+    cdef double c
+    cdef double d
+    cdef double e
+    cdef double x
+    cdef double next_x
+    cdef double c_exp
+    cdef double f
+    cdef double f_prime
+
+    for i in range(n_nodes):
+        src_id = src_nodes[i]
+        if not has_receiver[src_id]:
+            continue
+        dst_id = dst_nodes[src_id]
+
+        a = alpha[src_id]
+        b = z[dst_id]
+        c = gamma[src_id]
+        d = delta[src_id]
+        e = a * b + c + z[src_id]
+
+        x = z[src_id]
+        niter = 0
+        while True:
+            c_exp = c * exp(- d * (x - b))
+            f = x * (1. + a) + c_exp - e
+            if f == 0.:
+                break
+            f_prime = (1. + a) - d * c_exp
+            if f_prime == 0.:
+                break
+            next_x = x - f / f_prime
+            niter += 1
+            if fabs(next_x - x) <= 1.48e-8:
+                x = next_x
+                break
+            if niter == 50:
+                raise RuntimeError(
+                    'Failed to converge after 50 iterations, value is '
+                    '{value}'.format(value=next_x))
+            x = next_x
+
+        z[src_id] = x
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+cdef inline double _interpolate_table(double x, double * table,
+                                      double * slopes_above,
+                                      double * slopes_below, int n_values):
+    """Interpolate a function tabulated at even spacing on [0, 1].
+
+    The function is interpolated with cubic Hermite polynomials between
+    the tabulated values, using the slopes to the right of the lower
+    value and to the left of the upper value.
+    """
+    cdef double spacing = 1. / (n_values - 1)
+    cdef double index = x * (n_values - 1)
+    cdef double t
+    cdef double t2
+    cdef double t3
+    cdef int j
+
+    if index <= 0.:
+        return table[0]
+    j = <int>index
+    if j >= n_values - 1:
+        return table[n_values - 1]
+
+    t = index - j
+    t2 = t * t
+    t3 = t2 * t
+    return ((2. * t3 - 3. * t2 + 1.) * table[j] +
+            (t3 - 2. * t2 + t) * spacing * slopes_above[j] +
+            (- 2. * t3 + 3. * t2) * table[j + 1] +
+            (t3 - t2) * spacing * slopes_below[j + 1])
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+def sed_flux_dep_routing(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
+                         np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] cell_areas,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] vol_capacities,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] dz_prefactors,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] flooded_depths,
+                         np.ndarray[DTYPE_UINT8_t, ndim=1] is_flooded,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] sed_flux_fn_table,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] slopes_above,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] slopes_below,
+                         int pseudoimplicit_repeats,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] sed_into_node,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] dz,
+                         np.ndarray[DTYPE_FLOAT_t, ndim=1] rel_sed_flux):
+    """Route sediment downstream with sediment-flux-dependent incision.
+
+    Work downstream through the nodes, eroding nodes that receive less
+    sediment than they can carry and depositing the excess at nodes that
+    receive more. Erosion is scaled by the sediment flux function, f, of
+    the relative sediment flux, which is found with a fixed number of
+    pseudo-implicit iterations.
+
+    Parameters
+    ----------
+    src_nodes : array_like
+        Ordered upstream node ids.
+    dst_nodes : array_like
+        Node ids of nodes receiving flow.
+    cell_areas : array_like
+        Area of the cell at each node.
+    vol_capacities : array_like
+        Volume of sediment each node can transport over the time step.
+    dz_prefactors : array_like
+        Erosion over the time step, at each node, when f is 1.
+    flooded_depths : array_like
+        Depth of flooding at each node, which is reduced as flooded nodes
+        are filled with sediment.
+    is_flooded : array_like of uint8
+        Flags that indicate if a node was flooded at the start of the time
+        step.
+    sed_flux_fn_table : array_like
+        Values of f at evenly spaced relative fluxes from 0 to 1.
+    slopes_above, slopes_below : array_like
+        Derivatives of f, to the right and to the left, at the relative
+        fluxes of *sed_flux_fn_table*.
+    pseudoimplicit_repeats : int
+        Maximum number of iterations to find the relative sediment flux.
+    sed_into_node : array_like
+        Volume of sediment into each node. Must be zero on input.
+    dz : array_like
+        Elevation change at each node. Must be zero on input.
+    rel_sed_flux : array_like
+        Relative sediment flux at each node.
+    """
+    cdef int n_nodes = src_nodes.size
+    cdef int n_values = sed_flux_fn_table.size
+    cdef double * table = <double *>sed_flux_fn_table.data
+    cdef double * above = <double *>slopes_above.data
+    cdef double * below = <double *>slopes_below.data
+    cdef int i
+    cdef int j
+    cdef int node
+    cdef double cell_area
+    cdef double flood_depth
+    cdef double sed_in
+    cdef double capacity
+    cdef double vol_prefactor
+    cdef double rel_in
+    cdef double rel
+    cdef double dz_here
+    cdef double vol_pass
+    cdef double height_excess
+
+    for i in range(n_nodes - 1, -1, -1):
+        node = src_nodes[i]
+        cell_area = cell_areas[node]
+        flood_depth = flooded_depths[node]
+        sed_in = sed_into_node[node]
+        capacity = vol_capacities[node]
+        if flood_depth > 0.:
+            capacity = 0.
+
+        if sed_in < capacity:
+            vol_prefactor = dz_prefactors[node] * cell_area
+            rel_in = sed_in / capacity
+            rel = rel_in
+            for j in range(pseudoimplicit_repeats):
+                rel = rel_in + (vol_prefactor *
+                                _interpolate_table(rel, table, above, below,
+                                                   n_values) /
+                                capacity)
+                if rel >= 1.:
+                    rel = 1.
+                    break
+                if rel < 0.:
+                    rel = 0.
+                    break
+            dz_here = (dz_prefactors[node] *
+                       _interpolate_table(rel, table, above, below,
+                                                   n_values))
+            rel_sed_flux[node] = rel
+            vol_pass = rel * capacity
+        else:
+            rel_sed_flux[node] = 1.
+            dz_here = - (sed_in - capacity) / cell_area
+            if flood_depth <= 0. and not is_flooded[node]:
+                vol_pass = capacity
+            else:
+                height_excess = - dz_here - flood_depth
+                if height_excess <= 0.:
+                    vol_pass = 0.
+                    flooded_depths[node] += dz_here
+                else:
+                    dz_here = - flood_depth
+                    vol_pass = height_excess * cell_area
+                    flooded_depths[node] = 0.
+
+        dz[node] -= dz_here
+        sed_into_node[dst_nodes[node]] += vol_pass
@@ -13,6 +13,8 @@ from landlab.core.model_parameter_dictionary import MissingKeyError, \
     ParameterValueError
 from landlab.utils.decorators import use_file_name_or_kwds
 from landlab.field.scalar_data_fields import FieldError
+from landlab.components.flow_accum import (partition_stack_by_basin,
+                                           run_on_basins)
 from scipy.optimize import newton, fsolve
 
 UNDEFINED_INDEX = -1
@@ -58,7 +60,7 @@ class FastscapeEroder(Component):
     Construction::
 
         FastscapeEroder(grid, K_sp=None, m_sp=0.5, n_sp=1., threshold_sp=0.,
-                        rainfall_intensity=1.)
+                        rainfall_intensity=1., n_threads=1)
 
     Parameters
     ----------
@@ -79,6 +81,9 @@ class FastscapeEroder(Component):
         varying rainfall intensity, pass rainfall_intensity_if_used to
         `run_one_step`. For a spatially variable rainfall, use the
         StreamPowerEroder component.
+    n_threads : int, optional
+        If greater than 1, split the drainage basins of the grid into this
+        many groups of similar size, and erode each group in its own thread.
 
     Examples
     --------
@@ -190,7 +195,7 @@ class FastscapeEroder(Component):
 
     @use_file_name_or_kwds
     def __init__(self, grid, K_sp=None, m_sp=0.5, n_sp=1., threshold_sp=0.,
-                 rainfall_intensity=1., **kwds):
+                 rainfall_intensity=1., n_threads=1, **kwds):
         """
         Initialize the Fastscape stream power component. Note: a timestep,
         dt, can no longer be supplied to this component through the input file.
@@ -209,8 +214,11 @@ class FastscapeEroder(Component):
         rainfall intensity : float, array, or field name; optional
             Modifying factor on drainage area to convert it to a true water
             volume flux in (m/time). i.e., E = K * (r_i*A)**m * S**n
+        n_threads : int, optional
+            Number of threads over which to split the drainage basins.
         """
         self._grid = grid
+        self._n_threads = n_threads
 
         self.K = K_sp  # overwritten below in special cases
         self.m = float(m_sp)
@@ -373,10 +381,25 @@ class FastscapeEroder(Component):
         self.alpha_by_flow_link_lengthtothenless1[
             defined_flow_receivers] = (alpha[defined_flow_receivers] /
                                        flow_link_lengths**(self.n - 1.))
-        alpha_divided = self.alpha_by_flow_link_lengthtothenless1
+        # the compiled solvers take arrays of the same type as elevations,
+        # which may be single or double precision
+        alpha_divided = self.alpha_by_flow_link_lengthtothenless1.astype(
+            z.dtype, copy=False)
         n = float(self.n)
         threshdt = self.thresholds * dt
-        if type(self.thresholds) is float:
+        if type(self.thresholds) is not float:
+            threshdt = threshdt.astype(z.dtype, copy=False)
+        if self._n_threads > 1:
+            from .cfuncs import erode_with_link_alpha_basins
+            # thresholds are taken in stack order by the compiled code
+            if type(self.thresholds) is float:
+                threshdt = numpy.full(n_nodes, threshdt, dtype=z.dtype)
+            partitions = partition_stack_by_basin(
+                upstream_order_IDs, flow_receivers, self._n_threads)
+            run_on_basins(erode_with_link_alpha_basins, partitions,
+                          upstream_order_IDs, flow_receivers, threshdt,
+                          alpha_divided, n, z)
+        elif type(self.thresholds) is float:
             from .cfuncs import erode_with_link_alpha_fixthresh
             erode_with_link_alpha_fixthresh(upstream_order_IDs, flow_receivers,
                                             threshdt, alpha_divided, n, z)
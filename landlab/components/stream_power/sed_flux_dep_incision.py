@@ -13,6 +13,14 @@ from landlab.field.scalar_data_fields import FieldError
 from landlab.grid.base import BAD_INDEX_VALUE
 from landlab.utils.decorators import make_return_array_immutable
 
+from .cfuncs import sed_flux_dep_routing
+
+
+# Number of evenly spaced relative sediment fluxes, from 0 to 1, at which
+# the sediment flux function is tabulated. The spacing puts a value at 0.1,
+# where 'almost_parabolic' has a kink.
+_SED_FLUX_FN_TABLE_SIZE = 10 * 2 ** 13 + 1
+
 
 class SedDepEroder(Component):
     """
@@ -208,6 +216,9 @@ class SedDepEroder(Component):
 
     _name = 'SedDepEroder'
 
+    # run_one_step divides long time steps internally
+    _unconstrained_time_step = True
+
     _input_var_names = (
         'topographic__elevation',
         'drainage_area',
@@ -333,6 +344,11 @@ class SedDepEroder(Component):
                  pseudoimplicit_repeats=5, return_stream_properties=False,
                  **kwds):
         """Constructor for the class."""
+        if grid.dtype != np.float64:
+            # the compiled sediment router is double precision only
+            raise ValueError(
+                'SedDepEroder needs a double-precision grid, not '
+                '{dtype}'.format(dtype=grid.dtype))
         self._grid = grid
         self.pseudoimplicit_repeats = pseudoimplicit_repeats
 
@@ -487,6 +503,10 @@ class SedDepEroder(Component):
         self.cell_areas.fill(np.mean(grid.area_of_cell))
         self.cell_areas[grid.node_at_cell] = grid.area_of_cell
 
+        # the sediment flux function is looked up from a table as we route
+        (self._sed_flux_fn_table, self._sed_flux_fn_slopes_above,
+         self._sed_flux_fn_slopes_below) = self._tabulate_sed_flux_function()
+
         # set up the necessary fields:
         self.initialize_output_fields()
         if self.return_ch_props:
@@ -517,6 +537,40 @@ class SedDepEroder(Component):
                 'recognised!')
         return sed_flux_fn
 
+    def _tabulate_sed_flux_function(self):
+        """Tabulate the sediment flux function and its derivatives.
+
+        Values are at evenly spaced relative sediment fluxes from 0 to 1.
+        Derivatives are from centered differences except at the ends of
+        the table, and at kinks in the function (such as at 0.1 for
+        'almost_parabolic'), where they are one sided.
+
+        Returns
+        -------
+        tuple of ndarray
+            The function, and its derivatives to the right and to the left.
+        """
+        rel_sed_flux = np.linspace(0., 1., _SED_FLUX_FN_TABLE_SIZE)
+        step = 1.e-6
+        (sed_flux_fn, fn_above, fn_below) = (
+            np.empty_like(rel_sed_flux) for _ in range(3))
+        sed_flux_fn[:] = self.get_sed_flux_function(rel_sed_flux)
+        fn_above[:] = self.get_sed_flux_function(rel_sed_flux + step)
+        with np.errstate(invalid='ignore'):
+            fn_below[:] = self.get_sed_flux_function(rel_sed_flux - step)
+
+        slopes_above = (fn_above - sed_flux_fn) / step
+        slopes_below = (sed_flux_fn - fn_below) / step
+        with np.errstate(invalid='ignore'):
+            is_smooth = (np.abs(slopes_above - slopes_below) <=
+                         1.e-3 * (np.abs(slopes_above) +
+                                  np.abs(slopes_below) + 1.))
+        is_smooth[[0, -1]] = False
+        slopes_above[is_smooth] = slopes_below[is_smooth] = (
+            fn_above - fn_below)[is_smooth] / (2. * step)
+
+        return sed_flux_fn, slopes_above, slopes_below
+
     def get_sed_flux_function_pseudoimplicit(self, sed_in, trans_cap_vol_out,
                                              prefactor_for_volume,
                                              prefactor_for_dz):
@@ -602,7 +656,7 @@ class SedDepEroder(Component):
         node_S = grid.at_node['topographic__steepest_slope']
 
         if type(flooded_depths) is str:
-            flooded_depths = mg.at_node[flooded_depths]
+            flooded_depths = grid.at_node[flooded_depths]
             # also need a map of initial flooded conds:
             flooded_nodes = flooded_depths > 0.
         elif type(flooded_depths) is np.ndarray:
@@ -612,6 +666,10 @@ class SedDepEroder(Component):
         else:
             # if None, handle in loop
             flooded_nodes = None
+        if flooded_nodes is None:
+            flood_depths_to_fill = np.zeros(grid.number_of_nodes)
+        else:
+            flood_depths_to_fill = flooded_depths
         steepest_link = 'flow__link_to_receiver_node'
         link_length = np.empty(grid.number_of_nodes, dtype=float)
         link_length.fill(np.nan)
@@ -701,87 +759,22 @@ class SedDepEroder(Component):
 
                 sed_into_node = np.zeros(grid.number_of_nodes, dtype=float)
                 dz = np.zeros(grid.number_of_nodes, dtype=float)
-                len_s_in = s_in.size
-                cell_areas = self.cell_areas
                 try:
-                    raise NameError
-                    # ^tripped out deliberately for now; doesn't appear to
-                    # accelerate much
-                    weave.inline(self.routing_code, [
-                        'len_s_in', 'sed_into_node', 'transport_capacities',
-                        'dz', 'cell_areas', 'dt_this_step', 'flow__receiver_node'])
-                except NameError:
-                    for i in s_in[::-1]:  # work downstream
-                        cell_area = cell_areas[i]
-                        if flooded_nodes is not None:
-                            flood_depth = flooded_depths[i]
-                        else:
-                            flood_depth = 0.
-                        sed_flux_into_this_node = sed_into_node[i]
-                        node_capacity = transport_capacities[i]
-                        # ^we work in volume flux, not volume per se here
-                        node_vol_capacity = node_vol_capacities[i]
-                        if flood_depth > 0.:
-                            node_vol_capacity = 0.
-                            # requires special case handling - as much sed as
-                            # possible is dumped here, then the remainder
-                            # passed on
-                        if sed_flux_into_this_node < node_vol_capacity:
-                            # ^note incision is forbidden at capacity
-                            # flooded nodes never enter this branch
-                            # #implementing the pseudoimplicit method:
-                            try:
-                                thresh = variable_thresh
-                            except:  # it doesn't exist
-                                thresh = self.thresh
-                            dz_prefactor = self._K_unit_time*dt_this_step*(
-                                shear_tothe_a[i]-thresh).clip(0.)
-                            vol_prefactor = dz_prefactor*cell_area
-                            (dz_here, sed_flux_out, rel_sed_flux_here,
-                             error_in_sed_flux) = \
-                                self.get_sed_flux_function_pseudoimplicit(
-                                    sed_flux_into_this_node, node_vol_capacity,
-                                    vol_prefactor, dz_prefactor)
-                            # note now dz_here may never create more sed than
-                            # the out can transport...
-                            assert sed_flux_out <= node_vol_capacity, (
-                                'failed at node '+str(s_in.size-i) +
-                                ' with rel sed flux '+str(
-                                    sed_flux_out/node_capacity))
-                            rel_sed_flux[i] = rel_sed_flux_here
-                            vol_pass = sed_flux_out
-                        else:
-                            rel_sed_flux[i] = 1.
-                            vol_dropped = (sed_flux_into_this_node -
-                                           node_vol_capacity)
-                            dz_here = -vol_dropped/cell_area
-                            # with the pits, we aim to inhibit incision, but
-                            # depo is OK. We have already zero'd any adverse
-                            # grads, so sed can make it to the bottom of the
-                            # pit but no further in a single step, which seems
-                            # raeasonable. Pit should fill.
-                            if flood_depth <= 0.:
-                                vol_pass = node_vol_capacity
-                            else:
-                                height_excess = -dz_here - flood_depth
-                                # ...above water level
-                                if height_excess <= 0.:
-                                    vol_pass = 0.
-                                    # dz_here is already correct
-                                    flooded_depths[i] += dz_here
-                                else:
-                                    dz_here = -flood_depth
-                                    vol_pass = height_excess * cell_area
-                                    # ^bit cheeky?
-                                    flooded_depths[i] = 0.
-                                    # note we must update flooded depths
-                                    # transiently to conserve mass
-                            # do we need to retain a small downhill slope?
-                            # ...don't think so. Will resolve itself on next
-                            # timestep.
-
-                        dz[i] -= dz_here
-                        sed_into_node[flow_receiver[i]] += vol_pass
+                    thresh = variable_thresh
+                except NameError:  # it doesn't exist
+                    thresh = self.thresh
+                dz_prefactors = self._K_unit_time*dt_this_step*(
+                    shear_tothe_a-thresh).clip(0.)
+                # work downstream; nodes in lakes aren't flagged here, so
+                # filled lakes pass on sediment at capacity
+                sed_flux_dep_routing(
+                    s_in, flow_receiver, self.cell_areas, node_vol_capacities,
+                    dz_prefactors, flood_depths_to_fill,
+                    np.zeros(grid.number_of_nodes, dtype=np.uint8),
+                    self._sed_flux_fn_table, self._sed_flux_fn_slopes_above,
+                    self._sed_flux_fn_slopes_below,
+                    self.pseudoimplicit_repeats,
+                    sed_into_node, dz, rel_sed_flux)
 
                 break_flag = True
 
@@ -826,64 +819,20 @@ class SedDepEroder(Component):
 
                 sed_into_node = np.zeros(grid.number_of_nodes, dtype=float)
                 dz = np.zeros(grid.number_of_nodes, dtype=float)
-                cell_areas = self.cell_areas
-                for i in s_in[::-1]:  # work downstream
-                    cell_area = cell_areas[i]
-                    if flooded_nodes is not None:
-                        flood_depth = flooded_depths[i]
-                    else:
-                        flood_depth = 0.
-                    sed_flux_into_this_node = sed_into_node[i]
-                    node_capacity = transport_capacities[i]
-                    # ^we work in volume flux, not volume per se here
-                    node_vol_capacity = node_vol_capacities[i]
-                    if flood_depth > 0.:
-                        node_vol_capacity = 0.
-                    if sed_flux_into_this_node < node_vol_capacity:
-                        # ^note incision is forbidden at capacity
-                        dz_prefactor = dt_this_step*erosion_prefactor_withS[i]
-                        vol_prefactor = dz_prefactor*cell_area
-                        (dz_here, sed_flux_out, rel_sed_flux_here,
-                         error_in_sed_flux) = \
-                            self.get_sed_flux_function_pseudoimplicit(
-                                sed_flux_into_this_node, node_vol_capacity,
-                                vol_prefactor, dz_prefactor)
-                        # note now dz_here may never create more sed than the
-                        # out can transport...
-                        assert sed_flux_out <= node_vol_capacity, (
-                            'failed at node '+str(s_in.size-i) +
-                            ' with rel sed flux '+str(
-                                sed_flux_out/node_capacity))
-                        rel_sed_flux[i] = rel_sed_flux_here
-                        vol_pass = sed_flux_out
-                    else:
-                        rel_sed_flux[i] = 1.
-                        vol_dropped = (sed_flux_into_this_node -
-                                       node_vol_capacity)
-                        dz_here = -vol_dropped/cell_area
-                        try:
-                            isflooded = flooded_nodes[i]
-                        except TypeError:  # was None
-                            isflooded = False
-                        if flood_depth <= 0. and not isflooded:
-                            vol_pass = node_vol_capacity
-                            # we want flooded nodes which have already been
-                            # filled to enter the else statement
-                        else:
-                            height_excess = -dz_here - flood_depth
-                            # ...above water level
-                            if height_excess <= 0.:
-                                vol_pass = 0.
-                                # dz_here is already correct
-                                flooded_depths[i] += dz_here
-                            else:
-                                dz_here = -flood_depth
-                                vol_pass = height_excess * cell_area
-                                # ^bit cheeky?
-                                flooded_depths[i] = 0.
-
-                    dz[i] -= dz_here
-                    sed_into_node[flow_receiver[i]] += vol_pass
+                dz_prefactors = dt_this_step*erosion_prefactor_withS
+                if flooded_nodes is None:
+                    is_flooded = np.zeros(grid.number_of_nodes,
+                                          dtype=np.uint8)
+                else:
+                    is_flooded = flooded_nodes.view(np.uint8)
+                # work downstream
+                sed_flux_dep_routing(
+                    s_in, flow_receiver, self.cell_areas, node_vol_capacities,
+                    dz_prefactors, flood_depths_to_fill, is_flooded,
+                    self._sed_flux_fn_table, self._sed_flux_fn_slopes_above,
+                    self._sed_flux_fn_slopes_below,
+                    self.pseudoimplicit_repeats,
+                    sed_into_node, dz, rel_sed_flux)
                 break_flag = True
 
                 node_z[grid.core_nodes] += dz[grid.core_nodes]
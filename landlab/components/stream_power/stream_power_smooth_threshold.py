@@ -18,10 +18,12 @@ Created on Sat Nov 26 08:36:49 2016
 
 if __name__ == '__main__':
     from landlab.components import FastscapeEroder
+    from landlab.components.stream_power.cfuncs import (
+        smooth_stream_power_eroder_solver)
 else:
     from .fastscape_stream_power import FastscapeEroder
+    from .cfuncs import smooth_stream_power_eroder_solver
 import numpy as np
-from scipy.optimize import newton
 
 UNDEFINED_INDEX = -1
 
@@ -260,20 +262,18 @@ class StreamPowerSmoothThresholdEroder(FastscapeEroder):
             * self.A_to_the_m[defined_flow_receivers] ) 
             / (thresh * flow_link_lengths))
 
-        # Iterate over nodes from downstream to upstream, using scipy's
-        # 'newton' function to find new elevation at each node in turn.
-        for node in upstream_order_IDs:
-            if defined_flow_receivers[node]:
-                epsilon = (self.alpha[node] * z[flow_receivers[node]]
-                           + self.gamma[node] + z[node])
-                z[node] = newton(new_elev, z[node],
-                                 fprime=new_elev_prime,
-                                 args=(self.alpha[node],
-                                       z[flow_receivers[node]],
-                                       self.gamma[node],
-                                       self.delta[node],
-                                       epsilon))  #, 
-                                 #fprime2=new_elev_prime2)
+        # Iterate over nodes from downstream to upstream, using Newton's
+        # method to find new elevation at each node in turn.
+        smooth_stream_power_eroder_solver(upstream_order_IDs, flow_receivers,
+                                          defined_flow_receivers.view(
+                                              np.uint8),
+                                          self.alpha.astype(z.dtype,
+                                                            copy=False),
+                                          self.gamma.astype(z.dtype,
+                                                            copy=False),
+                                          self.delta.astype(z.dtype,
+                                                            copy=False),
+                                          z)
 
         # TODO: handle case self.thresholds = 0
         # THIS WOULD REQUIRE SETTING DELTA = 0 WHEN/WHERE THRESHOLD = 0
@@ -8,6 +8,7 @@ import os
 
 import numpy
 from numpy.testing import assert_array_almost_equal
+from nose.tools import assert_equal
 
 from landlab import RasterModelGrid
 from landlab import ModelParameterDictionary
@@ -120,3 +121,51 @@ def test_fastscape_new():
                          3.15428351e-04,   3.63710771e-04])
 
     assert_array_almost_equal(mg.at_node['topographic__elevation'], z_trg)
+
+
+def test_fastscape_threads():
+    """Test eroding basins in parallel matches eroding them serially."""
+    numpy.random.seed(1945)
+    z_init = numpy.random.rand(30 * 40)
+
+    results = []
+    for n_threads in (1, 3):
+        mg = RasterModelGrid((30, 40), 10.)
+        z = mg.add_field('node', 'topographic__elevation', z_init.copy())
+        fr = FlowRouter(mg, n_threads=n_threads)
+        fsp = Fsc(mg, K_sp=0.001, m_sp=0.5, n_sp=1.5, threshold_sp=0.01,
+                  n_threads=n_threads)
+        for _ in range(5):
+            fr.run_one_step()
+            fsp.run_one_step(10.)
+            z[mg.core_nodes] += 0.01
+        results.append((z, mg.at_node['drainage_area']))
+
+    assert_array_almost_equal(results[1][0], results[0][0])
+    assert_array_almost_equal(results[1][1], results[0][1])
+
+
+def test_fastscape_single_precision():
+    """Test eroding a single-precision grid matches double precision."""
+    numpy.random.seed(1945)
+    z_init = numpy.random.rand(20 * 30)
+
+    for (threshold, n_threads) in ((0.01, 1), ('threshold', 1),
+                                   ('threshold', 3)):
+        results = []
+        for dtype in (numpy.float32, numpy.float64):
+            mg = RasterModelGrid((20, 30), 10., dtype=dtype)
+            z = mg.add_field('node', 'topographic__elevation',
+                             z_init.astype(dtype))
+            mg.add_field('node', 'threshold', mg.ones(at='node') * 0.01)
+            fr = FlowRouter(mg, n_threads=n_threads)
+            fsp = Fsc(mg, K_sp=0.001, m_sp=0.5, n_sp=1.5,
+                      threshold_sp=threshold, n_threads=n_threads)
+            for _ in range(5):
+                fr.run_one_step()
+                fsp.run_one_step(10.)
+                z[mg.core_nodes] += 0.01
+            assert_equal(z.dtype, dtype)
+            results.append(z)
+
+        assert_array_almost_equal(results[0], results[1], decimal=5)
@@ -11,6 +11,7 @@ from six.moves import range
 import numpy as np
 import os
 from numpy.testing import assert_array_almost_equal
+from nose.tools import assert_raises
 
 from landlab import RasterModelGrid, CLOSED_BOUNDARY
 from landlab.components.flow_routing import FlowRouter
@@ -91,3 +92,48 @@ def test_sed_dep_new():
         z[mg.core_nodes] += 20.*up
 
     assert_array_almost_equal(z, np.loadtxt(finalconds))
+
+
+def test_sed_flux_routing_matches_pseudoimplicit():
+    """Test the compiled routing against the pseudoimplicit function."""
+    from landlab.components.stream_power.cfuncs import sed_flux_dep_routing
+
+    np.random.seed(1945)
+    n_nodes = 1000
+    sed_in = np.random.rand(n_nodes + 1)
+    capacity = sed_in + np.random.rand(n_nodes + 1)
+    dz_prefactor = np.random.rand(n_nodes + 1)
+    sed_in[-1] = capacity[-1] = 0.
+
+    for sed_dependency_type in ('generalized_humped', 'None',
+                                'linear_decline', 'almost_parabolic'):
+        mg = RasterModelGrid((5, 5), 200.)
+        mg.add_zeros('node', 'topographic__elevation')
+        sde = SedDepEroder(mg, sed_dependency_type=sed_dependency_type)
+
+        sed_into_node = sed_in.copy()
+        dz = np.zeros(n_nodes + 1)
+        rel_sed_flux = np.empty(n_nodes + 1)
+        receivers = np.full(n_nodes + 1, n_nodes, dtype=int)
+        sed_flux_dep_routing(
+            np.arange(n_nodes + 1), receivers, np.ones(n_nodes + 1),
+            capacity, dz_prefactor, np.zeros(n_nodes + 1),
+            np.zeros(n_nodes + 1, dtype=np.uint8), sde._sed_flux_fn_table,
+            sde._sed_flux_fn_slopes_above, sde._sed_flux_fn_slopes_below,
+            sde.pseudoimplicit_repeats, sed_into_node, dz, rel_sed_flux)
+
+        expected = [sde.get_sed_flux_function_pseudoimplicit(
+            sed_in[i], capacity[i], dz_prefactor[i], dz_prefactor[i])
+            for i in range(n_nodes)]
+        assert_array_almost_equal(-dz[:-1], [e[0] for e in expected],
+                                  decimal=8)
+        assert_array_almost_equal(rel_sed_flux[:-1], [e[2] for e in expected],
+                                  decimal=8)
+        assert_array_almost_equal(sed_into_node[-1],
+                                  sum(e[1] for e in expected))
+
+
+def test_single_precision_grid():
+    mg = RasterModelGrid((5, 5), 200., dtype=np.float32)
+    mg.add_zeros('node', 'topographic__elevation')
+    assert_raises(ValueError, SedDepEroder, mg)
@@ -0,0 +1,50 @@
+"""Test the StreamPowerSmoothThresholdEroder against scipy's newton."""
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+from nose.tools import assert_raises
+from scipy.optimize import newton
+
+from landlab import RasterModelGrid
+from landlab.components import FlowRouter, StreamPowerSmoothThresholdEroder
+from landlab.components.stream_power.cfuncs import (
+    smooth_stream_power_eroder_solver)
+from landlab.components.stream_power.stream_power_smooth_threshold import (
+    new_elev, new_elev_prime)
+
+
+def _erode_with_newton(sp, z):
+    receivers = sp.grid.at_node['flow__receiver_node']
+    has_receiver = sp.grid.at_node['flow__link_to_receiver_node'] != -1
+    for node in sp.grid.at_node['flow__upstream_node_order']:
+        if has_receiver[node]:
+            epsilon = (sp.alpha[node] * z[receivers[node]] +
+                       sp.gamma[node] + z[node])
+            z[node] = newton(new_elev, z[node], fprime=new_elev_prime,
+                             args=(sp.alpha[node], z[receivers[node]],
+                                   sp.gamma[node], sp.delta[node], epsilon))
+
+
+def test_matches_scipy_newton():
+    np.random.seed(1945)
+    grid = RasterModelGrid((20, 30), 10.)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z += np.random.rand(z.size) + 0.01 * grid.node_y
+
+    fr = FlowRouter(grid)
+    sp = StreamPowerSmoothThresholdEroder(grid, K_sp=0.001, threshold_sp=0.1)
+    for _ in range(5):
+        fr.run_one_step()
+        z_newton = z.copy()
+        sp.run_one_step(10.)
+        _erode_with_newton(sp, z_newton)
+
+        assert_array_almost_equal(z, z_newton, decimal=12)
+        z[grid.core_nodes] += 0.01
+
+
+def test_failure_to_converge():
+    z = np.array([0., 1.])
+    assert_raises(RuntimeError, smooth_stream_power_eroder_solver,
+                  np.array([0, 1]), np.array([0, 0]),
+                  np.array([0, 1], dtype=np.uint8), np.array([0., -1.]),
+                  np.array([0., 1.]), np.array([0., np.nan]), z)
@@ -27,6 +27,7 @@ Base component class methods
     ~landlab.core.model_component.Component.grid
     ~landlab.core.model_component.Component.coords
     ~landlab.core.model_component.Component.imshow
+    ~landlab.core.model_component.Component.profile
 """
 
 from __future__ import print_function
@@ -81,11 +82,15 @@ class Component(object):
         ~landlab.core.model_component.Component.grid
         ~landlab.core.model_component.Component.coords
         ~landlab.core.model_component.Component.imshow
+        ~landlab.core.model_component.Component.profile
     """
     _input_var_names = set()
     _output_var_names = set()
     _optional_var_names = set()
     _var_units = dict()
+    # True if run_one_step can be given a time step of any length, because
+    # the component is unconditionally stable or divides it internally
+    _unconstrained_time_step = False
 
     def __init__(self, grid, map_vars=None, **kwds):
         map_vars = map_vars or {}
@@ -110,21 +115,17 @@ class Component(object):
         ----------
         grid : ModelGrid
             A landlab grid.
-        path : str or file_like
-            Path to a parameter file, contents of a parameter file, or
-            a file-like object.
+        path : str, file_like, or dict
+            Path to a parameter file, contents of a parameter file,
+            a file-like object, or parameters that have already been
+            loaded.
 
         Returns
         -------
         Component
             A newly-created component.
         """
-        if os.path.isfile(path):
-            with open(path, 'r') as fp:
-                params = load_params(fp)
-        else:
-            params = load_params(path)
-        return cls(grid, **params)
+        return cls(grid, **load_params(path))
 
     @classproperty
     @classmethod
@@ -373,3 +374,37 @@ class Component(object):
         """Plot data on the grid attached to the component.
         """
         self._grid.imshow(name, **kwds)
+
+    @staticmethod
+    def profile(trace_memory=False, track_fields=False):
+        """Start recording time spent in the entry points of components.
+
+        Every component's ``run_one_step`` (and the older ``route_flow``,
+        ``erode``, ``diffuse`` and ``update``) is timed until the returned
+        profiler is stopped. See
+        :class:`~landlab.core.profiler.ComponentProfiler` for the keywords.
+
+        Returns
+        -------
+        ComponentProfiler
+            A running profiler; also usable as a context manager.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid, Component
+        >>> from landlab.components import LinearDiffuser
+        >>> grid = RasterModelGrid((5, 5))
+        >>> _ = grid.add_zeros('node', 'topographic__elevation')
+        >>> ld = LinearDiffuser(grid, linear_diffusivity=1.)
+        >>> with Component.profile() as profiler:
+        ...     ld.run_one_step(0.1)
+        ...     ld.run_one_step(0.1)
+        >>> profiler.stats['LinearDiffuser']['calls']
+        2
+        """
+        from .profiler import ComponentProfiler
+
+        profiler = ComponentProfiler(trace_memory=trace_memory,
+                                     track_fields=track_fields)
+        profiler.start()
+        return profiler
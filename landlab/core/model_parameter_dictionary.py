@@ -74,6 +74,7 @@ command line (e.g., read_float_cmdline( 'PI' ) )
 # Boston, MA 02110-1301 USA.
 
 
+import os
 import warnings
 import six
 
@@ -85,6 +86,28 @@ _VALID_FALSE_VALUES = set(['FALSE', '0', 0])
 _VALID_BOOLEAN_VALUES = _VALID_TRUE_VALUES | _VALID_FALSE_VALUES
 
 
+# Parameters parsed from files, by absolute path and auto_type, with the
+# modification time and size of each file when it was parsed
+_PARAMS_BY_PATH = {}
+
+
+def file_stamp(path):
+    """Modification time and size of a file, to tell if it has changed.
+
+    Parameters
+    ----------
+    path : str
+        Path to a file.
+
+    Returns
+    -------
+    tuple
+        The modification time and size of the file.
+    """
+    stat = os.stat(path)
+    return (getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size)
+
+
 class Error(Exception):
 
     """Base class for exceptions raised from this module."""
@@ -337,14 +360,38 @@ class ModelParameterDictionary(dict):
             Name of parameter file (or file_like)
         """
         if isinstance(param_file, six.string_types):
-            try:
-                with open(param_file, 'r') as opened_file:
-                    self._read_from_file_like(opened_file)
-            except IOError:
-                raise
+            self._read_from_path(param_file)
         else:
             self._read_from_file_like(param_file)
 
+    def _read_from_path(self, path):
+        """Read parameters from a file, parsing it only if it has changed.
+
+        Parameters are parsed (and typed, if *auto_type*) the first time a
+        file is read. Later reads of the same, unchanged, file reuse them.
+
+        Parameters
+        ----------
+        path : str
+            Name of parameter file.
+        """
+        key = (os.path.abspath(path), self._auto_type)
+        stamp = file_stamp(path)
+        try:
+            (parsed_stamp, params) = _PARAMS_BY_PATH[key]
+        except KeyError:
+            parsed_stamp = None
+        if parsed_stamp != stamp:
+            params = ModelParameterDictionary(auto_type=self._auto_type)
+            with open(path, 'r') as opened_file:
+                params._read_from_file_like(opened_file)
+            _PARAMS_BY_PATH[key] = (stamp, params)
+
+        for (key, value) in params.items():
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            self[key] = value
+
     @staticmethod
     def _get_stripped_lines(param_file):
         """Strip whitespace for the lines of a parameter file.
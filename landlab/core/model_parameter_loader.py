@@ -1,10 +1,11 @@
+import copy
 import os
 import re
 
 import six
 import yaml
 
-from .model_parameter_dictionary import ModelParameterDictionary
+from .model_parameter_dictionary import ModelParameterDictionary, file_stamp
 
 
 _loader = yaml.SafeLoader
@@ -20,6 +21,11 @@ _loader.add_implicit_resolver(
     list(u'-+0123456789.'))
 
 
+# Parameters parsed from files, by absolute path, with the modification
+# time and size of each file when it was parsed
+_PARAMS_BY_PATH = {}
+
+
 def load_file_contents(file_like):
     """Load the contents of a file or file-like object.
 
@@ -87,9 +93,32 @@ def load_params(file_like):
     True
     >>> params['start'], params['stop'], params['step']
     (0.0, 10.0, 2.0)
-    """
-    contents = load_file_contents(file_like)
 
+    A parameter file is parsed once and the result reused until the file
+    changes. Parameters that have already been parsed (a dict) are
+    returned as a copy.
+    """
+    if isinstance(file_like, dict):
+        return copy.deepcopy(dict(file_like))
+
+    if isinstance(file_like, six.string_types) and os.path.isfile(file_like):
+        path = os.path.abspath(file_like)
+        stamp = file_stamp(path)
+        try:
+            (parsed_stamp, params) = _PARAMS_BY_PATH[path]
+        except KeyError:
+            parsed_stamp = None
+        if parsed_stamp != stamp:
+            with open(path, 'r') as fp:
+                params = _parse_params(fp.read())
+            _PARAMS_BY_PATH[path] = (stamp, params)
+        return copy.deepcopy(params)
+
+    return _parse_params(load_file_contents(file_like))
+
+
+def _parse_params(contents):
+    """Parse the contents of a YAML or ModelParameterDictionary file."""
     try:
         params = yaml.load(contents, Loader=_loader)
     except yaml.YAMLError:
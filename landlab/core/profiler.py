@@ -0,0 +1,315 @@
+#! /usr/bin/env python
+"""Time and profile the components of a coupled model.
+
+A :class:`ComponentProfiler` records how long each component spends in its
+entry points (``run_one_step`` and the older ``route_flow``, ``erode``,
+``diffuse`` and ``update``), how often they are called and, optionally, how
+much memory they allocate and which fields they change.
+
+Instrumentation is opt-in. While a profiler is running, the entry points of
+every :class:`~landlab.core.model_component.Component` subclass are wrapped;
+when it stops they are put back, so there is no overhead at all when no
+profiler is running. Only component classes that have been imported by the
+time the profiler starts are instrumented.
+
+Examples
+--------
+>>> import numpy as np
+>>> from landlab import RasterModelGrid
+>>> from landlab.components import FlowRouter
+>>> from landlab.core.profiler import ComponentProfiler
+>>> grid = RasterModelGrid((10, 10))
+>>> _ = grid.add_field('node', 'topographic__elevation', grid.node_x.copy())
+>>> fr = FlowRouter(grid)
+>>> with ComponentProfiler(track_fields=True) as profiler:
+...     for _ in range(3):
+...         fr.run_one_step()
+>>> stats = profiler.stats['FlowRouter']
+>>> stats['calls']
+3
+>>> 'topographic__elevation' in stats['reads']
+True
+>>> 'drainage_area' in stats['writes']
+True
+"""
+from __future__ import print_function
+
+import functools
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+from timeit import default_timer
+
+from landlab.field import field_fingerprints
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+ENTRY_POINTS = ('run_one_step', 'route_flow', 'erode', 'diffuse', 'update')
+
+
+def _all_subclasses(cls):
+    """All subclasses of a class, and their subclasses, and so on."""
+    subclasses = []
+    for subclass in cls.__subclasses__():
+        subclasses.append(subclass)
+        subclasses.extend(_all_subclasses(subclass))
+    return subclasses
+
+
+def _grid_field_names(grid):
+    """Names of all fields on a grid."""
+    names = set()
+    for group in grid.groups:
+        names.update(grid.keys(group))
+    return names
+
+
+class ComponentProfiler(object):
+
+    """Record time spent in the entry points of landlab components.
+
+    Calls are grouped by the class name of the component. When an entry
+    point calls another one on the same component (``run_one_step`` calling
+    ``route_flow``, say), only the outer call is recorded.
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        Record the bytes allocated by each call (the net change and the
+        peak) with :mod:`tracemalloc`. This slows the model down a good deal,
+        and allocations by calls running at the same time in other threads
+        are counted too.
+    track_fields : bool, optional
+        Find the fields that each call actually changed by checksumming
+        every field before and after the call. Otherwise the fields written
+        are taken to be the output fields the component declares.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import LinearDiffuser
+    >>> from landlab.core.profiler import ComponentProfiler
+    >>> grid = RasterModelGrid((5, 5))
+    >>> _ = grid.add_zeros('node', 'topographic__elevation')
+    >>> ld = LinearDiffuser(grid, linear_diffusivity=1.)
+    >>> profiler = ComponentProfiler()
+    >>> profiler.start()
+    >>> ld.run_one_step(0.1)
+    >>> profiler.stop()
+    >>> profiler.stats['LinearDiffuser']['calls']
+    1
+    >>> ld.run_one_step(0.1)
+    >>> profiler.stats['LinearDiffuser']['calls']
+    1
+    """
+
+    def __init__(self, trace_memory=False, track_fields=False):
+        if trace_memory and tracemalloc is None:
+            raise ValueError('tracing memory needs the tracemalloc module')
+        self._trace_memory = trace_memory
+        self._track_fields = track_fields
+        self._patched = []
+        self._active = False
+        self._running = set()
+        self._lock = threading.Lock()
+        self._stats = OrderedDict()
+        self._events = []
+        self._started_tracemalloc = False
+        self._t0 = None
+
+    def start(self):
+        """Start instrumenting components."""
+        if self._active:
+            raise RuntimeError('profiler is already running')
+        self._active = True
+        from .model_component import Component
+
+        if self._t0 is None:
+            self._t0 = default_timer()
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        for cls in [Component] + _all_subclasses(Component):
+            for method_name in ENTRY_POINTS:
+                func = cls.__dict__.get(method_name, None)
+                if inspect.isfunction(func):
+                    setattr(cls, method_name,
+                            self._instrument(method_name, func))
+                    self._patched.append((cls, method_name, func))
+
+    def stop(self):
+        """Stop instrumenting components, keeping what was recorded."""
+        for (cls, method_name, func) in reversed(self._patched):
+            setattr(cls, method_name, func)
+        self._patched = []
+        self._active = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @property
+    def active(self):
+        """True while components are being instrumented."""
+        return self._active
+
+    def __enter__(self):
+        if not self._active:
+            self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _instrument(self, method_name, func):
+        """Wrap an entry point so that calls to it are recorded."""
+        profiler = self
+
+        @functools.wraps(func)
+        def instrumented(component, *args, **kwds):
+            if id(component) in profiler._running:
+                return func(component, *args, **kwds)
+            return profiler._call(component, method_name, func, args, kwds)
+
+        return instrumented
+
+    def _call(self, component, method_name, func, args, kwds):
+        """Call an entry point and record what it did."""
+        grid = getattr(component, '_grid', None)
+        if self._track_fields and grid is not None:
+            fields_before = field_fingerprints(grid)
+
+        self._running.add(id(component))
+        if self._trace_memory:
+            bytes_before = tracemalloc.get_traced_memory()[0]
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        start = default_timer()
+        try:
+            return func(component, *args, **kwds)
+        finally:
+            elapsed = default_timer() - start
+            self._running.discard(id(component))
+
+            if self._trace_memory:
+                (bytes_after, peak) = tracemalloc.get_traced_memory()
+                allocated = (bytes_after - bytes_before,
+                             max(peak - bytes_before, 0))
+            else:
+                allocated = None
+
+            if grid is None:
+                (reads, writes) = (set(), set())
+            else:
+                names = _grid_field_names(grid)
+                reads = names.intersection(
+                    getattr(component, '_input_var_names', ()))
+                if self._track_fields:
+                    fields_after = field_fingerprints(grid)
+                    writes = set(key[1] for key in fields_after
+                                 if fields_before.get(key) !=
+                                 fields_after[key])
+                else:
+                    writes = names.intersection(
+                        getattr(component, '_output_var_names', ()))
+
+            self._record(type(component).__name__, method_name, start,
+                         elapsed, allocated, reads, writes)
+
+    def _record(self, name, method_name, start, elapsed, allocated, reads,
+                writes):
+        """Add a call to the statistics and the list of events."""
+        with self._lock:
+            try:
+                stats = self._stats[name]
+            except KeyError:
+                stats = self._stats[name] = {
+                    'calls': 0, 'time': 0., 'bytes': 0, 'peak_bytes': 0,
+                    'reads': set(), 'writes': set()}
+            stats['calls'] += 1
+            stats['time'] += elapsed
+            if allocated is not None:
+                stats['bytes'] += allocated[0]
+                stats['peak_bytes'] = max(stats['peak_bytes'], allocated[1])
+            stats['reads'] |= reads
+            stats['writes'] |= writes
+
+            args = {'reads': sorted(reads), 'writes': sorted(writes)}
+            if allocated is not None:
+                args['bytes'], args['peak_bytes'] = allocated
+            self._events.append({
+                'name': '{0}.{1}'.format(name, method_name),
+                'cat': 'component', 'ph': 'X',
+                'ts': (start - self._t0) * 1e6, 'dur': elapsed * 1e6,
+                'pid': os.getpid(), 'tid': threading.current_thread().ident,
+                'args': args})
+
+    @property
+    def stats(self):
+        """Statistics for each component, by class name.
+
+        Each entry is a dict with the number of calls, the total wall time
+        (in seconds), the net bytes allocated, the largest peak allocation
+        of a single call (both zero unless tracing memory) and the sets of
+        field names read and written.
+        """
+        return self._stats
+
+    def summary(self):
+        """Table of the time spent in each component, slowest first.
+
+        Returns
+        -------
+        str
+            The table.
+        """
+        total = sum(stats['time'] for stats in self._stats.values())
+        lines = ['{0:<32} {1:>8} {2:>12} {3:>12} {4:>7} {5:>12}'.format(
+            'component', 'calls', 'total (s)', 'mean (s)', '% time',
+            'alloc (MB)')]
+        by_time = sorted(self._stats.items(), key=lambda item: item[1]['time'],
+                         reverse=True)
+        for (name, stats) in by_time:
+            lines.append(
+                '{0:<32} {1:>8d} {2:>12.4f} {3:>12.6f} {4:>7.1f} {5:>12.3f}'
+                .format(name, stats['calls'], stats['time'],
+                        stats['time'] / stats['calls'],
+                        100. * stats['time'] / total if total > 0. else 0.,
+                        stats['bytes'] / 2. ** 20))
+        for (name, stats) in by_time:
+            lines.append('{0}: reads {1}; writes {2}'.format(
+                name, ', '.join(sorted(stats['reads'])) or '-',
+                ', '.join(sorted(stats['writes'])) or '-'))
+        return os.linesep.join(lines)
+
+    def to_chrome_trace(self):
+        """Recorded calls in the Chrome trace event format.
+
+        Load the saved JSON into chrome://tracing (or Perfetto) to see a
+        timeline of component calls, one row per thread.
+
+        Returns
+        -------
+        dict
+            The trace, ready to be written as JSON.
+        """
+        with self._lock:
+            events = list(self._events)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save_chrome_trace(self, path):
+        """Write recorded calls to a Chrome trace JSON file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to write.
+        """
+        with open(path, 'w') as fp:
+            json.dump(self.to_chrome_trace(), fp)
@@ -88,3 +88,27 @@ def test_from_yaml_path():
     assert_dict_equal(params, MPD_PARAMS)
     assert_is_instance(params['x'], float)
     assert_is_instance(params['y'], int)
+
+
+def test_from_path_is_cached():
+    """Parse a parameter file once, until it changes."""
+    with cdtemp() as dir:
+        with open('params.yaml', 'w') as fp:
+            fp.write(YAML_PARAMS_STR)
+        params = load_params('./params.yaml')
+        params['z'].append(3)
+        params = load_params('params.yaml')
+        assert_dict_equal(params, YAML_PARAMS)
+
+        with open('params.yaml', 'w') as fp:
+            fp.write(YAML_PARAMS_STR + 'b: toad\n')
+        params = load_params('./params.yaml')
+        assert_true(params['b'] == 'toad')
+
+
+def test_from_dict():
+    """Copy parameters that have already been loaded."""
+    params = load_params(YAML_PARAMS)
+    assert_dict_equal(params, YAML_PARAMS)
+    params['z'].append(3)
+    assert_true(YAML_PARAMS['z'] == [1, 2])
@@ -0,0 +1,98 @@
+"""Test profiling component entry points."""
+import json
+import os
+import tempfile
+
+import numpy as np
+from nose.tools import assert_equal, assert_true, assert_false
+
+from landlab import RasterModelGrid, Component
+from landlab.components import FlowRouter, LinearDiffuser
+from landlab.core.profiler import ComponentProfiler
+
+
+def _grid():
+    np.random.seed(1945)
+    grid = RasterModelGrid((10, 12))
+    grid.add_field('node', 'topographic__elevation',
+                   grid.node_x + np.random.rand(grid.number_of_nodes))
+    return grid
+
+
+def test_entry_points_restored():
+    """Test entry points are only wrapped while the profiler is running."""
+    run_one_step = FlowRouter.__dict__['run_one_step']
+    with ComponentProfiler() as profiler:
+        assert_true(profiler.active)
+        assert_true(FlowRouter.__dict__['run_one_step'] is not run_one_step)
+    assert_false(profiler.active)
+    assert_true(FlowRouter.__dict__['run_one_step'] is run_one_step)
+
+
+def test_nested_entry_points():
+    """Test route_flow called from run_one_step is not counted again."""
+    grid = _grid()
+    fr = FlowRouter(grid)
+    ld = LinearDiffuser(grid, linear_diffusivity=0.01)
+    with Component.profile() as profiler:
+        for _ in range(4):
+            fr.run_one_step()
+            ld.run_one_step(1.)
+        fr.route_flow()
+
+    assert_equal(profiler.stats['FlowRouter']['calls'], 5)
+    assert_equal(profiler.stats['LinearDiffuser']['calls'], 4)
+    assert_true(profiler.stats['FlowRouter']['time'] > 0.)
+
+    names = [event['name'] for event in profiler.to_chrome_trace()[
+        'traceEvents']]
+    assert_equal(names.count('FlowRouter.run_one_step'), 4)
+    assert_equal(names.count('FlowRouter.route_flow'), 1)
+
+    summary = profiler.summary()
+    assert_true('FlowRouter' in summary)
+    assert_true('LinearDiffuser' in summary)
+
+
+def test_track_fields():
+    """Test only fields that change are reported as written."""
+    grid = _grid()
+    grid.add_ones('node', 'untouched')
+    ld = LinearDiffuser(grid, linear_diffusivity=0.01)
+    with ComponentProfiler(track_fields=True) as profiler:
+        ld.run_one_step(1.)
+
+    writes = profiler.stats['LinearDiffuser']['writes']
+    assert_true('topographic__elevation' in writes)
+    assert_false('untouched' in writes)
+
+
+def test_trace_memory():
+    """Test peak allocations are recorded."""
+    grid = _grid()
+    fr = FlowRouter(grid)
+    with ComponentProfiler(trace_memory=True) as profiler:
+        fr.run_one_step()
+    assert_true(profiler.stats['FlowRouter']['peak_bytes'] > 0)
+
+
+def test_save_chrome_trace():
+    grid = _grid()
+    fr = FlowRouter(grid)
+    with ComponentProfiler() as profiler:
+        fr.run_one_step()
+
+    (fd, path) = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        profiler.save_chrome_trace(path)
+        with open(path) as fp:
+            trace = json.load(fp)
+    finally:
+        os.remove(path)
+
+    (event, ) = trace['traceEvents']
+    assert_equal(event['ph'], 'X')
+    assert_equal(event['name'], 'FlowRouter.run_one_step')
+    assert_true(event['dur'] >= 0.)
+    assert_true('drainage_area' in event['args']['writes'])
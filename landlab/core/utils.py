@@ -19,6 +19,7 @@ Landlab utilities
     ~landlab.core.utils.sort_points_by_x_then_y
     ~landlab.core.utils.anticlockwise_argsort_points
     ~landlab.core.utils.get_categories_from_grid_methods
+    ~landlab.core.utils.takes_time_step
 """
 
 import numpy as np
@@ -299,8 +300,11 @@ def add_module_functions_to_class(cls, module, pattern=None):
     import imp
     import os
     
-    caller = inspect.stack()[1]
-    path = os.path.join(os.path.dirname(caller[1]), os.path.dirname(module))
+    # inspect.stack() reads the source of every frame, which is slow, so only
+    # look up the caller's file name
+    caller = inspect.currentframe().f_back
+    path = os.path.join(os.path.dirname(caller.f_code.co_filename),
+                        os.path.dirname(module))
 
     (module, _) = os.path.splitext(os.path.basename(module))
 
@@ -663,6 +667,42 @@ def get_categories_from_grid_methods(grid_type):
     return cat_dict, grid_dict, FAILS
 
 
+def takes_time_step(method):
+    """Check if a component method, such as *run_one_step*, takes a dt.
+
+    Parameters
+    ----------
+    method : function
+        A bound method.
+
+    Returns
+    -------
+    bool
+        True if the method takes a positional argument.
+
+    Examples
+    --------
+    >>> from landlab.core.utils import takes_time_step
+    >>> class Component(object):
+    ...     def run_one_step(self, dt):
+    ...         pass
+    ...     def update(self):
+    ...         pass
+    >>> takes_time_step(Component().run_one_step)
+    True
+    >>> takes_time_step(Component().update)
+    False
+    """
+    import inspect
+
+    try:
+        return any(
+            param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)
+            for param in inspect.signature(method).parameters.values())
+    except AttributeError:  # Python 2
+        return len(inspect.getargspec(method).args) > 1
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod()
@@ -1,6 +1,11 @@
 from landlab.field.scalar_data_fields import ScalarDataFields, FieldError
-from landlab.field.grouped import ModelDataFields, GroupError, GroupSizeError
+from landlab.field.grouped import (ModelDataFields, GroupError,
+                                   GroupSizeError, field_fingerprints)
 from landlab.field.field_mixin import ModelDataFieldsMixIn
+from landlab.field.shared import SharedFieldStore
+from landlab.field.memmap import MemmapFieldStore
+from landlab.field.buffers import BufferPool
 
 __all__ = ['ScalarDataFields', 'ModelDataFields', 'ModelDataFieldsMixIn',
-           'FieldError', 'GroupError', 'GroupSizeError']
+           'FieldError', 'GroupError', 'GroupSizeError', 'SharedFieldStore',
+           'MemmapFieldStore', 'BufferPool', 'field_fingerprints']
@@ -0,0 +1,147 @@
+#! /usr/bin/env python
+"""Reuse scratch arrays, rather than allocating new ones every time step.
+
+Components often need temporary arrays the size of a group of grid
+elements (slopes at links, say, or a divergence at nodes) while advancing
+a step. Allocating them anew each step costs time, and memory churn, on
+large grids. A :class:`BufferPool`, available as the *buffers* attribute
+of a grid, lends such arrays out and takes them back for the next step.
+
+Examples
+--------
+>>> from landlab import RasterModelGrid
+>>> grid = RasterModelGrid((3, 4))
+>>> slope = grid.buffers.empty('link', purpose='slope')
+>>> slope.size == grid.number_of_links
+True
+>>> grid.buffers.release(slope)
+
+The next time an array is borrowed for the same purpose, the one that was
+released is lent out again.
+
+>>> grid.buffers.empty('link', purpose='slope') is slope
+True
+>>> grid.buffers.number_of_allocations
+1
+"""
+
+import numpy as np
+
+
+class BufferPool(object):
+
+    """Lend out scratch arrays sized for the groups of a grid.
+
+    Arrays are kept by group, data type, and purpose. Borrowing an array
+    reuses one that has been released for the same key, if there is one,
+    and otherwise allocates a new one. The contents of a borrowed array are
+    whatever was last left in it.
+
+    Parameters
+    ----------
+    fields : ModelDataFields
+        A grid, or other collection of fields, that gives the sizes of its
+        groups.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.field.buffers import BufferPool
+    >>> grid = RasterModelGrid((3, 4))
+    >>> pool = BufferPool(grid)
+
+    Arrays borrowed at the same time are different arrays.
+
+    >>> (a, b) = pool.zeros('node'), pool.zeros('node')
+    >>> a is b
+    False
+    >>> pool.number_in_use
+    2
+    >>> pool.release(a, b)
+    >>> pool.number_in_use
+    0
+
+    Released arrays are reused, so borrowing two more allocates nothing.
+
+    >>> _ = pool.zeros('node'), pool.zeros('node')
+    >>> pool.number_of_allocations
+    2
+    """
+
+    def __init__(self, fields):
+        self._fields = fields
+        self._free = {}
+        self._in_use = {}
+        self._number_of_allocations = 0
+
+    @property
+    def number_of_allocations(self):
+        """Number of arrays the pool has allocated, in total."""
+        return self._number_of_allocations
+
+    @property
+    def number_in_use(self):
+        """Number of arrays lent out and not yet released."""
+        return len(self._in_use)
+
+    def empty(self, at='node', dtype=None, purpose=None):
+        """Borrow an array for a group, without initializing it.
+
+        Parameters
+        ----------
+        at : str, optional
+            Group of grid elements the array is for.
+        dtype : data-type, optional
+            Data type of the array. The default is the default data type of
+            the grid's fields.
+        purpose : hashable, optional
+            What the array is used for. Arrays are only reused for the
+            same purpose.
+
+        Returns
+        -------
+        ndarray
+            The borrowed array. Give it back with :meth:`release`.
+        """
+        if dtype is None:
+            dtype = self._fields.dtype
+        key = (at, np.dtype(dtype), purpose)
+        try:
+            array = self._free[key].pop()
+        except (KeyError, IndexError):
+            array = self._fields.empty(at, dtype=dtype)
+            self._number_of_allocations += 1
+        self._in_use[id(array)] = (key, array)
+        return array
+
+    def zeros(self, at='node', dtype=None, purpose=None):
+        """Borrow an array for a group, filled with zeros.
+
+        See :meth:`empty` for a description of the parameters.
+        """
+        array = self.empty(at=at, dtype=dtype, purpose=purpose)
+        array.fill(0)
+        return array
+
+    def release(self, *arrays):
+        """Give back borrowed arrays, to be lent out again.
+
+        Parameters
+        ----------
+        arrays : ndarray
+            Arrays borrowed from the pool. They must no longer be used.
+        """
+        for array in arrays:
+            try:
+                (key, _) = self._in_use.pop(id(array))
+            except KeyError:
+                raise ValueError('array was not borrowed from this pool')
+            self._free.setdefault(key, []).append(array)
+
+    def clear(self):
+        """Forget released arrays, so their memory can be freed."""
+        self._free.clear()
+
+    def __reduce__(self):
+        # scratch arrays are not worth pickling
+        return (BufferPool, (self._fields, ))
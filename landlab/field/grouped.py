@@ -1,7 +1,13 @@
 #! /usr/bin/env python
 """Store collections of data fields."""
 
+import functools
+import zlib
+
+import numpy as np
+
 from .scalar_data_fields import ScalarDataFields
+from .buffers import BufferPool
 
 
 class Error(Exception):
@@ -51,9 +57,16 @@ class ModelDataFields(object):
     the ScalarDataFields class but with the first argument being a string that
     defines the group name.
 
+    Parameters
+    ----------
+    dtype : data-type, optional
+        The default data type of new arrays created in any of the groups
+        (float64, by default).
+
     Attributes
     ----------
     groups
+    dtype
 
     See Also
     --------
@@ -103,6 +116,7 @@ class ModelDataFields(object):
     def __init__(self, **kwds):
         self._groups = dict()
         self._default_group = None
+        self._dtype = np.dtype(kwds.pop('dtype', float))
         super(ModelDataFields, self).__init__(**kwds)
 
     @property
@@ -116,6 +130,69 @@ class ModelDataFields(object):
         """
         return set(self._groups.keys())
 
+    @property
+    def dtype(self):
+        """Default data type of new arrays.
+
+        Arrays created with *empty*, *ones*, and *zeros* (and so fields
+        added with *add_empty*, *add_ones*, and *add_zeros*) are of this
+        type unless a *dtype* keyword is given. Use single precision
+        (float32) to halve the memory used by fields.
+
+        Returns
+        -------
+        numpy.dtype
+            The default data type.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab.field import ModelDataFields
+        >>> fields = ModelDataFields(dtype=np.float32)
+        >>> fields.dtype
+        dtype('float32')
+        >>> fields.new_field_location('node', 4)
+        >>> fields.add_ones('node', 'topographic__elevation').dtype
+        dtype('float32')
+        >>> fields.ones('node', dtype=int).dtype == np.dtype(int)
+        True
+
+        LLCATS: FIELDINF
+        """
+        return self._dtype
+
+    @property
+    def buffers(self):
+        """Pool of scratch arrays for the groups.
+
+        Components borrow temporary arrays from the pool while advancing a
+        step, and give them back when done, so that they are reused from one
+        step to the next rather than allocated anew (see
+        :class:`~landlab.field.buffers.BufferPool`).
+
+        Returns
+        -------
+        BufferPool
+            The pool of scratch arrays.
+
+        Examples
+        --------
+        >>> from landlab.field import ModelDataFields
+        >>> fields = ModelDataFields()
+        >>> fields.new_field_location('link', 5)
+        >>> grad = fields.buffers.zeros('link')
+        >>> grad.size
+        5
+        >>> fields.buffers.release(grad)
+
+        LLCATS: FIELDINF
+        """
+        try:
+            return self._buffers
+        except AttributeError:
+            self._buffers = BufferPool(self)
+            return self._buffers
+
     def set_default_group(self, group):
         """Set the default group for which fields are added.
 
@@ -316,7 +393,7 @@ class ModelDataFields(object):
         if self.has_group(group):
             raise ValueError('ModelDataFields already contains %s' % group)
         else:
-            self._groups[group] = ScalarDataFields(size)
+            self._groups[group] = ScalarDataFields(size, dtype=self.dtype)
             setattr(self, 'at_' + group, self[group])
 
     def field_values(self, group, field):
@@ -405,6 +482,78 @@ class ModelDataFields(object):
         """
         return self[group].units[field]
 
+    def field_version(self, group, field):
+        """Get the version number of a field.
+
+        A field's version number changes whenever the field is added or
+        replaced, and whenever it is marked as modified with
+        *mark_modified*. Changing the values of a field in place does not
+        change its version, so code that does this should mark the field
+        as modified.
+
+        Parameters
+        ----------
+        group: str
+            Name of the group.
+        field: str
+            Name of the field withing *group*.
+
+        Returns
+        -------
+        int
+            The version number of the field.
+
+        Raises
+        ------
+        GroupError
+            If *group* does not exits
+        FieldError
+            If *field* does not exits
+
+        Examples
+        --------
+        >>> from landlab.field import ModelDataFields
+        >>> fields = ModelDataFields()
+        >>> fields.new_field_location('node', 4)
+        >>> z = fields.add_ones('node', 'topographic__elevation')
+        >>> version = fields.field_version('node', 'topographic__elevation')
+
+        >>> z[0] = 2.
+        >>> fields.field_version('node', 'topographic__elevation') == version
+        True
+        >>> fields.mark_modified('node', 'topographic__elevation')
+        >>> fields.field_version('node', 'topographic__elevation') == version
+        False
+
+        LLCATS: FIELDINF
+        """
+        return self[group].version(field)
+
+    def mark_modified(self, group, field):
+        """Mark a field as modified.
+
+        Give a field a new version number. Call this after changing the
+        values of a field in place so that components tracking the field's
+        version see the change.
+
+        Parameters
+        ----------
+        group: str
+            Name of the group.
+        field: str
+            Name of the field withing *group*.
+
+        Raises
+        ------
+        GroupError
+            If *group* does not exits
+        FieldError
+            If *field* does not exits
+
+        LLCATS: FIELDIO
+        """
+        self[group].mark_modified(field)
+
     def empty(self, group, **kwds):
         """Uninitialized array whose size is that of the field.
 
@@ -593,8 +742,9 @@ class ModelDataFields(object):
         numpy_kwds = kwds.copy()
         numpy_kwds.pop('units', 0.)
         numpy_kwds.pop('noclobber', 0.)
-        return self.add_field(group, name, self.empty(group, **numpy_kwds),
-                              **kwds)
+        values = self[group]._new_field_array(
+            name, functools.partial(self.empty, group), None, **numpy_kwds)
+        return self.add_field(group, name, values, **kwds)
 
     def add_ones(self, *args, **kwds):
         """
@@ -668,8 +818,9 @@ class ModelDataFields(object):
         numpy_kwds = kwds.copy()
         numpy_kwds.pop('units', 0.)
         numpy_kwds.pop('noclobber', 0.)
-        return self.add_field(group, name, self.ones(group, **numpy_kwds),
-                              **kwds)
+        values = self[group]._new_field_array(
+            name, functools.partial(self.ones, group), 1, **numpy_kwds)
+        return self.add_field(group, name, values, **kwds)
 
     def add_zeros(self, *args, **kwds):
         """
@@ -725,8 +876,9 @@ class ModelDataFields(object):
         numpy_kwds = kwds.copy()
         numpy_kwds.pop('units', 0.)
         numpy_kwds.pop('noclobber', 0.)
-        return self.add_field(group, name, self.zeros(group, **numpy_kwds),
-                              **kwds)
+        values = self[group]._new_field_array(
+            name, functools.partial(self.zeros, group), 0, **numpy_kwds)
+        return self.add_field(group, name, values, **kwds)
 
     def add_field(self, *args, **kwds):
         """Add an array of values to the field.
@@ -864,3 +1016,46 @@ class ModelDataFields(object):
             return self._groups[group]
         except KeyError:
             raise GroupError(group)
+
+
+def field_fingerprints(fields):
+    """Identity and checksum of every field in a collection of fields.
+
+    Compare fingerprints taken before and after running some code to find
+    the fields it replaced or changed in place.
+
+    Parameters
+    ----------
+    fields : ModelDataFields
+        A grid, or other collection of fields.
+
+    Returns
+    -------
+    dict
+        For each field, keyed by (*group*, *name*), a tuple of the id of its
+        array and a checksum of its values. The checksum is None for arrays
+        that can't be checksummed.
+
+    Examples
+    --------
+    >>> from landlab.field import ModelDataFields, field_fingerprints
+    >>> fields = ModelDataFields()
+    >>> fields.new_field_location('node', 4)
+    >>> z = fields.add_ones('node', 'topographic__elevation')
+    >>> before = field_fingerprints(fields)
+    >>> z[0] = 2.
+    >>> after = field_fingerprints(fields)
+    >>> key = ('node', 'topographic__elevation')
+    >>> before[key][0] == after[key][0], before[key][1] == after[key][1]
+    (True, False)
+    """
+    fingerprints = {}
+    for group in fields.groups:
+        for name in fields.keys(group):
+            values = fields.field_values(group, name)
+            try:
+                checksum = zlib.crc32(np.ascontiguousarray(values))
+            except (TypeError, ValueError):
+                checksum = None
+            fingerprints[(group, name)] = (id(values), checksum)
+    return fingerprints
@@ -0,0 +1,295 @@
+#! /usr/bin/env python
+"""Keep selected fields in memory-mapped files rather than in memory.
+
+A :class:`MemmapFieldStore` holds fields in :class:`numpy.memmap` files in
+a scratch directory, so a grid can have more, and larger, fields than fit
+in memory; the operating system pages values in and out as they are used.
+Once a store is attached to the groups of a grid, fields that components
+(or anything else) add with *add_empty*, *add_ones*, or *add_zeros* go to
+the store if its policy takes them. Fields that already exist are moved
+with :meth:`MemmapFieldStore.move_fields`. A memory-mapped field is an
+ndarray, so component code works with it unchanged.
+
+Changes to memory-mapped fields reach the files when the operating system
+writes them back, or when the store is flushed. Flush it before saving a
+checkpoint of the model.
+
+Examples
+--------
+>>> from landlab import RasterModelGrid
+>>> from landlab.field.memmap import MemmapFieldStore
+>>> grid = RasterModelGrid((3, 4))
+>>> with MemmapFieldStore(policy=['topographic__elevation']) as store:
+...     store.attach(grid)
+...     z = grid.add_ones('node', 'topographic__elevation')
+...     area = grid.add_zeros('node', 'drainage_area')
+...     (store.is_mapped(z), store.is_mapped(area))
+(True, False)
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+class MemmapFieldStore(object):
+
+    """Allocate fields in memory-mapped files.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Scratch directory for the files. The default is a new temporary
+        directory, which is removed with the store.
+    policy : iterable of str or callable, optional
+        Fields to allocate in files. Either the names of the fields, or a
+        function that is passed the group, name, and size (in bytes) of a
+        new field and returns True if it should be in a file. The default
+        is every field.
+
+    Examples
+    --------
+    >>> from landlab.field.memmap import MemmapFieldStore
+    >>> store = MemmapFieldStore(policy=lambda group, name, nbytes:
+    ...                          nbytes > 2 ** 20)
+    >>> store.wants('node', 'topographic__elevation', 2 ** 30)
+    True
+    >>> store.wants('node', 'topographic__elevation', 2 ** 10)
+    False
+
+    >>> x = store.empty(10, name='x')
+    >>> store.is_mapped(x[2:])
+    True
+    >>> os.path.basename(store.files[0])
+    'x.0.dat'
+    >>> store.remove()
+    >>> store.files
+    []
+    """
+
+    def __init__(self, directory=None, policy=None):
+        if directory is None:
+            self._directory = tempfile.mkdtemp(prefix='landlab-')
+            self._owns_directory = True
+        else:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            self._directory = directory
+            self._owns_directory = False
+
+        if policy is None or callable(policy):
+            self._policy = policy
+        else:
+            self._policy = frozenset(policy)
+
+        self._arrays = []
+        self._groups = {}
+
+    @property
+    def directory(self):
+        """Directory that holds the files."""
+        return self._directory
+
+    @property
+    def files(self):
+        """Paths to the files, in the order they were created."""
+        return [path for (path, _) in self._arrays]
+
+    def wants(self, group, name, nbytes):
+        """Check if the policy puts a field in a file.
+
+        Parameters
+        ----------
+        group : str
+            Group of the field.
+        name : str
+            Name of the field.
+        nbytes : int
+            Size of the field in bytes.
+
+        Returns
+        -------
+        bool
+            True if the field should be in a file.
+        """
+        if self._policy is None:
+            return True
+        elif callable(self._policy):
+            return bool(self._policy(group, name, nbytes))
+        else:
+            return name in self._policy
+
+    def empty(self, shape, dtype=float, name='array'):
+        """New, uninitialized, memory-mapped array.
+
+        Parameters
+        ----------
+        shape : int or tuple of int
+            Shape of the array.
+        dtype : data-type, optional
+            Data type of the array.
+        name : str, optional
+            Start of the file name.
+
+        Returns
+        -------
+        numpy.memmap
+            The new array.
+        """
+        # a new file every time: truncating a file that is still mapped
+        # would pull the memory out from under its old array
+        path = os.path.join(self._directory, '{name}.{n}.dat'.format(
+            name=name, n=len(self._arrays)))
+        array = np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+        self._arrays.append((path, array))
+        return array
+
+    def is_mapped(self, array):
+        """Check if an array is, or views, one of the store's arrays.
+
+        Parameters
+        ----------
+        array : ndarray
+            An array.
+
+        Returns
+        -------
+        bool
+            True if the array is in one of the store's files.
+        """
+        roots = set(id(root) for (_, root) in self._arrays)
+        while isinstance(array, np.ndarray):
+            if id(array) in roots:
+                return True
+            array = array.base
+        return False
+
+    def attach(self, grid, groups=None):
+        """Allocate new fields of a grid from the store.
+
+        Parameters
+        ----------
+        grid : ModelDataFields
+            A grid, or other collection of fields.
+        groups : iterable of str, optional
+            Groups whose new fields the store allocates. The default is
+            every group of the grid, other than *grid*.
+        """
+        if groups is None:
+            groups = [group for group in grid.groups if group != 'grid']
+        for group in groups:
+            fields = grid[group]
+            if fields.size is None:
+                fields.size = grid.number_of_elements(group)
+            fields.store = self
+            self._groups[id(fields)] = (group, fields)
+
+    def detach(self, grid):
+        """Allocate new fields of a grid in memory again.
+
+        Fields already in files stay there.
+
+        Parameters
+        ----------
+        grid : ModelDataFields
+            A grid that the store is attached to.
+        """
+        for group in grid.groups:
+            if grid[group].store is self:
+                grid[group].store = None
+                del self._groups[id(grid[group])]
+
+    def allocate(self, fields, name, shape, dtype):
+        """Array for a new field, if the policy puts it in a file.
+
+        This is called by a collection of fields that the store is attached
+        to as fields are added.
+
+        Parameters
+        ----------
+        fields : ScalarDataFields
+            The fields of a group.
+        name : str
+            Name of the new field.
+        shape : tuple of int
+            Shape of the new field.
+        dtype : numpy.dtype
+            Data type of the new field.
+
+        Returns
+        -------
+        numpy.memmap or None
+            A new memory-mapped array, or None to allocate the field in
+            memory (as empty fields always are).
+        """
+        try:
+            (group, _) = self._groups[id(fields)]
+        except KeyError:
+            return None
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        # an empty file can't be mapped, and there would be nothing to page
+        if nbytes > 0 and self.wants(group, name, nbytes):
+            return self.empty(shape, dtype=dtype,
+                              name='{group}__{name}'.format(group=group,
+                                                            name=name))
+        else:
+            return None
+
+    def move_fields(self, grid, group='node', names=None):
+        """Move existing fields of a grid into files.
+
+        Each field is replaced by a memory-mapped copy of itself, so arrays
+        taken from the grid beforehand are no longer its fields.
+
+        Parameters
+        ----------
+        grid : ModelDataFields
+            A grid, or other collection of fields.
+        group : str, optional
+            Group of the fields.
+        names : iterable of str, optional
+            Names of the fields to move. The default is the fields of the
+            group that the policy puts in files. Empty fields stay in memory.
+        """
+        fields = grid[group]
+        if names is None:
+            names = [name for name in fields.keys()
+                     if self.wants(group, name, fields[name].nbytes)]
+        for name in names:
+            values = fields[name]
+            if values.size > 0 and not self.is_mapped(values):
+                mapped = self.empty(values.shape, dtype=values.dtype,
+                                    name='{group}__{name}'.format(
+                                        group=group, name=name))
+                mapped[...] = values
+                fields[name] = mapped
+
+    def flush(self):
+        """Write changes to all of the store's arrays to their files."""
+        for (_, array) in self._arrays:
+            array.flush()
+
+    def remove(self):
+        """Forget the store's arrays and delete their files.
+
+        Arrays still in use stay valid until they are garbage collected,
+        but should no longer be used. New fields of attached grids are
+        allocated in memory.
+        """
+        for (_, fields) in self._groups.values():
+            fields.store = None
+        self._groups.clear()
+        for (path, _) in self._arrays:
+            if os.path.exists(path):
+                os.remove(path)
+        self._arrays = []
+        if self._owns_directory and os.path.isdir(self._directory):
+            shutil.rmtree(self._directory)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.remove()
@@ -1,11 +1,17 @@
 #! /usr/bin/env python
 """Container that holds a collection of named data-fields."""
 
+import itertools
+
 import numpy as np
 
 
 _UNKNOWN_UNITS = '?'
 
+# Field versions are drawn from a single counter so that a field that is
+# deleted and then added again never reuses an earlier version number.
+_FIELD_VERSIONS = itertools.count(1)
+
 
 class Error(Exception):
 
@@ -68,11 +74,16 @@ class ScalarDataFields(dict):
     ----------
     size : int
         The number of elements in each of the data fields.
+    dtype : data-type, optional
+        The default data type of new arrays created by the collection
+        (float64, by default).
 
     Attributes
     ----------
     units
     size
+    dtype
+    versions
 
     See Also
     --------
@@ -132,11 +143,14 @@ class ScalarDataFields(dict):
     LLCATS: FIELDCR, FIELDIO
     """
 
-    def __init__(self, size=None):
+    def __init__(self, size=None, dtype=float):
         self._size = size
+        self._dtype = np.dtype(dtype)
 
         super(ScalarDataFields, self).__init__()
         self._units = dict()
+        self._versions = dict()
+        self._store = None
 
     @property
     def units(self):
@@ -167,6 +181,151 @@ class ScalarDataFields(dict):
         else:
             raise ValueError('size has already been set')
 
+    @property
+    def dtype(self):
+        """Default data type of new arrays.
+
+        Arrays created with *empty*, *ones*, and *zeros* (and so fields
+        added with *add_empty*, *add_ones*, and *add_zeros*) are of this
+        type unless a *dtype* keyword is given.
+
+        Returns
+        -------
+        numpy.dtype
+            The default data type.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab.field import ScalarDataFields
+        >>> field = ScalarDataFields(4, dtype=np.float32)
+        >>> field.dtype
+        dtype('float32')
+        >>> field.zeros().dtype
+        dtype('float32')
+        >>> field.zeros(dtype=int).dtype == np.dtype(int)
+        True
+        """
+        return self._dtype
+
+    @property
+    def store(self):
+        """Where new fields are allocated, if not in memory.
+
+        If set, fields added with *add_empty*, *add_ones*, and *add_zeros*
+        are allocated by the store (see
+        :class:`~landlab.field.memmap.MemmapFieldStore`), if it takes them,
+        rather than in memory. Its *allocate* method is passed this
+        collection of fields, the field name, shape and data type, and
+        returns a new array or None.
+
+        Returns
+        -------
+        object or None
+            The field store.
+        """
+        return self._store
+
+    @store.setter
+    def store(self, store):
+        self._store = store
+
+    def _new_field_array(self, name, create, fill, **kwds):
+        """Array for a new field, from the field store if it takes it."""
+        if self._store is not None:
+            dtype = np.dtype(kwds.get('dtype', self.dtype))
+            array = self._store.allocate(self, name, (self.size, ), dtype)
+            if array is not None:
+                if fill is not None:
+                    array.fill(fill)
+                return array
+        return create(**kwds)
+
+    @property
+    def versions(self):
+        """Version numbers of the fields.
+
+        A field's version number changes whenever the field is set, either
+        with one of the *add_* methods or through dict-like assignment, and
+        whenever it is marked as modified with *mark_modified*. Changing the
+        values of a field in place does not change its version.
+
+        Returns
+        -------
+        dict
+            Version numbers, keyed by field name.
+        """
+        return self._versions
+
+    def version(self, name):
+        """Version number of a field.
+
+        Version numbers can be saved and compared later to tell if a field
+        has changed in the meantime.
+
+        Parameters
+        ----------
+        name : str
+            Name of the field.
+
+        Returns
+        -------
+        int
+            The field's version number.
+
+        Raises
+        ------
+        FieldError
+            If the named field does not exist.
+
+        Examples
+        --------
+        >>> from landlab.field import ScalarDataFields
+        >>> fields = ScalarDataFields(4)
+        >>> z = fields.add_zeros('topographic__elevation')
+        >>> version = fields.version('topographic__elevation')
+
+        Changing values in place does not change the version,
+
+        >>> z += 1.
+        >>> fields.version('topographic__elevation') == version
+        True
+
+        unless the field is marked as modified.
+
+        >>> fields.mark_modified('topographic__elevation')
+        >>> fields.version('topographic__elevation') > version
+        True
+
+        LLCATS: FIELDINF
+        """
+        if name not in self:
+            raise FieldError(name)
+        return self._versions[name]
+
+    def mark_modified(self, name):
+        """Mark a field as modified.
+
+        Give a field a new version number. Call this after changing the
+        values of a field in place to signal the change to anything that
+        is tracking the field's version.
+
+        Parameters
+        ----------
+        name : str
+            Name of the field.
+
+        Raises
+        ------
+        FieldError
+            If the named field does not exist.
+
+        LLCATS: FIELDIO
+        """
+        if name not in self:
+            raise FieldError(name)
+        self._versions[name] = next(_FIELD_VERSIONS)
+
     def empty(self, **kwds):
         """Uninitialized array whose size is that of the field.
 
@@ -195,6 +354,7 @@ class ScalarDataFields(dict):
         >>> list(field.keys())
         []
         """
+        kwds.setdefault('dtype', self.dtype)
         return np.empty(self.size, **kwds)
 
     def ones(self, **kwds):
@@ -225,6 +385,7 @@ class ScalarDataFields(dict):
         >>> list(field.keys())
         []
         """
+        kwds.setdefault('dtype', self.dtype)
         return np.ones(self.size, **kwds)
 
     def zeros(self, **kwds):
@@ -253,6 +414,7 @@ class ScalarDataFields(dict):
         >>> list(field.keys())
         []
         """
+        kwds.setdefault('dtype', self.dtype)
         return np.zeros(self.size, **kwds)
 
     def add_empty(self, name, units=_UNKNOWN_UNITS, noclobber=True, **kwds):
@@ -287,8 +449,8 @@ class ScalarDataFields(dict):
 
         LLCATS: FIELDCR
         """
-        return self.add_field(name, self.empty(**kwds), units=units,
-                              noclobber=noclobber)
+        values = self._new_field_array(name, self.empty, None, **kwds)
+        return self.add_field(name, values, units=units, noclobber=noclobber)
 
     def add_ones(self, name, units=_UNKNOWN_UNITS, noclobber=True, **kwds):
         """Create and add an array of values, initialized to 1, to the field.
@@ -335,8 +497,8 @@ class ScalarDataFields(dict):
 
         LLCATS: FIELDCR
         """
-        return self.add_field(name, self.ones(**kwds), units=units,
-                              noclobber=noclobber)
+        values = self._new_field_array(name, self.ones, 1, **kwds)
+        return self.add_field(name, values, units=units, noclobber=noclobber)
 
     def add_zeros(self, name, units=_UNKNOWN_UNITS, noclobber=True, **kwds):
         """Create and add an array of values, initialized to 0, to the field.
@@ -370,8 +532,8 @@ class ScalarDataFields(dict):
 
         LLCATS: FIELDCR
         """
-        return self.add_field(name, self.zeros(**kwds), units=units,
-                              noclobber=noclobber)
+        values = self._new_field_array(name, self.zeros, 0, **kwds)
+        return self.add_field(name, values, units=units, noclobber=noclobber)
 
     def add_field(self, name, value_array, units=_UNKNOWN_UNITS, copy=False,
                   noclobber=True, **kwds):
@@ -485,6 +647,22 @@ class ScalarDataFields(dict):
             self.set_units(name, None)
 
         super(ScalarDataFields, self).__setitem__(name, value_array)
+        self.mark_modified(name)
+
+    def __delitem__(self, name):
+        """Remove a data field by name."""
+        super(ScalarDataFields, self).__delitem__(name)
+        self._versions.pop(name, None)
+
+    def __reduce__(self):
+        """Pickle the size, dtype, and units as well as the fields.
+
+        The field store is not pickled.
+        """
+        state = self.__dict__.copy()
+        state['_store'] = None
+        return (self.__class__, (self._size, self._dtype), state, None,
+                iter(dict.items(self)))
 
     def __getitem__(self, name):
         """Get a data field by name."""
@@ -0,0 +1,339 @@
+#! /usr/bin/env python
+"""Keep fields in named shared memory so other processes can use them.
+
+A :class:`SharedFieldStore` allocates arrays from named POSIX shared-memory
+segments and can move the fields of a grid into them. Objects that refer to
+these arrays (a grid, a component, a dict of fields) are then passed to
+another process with :meth:`SharedFieldStore.dumps` and :func:`loads`. Only
+the names of the segments, and the layout of the arrays within them, are
+pickled, so the other process attaches to the same memory rather than
+receiving a copy. Values it changes are seen by every process.
+
+The process that created a store owns its segments. They live until the
+store is unlinked (explicitly, or on leaving its ``with`` block), not until
+the processes using them exit. Other processes release their mappings with
+:func:`detach`.
+
+Shared memory needs the :mod:`multiprocessing.shared_memory` module, which
+is new in Python 3.8.
+
+Examples
+--------
+>>> from landlab import RasterModelGrid
+>>> from landlab.field.shared import SharedFieldStore, loads
+>>> grid = RasterModelGrid((3, 4))
+>>> z = grid.add_ones('node', 'topographic__elevation')
+>>> with SharedFieldStore() as store:
+...     store.share_fields(grid)
+...     data = store.dumps(grid)
+...     copy = loads(data)
+...     copy.at_node['topographic__elevation'][0] = 5.
+...     grid.at_node['topographic__elevation'][0]
+5.0
+"""
+
+import io
+import os
+import pickle
+import uuid
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+# Segments attached to by loads, by name
+_ATTACHED = {}
+
+# Segments that could not be closed because arrays still use them. Keep
+# them so they are not closed again when garbage collected.
+_IN_USE = []
+
+
+def _require_shared_memory():
+    """Raise if shared memory is not available."""
+    if shared_memory is None:
+        raise RuntimeError('shared memory fields need the '
+                           'multiprocessing.shared_memory module '
+                           '(Python 3.8 or later)')
+
+
+def _attach(name):
+    """Attach to an existing segment, once per process."""
+    try:
+        return _ATTACHED[name]
+    except KeyError:
+        pass
+    _require_shared_memory()
+    try:
+        segment = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # track is new in Python 3.13
+        segment = shared_memory.SharedMemory(name=name)
+    _ATTACHED[name] = segment
+    return segment
+
+
+def _close(segment):
+    """Close a segment, unless arrays still use it."""
+    try:
+        segment.close()
+    except BufferError:
+        _IN_USE.append(segment)
+
+
+def _array_from_layout(layout):
+    """Array that views a shared segment with a given layout."""
+    (name, dtype, shape, strides, offset) = layout
+    return np.ndarray(shape, dtype=np.dtype(dtype), strides=strides,
+                      offset=offset, buffer=_attach(name).buf)
+
+
+class _Unpickler(pickle.Unpickler):
+
+    """Unpickler that attaches to the shared arrays in the pickle."""
+
+    def __init__(self, fp):
+        pickle.Unpickler.__init__(self, fp)
+        self._arrays = {}
+
+    def persistent_load(self, pid):
+        # pickling views of the same array twice gives the same layout;
+        # reuse the array so identity within the pickled object survives
+        try:
+            return self._arrays[pid]
+        except KeyError:
+            array = self._arrays[pid] = _array_from_layout(pid)
+            return array
+
+
+class _Pickler(pickle.Pickler):
+
+    """Pickler that refers to shared arrays by name and layout."""
+
+    def __init__(self, fp, store):
+        pickle.Pickler.__init__(self, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store = store
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.ndarray):
+            return self._store.layout(obj)
+        return None
+
+
+def loads(data):
+    """Rebuild an object pickled by :meth:`SharedFieldStore.dumps`.
+
+    Shared arrays in the object are attached to, not copied. The segments
+    stay mapped until :func:`detach` is called.
+
+    Parameters
+    ----------
+    data : bytes
+        Pickled object.
+
+    Returns
+    -------
+    object
+        The rebuilt object.
+    """
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+def detach(name=None):
+    """Release segments attached to by :func:`loads`.
+
+    Arrays from a segment must no longer be used once it is detached.
+
+    Parameters
+    ----------
+    name : str, optional
+        Name of a segment. The default is every attached segment.
+    """
+    names = list(_ATTACHED) if name is None else [name]
+    for name in names:
+        _close(_ATTACHED.pop(name))
+
+
+class SharedFieldStore(object):
+
+    """Allocate arrays, and grid fields, from named shared memory.
+
+    Parameters
+    ----------
+    prefix : str, optional
+        Start of the names of the store's segments. The default is unique
+        to this process.
+
+    Examples
+    --------
+    >>> from landlab.field.shared import SharedFieldStore
+    >>> store = SharedFieldStore()
+    >>> x = store.zeros(4)
+    >>> x.sum()
+    0.0
+    >>> len(store.segments)
+    1
+    >>> store.layout(x[1:]) == (store.segments[0], '<f8', (3, ), (8, ), 8)
+    True
+    >>> store.layout(np.zeros(4)) is None
+    True
+
+    Unlink the segments when done with them.
+
+    >>> store.unlink()
+    >>> store.segments
+    []
+    """
+
+    def __init__(self, prefix=None):
+        _require_shared_memory()
+        self._prefix = prefix or 'landlab_{pid}_{id}'.format(
+            pid=os.getpid(), id=uuid.uuid4().hex[:8])
+        self._segments = {}
+        self._roots = {}
+
+    @property
+    def segments(self):
+        """Names of the store's segments."""
+        return sorted(self._segments)
+
+    def empty(self, shape, dtype=float):
+        """Uninitialized array in shared memory.
+
+        Parameters
+        ----------
+        shape : int or tuple of int
+            Shape of the array.
+        dtype : data-type, optional
+            Data type of the array.
+
+        Returns
+        -------
+        ndarray
+            The new array.
+        """
+        dtype = np.dtype(dtype)
+        shape = tuple(np.atleast_1d(shape))
+        nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        name = '{prefix}_{n}'.format(prefix=self._prefix,
+                                     n=len(self._segments))
+        segment = shared_memory.SharedMemory(name=name, create=True,
+                                             size=nbytes)
+        array = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+        self._segments[segment.name] = segment
+        self._roots[id(array)] = (segment.name, array)
+        return array
+
+    def zeros(self, shape, dtype=float):
+        """Array of zeros in shared memory (see :meth:`empty`)."""
+        array = self.empty(shape, dtype=dtype)
+        array.fill(0)
+        return array
+
+    def share(self, array):
+        """Copy of an array, in shared memory.
+
+        Parameters
+        ----------
+        array : array_like
+            Values to copy.
+
+        Returns
+        -------
+        ndarray
+            The shared copy.
+        """
+        array = np.asarray(array)
+        shared = self.empty(array.shape, dtype=array.dtype)
+        shared[...] = array
+        return shared
+
+    def share_fields(self, grid, groups=None):
+        """Move the fields of a grid into shared memory.
+
+        Each field is replaced by a shared copy of itself, so arrays that
+        were taken from the grid beforehand are no longer its fields. Fields
+        added later are not shared.
+
+        Parameters
+        ----------
+        grid : ModelDataFields
+            A grid, or other collection of fields.
+        groups : iterable of str, optional
+            Groups whose fields to move. The default is every group.
+        """
+        for group in (grid.groups if groups is None else groups):
+            fields = grid[group]
+            for name in list(fields.keys()):
+                if self.layout(fields[name]) is None:
+                    fields[name] = self.share(fields[name])
+
+    def layout(self, array):
+        """Where an array lies in the store's shared memory.
+
+        Parameters
+        ----------
+        array : ndarray
+            An array from the store, or a view of one.
+
+        Returns
+        -------
+        tuple or None
+            The segment name, data type, shape, strides and byte offset
+            of the array, or None if it is not in shared memory.
+        """
+        root = array
+        while id(root) not in self._roots:
+            root = root.base
+            if not isinstance(root, np.ndarray):
+                return None
+        (name, root) = self._roots[id(root)]
+        offset = (array.__array_interface__['data'][0] -
+                  root.__array_interface__['data'][0])
+        return (name, array.dtype.str, array.shape, array.strides, offset)
+
+    def dumps(self, obj):
+        """Pickle an object, referring to shared arrays by name.
+
+        Parameters
+        ----------
+        obj : object
+            Object to pickle, such as a grid or a component.
+
+        Returns
+        -------
+        bytes
+            The pickled object, for :func:`loads`.
+        """
+        fp = io.BytesIO()
+        _Pickler(fp, self).dump(obj)
+        return fp.getvalue()
+
+    def close(self):
+        """Release this process's mappings of the store's segments.
+
+        Segments whose arrays are still in use stay mapped.
+        """
+        for segment in self._segments.values():
+            _close(segment)
+
+    def unlink(self):
+        """Destroy the store's segments.
+
+        Processes that have them mapped can go on using them; the memory is
+        freed once the last of them releases it.
+        """
+        self.close()
+        for segment in self._segments.values():
+            segment.unlink()
+        self._segments.clear()
+        self._roots.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.unlink()
@@ -0,0 +1,76 @@
+#! /usr/bin/env python
+import pickle
+
+from nose.tools import assert_equal, assert_true, assert_is, assert_raises
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.field.buffers import BufferPool
+
+
+def test_grid_has_one_pool():
+    grid = RasterModelGrid((3, 4))
+    assert_is(grid.buffers, grid.buffers)
+    assert_true(isinstance(grid.buffers, BufferPool))
+
+
+def test_borrow_sized_for_group():
+    grid = RasterModelGrid((3, 4))
+    for group in ('node', 'link', 'patch', 'cell'):
+        array = grid.buffers.empty(group)
+        assert_equal(array.shape, (grid.number_of_elements(group), ))
+        grid.buffers.release(array)
+
+
+def test_reuse_by_key():
+    grid = RasterModelGrid((3, 4))
+    pool = grid.buffers
+    grad = pool.empty('link', purpose='gradient')
+    pool.release(grad)
+
+    assert_true(pool.empty('link', purpose='flux') is not grad)
+    assert_true(pool.empty('link', dtype=int, purpose='gradient')
+                is not grad)
+    assert_is(pool.empty('link', purpose='gradient'), grad)
+    assert_equal(pool.number_of_allocations, 3)
+    assert_equal(pool.number_in_use, 3)
+
+
+def test_default_dtype_is_that_of_grid():
+    grid = RasterModelGrid((3, 4), dtype=np.float32)
+    assert_equal(grid.buffers.empty('node').dtype, np.float32)
+    assert_equal(grid.buffers.empty('node', dtype=int).dtype, np.dtype(int))
+
+
+def test_zeros_are_zeroed_on_reuse():
+    grid = RasterModelGrid((3, 4))
+    array = grid.buffers.zeros('node')
+    array.fill(5.)
+    grid.buffers.release(array)
+    assert_equal(grid.buffers.zeros('node').sum(), 0.)
+
+
+def test_release_unknown_array():
+    grid = RasterModelGrid((3, 4))
+    assert_raises(ValueError, grid.buffers.release, grid.zeros('node'))
+
+    array = grid.buffers.empty('node')
+    grid.buffers.release(array)
+    assert_raises(ValueError, grid.buffers.release, array)
+
+
+def test_clear():
+    grid = RasterModelGrid((3, 4))
+    grid.buffers.release(grid.buffers.empty('node'))
+    grid.buffers.clear()
+    grid.buffers.empty('node')
+    assert_equal(grid.buffers.number_of_allocations, 2)
+
+
+def test_pickle_grid_with_buffers():
+    grid = RasterModelGrid((3, 4))
+    grid.buffers.release(grid.buffers.empty('node'))
+
+    copy = pickle.loads(pickle.dumps(grid))
+    assert_equal(copy.buffers.number_of_allocations, 0)
+    assert_equal(copy.buffers.empty('node').size, 12)
@@ -236,3 +236,58 @@ def test_nd_field():
     assert_raises(ValueError, fields.add_field, 'newestest_value', np.ones((13)), at='node')
 
     
+
+def test_default_dtype():
+    """Test that new fields take the dtype of the field groups."""
+    fields = ModelDataFields()
+    assert_true(fields.dtype == np.float64)
+    fields.new_field_location('node', 12)
+    assert_true(fields.add_zeros('value', at='node').dtype == np.float64)
+
+def test_single_precision_fields():
+    """Test creating single-precision fields."""
+    fields = ModelDataFields(dtype=np.float32)
+    fields.new_field_location('node', 12)
+
+    assert_true(fields.dtype == np.float32)
+    assert_true(fields.add_zeros('zeros', at='node').dtype == np.float32)
+    assert_true(fields.add_ones('ones', at='node').dtype == np.float32)
+    assert_true(fields.add_empty('empty', at='node').dtype == np.float32)
+    assert_true(fields.zeros('node').dtype == np.float32)
+    assert_true(fields.add_zeros('ids', at='node', dtype=int).dtype == int)
+
+def test_field_versions():
+    """Test that setting a field or marking it as modified changes version."""
+    fields = ModelDataFields()
+    fields.new_field_location('node', 12)
+
+    z = fields.add_zeros('node', 'topographic__elevation')
+    version = fields.field_version('node', 'topographic__elevation')
+    z += 1.
+    assert_true(fields.field_version('node', 'topographic__elevation') ==
+                version)
+
+    fields.mark_modified('node', 'topographic__elevation')
+    new_version = fields.field_version('node', 'topographic__elevation')
+    assert_true(new_version != version)
+
+    fields.at_node['topographic__elevation'] = np.ones(12)
+    assert_true(fields.field_version('node', 'topographic__elevation') !=
+                new_version)
+
+def test_field_version_after_delete():
+    """Test that a deleted field doesn't reuse an old version."""
+    fields = ModelDataFields()
+    fields.new_field_location('node', 12)
+
+    fields.add_zeros('node', 'topographic__elevation')
+    version = fields.field_version('node', 'topographic__elevation')
+    fields.delete_field('node', 'topographic__elevation')
+    assert_raises(FieldError, fields.field_version, 'node',
+                  'topographic__elevation')
+    assert_raises(FieldError, fields.mark_modified, 'node',
+                  'topographic__elevation')
+
+    fields.add_zeros('node', 'topographic__elevation')
+    assert_true(fields.field_version('node', 'topographic__elevation') !=
+                version)
@@ -0,0 +1,117 @@
+#! /usr/bin/env python
+import os
+import pickle
+
+from nose.tools import assert_equal, assert_true, assert_false
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid, HexModelGrid
+from landlab.components import FlowRouter
+from landlab.field import ScalarDataFields
+from landlab.field.memmap import MemmapFieldStore
+
+
+def test_policy_by_name():
+    grid = RasterModelGrid((3, 4))
+    with MemmapFieldStore(policy=['topographic__elevation']) as store:
+        store.attach(grid)
+        z = grid.add_ones('node', 'topographic__elevation', units='m')
+        area = grid.add_zeros('node', 'drainage_area')
+        assert_true(store.is_mapped(z))
+        assert_false(store.is_mapped(area))
+        assert_array_equal(z, 1.)
+        assert_equal(grid.at_node.units['topographic__elevation'], 'm')
+        assert_equal(len(store.files), 1)
+
+
+def test_policy_by_size():
+    grid = RasterModelGrid((3, 4))
+    with MemmapFieldStore(policy=lambda group, name, nbytes:
+                          group == 'node' and nbytes > 16) as store:
+        store.attach(grid)
+        assert_true(store.is_mapped(grid.add_zeros('node', 'x')))
+        assert_false(store.is_mapped(grid.add_zeros('cell', 'x')))
+
+
+def test_scalar_data_fields_store():
+    class OnlyX(object):
+        def allocate(self, fields, name, shape, dtype):
+            if name == 'x':
+                return np.full(shape, -1., dtype=dtype)
+
+    fields = ScalarDataFields(4)
+    fields.store = OnlyX()
+    assert_array_equal(fields.add_empty('x'), -1.)
+    assert_array_equal(fields.add_ones('y'), 1.)
+
+
+def test_move_fields():
+    grid = RasterModelGrid((3, 4))
+    grid.add_field('node', 'topographic__elevation', np.arange(12.))
+    with MemmapFieldStore() as store:
+        store.move_fields(grid)
+        z = grid.at_node['topographic__elevation']
+        assert_true(store.is_mapped(z))
+        assert_array_equal(z, np.arange(12.))
+
+
+def test_flush_and_remove():
+    grid = RasterModelGrid((3, 4))
+    store = MemmapFieldStore()
+    store.attach(grid)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z[:] = 2.
+    store.flush()
+    path = store.files[0]
+    assert_array_equal(np.fromfile(path, dtype=float), 2.)
+
+    store.remove()
+    assert_false(os.path.exists(path))
+    assert_false(os.path.exists(store.directory))
+    assert_true(grid.at_node.store is None)
+    assert_false(store.is_mapped(grid.add_zeros('node', 'drainage_area')))
+
+
+def test_flow_router_on_memmap():
+    np.random.seed(1945)
+    z = np.random.rand(100)
+
+    grid = RasterModelGrid((10, 10))
+    grid.add_field('node', 'topographic__elevation', z.copy())
+    FlowRouter(grid).run_one_step()
+
+    mapped = RasterModelGrid((10, 10))
+    with MemmapFieldStore() as store:
+        store.attach(mapped)
+        mapped.add_empty('node', 'topographic__elevation')[:] = z
+        FlowRouter(mapped).run_one_step()
+        assert_true(store.is_mapped(mapped.at_node['drainage_area']))
+        assert_array_equal(mapped.at_node['drainage_area'],
+                           grid.at_node['drainage_area'])
+
+
+def test_pickle_without_store():
+    grid = RasterModelGrid((3, 4))
+    with MemmapFieldStore() as store:
+        store.attach(grid)
+        grid.add_ones('node', 'topographic__elevation')
+        copy = pickle.loads(pickle.dumps(grid))
+    assert_true(copy.at_node.store is None)
+    assert_array_equal(copy.at_node['topographic__elevation'], 1.)
+
+
+def test_empty_group_stays_in_memory():
+    grid = HexModelGrid(2, 2)
+    assert_equal(grid.number_of_cells, 0)
+    with MemmapFieldStore() as store:
+        store.attach(grid)
+        x = grid.add_zeros('cell', 'x')
+        z = grid.add_ones('node', 'topographic__elevation')
+        assert_equal(x.size, 0)
+        assert_false(store.is_mapped(x))
+        assert_true(store.is_mapped(z))
+
+        grid.at_cell['y'] = np.empty(0)
+        store.move_fields(grid, group='cell')
+        assert_false(store.is_mapped(grid.at_cell['y']))
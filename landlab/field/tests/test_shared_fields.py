@@ -0,0 +1,85 @@
+#! /usr/bin/env python
+import multiprocessing
+import pickle
+
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_equal, assert_true, assert_is
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.field import shared
+
+
+def _require_shared_memory():
+    if shared.shared_memory is None:
+        raise SkipTest('shared memory not supported')
+
+
+def _raise_in_worker(data):
+    grid = shared.loads(data)
+    grid.at_node['topographic__elevation'] += 1.
+    shared.detach()
+
+
+def test_pickle_grid_with_fields():
+    grid = RasterModelGrid((3, 4))
+    grid.add_ones('node', 'topographic__elevation', units='m')
+
+    copy = pickle.loads(pickle.dumps(grid))
+    assert_array_equal(copy.at_node['topographic__elevation'], np.ones(12))
+    assert_equal(copy.at_node.units['topographic__elevation'], 'm')
+    assert_equal(copy.at_node.size, 12)
+
+
+def test_share_fields_keeps_values():
+    _require_shared_memory()
+    grid = RasterModelGrid((3, 4))
+    grid.add_field('node', 'topographic__elevation', np.arange(12.),
+                   units='m')
+    with shared.SharedFieldStore() as store:
+        store.share_fields(grid)
+        z = grid.at_node['topographic__elevation']
+        assert_true(store.layout(z) is not None)
+        assert_array_equal(z, np.arange(12.))
+        assert_equal(grid.at_node.units['topographic__elevation'], 'm')
+
+
+def test_dumps_does_not_copy_fields():
+    _require_shared_memory()
+    grid = RasterModelGrid((100, 100))
+    grid.add_zeros('node', 'topographic__elevation')
+    with shared.SharedFieldStore() as store:
+        store.share_fields(grid)
+        data = store.dumps(grid.at_node)
+        assert_true(len(data) < grid.number_of_nodes)
+
+        at_node = shared.loads(data)
+        at_node['topographic__elevation'][:] = 2.
+        assert_array_equal(grid.at_node['topographic__elevation'], 2.)
+    shared.detach()
+
+
+def test_loads_keeps_views_of_the_same_array():
+    _require_shared_memory()
+    with shared.SharedFieldStore() as store:
+        x = store.zeros(10)
+        (a, b, c) = shared.loads(store.dumps((x, x, x[2:])))
+        assert_is(a, b)
+        c[0] = 1.
+        assert_equal(a[2], 1.)
+    shared.detach()
+
+
+def test_fields_shared_with_another_process():
+    _require_shared_memory()
+    grid = RasterModelGrid((3, 4))
+    grid.add_zeros('node', 'topographic__elevation')
+    with shared.SharedFieldStore() as store:
+        store.share_fields(grid)
+        process = multiprocessing.Process(target=_raise_in_worker,
+                                          args=(store.dumps(grid), ))
+        process.start()
+        process.join()
+        assert_equal(process.exitcode, 0)
+        assert_array_equal(grid.at_node['topographic__elevation'], 1.)
@@ -3,6 +3,7 @@
 import inspect
 
 from .component import load_landlab_components
+from .scheduler import Scheduler
 from landlab import Palette, Arena
 
 
@@ -76,5 +77,13 @@ class Framework(object):
         """
         return self._palette.provides()
 
+    def scheduler(self, **kwds):
+        """
+        Get a scheduler that runs the components in the arena, concurrently
+        where they do not depend on one another. Keywords are passed to
+        :class:`~landlab.framework.scheduler.Scheduler`.
+        """
+        return Scheduler(self._arena, **kwds)
+
     def __repr__(self):
         return 'Framework(%s)' % ', '.join(self._palette.keys())
@@ -0,0 +1,376 @@
+#! /usr/bin/env python
+"""
+Run the components of an arena concurrently, in dependency order.
+
+The order in which components are listed is the order a simple model loop
+would run them in. Within a step, a component must wait for an earlier one
+if it reads a variable the earlier one writes, if it writes a variable the
+earlier one reads, or if they both write the same variable. Components that
+do not have to wait for one another are run at the same time in a thread
+pool. This only pays off if they spend their time in compiled code that
+releases the GIL, but it is always safe.
+
+Components can be run less often than every step (multi-rate coupling). A
+component that runs every *n* steps is run on steps 0, *n*, 2*n*, ..., and
+is given a time step *n* times as long.
+"""
+
+import threading
+
+from landlab.core.utils import takes_time_step
+from landlab.field import field_fingerprints
+from .collections import get_var_names
+
+
+class Error(Exception):
+    """
+    Base exception for this module
+    """
+
+
+class FieldConflictError(Error):
+    """
+    Raise this exception if components running at the same time changed a
+    field that none, or more than one, of them declares as an output.
+    """
+
+    def __init__(self, var_name, names):
+        self._name = var_name
+        self._components = names
+
+    def __str__(self):
+        return ('Field %s changed while %s ran concurrently, but is not an '
+                'output of exactly one of them' %
+                (self._name, ', '.join(sorted(self._components))))
+
+
+def _var_names(component, intent='input'):
+    """Names of the variables used (or provided) by a component.
+
+    Works for BMI-like components and for landlab components, which list
+    their variables as *input_var_names* and *output_var_names*.
+    """
+    try:
+        return set(get_var_names(component, intent=intent))
+    except AttributeError:
+        return set(getattr(component, intent + '_var_names', ()))
+
+
+def _stepper(component):
+    """Function that advances a component by a time step.
+
+    Landlab components are run with *run_one_step*, which is given the time
+    step if it takes one. Otherwise the BMI *update* method is called.
+    """
+    try:
+        run_one_step = component.run_one_step
+    except AttributeError:
+        return lambda dt: component.update()
+
+    # look the method up on every call, so a profiler can wrap it
+    if takes_time_step(run_one_step):
+        return lambda dt: component.run_one_step(dt)
+    else:
+        return lambda dt: component.run_one_step()
+
+
+def _run_in_threads(calls):
+    """Make calls in parallel threads, one thread for each.
+
+    Any error raised in a thread is raised again once all threads have
+    finished.
+
+    Parameters
+    ----------
+    calls : list of tuple
+        Functions to call, and the argument to call each with.
+    """
+    errors = []
+
+    def _run(func, arg):
+        try:
+            func(arg)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=_run, args=call) for call in calls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+class Scheduler(object):
+    """
+    Run the components of an arena, concurrently where possible.
+
+    Parameters
+    ----------
+    arena : dict-like
+        Components by name, such as an :class:`~landlab.Arena`.
+    order : list of str, optional
+        Names of the components in the order a serial model would run
+        them. The default is the order of the arena's keys.
+    every : dict, optional
+        For components that should not run every step, the number of steps
+        between runs.
+    executor : {'thread', 'serial'}, optional
+        Run independent components in a thread pool, or one at a time.
+    max_workers : int, optional
+        Number of threads in the pool. The default is one for each
+        component.
+    check_fields : bool, optional
+        After components have run concurrently, check that every field of
+        their grid that changed is an output of exactly one of them, and
+        raise :class:`FieldConflictError` if not. This catches components
+        that write fields they do not declare. It checksums every field, so
+        is slow.
+
+    Examples
+    --------
+    >>> from landlab.framework.scheduler import Scheduler
+    >>> class Stub(object):
+    ...     def __init__(self, uses, provides):
+    ...         self.input_var_names = uses
+    ...         self.output_var_names = provides
+    ...     def run_one_step(self, dt):
+    ...         pass
+    >>> arena = {
+    ...     'rain': Stub((), ('water__unit_flux_in', )),
+    ...     'uplift': Stub(('topographic__elevation', ),
+    ...                    ('topographic__elevation', )),
+    ...     'router': Stub(('topographic__elevation', 'water__unit_flux_in'),
+    ...                    ('drainage_area', ))}
+    >>> scheduler = Scheduler(arena, order=['rain', 'uplift', 'router'],
+    ...                       every={'rain': 10})
+    >>> scheduler.stages()
+    [['rain', 'uplift'], ['router']]
+    >>> scheduler.stages(step=1)
+    [['uplift'], ['router']]
+    >>> scheduler.dependencies()['router']
+    ['rain', 'uplift']
+    >>> scheduler.run(20, 1.)
+    >>> scheduler.step
+    20
+    """
+
+    def __init__(self, arena, order=None, every=None, executor='thread',
+                 max_workers=None, check_fields=False):
+        if executor not in ('thread', 'serial'):
+            raise ValueError('executor must be one of thread or serial')
+
+        self._arena = arena
+        self._order = list(order or arena.keys())
+        for name in self._order:
+            if name not in arena:
+                raise KeyError(name)
+        self._every = dict((name, 1) for name in self._order)
+        self._every.update(every or {})
+        for (name, every) in self._every.items():
+            if int(every) != every or every < 1:
+                raise ValueError(
+                    '%s: run frequency must be a positive integer' % name)
+        self._executor = executor
+        self._max_workers = max_workers
+        self._check_fields = check_fields
+
+        self._uses = {}
+        self._provides = {}
+        self._steppers = {}
+        for name in self._order:
+            component = arena[name]
+            self._uses[name] = _var_names(component, intent='input')
+            self._provides[name] = _var_names(component, intent='output')
+            self._steppers[name] = _stepper(component)
+
+        self._stages = {}
+        self._pool = None
+        self._step = 0
+
+    @property
+    def step(self):
+        """Number of steps run so far."""
+        return self._step
+
+    def due(self, step=None):
+        """Names of the components that run on a step, in order.
+
+        Parameters
+        ----------
+        step : int, optional
+            Step number. The default is the next step to be run.
+        """
+        if step is None:
+            step = self._step
+        return [name for name in self._order
+                if step % self._every[name] == 0]
+
+    def conflicts(self, step=None):
+        """Pairs of components that touch the same variable.
+
+        Parameters
+        ----------
+        step : int, optional
+            Step number. The default is the next step to be run.
+
+        Returns
+        -------
+        list of tuple
+            Tuples of (*earlier*, *later*, *var_name*, *kind*), where *kind*
+            is one of 'read-after-write', 'write-after-read' or
+            'write-after-write'.
+        """
+        names = self.due(step)
+        conflicts = []
+        for (i, earlier) in enumerate(names):
+            for later in names[i + 1:]:
+                for (kind, first, second) in (
+                        ('read-after-write', self._provides[earlier],
+                         self._uses[later]),
+                        ('write-after-read', self._uses[earlier],
+                         self._provides[later]),
+                        ('write-after-write', self._provides[earlier],
+                         self._provides[later])):
+                    for var_name in sorted(first & second):
+                        conflicts.append((earlier, later, var_name, kind))
+        return conflicts
+
+    def dependencies(self, step=None):
+        """Components that each component must wait for.
+
+        Parameters
+        ----------
+        step : int, optional
+            Step number. The default is the next step to be run.
+
+        Returns
+        -------
+        dict
+            For each component that runs on the step, a list of the names of
+            the earlier components it depends on.
+        """
+        depends_on = dict((name, set()) for name in self.due(step))
+        for (earlier, later, _, _) in self.conflicts(step):
+            depends_on[later].add(earlier)
+        return dict((name, [other for other in self._order if other in deps])
+                    for (name, deps) in depends_on.items())
+
+    def stages(self, step=None):
+        """Groups of components that can run at the same time.
+
+        Every component in a group only depends on components in earlier
+        groups.
+
+        Parameters
+        ----------
+        step : int, optional
+            Step number. The default is the next step to be run.
+
+        Returns
+        -------
+        list of list of str
+            Component names in each group.
+        """
+        names = tuple(self.due(step))
+        try:
+            return self._stages[names]
+        except KeyError:
+            pass
+
+        depends_on = self.dependencies(step)
+        level = {}
+        for name in names:
+            level[name] = 1 + max([level[other] for other in
+                                   depends_on[name]] or [-1])
+        stages = [[] for _ in range(max(level.values()) + 1)] if level else []
+        for name in names:
+            stages[level[name]].append(name)
+
+        self._stages[names] = stages
+        return stages
+
+    def run_one_step(self, dt=None):
+        """Run every component that is due for one step.
+
+        Parameters
+        ----------
+        dt : float, optional
+            Time step, passed to components whose *run_one_step* takes one.
+        """
+        for stage in self.stages():
+            if self._check_fields and len(stage) > 1:
+                grid = self._grid(stage)
+                fields_before = field_fingerprints(grid)
+
+            self._run_stage(stage, dt)
+
+            if self._check_fields and len(stage) > 1:
+                self._check_changed_fields(
+                    stage, fields_before, field_fingerprints(grid))
+        self._step += 1
+
+    def run(self, n_steps, dt=None):
+        """Run a number of steps.
+
+        Parameters
+        ----------
+        n_steps : int
+            Number of steps.
+        dt : float, optional
+            Time step, passed to components whose *run_one_step* takes one.
+        """
+        try:
+            for _ in range(n_steps):
+                self.run_one_step(dt)
+        finally:
+            self.close()
+
+    def close(self):
+        """Shut down the thread pool, if there is one."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run_stage(self, stage, dt):
+        """Run a group of independent components."""
+        calls = [(self._steppers[name],
+                  None if dt is None else dt * self._every[name])
+                 for name in stage]
+        if self._executor == 'serial' or len(stage) == 1:
+            for (stepper, component_dt) in calls:
+                stepper(component_dt)
+        else:
+            if self._pool is None:
+                try:
+                    from concurrent.futures import ThreadPoolExecutor
+                except ImportError:  # Python 2 without the futures backport
+                    _run_in_threads(calls)
+                    return
+                self._pool = ThreadPoolExecutor(
+                    self._max_workers or len(self._order))
+            futures = [self._pool.submit(stepper, component_dt)
+                       for (stepper, component_dt) in calls]
+            for future in futures:
+                future.result()
+
+    def _grid(self, stage):
+        """The grid shared by a group of components."""
+        for name in stage:
+            grid = getattr(self._arena[name], '_grid', None)
+            if grid is not None:
+                return grid
+        raise ValueError('check_fields needs components with a grid')
+
+    def _check_changed_fields(self, stage, before, after):
+        """Raise if a changed field is not written by exactly one component."""
+        for key in after:
+            if before.get(key) != after[key]:
+                var_name = key[1]
+                writers = [name for name in stage
+                           if var_name in self._provides[name]]
+                if len(writers) != 1:
+                    raise FieldConflictError(var_name, stage)
+
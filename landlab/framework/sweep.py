@@ -0,0 +1,189 @@
+#! /usr/bin/env python
+"""
+Run a model over many sets of parameters in a pool of processes.
+
+A :class:`ParameterSweep` is given a grid that has been set up once, and a
+function that runs a model on a grid for one set of parameters and returns
+whatever should be kept from the run (mean elevation, say, or a chi
+profile) rather than the whole grid. Each run gets a grid that shares the
+template's topology and read-only fields, with private copies of only the
+fields the model changes.
+
+Worker processes get the template grid without copying it when processes
+are forked. Otherwise the grid is pickled once for each worker, with its
+fields in shared memory if possible (see :mod:`landlab.field.shared`). In
+that case the model function must be importable by the workers (defined at
+the top level of a module, say).
+"""
+
+import copy
+import multiprocessing
+
+from landlab.field.scalar_data_fields import ScalarDataFields
+from landlab.field import shared
+
+
+# The template grid, model function and names of mutable fields of a
+# worker process
+_WORKER = {}
+
+
+def _task_grid(template, mutable=None):
+    """Grid for a run, that shares the topology of a template grid.
+
+    Fields named in *mutable* (all fields, if None) are copies of those of
+    the template. Others are read-only views of them. Fields added during
+    the run are only added to the new grid.
+    """
+    grid = copy.copy(template)
+    # scratch arrays and search structures are not shared between runs
+    grid.__dict__.pop('_buffers', None)
+    grid._node_kdtree = None
+    grid._node_triangulation = None
+    grid._groups = {}
+    for group in template.groups:
+        fields = template[group]
+        new_fields = ScalarDataFields(fields.size, dtype=fields.dtype)
+        for name in fields.keys():
+            if mutable is None or name in mutable:
+                new_fields[name] = fields[name].copy()
+            else:
+                new_fields[name] = fields[name].view()
+                new_fields[name].flags.writeable = False
+            new_fields.set_units(name, fields.units[name])
+        grid._groups[group] = new_fields
+        setattr(grid, 'at_' + group, new_fields)
+    return grid
+
+
+def _init_worker(template, run, mutable):
+    """Set up a worker process with the template grid."""
+    if isinstance(template, bytes):
+        template = shared.loads(template)
+    _WORKER.update(template=template, run=run, mutable=mutable)
+
+
+def _run_task(task):
+    """Run the model for one set of parameters in a worker process."""
+    (index, params) = task
+    grid = _task_grid(_WORKER['template'], _WORKER['mutable'])
+    return (index, _WORKER['run'](grid, **params))
+
+
+class ParameterSweep(object):
+    """
+    Run a model for each of a number of sets of parameters.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        The template grid, with its fields and boundary conditions set up.
+    run : callable
+        The model. It is passed a grid and a set of parameters as keywords,
+        and returns the result of the run.
+    mutable : iterable of str, optional
+        Names of the fields that the model changes. Each run gets its own
+        copy of these fields; others are shared, read-only, with the
+        template. The default is to copy every field. The model must not
+        change the grid's boundary conditions.
+    n_procs : int, optional
+        Number of worker processes. With one, runs are done in this
+        process, one after another.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import LinearDiffuser
+    >>> from landlab.framework.sweep import ParameterSweep
+
+    >>> grid = RasterModelGrid((5, 5))
+    >>> z = grid.add_zeros('node', 'topographic__elevation')
+    >>> z[12] = 1.
+    >>> def diffuse(grid, diffusivity=1.):
+    ...     ld = LinearDiffuser(grid, linear_diffusivity=diffusivity)
+    ...     for _ in range(10):
+    ...         ld.run_one_step(0.01)
+    ...     return grid.at_node['topographic__elevation'][12]
+    >>> sweep = ParameterSweep(grid, diffuse,
+    ...                        mutable=['topographic__elevation'])
+    >>> peaks = sweep.run([{'diffusivity': 0.1}, {'diffusivity': 1.}])
+    >>> peaks[0] > peaks[1]
+    True
+
+    The template grid is not changed.
+
+    >>> z[12]
+    1.0
+    """
+
+    def __init__(self, grid, run, mutable=None, n_procs=1):
+        self._grid = grid
+        self._run = run
+        self._mutable = None if mutable is None else frozenset(mutable)
+        self._n_procs = n_procs
+
+    def imap(self, param_sets):
+        """Run the model for each set of parameters, as results come in.
+
+        Parameters
+        ----------
+        param_sets : iterable of dict
+            Parameters of each run, as keywords for the model.
+
+        Yields
+        ------
+        tuple of (int, object)
+            The index of a set of parameters, and the result of its run,
+            in the order the runs finish.
+        """
+        tasks = enumerate(param_sets)
+        if self._n_procs == 1:
+            for (index, params) in tasks:
+                grid = _task_grid(self._grid, self._mutable)
+                yield (index, self._run(grid, **params))
+            return
+
+        try:
+            context = multiprocessing.get_context('fork')
+        except (AttributeError, ValueError):  # no fork
+            context = multiprocessing
+
+        start_method = getattr(context, 'get_start_method', lambda: 'fork')
+        store = None
+        if start_method() == 'fork':
+            template = self._grid
+        elif shared.shared_memory is not None:
+            store = shared.SharedFieldStore()
+            template = _task_grid(self._grid)
+            store.share_fields(template)
+            template = store.dumps(template)
+        else:
+            template = self._grid
+
+        pool = context.Pool(self._n_procs, initializer=_init_worker,
+                            initargs=(template, self._run, self._mutable))
+        try:
+            for result in pool.imap_unordered(_run_task, tasks):
+                yield result
+        finally:
+            pool.terminate()
+            pool.join()
+            if store is not None:
+                store.unlink()
+
+    def run(self, param_sets):
+        """Run the model for each set of parameters.
+
+        Parameters
+        ----------
+        param_sets : iterable of dict
+            Parameters of each run, as keywords for the model.
+
+        Returns
+        -------
+        list
+            The result of each run, in the order of *param_sets*.
+        """
+        results = dict(self.imap(param_sets))
+        return [results[index] for index in range(len(results))]
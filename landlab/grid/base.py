@@ -330,6 +330,10 @@ class ModelGrid(ModelDataFieldsMixIn):
         Name of axes
     axis_units : tuple, optional
         Units of coordinates
+    dtype : data-type, optional
+        Default data type of fields and arrays created by the grid (float64,
+        by default). Single precision (float32) halves the memory used by
+        fields.
     """
     # Debugging flags (if True, activates some output statements)
     _DEBUG_VERBOSE = False
@@ -348,7 +352,7 @@ class ModelGrid(ModelDataFieldsMixIn):
     _node_outlink_matrix = numpy.array([], dtype=numpy.int32)
 
     def __init__(self, **kwds):
-        super(ModelGrid, self).__init__()
+        super(ModelGrid, self).__init__(dtype=kwds.get('dtype', float))
 
         self.axis_name = kwds.get('axis_name', _default_axis_names(self.ndim))
         self.axis_units = kwds.get(
@@ -361,6 +365,8 @@ class ModelGrid(ModelDataFieldsMixIn):
         self._node_unit_vector_sum_y = None
         self._link_unit_vec_x = None
         self._link_unit_vec_y = None
+        self._node_kdtree = None
+        self._node_triangulation = None
         self.bc_set_code = 0
 
         # Sort links according to the x and y coordinates of their midpoints.
@@ -1738,11 +1744,11 @@ class ModelGrid(ModelDataFieldsMixIn):
         >>> mg.number_of_links_at_node
         array([2, 3, 3, 2, 3, 4, 4, 3, 2, 3, 3, 2])
         """
-        self._number_of_links_at_node = np.zeros(self.number_of_nodes,
-                                                 dtype=np.int)
-        for ln in range(self.number_of_links):
-            self._number_of_links_at_node[self.node_at_link_tail[ln]] += 1
-            self._number_of_links_at_node[self.node_at_link_head[ln]] += 1
+        self._number_of_links_at_node = (
+            np.bincount(self.node_at_link_tail,
+                        minlength=self.number_of_nodes) +
+            np.bincount(self.node_at_link_head,
+                        minlength=self.number_of_nodes)).astype(np.int)
 
     @property
     def number_of_links_at_node(self):
@@ -1805,21 +1811,25 @@ class ModelGrid(ModelDataFieldsMixIn):
         self._link_dirs_at_node = np.zeros((self.number_of_nodes,
                                             max_num_links), dtype=np.int8)
 
-        # Sweep over all links
-        for lk in range(self.number_of_links):
-            # Find the IDs of the tail and head nodes
-            t = self.node_at_link_tail[lk]
-            h = self.node_at_link_head[lk]
-
-            # Add this link to the list for this node, set the direction
-            # (outgoing, indicated by -1), and increment the number found so
-            # far
-            self._links_at_node[t][nlpn[t]] = lk
-            self._links_at_node[h][nlpn[h]] = lk
-            self._link_dirs_at_node[t][nlpn[t]] = -1
-            self._link_dirs_at_node[h][nlpn[h]] = 1
-            nlpn[t] += 1
-            nlpn[h] += 1
+        # Gather the tail and head nodes of all links, grouped by node, and
+        # add them to the lists for each node with their directions (outgoing,
+        # indicated by -1, or incoming, by 1).
+        nodes = np.concatenate((self.node_at_link_tail,
+                                self.node_at_link_head))
+        links = np.concatenate((np.arange(self.number_of_links),
+                                np.arange(self.number_of_links)))
+        dirs = np.repeat(np.array([-1, 1], dtype=np.int8),
+                         self.number_of_links)
+        sorted_by_node = np.argsort(nodes, kind='mergesort')
+        nodes = nodes[sorted_by_node]
+        links = links[sorted_by_node]
+        dirs = dirs[sorted_by_node]
+        del sorted_by_node
+        nlpn[:] = np.bincount(nodes, minlength=self.number_of_nodes)
+        position_at_node = np.arange(len(nodes))
+        position_at_node -= (np.cumsum(nlpn) - nlpn)[nodes]
+        self._links_at_node[nodes, position_at_node] = links
+        self._link_dirs_at_node[nodes, position_at_node] = dirs
 
         # Sort the links at each node by angle, counter-clockwise from +x
         self._sort_links_at_node_by_angle()
@@ -2022,10 +2032,10 @@ class ModelGrid(ModelDataFieldsMixIn):
             self.links_at_node[linkhead_at_node]]
         ang[self.link_dirs_at_node == 0] = 100.
         argsorted = np.argsort(ang, axis=1)
-        indices = np.indices(ang.shape)[0] * ang.shape[1] + argsorted
-        self._links_at_node.flat = self._links_at_node.flat[indices.flatten()]
-        self._link_dirs_at_node.flat = self._link_dirs_at_node.flat[
-            indices.flatten()]
+        del ang
+        rows = np.arange(self.number_of_nodes).reshape((-1, 1))
+        self._links_at_node[:] = self._links_at_node[rows, argsorted]
+        self._link_dirs_at_node[:] = self._link_dirs_at_node[rows, argsorted]
 
     def resolve_values_on_links(self, link_values, out=None):
         """Resolve the xy-components of links.
@@ -2375,15 +2385,10 @@ class ModelGrid(ModelDataFieldsMixIn):
 
         LLCATS: FINF CINF CONN
         """
-        num_faces_at_cell = np.zeros(self.number_of_cells, dtype=np.int)
-        for ln in range(self.number_of_links):
-            cell = self.cell_at_node[self.node_at_link_tail[ln]]
-            if cell != BAD_INDEX_VALUE:
-                num_faces_at_cell[cell] += 1
-            cell = self.cell_at_node[self.node_at_link_head[ln]]
-            if cell != BAD_INDEX_VALUE:
-                num_faces_at_cell[cell] += 1
-        return num_faces_at_cell
+        cells = np.concatenate((self.cell_at_node[self.node_at_link_tail],
+                                self.cell_at_node[self.node_at_link_head]))
+        return np.bincount(cells[cells != BAD_INDEX_VALUE],
+                           minlength=self.number_of_cells)
 
     def _sort_faces_at_cell_by_angle(self):
         """Sort the faces_at_cell array by angle.
@@ -2929,13 +2934,9 @@ class ModelGrid(ModelDataFieldsMixIn):
         """
         self._face_at_link = numpy.full(self.number_of_links, BAD_INDEX_VALUE,
                                         dtype=int)
-        face_id = 0
-        for link in range(self.number_of_links):
-            tc = self.cell_at_node[self.node_at_link_tail[link]]
-            hc = self.cell_at_node[self.node_at_link_head[link]]
-            if tc != BAD_INDEX_VALUE or hc != BAD_INDEX_VALUE:
-                self._face_at_link[link] = face_id
-                face_id += 1
+        (links_with_face, ) = numpy.where(self._link_has_face())
+        self._face_at_link[links_with_face] = numpy.arange(
+            len(links_with_face))
 
         return self._face_at_link
 
@@ -2949,18 +2950,26 @@ class ModelGrid(ModelDataFieldsMixIn):
         >>> hg.link_at_face
         array([ 3,  4,  5,  6,  8,  9, 10, 12, 13, 14, 15])
         """
-        num_faces = len(self.width_of_face)
-        self._link_at_face = numpy.empty(num_faces, dtype=int)
-        face_id = 0
-        for link in range(self.number_of_links):
-            tc = self.cell_at_node[self.node_at_link_tail[link]]
-            hc = self.cell_at_node[self.node_at_link_head[link]]
-            if tc != BAD_INDEX_VALUE or hc != BAD_INDEX_VALUE:
-                self._link_at_face[face_id] = link
-                face_id += 1
+        (self._link_at_face, ) = numpy.where(self._link_has_face())
+        self._link_at_face = as_id_array(self._link_at_face)
 
         return self._link_at_face
 
+    def _link_has_face(self):
+        """Find links that cross a face.
+
+        A link has a face if there is a cell at either of its nodes.
+
+        Returns
+        -------
+        ndarray of bool
+            ``True`` for links with a face.
+        """
+        return ((self.cell_at_node[self.node_at_link_tail] !=
+                 BAD_INDEX_VALUE) |
+                (self.cell_at_node[self.node_at_link_head] !=
+                 BAD_INDEX_VALUE))
+
     def _create_cell_areas_array_force_inactive(self):
         """Set up an array of cell areas that is n_nodes long.
 
@@ -3548,15 +3557,15 @@ class ModelGrid(ModelDataFieldsMixIn):
         accordingly. Assumes that self.number_of_nodes, self.node_at_link_tail,
         and self.node_at_link_head have already been set up.
 
-        Algorithm works by simply looping through all links; for each, the
-        endpoints are neighbors of one another, so we increment the number of
-        neighbors for both the endpoint nodes.
+        Algorithm works by simply counting the links; for each, the
+        endpoints are neighbors of one another, so we count a neighbor for
+        both the endpoint nodes.
         """
-        num_nbrs = numpy.zeros(self.number_of_nodes, dtype=int)
-        for link in range(self.number_of_links):
-            num_nbrs[self.node_at_link_tail[link]] += 1
-            num_nbrs[self.node_at_link_head[link]] += 1
-        return num_nbrs
+        num_nbrs = (numpy.bincount(self.node_at_link_tail,
+                                   minlength=self.number_of_nodes) +
+                    numpy.bincount(self.node_at_link_head,
+                                   minlength=self.number_of_nodes))
+        return num_nbrs.astype(int)
 
     def _create_active_faces(self):
         self._active_faces = self.face_at_link[self.active_links]
@@ -4542,6 +4551,267 @@ class ModelGrid(ModelDataFieldsMixIn):
 
         return self._all_node_distances_map, self._all_node_azimuths_map
 
+    def _query_points_from_coords(self, coords):
+        """Pack x, y coordinates into an array of query points.
+
+        Parameters
+        ----------
+        coords : tuple of float or tuple of array_like
+            Coordinates of points as (x, y).
+
+        Returns
+        -------
+        tuple of (ndarray, tuple)
+            Query points as a (n_points, 2) array, and the shape that the
+            coordinates were broadcast to (an empty tuple for a single
+            point).
+        """
+        x, y = np.broadcast_arrays(np.asarray(coords[0], dtype=float),
+                                   np.asarray(coords[1], dtype=float))
+        pts = np.empty((x.size, 2), dtype=float)
+        pts[:, 0] = x.flat
+        pts[:, 1] = y.flat
+        return pts, x.shape
+
+    @property
+    def _kdtree_of_node(self):
+        """KD-tree of node coordinates, built the first time it is needed."""
+        if self._node_kdtree is None:
+            from scipy.spatial import cKDTree
+            pts = np.empty((self.number_of_nodes, 2), dtype=float)
+            pts[:, 0] = self.x_of_node
+            pts[:, 1] = self.y_of_node
+            self._node_kdtree = cKDTree(pts)
+        return self._node_kdtree
+
+    @property
+    def _triangulation_of_node(self):
+        """Delaunay triangulation of nodes, built the first time it is needed.
+        """
+        if self._node_triangulation is None:
+            from scipy.spatial import Delaunay
+            pts = np.empty((self.number_of_nodes, 2), dtype=float)
+            pts[:, 0] = self.x_of_node
+            pts[:, 1] = self.y_of_node
+            self._node_triangulation = Delaunay(pts)
+        return self._node_triangulation
+
+    def is_point_on_grid(self, xcoord, ycoord):
+        """Check if a point is on the grid.
+
+        A point is on the grid if it lies within the convex hull of the grid
+        nodes. The triangulation used for the test is built the first time
+        it is needed and cached with the grid.
+
+        Parameters
+        ----------
+        xcoord : float or array_like
+            The point's x-coordinate.
+        ycoord : float or array_like
+            The point's y-coordinate.
+
+        Returns
+        -------
+        bool or ndarray of bool
+            ``True`` if the point is on the grid. Otherwise, ``False``.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> grid = HexModelGrid(3, 3)
+        >>> grid.is_point_on_grid(1., 0.5)
+        True
+        >>> grid.is_point_on_grid((1., 1., -1.), (0.5, -0.5, 0.5))
+        array([ True, False, False], dtype=bool)
+
+        LLCATS: GINF MEAS SUBSET
+        """
+        pts, shape = self._query_points_from_coords((xcoord, ycoord))
+        on_grid = self._triangulation_of_node.find_simplex(pts) >= 0
+        if shape == ():
+            return bool(on_grid[0])
+        else:
+            return on_grid.reshape(shape)
+
+    def find_nearest_node(self, coords, mode='raise'):
+        """Node nearest a point.
+
+        Find the index to the node nearest the given x, y coordinates.
+        Coordinates are provided as numpy arrays in the *coords* tuple. Nodes
+        are located using a KD-tree of node coordinates that is built the
+        first time it is needed and then cached with the grid, so many
+        points can be located in a single, fast, call.
+
+        Parameters
+        ----------
+        coords : tuple of array-like
+            Coordinates of points.
+        mode : {'raise', 'clip'}, optional
+            What to do if a point is off the grid. If 'raise', raise a
+            ``ValueError``; if 'clip', return the nearest node anyway.
+
+        Returns
+        -------
+        array-like
+            IDs of the nearest nodes.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> grid = HexModelGrid(3, 3)
+        >>> grid.find_nearest_node((1.1, 0.1))
+        1
+        >>> grid.find_nearest_node(([0.6, 1.4, 1.9], [0.8, 0.8, 1.6]))
+        array([4, 5, 9])
+        >>> grid.find_nearest_node((-0.2, -0.3), mode='raise')
+        Traceback (most recent call last):
+            ...
+        ValueError: point is off the grid
+        >>> grid.find_nearest_node((-0.2, -0.3), mode='clip')
+        0
+
+        LLCATS: NINF SUBSET
+        """
+        if mode not in ('raise', 'clip'):
+            raise ValueError('{mode}: mode not understood'.format(mode=mode))
+
+        pts, shape = self._query_points_from_coords(coords)
+        if mode == 'raise' and not np.all(self.is_point_on_grid(pts[:, 0],
+                                                                pts[:, 1])):
+            raise ValueError('point is off the grid')
+
+        _, nodes = self._kdtree_of_node.query(pts)
+        nodes = as_id_array(nodes)
+        if shape == ():
+            return nodes[0]
+        else:
+            return nodes.reshape(shape)
+
+    def find_k_nearest_nodes(self, coords, k, return_distances=False):
+        """Nodes nearest a point, closest first.
+
+        Find the *k* nodes nearest each of the given x, y coordinates. Points
+        may be off of the grid.
+
+        Parameters
+        ----------
+        coords : tuple of array-like
+            Coordinates of points.
+        k : int
+            Number of nodes to find for each point.
+        return_distances : bool, optional
+            If ``True``, also return the distances to the nodes.
+
+        Returns
+        -------
+        ndarray or tuple of ndarray
+            IDs of the nearest nodes, as an array of shape
+            (number of points, *k*), ordered by increasing distance. If
+            *return_distances* is ``True``, a tuple of the IDs and the
+            distances.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> grid = HexModelGrid(3, 3)
+        >>> grid.find_k_nearest_nodes((1.1, 0.1), 2)
+        array([[1, 5]])
+        >>> nodes, dists = grid.find_k_nearest_nodes(([1.5, 0.1], [0.1, 0.]),
+        ...                                          2, return_distances=True)
+        >>> nodes[1]
+        array([0, 1])
+        >>> dists[1]
+        array([ 0.1,  0.9])
+
+        LLCATS: NINF SUBSET
+        """
+        pts, _ = self._query_points_from_coords(coords)
+        dists, nodes = self._kdtree_of_node.query(pts, k=k)
+        nodes = as_id_array(nodes).reshape((len(pts), k))
+        if return_distances:
+            return nodes, dists.reshape((len(pts), k))
+        else:
+            return nodes
+
+    def find_nodes_within_distance(self, coords, distance):
+        """Nodes within a distance of a point.
+
+        Find all nodes that are no further than *distance* from each of the
+        given x, y coordinates.
+
+        Parameters
+        ----------
+        coords : tuple of array-like
+            Coordinates of points.
+        distance : float
+            Search radius.
+
+        Returns
+        -------
+        ndarray or list of ndarray
+            Sorted IDs of the nodes within the search radius. If *coords* is
+            a single point, an array of node IDs; otherwise, a list with an
+            array for each point.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> grid = HexModelGrid(3, 3)
+        >>> grid.find_nodes_within_distance((1.5, 0.9), 0.99)
+        array([5, 8, 9])
+        >>> grid.find_nodes_within_distance(([0.5, 10.], [0.4, 0.]), 0.7)
+        [array([0, 1, 4]), array([], dtype=int64)]
+
+        LLCATS: NINF SUBSET
+        """
+        pts, shape = self._query_points_from_coords(coords)
+        nodes_near = self._kdtree_of_node.query_ball_point(pts, distance)
+        nodes_near = [np.sort(as_id_array(np.array(nodes, dtype=int)))
+                      for nodes in nodes_near]
+        if shape == ():
+            return nodes_near[0]
+        else:
+            return nodes_near
+
+    def find_cell_containing_point(self, coords):
+        """Cell containing a point.
+
+        Find the cell that contains each of the given x, y coordinates. Grid
+        cells are the Voronoi polygons of their nodes, so the cell
+        containing a point is the cell of the node nearest to it. Points that
+        are not within any cell (including points off the grid) are assigned
+        :const:`~landlab.grid.base.BAD_INDEX_VALUE`.
+
+        Parameters
+        ----------
+        coords : tuple of array-like
+            Coordinates of points.
+
+        Returns
+        -------
+        array-like
+            IDs of the cells containing the points.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> grid = HexModelGrid(3, 3)
+        >>> grid.node_at_cell
+        array([4, 5])
+        >>> grid.find_cell_containing_point((0.7, 0.9))
+        0
+        >>> grid.find_cell_containing_point(([1.9, 0.1, 10.], [0.9, 0., 0.]))
+        array([ 1, -1, -1])
+
+        LLCATS: CINF SUBSET
+        """
+        nodes = np.asarray(self.find_nearest_node(coords, mode='clip'))
+        cells = self.cell_at_node[nodes]
+        if nodes.ndim == 0:
+            return cells
+        else:
+            return as_id_array(cells)
+
     def _sort_links_by_midpoint(self):
         """Sort links in order first by midpoint x coordinate, then y.
 
@@ -4593,6 +4863,8 @@ class ModelGrid(ModelDataFieldsMixIn):
         """
         self._node_x += origin[0]
         self._node_y += origin[1]
+        self._node_kdtree = None
+        self._node_triangulation = None
 
 
 add_module_functions_to_class(ModelGrid, 'mappers.py', pattern='map_*')
@@ -40,19 +40,35 @@ def find_rows_containing_ID(np.ndarray[DTYPE_INT_t, ndim=2] input_array,
 def create_patches_at_element(
         np.ndarray[DTYPE_INT_t, ndim=2] elements_at_patch,
         int number_of_elements, np.ndarray[DTYPE_INT_t, ndim=2] out):
+    """Record the patches that each element is part of.
+
+    Patches at each element are listed in increasing order of patch ID.
+    Unfilled entries of *out* are left untouched.
+
+    Parameters
+    ----------
+    elements_at_patch : ndarray of int, shape `(n_patches, n_elements)`
+        Elements (nodes or links, say) of each patch. Entries of -1 are
+        ignored.
+    number_of_elements : int
+        Number of elements.
+    out : ndarray of int, shape `(number_of_elements, max_patches)`
+        Output array of patches at each element.
     """
-    """
+    cdef int n_patches = elements_at_patch.shape[0]
+    cdef int n_elements_at_patch = elements_at_patch.shape[1]
+    cdef int patch
     cdef int i
-    cdef np.ndarray[DTYPE_INT_t, ndim=2] element_with_value = np.empty_like(
-        (elements_at_patch), dtype=int)
-    cdef np.ndarray[DTYPE_INTP_t, ndim=1] patches_with_element
-    cdef int num_elements_here
+    cdef int element
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] n_found = np.zeros(
+        number_of_elements, dtype=int)
 
-    for i in range(number_of_elements):
-        np.equal(elements_at_patch, i, out=element_with_value)
-        patches_with_element = np.argwhere(element_with_value)[:, 0]
-        num_elements_here = patches_with_element.size
-        out[i, :num_elements_here] = patches_with_element
+    for patch in range(n_patches):
+        for i in range(n_elements_at_patch):
+            element = elements_at_patch[patch, i]
+            if element >= 0 and element < number_of_elements:
+                out[element, n_found[element]] = patch
+                n_found[element] += 1
 
 
 @cython.boundscheck(False)
@@ -60,24 +76,57 @@ def create_links_at_patch(np.ndarray[DTYPE_INT_t, ndim=2] nodes_at_patch,
                           np.ndarray[DTYPE_INT_t, ndim=2] links_at_node,
                           int number_of_patches,
                           np.ndarray[DTYPE_INT_t, ndim=2] out):
+    """Find the links that connect the nodes of each patch.
 
+    Links of each patch are listed in increasing order of link ID.
+
+    Parameters
+    ----------
+    nodes_at_patch : ndarray of int, shape `(n_patches, 3)`
+        Nodes at the corners of each (triangular) patch.
+    links_at_node : ndarray of int, shape `(n_nodes, max_links)`
+        Links at each node, padded with -1.
+    number_of_patches : int
+        Number of patches.
+    out : ndarray of int, shape `(n_patches, 3)`
+        Output array of links at each patch.
+    """
+    cdef int n_corners = nodes_at_patch.shape[1]
+    cdef int max_links = links_at_node.shape[1]
+    cdef int max_found = out.shape[1]
+    cdef int patch
+    cdef int corner
+    cdef int node
+    cdef int other
     cdef int i
-    cdef np.ndarray[DTYPE_INT_t, ndim=1] nodes_on_patch = np.empty(
-        nodes_at_patch.shape[1], dtype=int)
-    cdef np.ndarray[DTYPE_INT_t, ndim=2] links_at_patch_nodes = np.empty(
-        (nodes_at_patch.shape[1], links_at_node.shape[1]), dtype=int)
-    cdef np.ndarray[DTYPE_INT_t, ndim=1] vals
-    cdef np.ndarray[DTYPE_INTP_t, ndim=1] counts
-    cdef np.ndarray[DTYPE_INT_t, ndim=1] duplicated_vals
-
-    for i in range(number_of_patches):
-        nodes_on_patch = nodes_at_patch[i, :]
-        links_at_patch_nodes = links_at_node[nodes_on_patch, :]
-        vals, counts = np.unique(links_at_patch_nodes,
-                                 return_counts=True)
-        duplicated_vals = vals[counts == 2]
-        # if len==4, contains a -1; strip it
-        out[i, :] = duplicated_vals[-3:]  # out of order, so far
+    cdef int j
+    cdef int link
+    cdef int n_found
+    cdef int tmp
+
+    for patch in range(number_of_patches):
+        n_found = 0
+        for corner in range(n_corners):
+            node = nodes_at_patch[patch, corner]
+            other = nodes_at_patch[patch, (corner + 1) % n_corners]
+            for i in range(max_links):
+                link = links_at_node[node, i]
+                if link < 0 or n_found == max_found:
+                    continue
+                for j in range(max_links):
+                    if links_at_node[other, j] == link:
+                        out[patch, n_found] = link
+                        n_found += 1
+                        break
+
+        # Insertion sort the (few) links of the patch by ID
+        for i in range(1, n_found):
+            j = i
+            while j > 0 and out[patch, j - 1] > out[patch, j]:
+                tmp = out[patch, j - 1]
+                out[patch, j - 1] = out[patch, j]
+                out[patch, j] = tmp
+                j -= 1
 
 
 @cython.boundscheck(False)
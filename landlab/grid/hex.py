@@ -11,10 +11,213 @@ automated fashion. To modify the text seen on the web, edit the files
 import numpy
 import six
 
+from landlab.grid.base import INACTIVE_LINK, FIXED_VALUE_BOUNDARY
 from landlab.grid.voronoi import VoronoiDelaunayGrid
+from landlab.core.utils import (as_id_array, sort_points_by_x_then_y,
+                                argsort_points_by_x_then_y)
 from .decorators import return_readonly_id_array
 
 
+def _lattice_coords_of_points(pts, dx, orientation):
+    """Get row and half-column indices of points on a hexagonal lattice.
+
+    Rows are parallel to the axis of the lattice given by *orientation*
+    (the x-axis for 'horizontal', the y-axis for 'vertical'). Along a row,
+    neighboring points are two half-columns apart.
+
+    Parameters
+    ----------
+    pts : ndarray of float, shape `(n_points, 2)`
+        Coordinates of the lattice points.
+    dx : float
+        Spacing between neighboring points.
+    orientation : str
+        Either 'horizontal' or 'vertical'.
+
+    Returns
+    -------
+    tuple of ndarray of int
+        Row and half-column of each point.
+
+    Examples
+    --------
+    >>> from landlab import HexModelGrid
+    >>> from landlab.grid.hex import _lattice_coords_of_points
+    >>> pts = HexModelGrid._hex_points_with_horizontal_hex(3, 2, 1.)
+    >>> (rows, cols) = _lattice_coords_of_points(pts, 1., 'horizontal')
+    >>> rows
+    array([0, 0, 1, 1, 1, 2, 2])
+    >>> cols
+    array([1, 3, 0, 2, 4, 1, 3])
+    """
+    if orientation[0] == 'h':
+        along, across = pts[:, 0], pts[:, 1]
+    else:
+        along, across = pts[:, 1], pts[:, 0]
+    row_spacing = dx * numpy.sqrt(3.) / 2.
+
+    rows = numpy.round((across - across.min()) / row_spacing).astype(int)
+    cols = numpy.round(2. * (along - along.min()) / dx).astype(int)
+
+    return rows, cols
+
+
+def _find_lattice_keys(sorted_keys, sorted_points, keys):
+    """Find the points with the given lattice keys (-1 if there are none)."""
+    inds = numpy.searchsorted(sorted_keys, keys)
+    inds[inds == len(sorted_keys)] = 0
+    return numpy.where(sorted_keys[inds] == keys, sorted_points[inds], -1)
+
+
+def _triangles_of_hex_lattice(rows, cols):
+    """Get the Delaunay triangles of the points of a hexagonal lattice.
+
+    Triangles are built directly from the lattice: every pair of neighboring
+    points in a row forms a triangle with the points above and below the
+    pair. Rows of a rectangular lattice alternate their offset, which leaves
+    a notch at every other row along the left and right edges; these are
+    closed with an additional triangle to fill the convex hull.
+
+    Parameters
+    ----------
+    rows : ndarray of int
+        Lattice row of each point.
+    cols : ndarray of int
+        Lattice half-column of each point.
+
+    Returns
+    -------
+    ndarray of int, shape `(n_triangles, 3)`
+        Points at the corners of each triangle.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.hex import _triangles_of_hex_lattice
+    >>> rows = np.array([0, 0, 1, 1, 1, 2, 2])
+    >>> cols = np.array([1, 3, 0, 2, 4, 1, 3])
+    >>> _triangles_of_hex_lattice(rows, cols)
+    array([[0, 1, 3],
+           [2, 3, 5],
+           [3, 4, 6],
+           [0, 2, 3],
+           [1, 3, 4],
+           [3, 5, 6]])
+    """
+    row_width = cols.max() + 3
+    keys = rows * row_width + cols
+    sorted_points = numpy.argsort(keys, kind='mergesort')
+    sorted_keys = keys[sorted_points]
+
+    right = _find_lattice_keys(sorted_keys, sorted_points, keys + 2)
+    (left, ) = numpy.where(right >= 0)
+    right = right[left]
+
+    above = _find_lattice_keys(sorted_keys, sorted_points,
+                               keys[left] + row_width + 1)
+    below = _find_lattice_keys(sorted_keys, sorted_points,
+                               keys[left] - row_width + 1)
+    triangles = [
+        numpy.column_stack((left, right, above))[above >= 0],
+        numpy.column_stack((below, left, right))[below >= 0],
+    ]
+
+    # Fill notches along the sides of the lattice.
+    sorted_rows = rows[sorted_points]
+    row_start = numpy.flatnonzero(numpy.diff(sorted_rows)) + 1
+    first = sorted_points[numpy.concatenate(([0], row_start))]
+    last = sorted_points[numpy.concatenate((row_start - 1,
+                                            [len(sorted_points) - 1]))]
+    for (ends, sign) in ((first, 1), (last, -1)):
+        col = cols[ends] * sign
+        (notch, ) = numpy.where((col[1:-1] > col[:-2]) &
+                                (col[1:-1] > col[2:]))
+        triangles.append(numpy.column_stack((ends[notch], ends[notch + 1],
+                                             ends[notch + 2])))
+
+    return as_id_array(numpy.concatenate(triangles))
+
+
+def _links_of_triangles(triangles, n_nodes):
+    """Get the links that form the sides of triangles.
+
+    Parameters
+    ----------
+    triangles : ndarray of int, shape `(n_triangles, 3)`
+        Nodes at the corners of each triangle.
+    n_nodes : int
+        Number of nodes.
+
+    Returns
+    -------
+    tuple of ndarray of int
+        Tail and head nodes of each link (the tail node is the lower of
+        the two node IDs), and the triangles on either side of each
+        link (-1 for links on the perimeter).
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.hex import _links_of_triangles
+    >>> (tail, head, triangles) = _links_of_triangles(
+    ...     np.array([[0, 1, 2], [1, 3, 2]]), 4)
+    >>> tail
+    array([0, 0, 1, 1, 2])
+    >>> head
+    array([1, 2, 2, 3, 3])
+    >>> triangles
+    array([[ 0, -1],
+           [ 0, -1],
+           [ 0,  1],
+           [ 1, -1],
+           [ 1, -1]])
+    """
+    n_triangles = len(triangles)
+    sides = numpy.concatenate((triangles[:, (0, 1)], triangles[:, (1, 2)],
+                               triangles[:, (2, 0)]))
+    sides.sort(axis=1)
+    triangle_at_side = numpy.tile(numpy.arange(n_triangles), 3)
+
+    (keys, link_at_side, count) = numpy.unique(
+        sides[:, 0] * n_nodes + sides[:, 1], return_inverse=True,
+        return_counts=True)
+
+    sorted_sides = numpy.argsort(link_at_side, kind='mergesort')
+    last_side = numpy.cumsum(count) - 1
+    first_side = last_side - count + 1
+
+    triangles_at_link = numpy.full((len(keys), 2), -1, dtype=int)
+    triangles_at_link[:, 0] = triangle_at_side[sorted_sides[first_side]]
+    triangles_at_link[count == 2, 1] = triangle_at_side[
+        sorted_sides[last_side[count == 2]]]
+
+    return (as_id_array(keys // n_nodes), as_id_array(keys % n_nodes),
+            triangles_at_link)
+
+
+def _circumcenters_of_triangles(x, y, triangles):
+    """Get the circumcenters of triangles.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.hex import _circumcenters_of_triangles
+    >>> x, y = np.array([0., 2., 0.]), np.array([0., 0., 2.])
+    >>> _circumcenters_of_triangles(x, y, np.array([[0, 1, 2]]))
+    (array([ 1.]), array([ 1.]))
+    """
+    (ax, ay) = (x[triangles[:, 0]], y[triangles[:, 0]])
+    (bx, by) = (x[triangles[:, 1]] - ax, y[triangles[:, 1]] - ay)
+    (cx, cy) = (x[triangles[:, 2]] - ax, y[triangles[:, 2]] - ay)
+
+    d = 2. * (bx * cy - by * cx)
+    b_sq = bx * bx + by * by
+    c_sq = cx * cx + cy * cy
+
+    return (ax + (cy * b_sq - by * c_sq) / d,
+            ay + (bx * c_sq - cx * b_sq) / d)
+
+
 class HexModelGrid(VoronoiDelaunayGrid):
     """A grid of hexagonal cells.
 
@@ -218,14 +421,99 @@ class HexModelGrid(VoronoiDelaunayGrid):
                 self._nodes[:, col] = numpy.arange(
                     base_node, self._nrows * self._ncols, self._ncols)
 
-        # Call the VoronoiDelaunayGrid constructor to triangulate/Voronoi
-        # the nodes into a grid.
-        super(HexModelGrid, self)._initialize(
-            pts[:, 0], pts[:, 1], reorient_links)
-
         # Remember grid spacing
         self._dx = dx
 
+        # Connect the nodes into a grid. Because the nodes lie on a regular
+        # lattice, the triangulation and its dual are known in closed form.
+        self._initialize_from_lattice(pts, reorient_links)
+
+    def _initialize_from_lattice(self, pts, reorient_links=True):
+        """Set up grid elements and connectivity from lattice points.
+
+        This builds the same grid as
+        :py:meth:`VoronoiDelaunayGrid._initialize` does for the lattice
+        points but constructs the Delaunay triangulation (patches), links,
+        faces, and cells directly from the layout of the hexagonal lattice
+        rather than from a general-purpose triangulation.
+        """
+        self.pts = sort_points_by_x_then_y(pts)
+        self._node_x = self.pts[:, 0]
+        self._node_y = self.pts[:, 1]
+        n_nodes = len(self.pts)
+
+        patches = self._triangles_of_lattice()
+        (tail, head, patches_at_link) = _links_of_triangles(patches, n_nodes)
+        on_perimeter = patches_at_link[:, 1] == -1
+
+        # NODES AND CELLS: nodes on the convex hull are boundaries, all
+        # others are core nodes that have a cell.
+        self._node_status = numpy.zeros(n_nodes, dtype=numpy.int8)
+        self._node_status[tail[on_perimeter]] = FIXED_VALUE_BOUNDARY
+        self._node_status[head[on_perimeter]] = FIXED_VALUE_BOUNDARY
+        self._boundary_nodes = as_id_array(
+            numpy.where(self._node_status != 0)[0])
+        core_nodes = as_id_array(numpy.where(self._node_status == 0)[0])
+        [self._cell_at_node, self._node_at_cell] = \
+            self._node_to_cell_connectivity(self._node_status,
+                                            len(core_nodes))
+        self._core_cells = self._cell_at_node[core_nodes]
+
+        # LINKS: sort by midpoint coordinates
+        sorted_links = argsort_points_by_x_then_y(
+            ((self._node_x[tail] + self._node_x[head]) / 2.,
+             (self._node_y[tail] + self._node_y[head]) / 2.))
+        tail = tail[sorted_links]
+        head = head[sorted_links]
+        patches_at_link = patches_at_link[sorted_links]
+
+        # FACES: each link shared by two triangles crosses the face that
+        # joins their circumcenters.
+        has_face = patches_at_link[:, 1] != -1
+        (xc, yc) = _circumcenters_of_triangles(self._node_x, self._node_y,
+                                               patches)
+        (left, right) = (patches_at_link[has_face, 0],
+                         patches_at_link[has_face, 1])
+        self._face_width = numpy.hypot(xc[left] - xc[right],
+                                       yc[left] - yc[right])
+
+        # CELLS: the area of a cell is the sum of the kite-shaped areas
+        # between its node and each of its faces.
+        half_area = numpy.hypot(
+            self._node_x[head[has_face]] - self._node_x[tail[has_face]],
+            self._node_y[head[has_face]] - self._node_y[tail[has_face]]
+        ) * self._face_width / 4.
+        area_at_node = (
+            numpy.bincount(tail[has_face], weights=half_area,
+                           minlength=n_nodes) +
+            numpy.bincount(head[has_face], weights=half_area,
+                           minlength=n_nodes))
+        self._area_of_cell = area_at_node[self._node_at_cell]
+
+        self._node_at_link_tail = tail
+        self._node_at_link_head = head
+        self._status_at_link = numpy.full(len(tail), INACTIVE_LINK,
+                                          dtype=int)
+
+        self._setup_link_connectivity(reorient_links)
+
+    def _triangles_of_lattice(self):
+        """Get the nodes of the Delaunay triangles of the lattice."""
+        return _triangles_of_hex_lattice(
+            *_lattice_coords_of_points(self.pts, self._dx, self.orientation))
+
+    def _create_patches(self):
+        """Create the patches of the grid from the triangles of the lattice.
+        """
+        patches = self._triangles_of_lattice()
+        (tail, head, patches_at_link) = _links_of_triangles(
+            patches, self.number_of_nodes)
+        on_perimeter = patches_at_link[:, 1] == -1
+
+        self._create_patches_from_triangles(
+            patches, numpy.concatenate((tail[on_perimeter],
+                                        head[on_perimeter])))
+
     def _create_cell_areas_array(self):
         r"""Create an array of surface areas of hexagonal cells.
 
@@ -288,19 +576,17 @@ class HexModelGrid(VoronoiDelaunayGrid):
                 ((num_rows - 1) // 2) * ((num_rows - 1) // 2)
         pts = numpy.zeros((npts, 2))
         middle_row = num_rows // 2
-        extra_cols = 0
-        xshift = 0.
-        i = 0
-        for r in range(num_rows):
-            for c in range(base_num_cols + extra_cols):
-                pts[i, 0] = c * dxh + xshift
-                pts[i, 1] = r * dxv
-                i += 1
-            if r < middle_row:
-                extra_cols += 1
-            else:
-                extra_cols -= 1
-            xshift = - half_dxh * extra_cols
+        rows = numpy.arange(num_rows)
+        extra_cols = middle_row - numpy.abs(middle_row - rows)
+        cols_in_row = base_num_cols + extra_cols
+
+        row = numpy.repeat(rows, cols_in_row)
+        col = numpy.arange(npts) - numpy.repeat(
+            numpy.cumsum(cols_in_row) - cols_in_row, cols_in_row)
+        xshift = - half_dxh * extra_cols[row]
+
+        pts[:, 0] = col * dxh + xshift
+        pts[:, 1] = row * dxv
 
         return pts
 
@@ -344,14 +630,11 @@ class HexModelGrid(VoronoiDelaunayGrid):
 
         npts = num_rows * num_cols
         pts = numpy.zeros((npts, 2))
-        xshift = 0.
-        i = 0
-        for r in range(num_rows):
-            for c in range(num_cols):
-                xshift = half_dxh * (r % 2)
-                pts[i, 0] = c * dxh + xshift
-                pts[i, 1] = r * dxv
-                i += 1
+        (row, col) = numpy.divmod(numpy.arange(npts), num_cols)
+        xshift = half_dxh * (row % 2)
+
+        pts[:, 0] = col * dxh + xshift
+        pts[:, 1] = row * dxv
 
         return pts
 
@@ -400,19 +683,17 @@ class HexModelGrid(VoronoiDelaunayGrid):
                 ((num_cols - 1) // 2) * ((num_cols - 1) // 2)
         pts = numpy.zeros((npts, 2))
         middle_col = num_cols // 2
-        extra_rows = 0
-        yshift = 0.
-        i = 0
-        for c in range(num_cols):
-            for r in range(base_num_rows + extra_rows):
-                pts[i, 1] = r * dxv + yshift
-                pts[i, 0] = c * dxh
-                i += 1
-            if c < middle_col:
-                extra_rows += 1
-            else:
-                extra_rows -= 1
-            yshift = - half_dxv * extra_rows
+        cols = numpy.arange(num_cols)
+        extra_rows = middle_col - numpy.abs(middle_col - cols)
+        rows_in_col = base_num_rows + extra_rows
+
+        col = numpy.repeat(cols, rows_in_col)
+        row = numpy.arange(npts) - numpy.repeat(
+            numpy.cumsum(rows_in_col) - rows_in_col, rows_in_col)
+        yshift = - half_dxv * extra_rows[col]
+
+        pts[:, 1] = row * dxv + yshift
+        pts[:, 0] = col * dxh
 
         return pts
 
@@ -455,14 +736,11 @@ class HexModelGrid(VoronoiDelaunayGrid):
 
         npts = num_rows * num_cols
         pts = numpy.zeros((npts, 2))
-        yshift = 0.
-        i = 0
-        for c in range(num_cols):
-            for r in range(num_rows):
-                yshift = half_dxv * (c % 2)
-                pts[i, 1] = r * dxv + yshift
-                pts[i, 0] = c * dxh
-                i += 1
+        (col, row) = numpy.divmod(numpy.arange(npts), num_rows)
+        yshift = half_dxv * (col % 2)
+
+        pts[:, 1] = row * dxv + yshift
+        pts[:, 0] = col * dxh
 
         return pts
 
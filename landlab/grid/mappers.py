@@ -624,8 +624,8 @@ def map_min_of_node_links_to_node(grid, var_name, out=None):
     if out is None:
         out = grid.empty(at='node')
 
-    values_at_linksX = np.empty(grid.number_of_links+1, dtype=float)
-    values_at_linksX[-1] = np.finfo(dtype=float).max
+    values_at_linksX = np.empty(grid.number_of_links+1, dtype=grid.dtype)
+    values_at_linksX[-1] = np.finfo(grid.dtype).max
     if type(var_name) is str:
         values_at_linksX[:-1] = grid.at_link[var_name]
     else:
@@ -689,8 +689,8 @@ def map_max_of_node_links_to_node(grid, var_name, out=None):
     if out is None:
         out = grid.empty(at='node')
 
-    values_at_linksX = np.empty(grid.number_of_links+1, dtype=float)
-    values_at_linksX[-1] = np.finfo(dtype=float).min
+    values_at_linksX = np.empty(grid.number_of_links+1, dtype=grid.dtype)
+    values_at_linksX[-1] = np.finfo(grid.dtype).min
     if type(var_name) is str:
         values_at_linksX[:-1] = grid.at_link[var_name]
     else:
@@ -1222,7 +1222,7 @@ def map_mean_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True,
     LLCATS: PINF NINF MAP
     """
     if out is None:
-        out = np.zeros(grid.number_of_patches, dtype=float)
+        out = np.zeros(grid.number_of_patches, dtype=grid.dtype)
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
@@ -1299,7 +1299,7 @@ def map_max_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True,
     LLCATS: PINF NINF MAP
     """
     if out is None:
-        out = np.zeros(grid.number_of_patches, dtype=float)
+        out = np.zeros(grid.number_of_patches, dtype=grid.dtype)
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
@@ -1376,7 +1376,7 @@ def map_min_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True,
     LLCATS: PINF NINF MAP
     """
     if out is None:
-        out = np.zeros(grid.number_of_patches, dtype=float)
+        out = np.zeros(grid.number_of_patches, dtype=grid.dtype)
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
@@ -1484,8 +1484,8 @@ def map_link_vector_sum_to_patch(grid, var_name, ignore_inactive_links=True,
     LLCATS: PINF LINF MAP
     """
     if out is None:
-        out = [np.zeros(grid.number_of_patches, dtype=float),
-               np.zeros(grid.number_of_patches, dtype=float)]
+        out = [np.zeros(grid.number_of_patches, dtype=grid.dtype),
+               np.zeros(grid.number_of_patches, dtype=grid.dtype)]
     else:
         assert len(out) == 2
 
@@ -0,0 +1,95 @@
+"""Test locating points on unstructured grids."""
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, assert_raises
+
+from landlab import HexModelGrid, RadialModelGrid, VoronoiDelaunayGrid
+from landlab.grid.base import BAD_INDEX_VALUE
+
+
+def _brute_force_nearest_node(grid, x, y):
+    """Find nearest nodes by calculating all of the distances."""
+    dist = np.hypot(grid.x_of_node.reshape((1, -1)) - x.reshape((-1, 1)),
+                    grid.y_of_node.reshape((1, -1)) - y.reshape((-1, 1)))
+    return np.argmin(dist, axis=1)
+
+
+def _grids():
+    np.random.seed(1945)
+    yield HexModelGrid(7, 5)
+    yield RadialModelGrid(num_shells=4)
+    yield VoronoiDelaunayGrid(np.random.rand(50), np.random.rand(50))
+
+
+def test_nearest_node_matches_brute_force():
+    """Test that nearest nodes from the tree are the closest nodes."""
+    np.random.seed(2017)
+    for grid in _grids():
+        x = np.random.uniform(grid.x_of_node.min(), grid.x_of_node.max(), 200)
+        y = np.random.uniform(grid.y_of_node.min(), grid.y_of_node.max(), 200)
+        assert_array_equal(grid.find_nearest_node((x, y), mode='clip'),
+                           _brute_force_nearest_node(grid, x, y))
+
+
+def test_nearest_node_with_scalars():
+    """Test scalar args."""
+    grid = HexModelGrid(3, 3)
+    node = grid.find_nearest_node((1.4, 0.8))
+    assert_equal(node, 5)
+    assert_equal(np.ndim(node), 0)
+
+
+def test_nearest_node_keeps_shape():
+    """Test that the shape of the coordinates is preserved."""
+    grid = HexModelGrid(3, 3)
+    x = np.array([[0.6, 1.4], [1.9, 1.1]])
+    y = np.array([[0.8, 0.8], [1.6, 0.1]])
+    assert_array_equal(grid.find_nearest_node((x, y)), [[4, 5], [9, 1]])
+
+
+def test_nearest_node_off_grid():
+    """Test the off-grid modes."""
+    grid = HexModelGrid(3, 3)
+    assert_raises(ValueError, grid.find_nearest_node, (10., 0.))
+    assert_equal(grid.find_nearest_node((10., 0.), mode='clip'), 6)
+    assert_raises(ValueError, grid.find_nearest_node, (1., 0.), mode='wrap')
+
+
+def test_k_nearest_nodes_sorted_by_distance():
+    """Test that k nearest nodes are closest first."""
+    np.random.seed(2017)
+    for grid in _grids():
+        x, y = np.random.rand(20), np.random.rand(20)
+        nodes, dists = grid.find_k_nearest_nodes((x, y), 4,
+                                                 return_distances=True)
+        assert_equal(nodes.shape, (20, 4))
+        assert_array_equal(nodes[:, 0], _brute_force_nearest_node(grid, x, y))
+        assert np.all(np.diff(dists, axis=1) >= 0.)
+
+
+def test_nodes_within_distance():
+    """Test the radius search against calculated distances."""
+    for grid in _grids():
+        point = (grid.x_of_node.mean(), grid.y_of_node.mean())
+        dist = grid.calc_distances_of_nodes_to_point(point)
+        assert_array_equal(grid.find_nodes_within_distance(point, 0.5),
+                           np.where(dist <= 0.5)[0])
+
+
+def test_cell_containing_point():
+    """Test that points are in the cells of their nearest node."""
+    grid = HexModelGrid(5, 4)
+    assert_array_equal(
+        grid.find_cell_containing_point((grid.x_of_node, grid.y_of_node)),
+        grid.cell_at_node)
+    assert_equal(grid.find_cell_containing_point((100., 100.)),
+                 BAD_INDEX_VALUE)
+
+
+def test_moving_origin_resets_index():
+    """Test that the index follows the nodes when the grid moves."""
+    grid = HexModelGrid(3, 3)
+    assert_equal(grid.find_nearest_node((1.4, 0.8)), 5)
+    grid.move_origin((10., 10.))
+    assert_equal(grid.find_nearest_node((11.4, 10.8)), 5)
+    assert_raises(ValueError, grid.find_nearest_node, (1.4, 0.8))
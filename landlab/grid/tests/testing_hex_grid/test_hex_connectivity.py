@@ -0,0 +1,50 @@
+"""Test the hex grid against a Voronoi-Delaunay grid of the same nodes."""
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_equal
+
+from landlab import HexModelGrid, VoronoiDelaunayGrid
+
+
+def _check_same_as_voronoi(hmg):
+    vdg = VoronoiDelaunayGrid(hmg.x_of_node, hmg.y_of_node)
+
+    assert_array_equal(hmg.x_of_node, vdg.x_of_node)
+    assert_array_equal(hmg.y_of_node, vdg.y_of_node)
+    assert_array_equal(hmg.status_at_node, vdg.status_at_node)
+    assert_array_equal(hmg.node_at_link_tail, vdg.node_at_link_tail)
+    assert_array_equal(hmg.node_at_link_head, vdg.node_at_link_head)
+    assert_array_equal(hmg.links_at_node, vdg.links_at_node)
+    assert_array_equal(hmg.link_dirs_at_node, vdg.link_dirs_at_node)
+    assert_array_equal(hmg.neighbors_at_node, vdg.neighbors_at_node)
+    assert_array_equal(hmg.node_at_cell, vdg.node_at_cell)
+    assert_array_equal(hmg.face_at_link, vdg.face_at_link)
+    assert_array_almost_equal(hmg.width_of_face, vdg.width_of_face)
+    assert_array_almost_equal(hmg.area_of_cell, vdg.area_of_cell)
+
+    assert_equal(hmg.number_of_patches, vdg.number_of_patches)
+    assert_equal(set(map(frozenset, hmg.nodes_at_patch)),
+                 set(map(frozenset, vdg.nodes_at_patch)))
+    assert_equal(hmg.patches_at_node.shape, vdg.patches_at_node.shape)
+
+
+def test_hex_shapes_match_voronoi():
+    """Test hex grids of every shape and orientation."""
+    for shape in ('hex', 'rect'):
+        for orientation in ('horizontal', 'vertical'):
+            for (nrows, ncols) in [(4, 5), (5, 6), (6, 4)]:
+                for dx in (1., 2.5):
+                    _check_same_as_voronoi(
+                        HexModelGrid(nrows, ncols, dx, shape=shape,
+                                     orientation=orientation))
+
+
+def test_cells_are_hexagons():
+    """Test that every cell is a regular hexagon."""
+    hmg = HexModelGrid(7, 7, dx=2.)
+    assert_array_almost_equal(hmg.area_of_cell,
+                              np.full(hmg.number_of_cells, 2. * np.sqrt(3.)))
+    assert_array_almost_equal(hmg.width_of_face,
+                              np.full(hmg.number_of_faces, 2. / np.sqrt(3.)))
+    assert_array_equal(np.sum(hmg.patches_at_node[hmg.core_nodes] >= 0,
+                              axis=1), 6)
@@ -7,6 +7,8 @@ Do NOT add new documentation here. Grid documentation is now built in a semi-
 automated fashion. To modify the text seen on the web, edit the files
 `docs/text_for_[gridfile].py.txt`.
 """
+from itertools import chain
+
 import numpy as np
 from six.moves import range
 
@@ -184,6 +186,29 @@ class VoronoiDelaunayGrid(ModelGrid):
             self._initialize(x, y, reorient_links)
         super(VoronoiDelaunayGrid, self).__init__(**kwds)
 
+    @property
+    def vor(self):
+        """Voronoi diagram of the grid's nodes.
+
+        The diagram takes up a lot of memory and so is not kept once the grid
+        has been built. It is recreated the first time it is asked for (for
+        instance, for plotting).
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 2)
+        >>> hmg.vor.npoints
+        7
+
+        LLCATS: OTHER
+        """
+        try:
+            return self._vor
+        except AttributeError:
+            self._vor = Voronoi(self.pts)
+            return self._vor
+
     def _initialize(self, x, y, reorient_links=True):
         """
         Creates an unstructured grid around the given (x,y) points.
@@ -231,13 +256,8 @@ class VoronoiDelaunayGrid(ModelGrid):
         # ACTIVE CELLS: Construct Voronoi diagram and calculate surface area of
         # each active cell.
         vor = Voronoi(self.pts)
-        self.vor = vor
-        self._area_of_cell = np.zeros(self.number_of_cells)
-        for node in self._node_at_cell:
-            xv = vor.vertices[vor.regions[vor.point_region[node]], 0]
-            yv = vor.vertices[vor.regions[vor.point_region[node]], 1]
-            self._area_of_cell[self.cell_at_node[node]] = (
-                simple_poly_area(xv, yv))
+        self._area_of_cell = self._calc_area_of_voronoi_regions(
+            vor, self._node_at_cell)
 
         # LINKS: Construct Delaunay triangulation and construct lists of link
         # "from" and "to" nodes.
@@ -246,12 +266,25 @@ class VoronoiDelaunayGrid(ModelGrid):
          _,
          self._face_width) = \
             self._create_links_and_faces_from_voronoi_diagram(vor)
+        # The diagram is big, so free it before building the rest of the grid
+        # (it can be recreated with the vor property).
+        del vor
         self._status_at_link = np.full(len(self._node_at_link_tail),
                                        INACTIVE_LINK, dtype=int)
 
         # Sort them by midpoint coordinates
         self._sort_links_by_midpoint()
 
+        self._setup_link_connectivity(reorient_links)
+
+    def _setup_link_connectivity(self, reorient_links=True):
+        """Set up link geometry and connectivity from sorted links.
+
+        Once the tail and head nodes of each link have been set, and the links
+        sorted by their midpoints, this creates the remaining link-based
+        structures of the grid (link lengths, links at nodes, unit vectors,
+        and neighbors).
+        """
         # Optionally re-orient links so that they all point within upper-right
         # semicircle
         if reorient_links:
@@ -292,7 +325,7 @@ class VoronoiDelaunayGrid(ModelGrid):
         try:
             return self._number_of_patches
         except AttributeError:
-            self._create_patches_from_delaunay_diagram(self.pts, self.vor)
+            self._create_patches()
             return self._number_of_patches
 
     @property
@@ -304,7 +337,7 @@ class VoronoiDelaunayGrid(ModelGrid):
         try:
             return self._nodes_at_patch
         except AttributeError:
-            self._create_patches_from_delaunay_diagram(self.pts, self.vor)
+            self._create_patches()
             return self._nodes_at_patch
 
     @property
@@ -338,7 +371,7 @@ class VoronoiDelaunayGrid(ModelGrid):
         try:
             return self._patches_at_node
         except AttributeError:
-            self._create_patches_from_delaunay_diagram(self.pts, self.vor)
+            self._create_patches()
             return self._patches_at_node
 
     @property
@@ -363,7 +396,7 @@ class VoronoiDelaunayGrid(ModelGrid):
         try:
             return self._links_at_patch
         except AttributeError:
-            self._create_patches_from_delaunay_diagram(self.pts, self.vor)
+            self._create_patches()
             return self._links_at_patch
 
     @property
@@ -394,7 +427,7 @@ class VoronoiDelaunayGrid(ModelGrid):
         try:
             return self._patches_at_link
         except AttributeError:
-            self._create_patches_from_delaunay_diagram(self.pts, self.vor)
+            self._create_patches()
             return self._patches_at_link
 
     def _find_perimeter_nodes_and_BC_set(self, pts):
@@ -411,11 +444,10 @@ class VoronoiDelaunayGrid(ModelGrid):
 
         # The ConvexHull object lists the edges that form the hull. We need to
         # get from this list of edges the unique set of nodes. To do this, we
-        # first flatten the list of vertices that make up all the hull edges
-        # ("simplices"), so it becomes a 1D array. With that, we can use the
-        # set() function to turn the array into a set, which removes duplicate
-        # vertices. Then we turn it back into an array, which now contains the
-        # set of IDs for the nodes that make up the convex hull.
+        # pass the vertices that make up all the hull edges ("simplices") to
+        # np.unique, which flattens them into a 1D array and removes duplicate
+        # vertices. The result contains the (sorted) set of IDs for the nodes
+        # that make up the convex hull.
         #   The next thing to worry about is the fact that the mesh perimeter
         # might contain nodes that are co-planar (that is, co-linear in our 2D
         # world). For example, if you make a set of staggered points for a
@@ -426,10 +458,10 @@ class VoronoiDelaunayGrid(ModelGrid):
         # the list of boundary_nodes. To deal with this, we pass the 'Qt'
         # option to ConvexHull, which makes it generate a list of coplanar
         # points. We include these in our set of boundary nodes.
-        convex_hull_nodes = np.array(list(set(hull.simplices.flatten())))
+        convex_hull_nodes = np.unique(hull.simplices)
         coplanar_nodes = hull.coplanar[:, 0]
-        boundary_nodes = as_id_array(np.concatenate(
-            (convex_hull_nodes, coplanar_nodes)))
+        boundary_nodes = as_id_array(np.unique(np.concatenate(
+            (convex_hull_nodes, coplanar_nodes))))
 
         # Now we'll create the "node_status" array, which contains the code
         # indicating whether the node is interior and active (=0) or a
@@ -491,14 +523,9 @@ class VoronoiDelaunayGrid(ModelGrid):
         assert ncells == np.count_nonzero(node_status == CORE_NODE), \
             'ncells must equal number of CORE_NODE values in node_status'
 
-        cell = 0
-        node_cell = np.ones(len(node_status), dtype=int) * BAD_INDEX_VALUE
-        cell_node = np.zeros(ncells, dtype=int)
-        for node in range(len(node_cell)):
-            if node_status[node] == CORE_NODE:
-                node_cell[node] = cell
-                cell_node[cell] = node
-                cell += 1
+        cell_node = np.where(node_status == CORE_NODE)[0].astype(int)
+        node_cell = np.full(len(node_status), BAD_INDEX_VALUE, dtype=int)
+        node_cell[cell_node] = np.arange(ncells)
 
         return node_cell, cell_node
 
@@ -537,34 +564,20 @@ class VoronoiDelaunayGrid(ModelGrid):
         # sharing an edge).
         num_shared_links = np.count_nonzero(tri.neighbors > -1)
         num_links = 3 * tri.nsimplex - num_shared_links // 2
-        link_fromnode = np.zeros(num_links, dtype=int)
-        link_tonode = np.zeros(num_links, dtype=int)
 
-        # Sweep through the list of triangles, assigning "from" and "to" nodes
-        # to the list of links.
-        #
-        # The basic algorithm works as follows. For each triangle, we will add
-        # its 3 edges as links. However, we have to make sure that each shared
-        # edge is added only once. To do this, we keep track of whether or not
-        # each triangle has been processed yet using a boolean array called
-        # "tridone". When we look at a given triangle, we check each vertex in
-        # turn. If there is no neighboring triangle opposite that vertex, then
-        # we need to add the corresponding edge. If there is a neighboring
-        # triangle but we haven't processed it yet, we also need to add the
-        # edge. If neither condition is true, then this edge has already been
-        # added, so we skip it.
-        link_id = 0
-        tridone = np.zeros(tri.nsimplex, dtype=bool)
-        for t in range(tri.nsimplex):  # loop over triangles
-            for i in range(0, 3):       # loop over vertices & neighbors
-                if tri.neighbors[t, i] == -1 or not tridone[
-                        tri.neighbors[t, i]]:
-                    link_fromnode[link_id] = tri.simplices[
-                        t, np.mod(i + 1, 3)]
-                    link_tonode[link_id] = tri.simplices[
-                        t, np.mod(i + 2, 3)]
-                    link_id += 1
-            tridone[t] = True
+        # Each triangle adds its 3 edges as links, where the edge opposite
+        # vertex i runs from vertex i + 1 to vertex i + 2. We have to make
+        # sure that each shared edge is added only once, so an edge is added
+        # only if there is no neighboring triangle opposite its vertex or if
+        # the neighbor comes later in the list of triangles (that is, it
+        # would not yet have been processed if we swept through the
+        # triangles in order).
+        triangle = np.arange(tri.nsimplex).reshape((-1, 1))
+        is_new_edge = ((tri.neighbors == -1) | (tri.neighbors > triangle))
+        link_fromnode = np.roll(tri.simplices, -1, axis=1)[is_new_edge]
+        link_tonode = np.roll(tri.simplices, -2, axis=1)[is_new_edge]
+        link_fromnode = link_fromnode.astype(int)
+        link_tonode = link_tonode.astype(int)
 
         # save the results
         # self.node_at_link_tail = link_fromnode
@@ -574,13 +587,72 @@ class VoronoiDelaunayGrid(ModelGrid):
         return link_fromnode, link_tonode, num_links
 
     @staticmethod
-    def _is_valid_voronoi_ridge(vor, n):
+    def _is_valid_voronoi_ridge(vor, ridge_vertices):
+        """Check if Voronoi ridges are finite.
+
+        Parameters
+        ----------
+        vor : scipy.spatial.Voronoi
+            Voronoi diagram.
+        ridge_vertices : ndarray of int, shape `(n_ridges, 2)`
+            Vertices at the ends of each ridge (-1 if a vertex is at
+            infinity).
 
+        Returns
+        -------
+        ndarray of bool
+            True for ridges whose ends are both defined.
+        """
         SUSPICIOUSLY_BIG = 40000000.0
-        return (vor.ridge_vertices[n][0] != -1 and
-                vor.ridge_vertices[n][1] != -1 and
-                np.amax(np.abs(vor.vertices[
-                    vor.ridge_vertices[n]])) < SUSPICIOUSLY_BIG)
+        ridge_vertices = np.asarray(ridge_vertices).reshape((-1, 2))
+        corners = vor.vertices[ridge_vertices]
+        return ((ridge_vertices[:, 0] != -1) &
+                (ridge_vertices[:, 1] != -1) &
+                (np.amax(np.abs(corners), axis=(1, 2)) < SUSPICIOUSLY_BIG))
+
+    @staticmethod
+    def _calc_area_of_voronoi_regions(vor, points):
+        """Calculate the areas of the Voronoi regions of points.
+
+        Parameters
+        ----------
+        vor : scipy.spatial.Voronoi
+            Voronoi diagram.
+        points : ndarray of int
+            IDs of points whose regions are all bounded.
+
+        Returns
+        -------
+        ndarray of float
+            Area of the region of each point.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from scipy.spatial import Voronoi
+        >>> from landlab.grid import VoronoiDelaunayGrid as vdg
+        >>> x, y = np.meshgrid([0., 1., 2.], [0., 2., 4.])
+        >>> vor = Voronoi(np.vstack((x.flat, y.flat)).T)
+        >>> vdg._calc_area_of_voronoi_regions(vor, np.array([4]))
+        array([ 2.])
+        """
+        regions = [vor.regions[region] for region in vor.point_region[points]]
+        n_vertices = np.fromiter((len(region) for region in regions),
+                                 dtype=int, count=len(regions))
+        vertices = np.fromiter(chain.from_iterable(regions), dtype=int,
+                               count=n_vertices.sum())
+
+        # Area of each polygon with the shoelace formula, summing over pairs
+        # of consecutive vertices (wrapping from the last to the first).
+        first = np.cumsum(n_vertices) - n_vertices
+        next_vertex = np.arange(1, len(vertices) + 1)
+        next_vertex[first + n_vertices - 1] = first
+        (x, y) = (vor.vertices[vertices, 0], vor.vertices[vertices, 1])
+        cross = x * y[next_vertex] - x[next_vertex] * y
+        region = np.repeat(np.arange(len(regions)), n_vertices)
+
+        return .5 * np.abs(np.bincount(region, weights=cross,
+                                       minlength=len(regions)))
 
     @staticmethod
     def _create_links_and_faces_from_voronoi_diagram(vor):
@@ -643,8 +715,9 @@ class VoronoiDelaunayGrid(ModelGrid):
         # links. So, to find the number of active links, we subtract from the
         # total number of links the number of occurrences of an undefined
         # vertex.
+        ridge_vertices = np.asarray(vor.ridge_vertices, dtype=int)
         num_active_links = num_links \
-            - np.count_nonzero(np.array(vor.ridge_vertices) == -1)
+            - np.count_nonzero(ridge_vertices == -1)
 
         # Create arrays for active links and width of faces (which are Voronoi
         # ridges).
@@ -652,31 +725,25 @@ class VoronoiDelaunayGrid(ModelGrid):
         face_width = -np.ones(num_active_links)
 
         # Find the order to sort by link midpoints
-        link_midpoints = np.zeros((num_links, 2))
-        for i in range(num_links):
-            link_midpoints[i][:] = (vor.points[vor.ridge_points[i, 0]] +
-                                    vor.points[vor.ridge_points[i, 1]])/2.
+        link_midpoints = (vor.points[vor.ridge_points[:, 0]] +
+                          vor.points[vor.ridge_points[:, 1]]) / 2.
         ind = argsort_points_by_x_then_y(link_midpoints)
 
-        # Loop through the list of ridges. For each ridge, there is a link, and
-        # its "from" and "to" nodes are the associated "points". In addition,
-        # if the ridge endpoints are defined, we have a face and an active
-        # link, so we add them to our arrays as well.
-        j = 0
-        for i in range(num_links):
-            link_fromnode[i] = vor.ridge_points[ind[i], 0]
-            link_tonode[i] = vor.ridge_points[ind[i], 1]
-            face_corner1 = vor.ridge_vertices[ind[i]][0]
-            face_corner2 = vor.ridge_vertices[ind[i]][1]
-            # means it's a valid face
-            if VoronoiDelaunayGrid._is_valid_voronoi_ridge(vor, ind[i]):
-                dx = vor.vertices[face_corner2, 0] - \
-                    vor.vertices[face_corner1, 0]
-                dy = vor.vertices[face_corner2, 1] - \
-                    vor.vertices[face_corner1, 1]
-                face_width[j] = np.sqrt(dx * dx + dy * dy)
-                active_links[j] = i
-                j += 1
+        # For each ridge, there is a link, and its "from" and "to" nodes are
+        # the associated "points". In addition, if the ridge endpoints are
+        # defined, we have a face and an active link.
+        link_fromnode[:] = vor.ridge_points[ind, 0]
+        link_tonode[:] = vor.ridge_points[ind, 1]
+
+        ridge_vertices = ridge_vertices[ind]
+        (valid, ) = np.where(
+            VoronoiDelaunayGrid._is_valid_voronoi_ridge(vor, ridge_vertices))
+        corner1 = vor.vertices[ridge_vertices[valid, 0]]
+        corner2 = vor.vertices[ridge_vertices[valid, 1]]
+        dx = corner2[:, 0] - corner1[:, 0]
+        dy = corner2[:, 1] - corner1[:, 1]
+        face_width[:len(valid)] = np.sqrt(dx * dx + dy * dy)
+        active_links[:len(valid)] = valid
 
         return link_fromnode, link_tonode, active_links, face_width
 
@@ -737,7 +804,11 @@ class VoronoiDelaunayGrid(ModelGrid):
                 flip_locs] = self.node_at_link_head[flip_locs]
             self._node_at_link_head[flip_locs] = fromnode_temp
 
-    def _create_patches_from_delaunay_diagram(self, pts, vor):
+    def _create_patches(self):
+        """Create the patches of the grid and their connectivity."""
+        self._create_patches_from_delaunay_diagram(self.pts)
+
+    def _create_patches_from_delaunay_diagram(self, pts):
         """
         Uses a delaunay diagram drawn from the provided points to
         generate an array of patches and patch-node-link connectivity.
@@ -745,15 +816,33 @@ class VoronoiDelaunayGrid(ModelGrid):
         DEJH, 10/3/14, modified May 16.
         """
         from scipy.spatial import Delaunay
-        from landlab.core.utils import anticlockwise_argsort_points_multiline
-        from .cfuncs import find_rows_containing_ID, \
-            create_patches_at_element, create_links_at_patch
         tri = Delaunay(pts)
-        assert np.array_equal(tri.points, vor.points)
+
+        # Triangle sides without a neighboring triangle are on the perimeter.
+        # The side opposite vertex i of a triangle joins vertices i + 1 and
+        # i + 2.
+        is_perimeter_side = tri.neighbors == -1
+        perimeter_nodes = np.concatenate(
+            (np.roll(tri.simplices, -1, axis=1)[is_perimeter_side],
+             np.roll(tri.simplices, -2, axis=1)[is_perimeter_side]))
+
+        self._create_patches_from_triangles(tri.simplices, perimeter_nodes)
+
+    def _create_patches_from_triangles(self, triangles, perimeter_nodes):
+        """Set up patches and their connectivity from triangles of nodes.
+
+        Parameters
+        ----------
+        triangles : ndarray of int, shape `(n_patches, 3)`
+            Nodes at the corners of each triangle, in any order.
+        perimeter_nodes : ndarray of int
+            Nodes on the perimeter of the triangulation.
+        """
+        from landlab.core.utils import anticlockwise_argsort_points_multiline
+        from .cfuncs import create_patches_at_element, create_links_at_patch
         nodata = -1
-        self._nodes_at_patch = as_id_array(tri.simplices)
-        # self._nodes_at_patch = np.empty_like(_nodes_at_patch)
-        self._number_of_patches = tri.simplices.shape[0]
+        self._nodes_at_patch = as_id_array(triangles)
+        self._number_of_patches = triangles.shape[0]
         # get the patches in order:
         patches_xy = np.empty((self._number_of_patches, 2), dtype=float)
         patches_xy[:, 0] = np.mean(self.node_x[self._nodes_at_patch],
@@ -774,8 +863,14 @@ class VoronoiDelaunayGrid(ModelGrid):
 
         # need to build a squared off, masked array of the patches_at_node
         # the max number of patches for a node in the grid is the max sides of
-        # the side-iest voronoi region.
-        max_dimension = len(max(vor.regions, key=len))
+        # the side-iest voronoi region. A region has a side for each patch at
+        # its node, plus an open side if the node is on the perimeter.
+        sides_at_node = np.bincount(self._nodes_at_patch.flat,
+                                    minlength=self.number_of_nodes)
+        is_perimeter_node = np.zeros(self.number_of_nodes, dtype=bool)
+        is_perimeter_node[perimeter_nodes] = True
+        sides_at_node += is_perimeter_node
+        max_dimension = sides_at_node.max()
 
         self._patches_at_node = np.full(
             (self.number_of_nodes, max_dimension), nodata, dtype=int)
@@ -809,23 +904,15 @@ class VoronoiDelaunayGrid(ModelGrid):
     def _create_neighbors(self):
         """Create the _neighbors_at_node property.
         """
-        self._neighbors_at_node = self.links_at_node.copy()
-        nodes_at_link = np.empty((self.number_of_links, 2))
-        nodes_at_link[:, 0] = self.node_at_link_tail
-        nodes_at_link[:, 1] = self.node_at_link_head
-        both_nodes = nodes_at_link[self.links_at_node]
+        tail = self.node_at_link_tail[self.links_at_node]
+        head = self.node_at_link_head[self.links_at_node]
 
-        nodes = np.arange(self.number_of_nodes, dtype=int)
+        nodes = np.arange(self.number_of_nodes, dtype=int).reshape((-1, 1))
         # ^we have to do this, as for a hex it's possible that mg.nodes is
         # returned not just in ID order.
 
-        for i in range(both_nodes.shape[1]):
-            centernottail = np.not_equal(both_nodes[:, i, 0], nodes)
-            centernothead = np.not_equal(both_nodes[:, i, 1], nodes)
-            self._neighbors_at_node[centernottail, i] = both_nodes[
-                centernottail, i, 0]
-            self._neighbors_at_node[centernothead, i] = both_nodes[
-                centernothead, i, 1]
+        # the neighbor is whichever end of the link isn't the center node
+        self._neighbors_at_node = np.where(tail != nodes, tail, head)
         # restamp the missing links:
         self._neighbors_at_node[
             self.links_at_node == BAD_INDEX_VALUE] = BAD_INDEX_VALUE
@@ -1,2 +1,47 @@
-from landlab.plot.imshow import (imshow_grid, imshow_node_grid,
-                                 imshow_cell_grid, imshow_grid_at_node)
+import importlib
+import os
+import sys
+
+if 'DISPLAY' not in os.environ:
+    try:
+        import matplotlib
+    except ImportError:
+        import warnings
+        warnings.warn('matplotlib not found', ImportWarning)
+    else:
+        matplotlib.use('Agg')
+
+
+# pyplot is slow to import, so the plotting functions are only imported the
+# first time they are used (see landlab/__init__.py).
+_LAZY_IMPORTS = {
+    'imshow_grid': '.imshow',
+    'imshow_node_grid': '.imshow',
+    'imshow_cell_grid': '.imshow',
+    'imshow_grid_at_node': '.imshow',
+}
+
+
+def __getattr__(name):
+    """Import a plotting function the first time it is used."""
+    try:
+        module = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            'module {0!r} has no attribute {1!r}'.format(__name__, name))
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+if sys.version_info < (3, 7):  # no module __getattr__, so import up front
+    for _name in list(_LAZY_IMPORTS):
+        __getattr__(_name)
+
+
+__all__ = ['imshow_grid', 'imshow_node_grid', 'imshow_cell_grid',
+           'imshow_grid_at_node']
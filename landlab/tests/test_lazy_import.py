@@ -0,0 +1,45 @@
+#! /usr/bin/env python
+"""
+Unit tests for importing landlab names on first use
+"""
+import subprocess
+import sys
+
+from nose.tools import assert_equal, assert_true
+
+
+def _modules_after(statement):
+    """Names of the modules loaded by running a statement."""
+    script = '\n'.join([statement, 'import sys',
+                        'print(" ".join(sorted(sys.modules)))'])
+    out = subprocess.check_output([sys.executable, '-c', script])
+    return set(out.decode().split())
+
+
+def test_import_landlab_is_lazy():
+    modules = _modules_after('import landlab')
+    for name in ('matplotlib', 'scipy', 'landlab.grid', 'landlab.plot',
+                 'landlab.components', 'nose'):
+        assert_true(name not in modules, msg=name)
+
+
+def test_import_grid_without_plotting():
+    modules = _modules_after('from landlab import RasterModelGrid; '
+                             'from landlab.components import FlowRouter')
+    assert_true('landlab.grid' in modules)
+    assert_true('matplotlib' not in modules)
+    assert_true('landlab.components.stream_power' not in modules)
+
+
+def test_lazy_names():
+    import landlab
+    import landlab.components
+    from landlab.grid import RasterModelGrid
+    from landlab.components.flow_routing import FlowRouter
+
+    assert_true(landlab.RasterModelGrid is RasterModelGrid)
+    assert_true(landlab.components.FlowRouter is FlowRouter)
+    assert_true(FlowRouter in landlab.components.COMPONENTS)
+    assert_equal([cls.__name__ for cls in landlab.components.COMPONENTS],
+                 landlab.components.__all__)
+    assert_true(landlab.io.read_esri_ascii is not None)
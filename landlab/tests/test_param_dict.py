@@ -78,6 +78,26 @@ def test_read_file_name():
     assert_equal(param_list, all_keys)
 
 
+def test_read_file_name_twice():
+    (prm_fd, prm_file_name) = tempfile.mkstemp()
+    with os.fdopen(prm_fd, 'w') as prm_file:
+        prm_file.write('ARRAY_VAL:\n1,2,3\n')
+
+    param_dict_1 = ModelParameterDictionary(prm_file_name, auto_type=True)
+    param_dict_1['ARRAY_VAL'][0] = 10
+    param_dict_2 = ModelParameterDictionary(prm_file_name, auto_type=True)
+    assert_equal(list(param_dict_2['ARRAY_VAL']), [1, 2, 3])
+    param_dict_3 = ModelParameterDictionary(prm_file_name)
+    assert_equal(param_dict_3['ARRAY_VAL'], '1,2,3')
+
+    with open(prm_file_name, 'w') as prm_file:
+        prm_file.write('ARRAY_VAL:\n4,5,6,7\n')
+    param_dict_4 = ModelParameterDictionary(prm_file_name, auto_type=True)
+    assert_equal(list(param_dict_4['ARRAY_VAL']), [4, 5, 6, 7])
+
+    os.remove(prm_file_name)
+
+
 @with_setup(setup)
 def test_read_file_like_twice():
     from six import StringIO
@@ -0,0 +1,86 @@
+#! /usr/bin/env python
+"""
+Unit tests for landlab.framework.sweep
+"""
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, assert_raises, assert_true
+
+from landlab import RasterModelGrid
+from landlab.components import FlowRouter, FastscapeEroder
+from landlab.framework.sweep import ParameterSweep
+
+
+def _grid():
+    np.random.seed(1945)
+    grid = RasterModelGrid((20, 20), 10.)
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    grid.add_field('node', 'topographic__elevation',
+                   np.random.rand(grid.number_of_nodes))
+    return grid
+
+
+def _erode(grid, K_sp=1e-5, n_steps=5):
+    fr = FlowRouter(grid)
+    sp = FastscapeEroder(grid, K_sp=K_sp)
+    z = grid.at_node['topographic__elevation']
+    for _ in range(n_steps):
+        z[grid.core_nodes] += 0.01
+        fr.run_one_step()
+        sp.run_one_step(100.)
+    return z[grid.core_nodes].mean()
+
+
+def _serial(K_sps):
+    return [_erode(_grid(), K_sp=K_sp) for K_sp in K_sps]
+
+
+def test_serial_matches_fresh_grids():
+    K_sps = [1e-5, 1e-4, 1e-3]
+    sweep = ParameterSweep(_grid(), _erode,
+                           mutable=['topographic__elevation'])
+    results = sweep.run([{'K_sp': K_sp} for K_sp in K_sps])
+    assert_array_equal(results, _serial(K_sps))
+
+
+def test_processes_match_fresh_grids():
+    K_sps = [1e-5, 1e-4, 1e-3, 1e-2]
+    sweep = ParameterSweep(_grid(), _erode,
+                           mutable=['topographic__elevation'], n_procs=2)
+    results = sweep.run([{'K_sp': K_sp} for K_sp in K_sps])
+    assert_array_equal(results, _serial(K_sps))
+
+
+def test_template_not_changed():
+    grid = _grid()
+    z = grid.at_node['topographic__elevation'].copy()
+    sweep = ParameterSweep(grid, _erode, mutable=['topographic__elevation'])
+    sweep.run([{'K_sp': 1e-3}])
+    assert_array_equal(grid.at_node['topographic__elevation'], z)
+    assert_equal(list(grid.at_node.keys()), ['topographic__elevation'])
+
+
+def test_shared_fields_are_read_only():
+    sweep = ParameterSweep(_grid(), _erode, mutable=[])
+    assert_raises(ValueError, sweep.run, [{}])
+
+
+def test_imap_streams_every_result():
+    sweep = ParameterSweep(_grid(), _erode,
+                           mutable=['topographic__elevation'], n_procs=2)
+    indices = sorted(index for (index, _) in
+                     sweep.imap({'K_sp': 10. ** -n} for n in range(3, 6)))
+    assert_equal(indices, [0, 1, 2])
+
+
+def test_runs_do_not_share_buffers():
+    grid = _grid()
+    grid.buffers.release(grid.buffers.empty('link'))
+
+    def pools(grid):
+        return grid.buffers
+    sweep = ParameterSweep(grid, pools)
+    (first, second) = sweep.run([{}, {}])
+    assert_true(first is not grid.buffers)
+    assert_true(first is not second)
+    assert_equal(first.number_of_allocations, 0)
@@ -0,0 +1,142 @@
+#! /usr/bin/env python
+"""
+Unit tests for landlab.framework.scheduler
+"""
+import threading
+
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, assert_raises, assert_true
+
+from landlab import RasterModelGrid
+from landlab.components import FlowRouter, FastscapeEroder, LinearDiffuser
+from landlab.framework.scheduler import (Scheduler, FieldConflictError,
+                                         _run_in_threads)
+
+
+class Stub(object):
+
+    """A component that records when it runs."""
+
+    def __init__(self, uses=(), provides=(), log=None, barrier=None):
+        self.input_var_names = uses
+        self.output_var_names = provides
+        self.log = log if log is not None else []
+        self.barrier = barrier
+
+    def run_one_step(self, dt):
+        if self.barrier is not None:
+            self.barrier.wait()
+        self.log.append((self, dt))
+
+
+class GridStub(Stub):
+
+    """A component that adds one to some fields of a grid."""
+
+    def __init__(self, grid, writes, **kwds):
+        super(GridStub, self).__init__(**kwds)
+        self._grid = grid
+        self.writes = writes
+
+    def run_one_step(self, dt):
+        for name in self.writes:
+            self._grid.at_node[name] += 1.
+
+
+def test_independent_components_run_concurrently():
+    """Both components must be running at once to get past the barrier."""
+    barrier = threading.Barrier(2, timeout=10.)
+    arena = {'a': Stub(provides=('x', ), barrier=barrier),
+             'b': Stub(provides=('y', ), barrier=barrier)}
+    scheduler = Scheduler(arena, order=['a', 'b'])
+    assert_equal(scheduler.stages(), [['a', 'b']])
+    scheduler.run(3)
+
+
+def test_run_in_threads_without_pool():
+    """The fallback for when concurrent.futures is missing."""
+    barrier = threading.Barrier(2, timeout=10.)
+    (a, b) = (Stub(barrier=barrier), Stub(barrier=barrier))
+    _run_in_threads([(a.run_one_step, 1.), (b.run_one_step, 2.)])
+    assert_equal(a.log, [(a, 1.)])
+    assert_equal(b.log, [(b, 2.)])
+
+    def fail(dt):
+        raise RuntimeError(dt)
+    assert_raises(RuntimeError, _run_in_threads,
+                  [(a.run_one_step, 1.), (fail, 2.)])
+
+
+def test_dependencies_keep_order():
+    log = []
+    arena = {'first': Stub(uses=('y', ), provides=('x', ), log=log),
+             'second': Stub(uses=('x', ), log=log),
+             'third': Stub(provides=('y', ), log=log)}
+    scheduler = Scheduler(arena, order=['first', 'second', 'third'])
+
+    assert_equal(scheduler.stages(), [['first'], ['second', 'third']])
+    assert_equal(sorted(scheduler.conflicts()),
+                 [('first', 'second', 'x', 'read-after-write'),
+                  ('first', 'third', 'y', 'write-after-read')])
+
+    scheduler.run(5, 1.)
+    first_runs = [i for (i, (component, _)) in enumerate(log)
+                  if component is arena['first']]
+    assert_equal(first_runs, [0, 3, 6, 9, 12])
+
+
+def test_run_frequencies():
+    log = []
+    arena = {'fast': Stub(log=log), 'slow': Stub(log=log)}
+    scheduler = Scheduler(arena, order=['fast', 'slow'], every={'slow': 4},
+                          executor='serial')
+    scheduler.run(8, 0.5)
+
+    slow_dts = [dt for (component, dt) in log if component is arena['slow']]
+    fast_dts = [dt for (component, dt) in log if component is arena['fast']]
+    assert_equal(slow_dts, [2., 2.])
+    assert_equal(fast_dts, [0.5] * 8)
+
+    assert_raises(ValueError, Scheduler, arena, every={'slow': 0})
+
+
+def test_check_fields():
+    """Test undeclared writes by concurrent components are caught."""
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'x')
+    grid.add_zeros('node', 'y')
+    grid.add_zeros('node', 'z')
+    arena = {'a': GridStub(grid, ['x'], provides=('x', )),
+             'b': GridStub(grid, ['y'], provides=('y', ))}
+    Scheduler(arena, order=['a', 'b'], check_fields=True).run(2)
+
+    arena['b'] = GridStub(grid, ['y', 'z'], provides=('y', ))
+    scheduler = Scheduler(arena, order=['a', 'b'], check_fields=True)
+    assert_raises(FieldConflictError, scheduler.run, 1)
+
+
+def test_landlab_components():
+    """Test scheduled components give the same result as a model loop."""
+    np.random.seed(1945)
+    z_init = np.random.rand(20 * 30)
+
+    elevations = []
+    for scheduled in (False, True):
+        grid = RasterModelGrid((20, 30), 10.)
+        z = grid.add_field('node', 'topographic__elevation', z_init.copy())
+        fr = FlowRouter(grid)
+        sp = FastscapeEroder(grid, K_sp=0.001)
+        ld = LinearDiffuser(grid, linear_diffusivity=0.01)
+        if scheduled:
+            Scheduler({'fr': fr, 'sp': sp, 'ld': ld},
+                      order=['fr', 'sp', 'ld'], every={'ld': 2}).run(6, 10.)
+        else:
+            for step in range(6):
+                fr.run_one_step()
+                sp.run_one_step(10.)
+                if step % 2 == 0:
+                    ld.run_one_step(20.)
+        elevations.append(z)
+
+    assert_array_equal(elevations[0], elevations[1])
@@ -9,6 +9,7 @@ General Landlab decorators
     ~landlab.utils.decorators.use_file_name_or_kwds
     ~landlab.utils.decorators.use_field_name_or_array
     ~landlab.utils.decorators.make_return_array_immutable
+    ~landlab.utils.decorators.skip_if_fields_unchanged
     ~landlab.utils.decorators.deprecated
 """
 
@@ -75,8 +76,8 @@ def use_file_name_or_kwds(func):
     Returns
     -------
     function
-        A function that takes an optional second argument, a file, from which
-        to read keywords.
+        A function that takes an optional second argument, a file from which
+        to read keywords, or a dict of keywords already read from one.
 
     Examples
     --------
@@ -99,6 +100,9 @@ def use_file_name_or_kwds(func):
     >>> foo = MyClass(grid, "kw: 1945", kw=1973)
     >>> foo.kw
     1973
+    >>> foo = MyClass(grid, {'kw': 1945})
+    >>> foo.kw
+    1945
 
     >>> mpd = \"\"\"
     ... kw: kw value
@@ -116,17 +120,15 @@ def use_file_name_or_kwds(func):
         if not isinstance(args[0], ModelGrid):
             raise ValueError('first argument must be a ModelGrid')
 
-        if len(args) == 2:
+        if len(args) == 2 and isinstance(args[1], dict):
+            params = load_params(args[1])
+        elif len(args) == 2:
             warnings.warn(
                 "Passing a file to a component's __init__ method is "
                 "deprecated. Instead, pass parameters as keywords.",
                 category=DeprecationWarning)
 
-            if os.path.isfile(args[1]):
-                with open(args[1], 'r') as fp:
-                    params = load_params(fp)
-            else:
-                params = load_params(args[1])
+            params = load_params(args[1])
         else:
             params = {}
 
@@ -242,6 +244,131 @@ def make_return_array_immutable(func):
     return _wrapped
 
 
+class skip_if_fields_unchanged(object):
+
+    """Decorate a component method so that it is skipped if nothing changed.
+
+    Output fields of the component are marked as modified after each run of
+    the decorated method so that other components see the change. If the
+    component's *skip_unchanged* attribute is True, the method is only run
+    if the version of one of the fields it depends on, the boundary
+    conditions of the grid, or the method's arguments have changed since
+    its last run. Otherwise, the value returned by the last run is
+    returned again.
+
+    Field versions change when a field is set through the field API or is
+    marked as modified, but *not* when values are changed in place. Only
+    set *skip_unchanged* if all in-place changes to the fields are followed
+    by a call to *mark_modified*.
+
+    Parameters
+    ----------
+    names : str, optional
+        Names of the fields that the method depends on. Locations of the
+        fields are taken from the component's *_var_mapping* (or "node"
+        for fields not listed there). If not given, use the input fields
+        of the component.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid, Component
+    >>> from landlab.utils.decorators import skip_if_fields_unchanged
+
+    >>> class Summer(Component):
+    ...     _input_var_names = ('topographic__elevation', )
+    ...     _output_var_names = ('total__elevation', )
+    ...     _var_mapping = {'topographic__elevation': 'node',
+    ...                     'total__elevation': 'grid'}
+    ...     def __init__(self, grid):
+    ...         self._grid = grid
+    ...         self.skip_unchanged = True
+    ...         self.runs = 0
+    ...     @skip_if_fields_unchanged()
+    ...     def run_one_step(self):
+    ...         self.runs += 1
+    ...         return self._grid.at_node['topographic__elevation'].sum()
+
+    >>> grid = RasterModelGrid((3, 4))
+    >>> z = grid.add_ones('node', 'topographic__elevation')
+    >>> summer = Summer(grid)
+    >>> summer.run_one_step()
+    12.0
+    >>> summer.run_one_step()
+    12.0
+    >>> summer.runs
+    1
+
+    After changing the elevations in place, mark the field as modified.
+
+    >>> z[0] = 2.
+    >>> grid.mark_modified('node', 'topographic__elevation')
+    >>> summer.run_one_step()
+    13.0
+    >>> summer.runs
+    2
+    """
+
+    def __init__(self, *names):
+        """Initialize the decorator.
+
+        Parameters
+        ----------
+        names : str, optional
+            Names of the fields that the method depends on.
+        """
+        self._names = names
+
+    def __call__(self, func):
+        """Wrap the method."""
+        memo = '_' + func.__name__ + '_last_run'
+
+        @wraps(func)
+        def _wrapped(component, *args, **kwds):
+            """Run the method only if the fields have changed."""
+            grid = component.grid
+            skip_unchanged = getattr(component, 'skip_unchanged', False)
+            names = self._names or component._input_var_names
+
+            args_key = (args, tuple(sorted(kwds.items())))
+            try:
+                hash(args_key)
+            except TypeError:
+                args_key = None
+
+            if skip_unchanged and args_key is not None:
+                last_key, last_value = getattr(component, memo, (None, None))
+                if last_key == (args_key, _field_versions(component, names)):
+                    return last_value
+
+            value = func(component, *args, **kwds)
+
+            for name in component._output_var_names:
+                at = component._var_mapping.get(name, 'node')
+                if grid.has_group(at) and grid.has_field(at, name):
+                    grid.mark_modified(at, name)
+
+            if skip_unchanged and args_key is not None:
+                setattr(component, memo,
+                        ((args_key, _field_versions(component, names)),
+                         value))
+
+            return value
+        return _wrapped
+
+
+def _field_versions(component, names):
+    """Versions of the fields a component method depends on."""
+    grid = component.grid
+    versions = []
+    for name in names:
+        at = component._var_mapping.get(name, 'node')
+        if grid.has_group(at) and grid.has_field(at, name):
+            versions.append(grid.field_version(at, name))
+        else:
+            versions.append(None)
+    return (grid.bc_set_code, tuple(versions))
+
+
 # def deprecated(use, version):
 #     """Mark a function as deprecated.
 # 
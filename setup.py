@@ -18,6 +18,8 @@ ext_modules = [
               ['landlab/grid/cfuncs.pyx']),
     Extension('landlab.components.flexure.cfuncs',
               ['landlab/components/flexure/cfuncs.pyx']),
+    Extension('landlab.components.overland_flow.cfuncs',
+              ['landlab/components/overland_flow/cfuncs.pyx']),
     Extension('landlab.components.flow_accum.cfuncs',
               ['landlab/components/flow_accum/cfuncs.pyx']),
     Extension('landlab.components.flow_routing.cfuncs',
@@ -26,6 +28,10 @@ ext_modules = [
               ['landlab/components/stream_power/cfuncs.pyx']),
     Extension('landlab.components.drainage_density.cfuncs',
               ['landlab/components/drainage_density/cfuncs.pyx']),
+    Extension('landlab.components.chi_index.cfuncs',
+              ['landlab/components/chi_index/cfuncs.pyx']),
+    Extension('landlab.components.steepness_index.cfuncs',
+              ['landlab/components/steepness_index/cfuncs.pyx']),
     Extension('landlab.utils.ext.jaggedarray',
               ['landlab/utils/ext/jaggedarray.pyx']),
     Extension('landlab.graph.structured_quad.ext.at_node',